@@ -0,0 +1,821 @@
+"""
+Student Result Management System
+Performance Benchmarks
+EduTech Solutions
+
+Usage:
+    python benchmarks.py grading [--sizes 10000 100000 1000000]
+    python benchmarks.py save [--sizes 1000 10000 100000]
+    python benchmarks.py parallel [--size 500000] [--workers 1 2 4 8] [--chunk-size 25000]
+    python benchmarks.py memory [--size 1000000]
+    python benchmarks.py snapshot [--sizes 100000 1000000]
+    python benchmarks.py export [--sizes 10000 100000 1000000] [--formats txt csv html]
+    python benchmarks.py suite [--sizes 1000 10000 100000] [--subjects 5] [--seed 42]
+                               [--formats json snap sqlite] [--output results.json]
+    python benchmarks.py compare baseline.json results.json [--threshold 10]
+    python benchmarks.py server [--size 100000] [--requests 20000] [--concurrency 64]
+                                [--url http://127.0.0.1:8080] [--revalidate] [--write-ratio 0.01]
+
+The suite times every layer on a seeded synthetic cohort (1k - 10M
+students) and writes the results as JSON. Run it before and after a
+change with the same options, then compare the two files.
+
+The server benchmark is a load test of the HTTP API (student_server):
+many keep-alive connections send a mix of lookups, pages and searches
+(and optionally writes) and the latency percentiles are reported. Without
+--url it serves a generated cohort from a server process of its own.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from collections import Counter
+from urllib.parse import urlsplit
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from student_export import DEFAULT_EXPORT_CHUNK_SIZE, ExportJob
+from student_files import iter_student_records, student_record
+from student_index import StudentIndex
+from student_io import LoadJob
+from student_journal import StudentJournal
+from student_parallel import DEFAULT_CHUNK_SIZE, calculate_parallel, render_report
+from student_storage import open_storage
+from student_store import MISSING, StudentCollection, load_numpy
+
+SUBJECTS = ['Mathematics', 'Science', 'English', 'History', 'Computer Science']
+SUITE_FORMATS = ['json', 'snap', 'sqlite']   # Data file extensions timed by the suite
+GENERATE_BLOCK_SIZE = 100000                 # Students generated per append_rows call
+NOISE_SECONDS = 0.001                        # Operations faster than this are never flagged
+
+
+# ============================================
+# SYNTHETIC DATA
+# ============================================
+def generate_cohort(count, subjects=SUBJECTS, seed=42, missing_rate=0.05):
+    """
+    Generate reproducible synthetic student records.
+    
+    Args:
+        count (int): Number of students to generate
+        subjects (list): Subject names
+        seed (int): Random seed, the same seed always gives the same cohort
+        missing_rate (float): Chance that a subject has no mark
+    
+    Yields:
+        tuple: (student_id, name, {subject: mark})
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        marks = {}
+        for subject in subjects:
+            if rng.random() >= missing_rate:
+                marks[subject] = float(rng.randint(0, 100))
+        yield 100 + index, f"Student {index}", marks
+
+
+def make_subjects(count):
+    """Return subject names: the standard subjects first, then 'Subject 6', 'Subject 7', ..."""
+    extra = [f"Subject {number}" for number in range(len(SUBJECTS) + 1, count + 1)]
+    return SUBJECTS[:count] + extra
+
+
+def generate_store(count, subjects=SUBJECTS, seed=42, missing_rate=0.05):
+    """
+    Generate the same cohort as generate_cohort directly into a collection.
+    
+    Marks are appended to the store's columns a block at a time, without a
+    dictionary per student, so cohorts of millions are practical. Results
+    are not calculated yet (every row is dirty).
+    
+    Returns:
+        StudentCollection: The generated students
+    """
+    students = StudentCollection(subjects)
+    store = students.store
+    rng = random.Random(seed)
+    for start in range(0, count, GENERATE_BLOCK_SIZE):
+        size = min(GENERATE_BLOCK_SIZE, count - start)
+        # Same draws in the same order as generate_cohort
+        marks = array('d', (float(rng.randint(0, 100)) if rng.random() >= missing_rate
+                            else MISSING for _ in range(size * len(subjects))))
+        no_results = array('d', bytes(8 * size))
+        store.append_rows(list(range(100 + start, 100 + start + size)),
+                          [f"Student {index}" for index in range(start, start + size)],
+                          subjects, marks, no_results, no_results,
+                          array('B', bytes(size)), store.grade_labels)
+    return students
+
+
+# ============================================
+# ORIGINAL PER-OBJECT IMPLEMENTATION
+# ============================================
+class LegacyStudent:
+    """Dictionary-backed student with the original calculate_results loop."""
+    
+    def __init__(self, student_id, name, marks):
+        self.student_id = student_id
+        self.name = name
+        self.marks = marks
+        self.total_marks = 0.0
+        self.percentage = 0.0
+        self.grade = ''
+    
+    def calculate_results(self):
+        if not self.marks:
+            self.total_marks = 0.0
+            self.percentage = 0.0
+            self.grade = 'N/A'
+            return
+        
+        self.total_marks = sum(self.marks.values())
+        
+        total_subjects = len(self.marks)
+        max_possible_marks = total_subjects * 100
+        if max_possible_marks > 0:
+            self.percentage = (self.total_marks / max_possible_marks) * 100
+        else:
+            self.percentage = 0.0
+        
+        if self.percentage >= 90:
+            self.grade = 'A'
+        elif self.percentage >= 80:
+            self.grade = 'B'
+        elif self.percentage >= 70:
+            self.grade = 'C'
+        elif self.percentage >= 60:
+            self.grade = 'D'
+        else:
+            self.grade = 'F'
+
+
+# ============================================
+# BENCHMARKS
+# ============================================
+def time_call(function, repeat=3):
+    """Return the best wall-clock time of several calls, in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def benchmark_grading(sizes):
+    """Compare the per-object grading loop with the columnar batch engine."""
+    engine = "numpy" if load_numpy() is not None else "python fallback"
+    print(f"Grading throughput (batch engine: {engine})")
+    print(f"{'Students':>10} {'Per-object/s':>15} {'Batch/s':>15} {'Speed-up':>10}")
+    
+    for size in sizes:
+        legacy = [LegacyStudent(*record) for record in generate_cohort(size)]
+        
+        def legacy_loop():
+            for student in legacy:
+                student.calculate_results()
+        
+        legacy_time = time_call(legacy_loop)
+        del legacy
+        
+        students = StudentCollection(SUBJECTS)
+        for record in generate_cohort(size):
+            students.add(*record)
+        batch_time = time_call(students.store.calculate_all)
+        
+        print(f"{size:>10} {size / legacy_time:>15,.0f} {size / batch_time:>15,.0f} "
+              f"{legacy_time / batch_time:>9.1f}x")
+
+
+def benchmark_save(sizes):
+    """Compare save latency of a full JSON rewrite with a journal append."""
+    print("Save latency after changing one student (milliseconds)")
+    print(f"{'Students':>10} {'Full rewrite':>14} {'Journal append':>16} {'Checkpoint':>12}")
+    
+    for size in sizes:
+        students = StudentCollection(SUBJECTS)
+        for record in generate_cohort(size):
+            students.add(*record)
+        students.calculate_all()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            data_file = os.path.join(directory, 'student_data.json')
+            
+            # Original save_to_file: rebuild and rewrite the whole file
+            def full_rewrite():
+                data_to_save = {}
+                for student_id, student in students.items():
+                    data_to_save[student_id] = student_record(student)
+                with open(data_file, 'w') as file:
+                    json.dump(data_to_save, file, indent=4, sort_keys=True)
+            
+            journal = StudentJournal(data_file)
+            changed_student = next(iter(students))
+            
+            rewrite_time = time_call(full_rewrite)
+            append_time = time_call(lambda: journal.append(students, [changed_student]))
+            checkpoint_time = time_call(lambda: journal.checkpoint(iter_student_records(students)))
+        
+        print(f"{size:>10} {rewrite_time * 1000:>14.2f} {append_time * 1000:>16.2f} "
+              f"{checkpoint_time * 1000:>12.2f}")
+
+
+def measure_memory(build):
+    """
+    Build an object under tracemalloc.
+    
+    Returns:
+        tuple: (bytes still allocated by the object, peak bytes while building)
+    """
+    tracemalloc.start()
+    try:
+        result = build()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def benchmark_memory(size):
+    """Compare the memory held by dictionary-backed and columnar students."""
+    def build_legacy():
+        # Original layout: {student_id: Student} with a marks dict per student
+        return {record[0]: LegacyStudent(*record) for record in generate_cohort(size)}
+    
+    def build_columnar():
+        students = StudentCollection(SUBJECTS)
+        for record in generate_cohort(size):
+            students.add(*record)
+        students.calculate_all()
+        return students
+    
+    # Import NumPy and compile the grading policy before measuring, so the
+    # module and its caches are not counted against the columnar layout
+    load_numpy()
+    warm_up = StudentCollection(SUBJECTS)
+    for record in generate_cohort(10):
+        warm_up.add(*record)
+    warm_up.calculate_all()
+    del warm_up
+    
+    print(f"Memory for {size} students (tracemalloc)")
+    print(f"{'Layout':>12} {'Held MB':>10} {'Bytes/student':>14} {'Peak MB':>10}")
+    for label, build in (("dict", build_legacy), ("columnar", build_columnar)):
+        current, peak = measure_memory(build)
+        print(f"{label:>12} {current / 2**20:>10.1f} {current / size:>14.0f} {peak / 2**20:>10.1f}")
+
+
+def benchmark_snapshot(sizes, chunk_size=5000):
+    """Compare opening and loading a JSON data file with a binary snapshot."""
+    print("Cold open, full read and GUI-style load (seconds)")
+    print(f"{'Students':>10} {'Format':>7} {'Size MB':>8} {'Open':>8} {'Read':>8} {'Load':>8}")
+    
+    for size in sizes:
+        students = StudentCollection(SUBJECTS)
+        for record in generate_cohort(size):
+            students.add(*record)
+        students.calculate_all()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in ('json', 'snap'):
+                storage = open_storage(os.path.join(directory, f'student_data.{extension}'))
+                storage.write_records(iter_student_records(students))
+                
+                # Time until the first record is available
+                start = time.perf_counter()
+                stream = storage.read()
+                next(stream)
+                open_time = time.perf_counter() - start
+                stream.close()
+                
+                def read_all():
+                    stream = storage.read()
+                    for _ in stream:
+                        pass
+                    stream.close()
+                
+                def load_all():
+                    # Same chunked load as ResultManagementSystem.load_next_chunk
+                    loaded = StudentCollection()
+                    stream = storage.read()
+                    while stream.load_into(loaded.store, chunk_size) == chunk_size:
+                        pass
+                    stream.close()
+                
+                read_time = time_call(read_all, repeat=1)
+                load_time = time_call(load_all, repeat=1)
+                file_size = os.path.getsize(storage.data_file)
+                print(f"{size:>10} {extension:>7} {file_size / 2**20:>8.1f} {open_time:>8.3f} "
+                      f"{read_time:>8.2f} {load_time:>8.2f}")
+
+
+def benchmark_parallel(size, worker_counts, chunk_size):
+    """Show how grading and report generation scale with worker processes."""
+    students = StudentCollection(SUBJECTS)
+    for record in generate_cohort(size):
+        students.add(*record)
+    
+    print(f"Parallel scaling for {size} students, {chunk_size} per task "
+          f"({os.cpu_count()} cores available)")
+    print(f"{'Workers':>8} {'Grading/s':>12} {'Speed-up':>9} {'Report/s':>12} {'Speed-up':>9}")
+    
+    baseline = None
+    for workers in worker_counts:
+        grade_time = time_call(
+            lambda: calculate_parallel(students.store, workers, chunk_size), repeat=1)
+        report_time = time_call(
+            lambda: sum(len(text) for text in render_report(students.store, workers, chunk_size)),
+            repeat=1)
+        if baseline is None:
+            baseline = (grade_time, report_time)
+        print(f"{workers:>8} {size / grade_time:>12,.0f} {baseline[0] / grade_time:>8.1f}x "
+              f"{size / report_time:>12,.0f} {baseline[1] / report_time:>8.1f}x")
+
+
+def benchmark_export(sizes, formats, chunk_size):
+    """Measure report export throughput and show that its memory does not grow."""
+    print("Streaming report export (peak: Python allocations while exporting)")
+    print(f"{'Students':>10} {'Format':>7} {'Size MB':>8} {'Students/s':>12} {'MB/s':>8} "
+          f"{'Peak MB':>8}")
+    
+    for size in sizes:
+        students = generate_store(size)
+        students.calculate_all()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in formats:
+                target_file = os.path.join(directory, f'report.{extension}')
+                job = ExportJob(target_file, students.store, chunk_size)
+                export_time = time_call(job, repeat=1)
+                file_size = os.path.getsize(target_file)
+                _, peak = measure_memory(ExportJob(target_file, students.store, chunk_size))
+                print(f"{size:>10} {extension:>7} {file_size / 2**20:>8.1f} "
+                      f"{size / export_time:>12,.0f} {file_size / 2**20 / export_time:>8.1f} "
+                      f"{peak / 2**20:>8.1f}")
+
+
+# ============================================
+# REGRESSION SUITE
+# ============================================
+def peak_rss():
+    """Return the process's peak resident memory in bytes, None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports KiB
+
+
+def run_operation(results, students, operation, function, repeat=1, trace_memory=False,
+                  storage_format=None, records=None):
+    """
+    Time one operation of the suite and add its result.
+    
+    Args:
+        results (list): Result dictionaries, the new one is appended
+        students (int): Cohort size, for the throughput
+        operation (str): Operation name
+        function (callable): Operation to time
+        repeat (int): Runs, the best one is recorded
+        trace_memory (bool): Also record the peak Python allocation with
+            tracemalloc (slows the operation down)
+        storage_format (str): Data file extension of persistence operations
+        records (int): Students the operation processes, for the
+            throughput (default: the whole cohort)
+    
+    Returns:
+        dict: The result, so callers can add fields (e.g. 'bytes')
+    """
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        seconds = time_call(function, repeat)
+        traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    
+    rss = peak_rss()
+    if records is None:
+        records = students
+    result = {
+        'students': students,
+        'operation': operation,
+        'format': storage_format,
+        'seconds': seconds,
+        'students_per_second': records / seconds if seconds else None,
+        'peak_rss_bytes': rss,
+        'peak_traced_bytes': traced_peak
+    }
+    results.append(result)
+    print(f"{students:>10} {operation:>16} {storage_format or '':>7} {seconds:>10.3f} "
+          f"{result['students_per_second'] or 0:>14,.0f} "
+          f"{'-' if rss is None else f'{rss / 2**20:.0f}':>8}")
+    return result
+
+
+def benchmark_suite(sizes, subject_count, seed, missing_rate, formats, repeat, workers,
+                    trace_memory):
+    """
+    Time generation, grading, persistence, refresh and reports for each size.
+    
+    Returns:
+        list: One result dictionary per operation, size and format
+    """
+    subjects = make_subjects(subject_count)
+    results = []
+    print(f"Benchmark suite: {len(subjects)} subjects, seed {seed}")
+    print(f"{'Students':>10} {'Operation':>16} {'Format':>7} {'Seconds':>10} "
+          f"{'Students/s':>14} {'Peak MB':>8}")
+    
+    for size in sizes:
+        generated = []
+        run_operation(results, size, 'generate',
+                      lambda: generated.append(generate_store(size, subjects, seed, missing_rate)),
+                      trace_memory=trace_memory)
+        students = generated.pop()
+        store = students.store
+        
+        # Model: Student.calculate_results one object at a time, then the batch engine
+        def per_object():
+            store.dirty_rows.update(range(len(store.ids)))
+            for student in students.values():
+                student.calculate_results()
+        
+        operations = [
+            ('calculate_results', per_object),
+            ('calculate_batch', store.calculate_all),
+            # Headless refresh_student_list rebuild: every table row's values
+            ('refresh_rows', lambda: [
+                (student_id, student.name, f"{student.total_marks:.1f}",
+                 f"{student.percentage:.1f}%", student.grade)
+                for student_id, student in ((student_id, students[student_id])
+                                            for student_id in sorted(students.keys()))]),
+            ('index_build', lambda: StudentIndex(store))
+        ]
+        for operation, function in operations:
+            run_operation(results, size, operation, function, repeat, trace_memory)
+        
+        report_chars = []
+        report = run_operation(
+            results, size, 'report',
+            lambda: report_chars.append(sum(len(text) for text in render_report(store, workers))),
+            repeat, trace_memory)
+        report['bytes'] = report_chars[-1]
+        
+        # Persistence: save_to_file (full and one change) and load_from_file
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in formats:
+                storage = open_storage(os.path.join(directory, f'student_data.{extension}'))
+                save = run_operation(
+                    results, size, 'save_full',
+                    lambda: storage.write_records(iter_student_records(students)),
+                    repeat, trace_memory, extension)
+                save['bytes'] = os.path.getsize(storage.data_file)
+                run_operation(results, size, 'load',
+                              lambda: LoadJob(storage, subjects)(),
+                              repeat, trace_memory, extension)
+                changed_id = next(iter(students))
+                run_operation(results, size, 'save_change',
+                              lambda: storage.save(students, {changed_id}),
+                              repeat, trace_memory, extension, records=1)
+        
+        for result in results:
+            result.setdefault('subjects', len(subjects))
+        del students, store
+    return results
+
+
+def write_suite_results(file_path, results, config):
+    """Write suite results with the environment they were measured in."""
+    document = {
+        'benchmark': 'suite',
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'numpy': load_numpy().__version__ if load_numpy() is not None else None
+        },
+        'config': config,
+        'results': results
+    }
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(document, file, indent=2)
+    print(f"Results written to {file_path}")
+
+
+def compare_results(baseline_file, current_file, threshold):
+    """
+    Compare two suite result files and list operations that got slower.
+    
+    Args:
+        baseline_file (str): Results of the earlier run
+        current_file (str): Results of the new run
+        threshold (float): Slow-down in percent counted as a regression
+    
+    Returns:
+        int: Exit status, 1 if any operation regressed
+    """
+    def load(file_path):
+        with open(file_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    
+    baseline_run = load(baseline_file)
+    current_run = load(current_file)
+    for section in ('config', 'environment'):
+        if baseline_run[section] != current_run[section]:
+            print(f"Note: the runs have a different {section}, timings may not be comparable")
+    
+    def by_key(document):
+        return {(result['students'], result['subjects'], result['operation'], result['format']):
+                result for result in document['results']}
+    
+    baseline = by_key(baseline_run)
+    current = by_key(current_run)
+    print(f"{'Students':>10} {'Subj':>5} {'Operation':>16} {'Format':>7} "
+          f"{'Baseline s':>11} {'Current s':>10} {'Change':>8}")
+    
+    regressions = 0
+    for key in sorted(baseline.keys() & current.keys(), key=lambda key: tuple(map(str, key))):
+        old = baseline[key]['seconds']
+        new = current[key]['seconds']
+        change = (new - old) / old * 100 if old else 0.0
+        flag = ''
+        if change > threshold and max(old, new) >= NOISE_SECONDS:
+            regressions += 1
+            flag = '  REGRESSION'
+        size, subjects, operation, storage_format = key
+        print(f"{size:>10} {subjects:>5} {operation:>16} {storage_format or '':>7} "
+              f"{old:>11.3f} {new:>10.3f} {change:>+7.1f}%{flag}")
+    
+    missing = len(baseline.keys() ^ current.keys())
+    if missing:
+        print(f"{missing} operations were only measured in one of the runs")
+    print(f"{regressions} regressions above {threshold:g}%")
+    return 1 if regressions else 0
+
+
+# ============================================
+# HTTP LOAD TEST
+# ============================================
+def latency_percentile(latencies, percent):
+    """Return a percentile of sorted latencies (nearest rank)."""
+    if not latencies:
+        return 0.0
+    rank = max(0, min(len(latencies) - 1, math.ceil(percent / 100 * len(latencies)) - 1))
+    return latencies[rank]
+
+
+async def read_response(reader):
+    """Read one HTTP response, returning (status, headers, body)."""
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers, body
+
+
+async def run_load(host, port, request_count, concurrency, student_ids, revalidate,
+                   write_ratio, seed=42):
+    """
+    Send requests over concurrent keep-alive connections.
+    
+    Returns:
+        tuple: (sorted latencies in seconds, Counter of (method, status), elapsed seconds)
+    """
+    latencies = []
+    statuses = Counter()
+    remaining = [request_count]
+    etag = [None]  # Last ETag seen, sent back when revalidating
+    
+    def next_request(chooser):
+        if write_ratio and chooser.random() < write_ratio:
+            student_id = chooser.choice(student_ids)
+            body = json.dumps({'students': [{
+                'id': student_id, 'name': f"Student {student_id}",
+                'marks': {subject: chooser.randint(0, 100) for subject in SUBJECTS}}]})
+            return 'POST', '/students', body.encode('utf-8')
+        kind = chooser.random()
+        if kind < 0.7:
+            return 'GET', f'/students/{chooser.choice(student_ids)}', b''
+        if kind < 0.85:
+            offset = chooser.randrange(max(1, len(student_ids) - 50))
+            return 'GET', f'/students?offset={offset}&limit=50', b''
+        return 'GET', f'/search?q=Student%20{chooser.randint(1, 99)}&limit=20', b''
+    
+    async def client(number):
+        chooser = random.Random(seed + number)
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                method, path, body = next_request(chooser)
+                headers = [f"{method} {path} HTTP/1.1", f"Host: {host}",
+                           f"Content-Length: {len(body)}"]
+                if revalidate and method == 'GET' and etag[0]:
+                    headers.append(f"If-None-Match: {etag[0]}")
+                start = time.perf_counter()
+                writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+                await writer.drain()
+                status, response_headers, _ = await read_response(reader)
+                latencies.append(time.perf_counter() - start)
+                statuses[method, status] += 1
+                if 'etag' in response_headers:
+                    etag[0] = response_headers['etag']
+        finally:
+            writer.close()
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return latencies, statuses, elapsed
+
+
+def start_server_process(size, directory):
+    """
+    Generate a cohort and serve it from a new server process.
+    
+    Returns:
+        tuple: (Popen, host, port)
+    """
+    data_file = os.path.join(directory, 'student_data.snap')
+    students = generate_store(size)
+    students.calculate_all()
+    open_storage(data_file).write_records(iter_student_records(students))
+    del students
+    
+    cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'student_cli.py')
+    process = subprocess.Popen(
+        [sys.executable, cli, '--data-file', data_file, 'serve', '--port', '0'],
+        stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()  # "Serving ... on http://host:port/"
+    if not line:
+        raise RuntimeError("The server process did not start")
+    address = urlsplit(line.split()[-1])
+    return process, address.hostname, address.port
+
+
+def benchmark_server(size, request_count, concurrency, url=None, revalidate=False,
+                     write_ratio=0.0, output=None):
+    """Load-test the HTTP API and print throughput and latency percentiles."""
+    with tempfile.TemporaryDirectory() as directory:
+        process = None
+        if url:
+            address = urlsplit(url)
+            host, port = address.hostname, address.port or 80
+        else:
+            print(f"Serving a generated cohort of {size} students...")
+            process, host, port = start_server_process(size, directory)
+        student_ids = list(range(100, 100 + size))  # IDs of generate_cohort
+        try:
+            latencies, statuses, elapsed = asyncio.run(run_load(
+                host, port, request_count, concurrency, student_ids, revalidate, write_ratio))
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+    
+    summary = {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'seconds': elapsed,
+        'requests_per_second': len(latencies) / elapsed if elapsed else None,
+        'p50_ms': latency_percentile(latencies, 50) * 1000,
+        'p90_ms': latency_percentile(latencies, 90) * 1000,
+        'p99_ms': latency_percentile(latencies, 99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+        'statuses': {f"{method} {status}": count
+                     for (method, status), count in sorted(statuses.items())}
+    }
+    print(f"{summary['requests']} requests, {concurrency} connections, "
+          f"{elapsed:.2f} s ({summary['requests_per_second'] or 0:,.0f} requests/s)")
+    print(f"Latency: p50 {summary['p50_ms']:.2f} ms  p90 {summary['p90_ms']:.2f} ms  "
+          f"p99 {summary['p99_ms']:.2f} ms  max {summary['max_ms']:.2f} ms")
+    print("Responses: " + "  ".join(f"{key}: {count}"
+                                    for key, count in summary['statuses'].items()))
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            json.dump(summary, file, indent=2)
+    return summary
+
+
+# ============================================
+# COMMAND LINE
+# ============================================
+def main():
+    """Parse command line arguments and run the selected benchmark."""
+    parser = argparse.ArgumentParser(description="Student Result System benchmarks")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    
+    grading = subparsers.add_parser('grading', help="per-object vs batch grading")
+    grading.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    
+    save = subparsers.add_parser('save', help="full rewrite vs journal append")
+    save.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    
+    parallel = subparsers.add_parser('parallel', help="scaling across worker processes")
+    parallel.add_argument('--size', type=int, default=500000)
+    parallel.add_argument('--workers', type=int, nargs='+',
+                          default=[count for count in (1, 2, 4, 8, 16)
+                                   if count <= (os.cpu_count() or 1)])
+    parallel.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    
+    memory = subparsers.add_parser('memory', help="dict-backed vs columnar students")
+    memory.add_argument('--size', type=int, default=1000000)
+    
+    snapshot = subparsers.add_parser('snapshot', help="JSON vs binary snapshot loading")
+    snapshot.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    
+    export = subparsers.add_parser('export', help="streaming report export throughput")
+    export.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    export.add_argument('--formats', nargs='+', choices=['txt', 'csv', 'html'],
+                        default=['txt', 'csv', 'html'])
+    export.add_argument('--chunk-size', type=int, default=DEFAULT_EXPORT_CHUNK_SIZE,
+                        help="students rendered at a time")
+    
+    suite = subparsers.add_parser('suite', help="full regression suite with JSON results")
+    suite.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                       help="cohort sizes (up to 10000000)")
+    suite.add_argument('--subjects', type=int, default=len(SUBJECTS), help="subjects per student")
+    suite.add_argument('--seed', type=int, default=42, help="random seed of the cohort")
+    suite.add_argument('--missing-rate', type=float, default=0.05,
+                       help="chance that a subject has no mark")
+    suite.add_argument('--formats', nargs='+', choices=SUITE_FORMATS, default=SUITE_FORMATS,
+                       help="data file formats to save and load")
+    suite.add_argument('--repeat', type=int, default=1, help="runs per operation (best is kept)")
+    suite.add_argument('--workers', type=int, default=1, help="worker processes for the report")
+    suite.add_argument('--trace-memory', action='store_true',
+                       help="also record peak Python allocations (slower)")
+    suite.add_argument('--output', default='benchmark_results.json', help="JSON results file")
+    
+    compare = subparsers.add_parser('compare', help="compare two suite result files")
+    compare.add_argument('baseline', help="results of the earlier run")
+    compare.add_argument('current', help="results of the new run")
+    compare.add_argument('--threshold', type=float, default=10.0,
+                         help="slow-down in percent reported as a regression")
+    
+    server = subparsers.add_parser('server', help="HTTP API load test with latency percentiles")
+    server.add_argument('--size', type=int, default=100000,
+                        help="students generated (with --url: IDs 100 to 99 + size are requested)")
+    server.add_argument('--requests', type=int, default=20000)
+    server.add_argument('--concurrency', type=int, default=64, help="concurrent connections")
+    server.add_argument('--url', help="load-test a running server instead of starting one")
+    server.add_argument('--revalidate', action='store_true',
+                        help="send If-None-Match with the last ETag (measures 304 responses)")
+    server.add_argument('--write-ratio', type=float, default=0.0,
+                        help="fraction of requests that update a student")
+    server.add_argument('--output', help="also write the summary as JSON")
+    
+    args = parser.parse_args()
+    if args.benchmark == 'grading':
+        benchmark_grading(args.sizes)
+    elif args.benchmark == 'save':
+        benchmark_save(args.sizes)
+    elif args.benchmark == 'memory':
+        benchmark_memory(args.size)
+    elif args.benchmark == 'snapshot':
+        benchmark_snapshot(args.sizes)
+    elif args.benchmark == 'export':
+        benchmark_export(args.sizes, args.formats, args.chunk_size)
+    elif args.benchmark == 'parallel':
+        benchmark_parallel(args.size, args.workers, args.chunk_size)
+    elif args.benchmark == 'suite':
+        config = {key: value for key, value in vars(args).items()
+                  if key not in ('benchmark', 'output')}
+        results = benchmark_suite(args.sizes, args.subjects, args.seed, args.missing_rate,
+                                  args.formats, args.repeat, args.workers, args.trace_memory)
+        write_suite_results(args.output, results, config)
+    elif args.benchmark == 'compare':
+        return compare_results(args.baseline, args.current, args.threshold)
+    elif args.benchmark == 'server':
+        benchmark_server(args.size, args.requests, args.concurrency, args.url, args.revalidate,
+                         args.write_ratio, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Student Result Management System
+Cohorts Window
+EduTech Solutions
+
+Lists the cohorts of the shard directory from its manifest (no shard is
+read) and opens one in the main window. A student ID can be looked up to
+find the cohort the student is in.
+"""
+
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog
+
+from student_shards import COMPRESSIONS, DEFAULT_COMPRESSION, read_manifest, shard_path
+
+COHORT_COLUMNS = ('Cohort', 'Students', 'Size', 'Compression')
+
+
+class CohortWindow(tk.Toplevel):
+    """Toplevel window listing the cohorts and opening one of them."""
+    
+    def __init__(self, master, directory, current_file, open_cohort):
+        """
+        Open the window.
+        
+        Args:
+            master: Parent window
+            directory (str): Shard directory
+            current_file (callable): Returns the data file shown in the main window
+            open_cohort (callable): open_cohort(data_file) shows a cohort's shard
+        """
+        super().__init__(master)
+        self.title("🏫 Cohorts")
+        self.geometry("560x420")
+        self.directory = directory
+        self.current_file = current_file
+        self.open_cohort = open_cohort
+        self.files = {}  # {tree item: shard path}
+        
+        # Cohorts in the manifest
+        self.cohorts_tree = ttk.Treeview(self, columns=COHORT_COLUMNS, show='headings',
+                                         selectmode='browse', height=12)
+        for column in COHORT_COLUMNS:
+            self.cohorts_tree.heading(column, text=column)
+            self.cohorts_tree.column(column, width=220 if column == 'Cohort' else 100,
+                                     anchor=tk.W if column == 'Cohort' else tk.E)
+        self.cohorts_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        self.cohorts_tree.bind('<Double-1>', lambda event: self.open_selected())
+        
+        buttons_frame = ttk.Frame(self)
+        buttons_frame.pack(fill=tk.X, padx=10)
+        ttk.Button(buttons_frame, text="Open", command=self.open_selected).pack(side=tk.LEFT)
+        ttk.Button(buttons_frame, text="New Cohort...", command=self.ask_new_cohort).pack(
+            side=tk.LEFT, padx=5)
+        ttk.Label(buttons_frame, text="Compression:").pack(side=tk.LEFT, padx=(10, 0))
+        self.compression_var = tk.StringVar(value=DEFAULT_COMPRESSION)
+        ttk.Combobox(buttons_frame, textvariable=self.compression_var, values=list(COMPRESSIONS),
+                     state='readonly', width=6).pack(side=tk.LEFT, padx=5)
+        
+        # Cohort of a student
+        find_frame = ttk.Frame(self)
+        find_frame.pack(fill=tk.X, padx=10, pady=(15, 5))
+        ttk.Label(find_frame, text="Find Student ID:").pack(side=tk.LEFT)
+        self.student_var = tk.StringVar()
+        student_entry = ttk.Entry(find_frame, textvariable=self.student_var, width=10)
+        student_entry.pack(side=tk.LEFT, padx=5)
+        student_entry.bind('<Return>', lambda event: self.find_student())
+        ttk.Button(find_frame, text="Find", command=self.find_student).pack(side=tk.LEFT)
+        self.find_label = ttk.Label(find_frame, text="")
+        self.find_label.pack(side=tk.LEFT, padx=10)
+        
+        close_btn = ttk.Button(self, text="Close", command=self.destroy)
+        close_btn.pack(pady=(5, 10))
+        
+        self.refresh()
+    
+    def manifest(self):
+        """Return the manifest, or None after showing why it cannot be read."""
+        try:
+            return read_manifest(self.directory)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Cohorts Error", f"Failed to read cohorts:\n{str(e)}",
+                                 parent=self)
+            return None
+    
+    def refresh(self):
+        """Redraw the cohort list; the cohort shown in the main window is marked."""
+        self.cohorts_tree.delete(*self.cohorts_tree.get_children())
+        self.files = {}
+        manifest = self.manifest()
+        if manifest is None:
+            return
+        current = os.path.abspath(self.current_file())
+        for cohort in manifest.cohorts():
+            shard = manifest.shards[cohort]
+            data_file = manifest.shard_file(cohort)
+            shown = os.path.abspath(data_file) == current
+            item = self.cohorts_tree.insert('', tk.END, values=(
+                f"▶ {cohort}" if shown else cohort, shard['students'],
+                f"{shard['bytes'] / 1024:.1f} KB", shard['compression']))
+            self.files[item] = data_file
+            if shown:
+                self.cohorts_tree.selection_set(item)
+    
+    def open_selected(self):
+        """Show the selected cohort in the main window."""
+        selection = self.cohorts_tree.selection()
+        if selection:
+            self.open_cohort(self.files[selection[0]])
+            self.refresh()
+    
+    def ask_new_cohort(self):
+        """Ask for a cohort name and show the new, empty cohort (saved with its first student)."""
+        name = simpledialog.askstring(
+            "New Cohort", "Cohort name (e.g. class and term, 2026 10A):", parent=self)
+        if not name:
+            return
+        manifest = self.manifest()
+        if manifest is None:
+            return
+        if name.strip() in manifest.shards:  # Already there: just open it
+            data_file = manifest.shard_file(name.strip())
+        else:
+            try:
+                data_file = shard_path(self.directory, name, self.compression_var.get())
+                os.makedirs(self.directory, exist_ok=True)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("New Cohort", str(e), parent=self)
+                return
+        self.open_cohort(data_file)
+        self.refresh()
+    
+    def find_student(self):
+        """Select the cohort of the student ID typed in the box."""
+        value = self.student_var.get().strip()
+        if not value.isdigit():
+            self.find_label.config(text="Enter a numeric Student ID")
+            return
+        manifest = self.manifest()
+        if manifest is None:
+            return
+        cohort = manifest.find(int(value))
+        if cohort is None:
+            self.find_label.config(text="Not in any saved cohort")
+            return
+        self.find_label.config(text=f"In cohort {cohort}")
+        for item, data_file in self.files.items():
+            if data_file == manifest.shard_file(cohort):
+                self.cohorts_tree.selection_set(item)
+                self.cohorts_tree.see(item)
\ No newline at end of file
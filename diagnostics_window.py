@@ -0,0 +1,189 @@
+"""
+Student Result Management System
+Diagnostics Window
+EduTech Solutions
+
+Shows the operation metrics collected by student_metrics and controls
+the session profilers. Use it when the application feels slow: turn on
+instrumentation, repeat the slow action, then read the table or export
+it (JSON, or Prometheus text for a monitoring system) for a bug report.
+"""
+
+import tkinter as tk
+import tracemalloc
+from tkinter import ttk, messagebox, filedialog
+
+from student_metrics import METRICS
+
+COLUMNS = ('Operation', 'Calls', 'Errors', 'Total s', 'Mean ms', 'p50 ms', 'p95 ms',
+           'Max ms', 'Alloc KB')
+REFRESH_INTERVAL_MS = 1000  # How often the table is redrawn
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Toplevel window with the instrumentation table and profiler switches."""
+    
+    def __init__(self, master):
+        """
+        Open the window.
+        
+        Args:
+            master: Parent window
+        """
+        super().__init__(master)
+        self.title("🩺 Diagnostics")
+        self.geometry("820x420")
+        
+        # Switches
+        switch_frame = ttk.Frame(self)
+        switch_frame.pack(fill=tk.X, padx=10, pady=(10, 5))
+        self.enabled_var = tk.BooleanVar(value=METRICS.enabled)
+        ttk.Checkbutton(switch_frame, text="Collect metrics", variable=self.enabled_var,
+                        command=self.toggle_metrics).pack(side=tk.LEFT)
+        self.allocations_var = tk.BooleanVar(value=METRICS.started_tracemalloc)
+        ttk.Checkbutton(switch_frame, text="Track allocations (slower)",
+                        variable=self.allocations_var,
+                        command=self.toggle_metrics).pack(side=tk.LEFT, padx=(15, 0))
+        
+        # Operation table
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.tree = ttk.Treeview(table_frame, columns=COLUMNS, show='headings', height=10)
+        for column in COLUMNS:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=160 if column == 'Operation' else 75,
+                             anchor=tk.W if column == 'Operation' else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        
+        # Actions
+        button_frame = ttk.Frame(self)
+        button_frame.pack(pady=(5, 10))
+        self.profile_btn = ttk.Button(button_frame, text="Start cProfile",
+                                      command=self.toggle_profile, width=16)
+        buttons = [
+            ttk.Button(button_frame, text="Reset", command=self.reset, width=10),
+            ttk.Button(button_frame, text="Export JSON...",
+                       command=lambda: self.export('.json'), width=16),
+            ttk.Button(button_frame, text="Export Prometheus...",
+                       command=lambda: self.export('.prom'), width=18),
+            self.profile_btn,
+            ttk.Button(button_frame, text="Memory Snapshot...",
+                       command=self.memory_snapshot, width=18),
+            ttk.Button(button_frame, text="Close", command=self.destroy, width=10)
+        ]
+        for button in buttons:
+            button.pack(side=tk.LEFT, padx=3)
+        self.update_profile_button()
+        
+        self.refresh()
+    
+    # ============================================
+    # DISPLAY
+    # ============================================
+    def refresh(self):
+        """Redraw the table, then schedule the next redraw while the window is open."""
+        if not self.winfo_exists():
+            return
+        
+        self.tree.delete(*self.tree.get_children())
+        for name, stats in METRICS.snapshot().items():
+            self.tree.insert('', tk.END, values=(
+                name,
+                stats['calls'],
+                stats['errors'],
+                f"{stats['total_seconds']:.3f}",
+                f"{stats['mean_seconds'] * 1000:.2f}",
+                f"{stats['p50_seconds'] * 1000:.2f}",
+                f"{stats['p95_seconds'] * 1000:.2f}",
+                f"{stats['max_seconds'] * 1000:.2f}",
+                f"{stats['allocated_bytes'] / 1024:.0f}"
+            ))
+        self.after(REFRESH_INTERVAL_MS, self.refresh)
+    
+    def update_profile_button(self):
+        """Show whether a cProfile capture is running."""
+        self.profile_btn.config(
+            text="Stop cProfile..." if METRICS.profiler is not None else "Start cProfile")
+    
+    # ============================================
+    # ACTIONS
+    # ============================================
+    def toggle_metrics(self):
+        """Apply the metric switches."""
+        if self.enabled_var.get():
+            METRICS.enable()
+            METRICS.track_allocations(self.allocations_var.get())
+        else:
+            METRICS.disable()
+            self.allocations_var.set(False)
+    
+    def reset(self):
+        """Forget the collected metrics."""
+        METRICS.reset()
+        self.tree.delete(*self.tree.get_children())
+    
+    def export(self, extension):
+        """Save the metrics as JSON or Prometheus text."""
+        file_path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension=extension,
+            initialfile='student_metrics' + extension,
+            filetypes=[("Prometheus text", "*.prom")] if extension == '.prom'
+            else [("JSON", "*.json")]
+        )
+        if not file_path:
+            return
+        try:
+            if extension == '.prom':
+                text = METRICS.to_prometheus()
+            else:
+                text = METRICS.to_json()
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write(text)
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Failed to export metrics:\n{e}", parent=self)
+    
+    def toggle_profile(self):
+        """Start a cProfile capture, or stop it and save the statistics."""
+        if METRICS.profiler is None:
+            METRICS.start_profile()
+        else:
+            file_path = filedialog.asksaveasfilename(
+                parent=self,
+                defaultextension='.prof',
+                initialfile='student_session.prof',
+                filetypes=[("cProfile statistics", "*.prof")]
+            )
+            if file_path:
+                try:
+                    METRICS.stop_profile(file_path)
+                except OSError as e:
+                    messagebox.showerror("Profile Error", f"Failed to save profile:\n{e}",
+                                         parent=self)
+        self.update_profile_button()
+    
+    def memory_snapshot(self):
+        """Save a tracemalloc snapshot, starting tracemalloc the first time."""
+        if not tracemalloc.is_tracing():
+            METRICS.track_allocations(True)
+            self.allocations_var.set(METRICS.enabled)
+            messagebox.showinfo(
+                "Memory Tracing Started",
+                "Memory tracing is now on.\n"
+                "Repeat the action you want to examine, then take the snapshot.",
+                parent=self
+            )
+            return
+        
+        file_path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension='.snapshot',
+            initialfile='student_memory.snapshot',
+            filetypes=[("tracemalloc snapshot", "*.snapshot")]
+        )
+        if not file_path:
+            return
+        try:
+            METRICS.take_memory_snapshot(file_path)
+        except OSError as e:
+            messagebox.showerror("Snapshot Error", f"Failed to save snapshot:\n{e}", parent=self)
\ No newline at end of file
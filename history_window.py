@@ -0,0 +1,119 @@
+"""
+Student Result Management System
+Term History Window
+EduTech Solutions
+
+Lists the recorded terms and shows one student's results in each of
+them. "Record Current Term" saves everyone's current marks as a term, so
+re-sits and the next term's marks can be entered without losing them.
+"""
+
+import tkinter as tk
+from tkinter import ttk, simpledialog
+
+TERM_COLUMNS = ('Term', 'Subjects', 'Students', 'Changed')
+PROGRESS_COLUMNS = ('Term', 'Total', 'Percentage', 'Grade', 'Change')
+
+
+class HistoryWindow(tk.Toplevel):
+    """Toplevel window showing recorded terms and a student's progress."""
+    
+    def __init__(self, master, history, policy, record_term):
+        """
+        Open the window.
+        
+        Args:
+            master: Parent window
+            history (TermHistory): Recorded terms
+            policy (GradingPolicy): Policy the progress is graded with
+            record_term (callable): record_term(name) records the current
+                marks as a term and returns the Term, or None on failure
+        """
+        super().__init__(master)
+        self.title("📚 Term History")
+        self.geometry("640x480")
+        self.history = history
+        self.policy = policy
+        self.record_term = record_term
+        
+        # Recorded terms
+        ttk.Label(self, text="Recorded Terms", font=('Arial', 10, 'bold')).pack(
+            anchor=tk.W, padx=10, pady=(10, 0))
+        self.terms_tree = ttk.Treeview(self, columns=TERM_COLUMNS, show='headings', height=6)
+        for column in TERM_COLUMNS:
+            self.terms_tree.heading(column, text=column)
+            self.terms_tree.column(column, width=220 if column == 'Term' else 100,
+                                   anchor=tk.W if column == 'Term' else tk.E)
+        self.terms_tree.pack(fill=tk.X, padx=10, pady=5)
+        
+        record_btn = ttk.Button(self, text="Record Current Term...", command=self.ask_record)
+        record_btn.pack(anchor=tk.W, padx=10)
+        
+        # Progress of one student
+        options_frame = ttk.Frame(self)
+        options_frame.pack(fill=tk.X, padx=10, pady=(15, 5))
+        ttk.Label(options_frame, text="Progress of Student ID:").pack(side=tk.LEFT)
+        self.student_var = tk.StringVar()
+        student_entry = ttk.Entry(options_frame, textvariable=self.student_var, width=10)
+        student_entry.pack(side=tk.LEFT, padx=5)
+        student_entry.bind('<Return>', lambda event: self.show_progress())
+        ttk.Button(options_frame, text="Show", command=self.show_progress).pack(side=tk.LEFT)
+        self.progress_label = ttk.Label(options_frame, text="")
+        self.progress_label.pack(side=tk.LEFT, padx=10)
+        
+        self.progress_tree = ttk.Treeview(self, columns=PROGRESS_COLUMNS, show='headings',
+                                          height=8)
+        for column in PROGRESS_COLUMNS:
+            self.progress_tree.heading(column, text=column)
+            self.progress_tree.column(column, width=220 if column == 'Term' else 90,
+                                      anchor=tk.W if column == 'Term' else tk.E)
+        self.progress_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        close_btn = ttk.Button(self, text="Close", command=self.destroy)
+        close_btn.pack(pady=(0, 10))
+        
+        self.refresh()
+    
+    def set_policy(self, policy):
+        """Grade the progress with another policy."""
+        self.policy = policy
+        self.refresh()
+    
+    def refresh(self):
+        """Redraw the term list and the progress shown."""
+        self.terms_tree.delete(*self.terms_tree.get_children())
+        for term in self.history.terms:
+            self.terms_tree.insert('', tk.END, values=(
+                term.name, len(term.subjects), term.students, term.changed))
+        if self.student_var.get().strip():
+            self.show_progress()
+    
+    def ask_record(self):
+        """Ask for a term name and record the current marks under it."""
+        default = self.history.terms[-1].name if self.history.terms else ""
+        name = simpledialog.askstring(
+            "Record Term",
+            "Term name (the last term's name replaces it, e.g. after re-sits):",
+            initialvalue=default, parent=self)
+        if name and self.record_term(name) is not None:
+            self.refresh()
+    
+    def show_progress(self):
+        """Show the results of the student ID typed in the box in every term."""
+        self.progress_tree.delete(*self.progress_tree.get_children())
+        value = self.student_var.get().strip()
+        if not value.isdigit():
+            self.progress_label.config(text="Enter a numeric Student ID")
+            return
+        
+        progress = self.history.progress(int(value), self.policy)
+        if not progress:
+            self.progress_label.config(text="No recorded terms for this student")
+            return
+        self.progress_label.config(text=f"{len(progress)} terms")
+        previous = None
+        for term, total_marks, percentage, grade in progress:
+            change = '' if previous is None else f"{percentage - previous:+.1f}"
+            self.progress_tree.insert('', tk.END, values=(
+                term, f"{total_marks:.1f}", f"{percentage:.1f}%", grade, change))
+            previous = percentage
\ No newline at end of file
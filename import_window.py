@@ -0,0 +1,83 @@
+"""
+Student Result Management System
+Import Report Window
+EduTech Solutions
+
+Lists the rows a bulk CSV import rejected, with the reason, so they can
+be fixed in the spreadsheet and imported again. The full list can be
+saved as a CSV file.
+"""
+
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+MAX_SHOWN_ERRORS = 2000  # Rows listed in the window; the saved report has every one
+
+
+class ImportReportWindow(tk.Toplevel):
+    """Toplevel window summarizing a bulk import and its rejected rows."""
+    
+    def __init__(self, master, source_file, added, errors):
+        """
+        Open the window.
+        
+        Args:
+            master: Parent window
+            source_file (str): Path of the imported CSV file
+            added (int): Number of students imported
+            errors (ImportErrors): Rows that were rejected
+        """
+        super().__init__(master)
+        self.title("📥 Import Report")
+        self.geometry("700x420")
+        self.source_file = source_file
+        self.errors = errors
+        
+        summary = (f"{os.path.basename(source_file)}: {added} students imported, "
+                   f"{errors.count} rows rejected")
+        ttk.Label(self, text=summary, font=('Arial', 11, 'bold')).pack(
+            fill=tk.X, padx=10, pady=(10, 5))
+        
+        # Rejected rows
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.tree = ttk.Treeview(table_frame, columns=('Line', 'Problem'), show='headings')
+        self.tree.heading('Line', text='Line')
+        self.tree.heading('Problem', text='Problem')
+        self.tree.column('Line', width=70, anchor=tk.E)
+        self.tree.column('Problem', width=580, anchor=tk.W)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        rows = errors.sorted()
+        for line_number, message in rows[:MAX_SHOWN_ERRORS]:
+            self.tree.insert('', tk.END, values=(line_number, message))
+        if len(rows) > MAX_SHOWN_ERRORS:
+            ttk.Label(self, text=f"Showing the first {MAX_SHOWN_ERRORS} rows; "
+                                 f"save the report to see all {len(rows)}.").pack(padx=10)
+        
+        button_frame = ttk.Frame(self)
+        button_frame.pack(pady=(5, 10))
+        ttk.Button(button_frame, text="Save Report...", command=self.save_report,
+                   width=15).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Close", command=self.destroy,
+                   width=10).pack(side=tk.LEFT, padx=5)
+    
+    def save_report(self):
+        """Save every rejected row as a CSV file."""
+        base_name = os.path.splitext(os.path.basename(self.source_file))[0]
+        file_path = filedialog.asksaveasfilename(
+            parent=self,
+            defaultextension='.csv',
+            initialfile=f"{base_name}_errors.csv",
+            filetypes=[("CSV", "*.csv")]
+        )
+        if not file_path:
+            return
+        try:
+            self.errors.write_csv(file_path)
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Failed to save the report:\n{e}", parent=self)
\ No newline at end of file
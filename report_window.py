@@ -0,0 +1,151 @@
+"""
+Student Result Management System
+Report Window
+EduTech Solutions
+
+Shows the detailed results report without blocking the main window. The
+window opens at once; the report is formatted from a snapshot of the
+cohort in a background thread, and finished chunks of text are handed
+back to the Tk main loop, which appends them as they arrive.
+"""
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+from student_metrics import instrumented
+from student_parallel import render_report
+
+POLL_INTERVAL_MS = 50   # How often the main loop checks for finished chunks
+INSERT_BUDGET = 4       # Chunks inserted per check, so scrolling stays smooth
+
+
+class ReportWindow(tk.Toplevel):
+    """Toplevel window that renders the results report in the background."""
+    
+    def __init__(self, master, store, workers=1, chunk_size=2000):
+        """
+        Open the window and start rendering.
+        
+        Args:
+            master: Parent window
+            store (CohortStore): Snapshot to report on, with current results.
+                It is read from another thread, so it must not be the
+                store the application keeps changing (see CohortStore.copy).
+            workers (int): Worker processes used to format the report
+            chunk_size (int): Students per chunk of text
+        """
+        super().__init__(master)
+        self.title("📄 All Student Results - Detailed View")
+        self.geometry("800x500")
+        
+        self.total_students = len(store)
+        self.rendered_students = 0
+        self.chunks = queue.Queue()       # (student count, text), None when done
+        self.stop_event = threading.Event()
+        
+        # Title
+        title_label = ttk.Label(
+            self,
+            text="📋 Complete Student Results Report",
+            font=('Arial', 14, 'bold')
+        )
+        title_label.pack(pady=(10, 20))
+        
+        # Create text widget with scrollbar
+        text_frame = ttk.Frame(self)
+        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        
+        self.text_widget = tk.Text(text_frame, wrap=tk.WORD, font=('Consolas', 10),
+                                   state='disabled')
+        scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL,
+                                  command=self.text_widget.yview)
+        self.text_widget.configure(yscrollcommand=scrollbar.set)
+        
+        self.text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Rendering progress
+        self.status_label = ttk.Label(
+            self,
+            text=f"Rendering report: 0 of {self.total_students} students..."
+        )
+        self.status_label.pack(pady=(0, 5))
+        
+        # Close button
+        close_btn = ttk.Button(
+            self,
+            text="Close Report",
+            command=self.destroy
+        )
+        close_btn.pack(pady=(0, 10))
+        
+        self.thread = threading.Thread(
+            target=self.render_chunks,
+            args=(store, workers, chunk_size),
+            daemon=True
+        )
+        self.thread.start()
+        self.after(POLL_INTERVAL_MS, self.show_chunks)
+    
+    def destroy(self):
+        """Close the window and stop the rendering thread."""
+        self.stop_event.set()
+        super().destroy()
+    
+    # ============================================
+    # BACKGROUND RENDERING
+    # ============================================
+    @instrumented('render_report')
+    def render_chunks(self, store, workers, chunk_size):
+        """Format the report in the background thread and queue each chunk."""
+        remaining = len(store)
+        report = render_report(store, workers, chunk_size)
+        try:
+            self.chunks.put((0, next(report)))  # Header
+            for text in report:
+                if self.stop_event.is_set():
+                    return
+                count = min(chunk_size, remaining)
+                remaining -= count
+                self.chunks.put((count, text))
+        except Exception as error:
+            self.chunks.put((0, error))
+        finally:
+            report.close()
+            self.chunks.put(None)
+    
+    # ============================================
+    # MAIN LOOP
+    # ============================================
+    def show_chunks(self):
+        """Append the chunks finished since the last check."""
+        if self.stop_event.is_set():
+            return
+        
+        for _ in range(INSERT_BUDGET):
+            try:
+                chunk = self.chunks.get_nowait()
+            except queue.Empty:
+                break
+            
+            if chunk is None:
+                self.status_label.pack_forget()
+                return
+            count, text = chunk
+            if isinstance(text, Exception):
+                self.status_label.config(text=f"Report could not be rendered: {text}")
+                return
+            
+            # The widget is read-only except while a chunk is appended
+            self.text_widget.configure(state='normal')
+            self.text_widget.insert(tk.END, text)
+            self.text_widget.configure(state='disabled')
+            self.rendered_students += count
+        
+        self.status_label.config(
+            text=f"Rendering report: {self.rendered_students} of "
+                 f"{self.total_students} students..."
+        )
+        self.after(POLL_INTERVAL_MS, self.show_chunks)
\ No newline at end of file
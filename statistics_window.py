@@ -0,0 +1,127 @@
+"""
+Student Result Management System
+Statistics Window
+EduTech Solutions
+
+Class-level statistics panel: mean, standard deviation, min/median/max
+and a chosen percentile per subject, the grade distribution and the
+class rank of any student. The figures come from CohortAnalytics, which
+keeps them current as students change, so refreshing the panel after
+every edit is cheap even for large cohorts.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+COLUMNS = ('Subject', 'Students', 'Mean', 'Std Dev', 'Min', 'Median', 'Max', 'Percentile')
+
+
+def format_value(value):
+    """Format a statistic for the table ('-' when there is no data)."""
+    return '-' if value is None else f"{value:.1f}"
+
+
+class StatisticsWindow(tk.Toplevel):
+    """Toplevel window showing cohort statistics."""
+    
+    def __init__(self, master, analytics):
+        """
+        Open the window.
+        
+        Args:
+            master: Parent window
+            analytics (CohortAnalytics): Statistics of the current cohort
+        """
+        super().__init__(master)
+        self.title("📊 Cohort Statistics")
+        self.geometry("760x420")
+        self.analytics = analytics
+        
+        # Subject statistics table
+        table_frame = ttk.Frame(self)
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        
+        self.tree = ttk.Treeview(table_frame, columns=COLUMNS, show='headings', height=8)
+        for column in COLUMNS:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=140 if column == 'Subject' else 80,
+                             anchor=tk.W if column == 'Subject' else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        
+        # Percentile shown in the last column
+        options_frame = ttk.Frame(self)
+        options_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(options_frame, text="Percentile:").pack(side=tk.LEFT)
+        self.percentile_var = tk.StringVar(value="90")
+        percentile_spin = ttk.Spinbox(options_frame, from_=0, to=100, increment=5, width=5,
+                                      textvariable=self.percentile_var, command=self.refresh)
+        percentile_spin.pack(side=tk.LEFT, padx=(5, 20))
+        percentile_spin.bind('<Return>', lambda event: self.refresh())
+        
+        # Rank of one student
+        ttk.Label(options_frame, text="Rank of Student ID:").pack(side=tk.LEFT)
+        self.rank_var = tk.StringVar()
+        rank_entry = ttk.Entry(options_frame, textvariable=self.rank_var, width=10)
+        rank_entry.pack(side=tk.LEFT, padx=5)
+        rank_entry.bind('<Return>', lambda event: self.show_rank())
+        self.rank_label = ttk.Label(options_frame, text="")
+        self.rank_label.pack(side=tk.LEFT, padx=5)
+        
+        # Grade distribution
+        self.grades_label = ttk.Label(self, text="", font=('Arial', 10))
+        self.grades_label.pack(fill=tk.X, padx=10, pady=5)
+        
+        close_btn = ttk.Button(self, text="Close", command=self.destroy)
+        close_btn.pack(pady=(0, 10))
+        
+        self.refresh()
+    
+    def set_analytics(self, analytics):
+        """Show the statistics of another cohort (e.g. after loading a file)."""
+        self.analytics = analytics
+        self.refresh()
+    
+    def refresh(self):
+        """Redraw the statistics from the current cohort."""
+        try:
+            percent = min(max(float(self.percentile_var.get()), 0.0), 100.0)
+        except ValueError:
+            percent = 90.0
+        self.tree.heading('Percentile', text=f"P{percent:g}")
+        
+        self.tree.delete(*self.tree.get_children())
+        for label, summary in self.analytics.summary():
+            subject = None if label == 'Overall %' else label
+            self.tree.insert('', tk.END, values=(
+                label,
+                summary['count'],
+                format_value(summary['mean']),
+                format_value(summary['std']),
+                format_value(summary['min']),
+                format_value(summary['median']),
+                format_value(summary['max']),
+                format_value(self.analytics.percentile(percent, subject))
+            ))
+        
+        distribution = self.analytics.grade_distribution()
+        total = sum(distribution.values())
+        if total:
+            self.grades_label.config(text="Grades:  " + "   ".join(
+                f"{grade}: {count} ({count / total:.0%})" for grade, count in distribution.items()))
+        else:
+            self.grades_label.config(text="Grades: no students yet")
+        
+        if self.rank_var.get().strip():
+            self.show_rank()
+    
+    def show_rank(self):
+        """Show the class rank of the student ID typed in the rank box."""
+        value = self.rank_var.get().strip()
+        if not value.isdigit():
+            self.rank_label.config(text="Enter a numeric Student ID")
+            return
+        rank = self.analytics.rank(int(value))
+        if rank is None:
+            self.rank_label.config(text="Not ranked (unknown ID or no marks)")
+        else:
+            self.rank_label.config(text=f"#{rank[0]} of {rank[1]}")
\ No newline at end of file
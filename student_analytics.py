@@ -0,0 +1,316 @@
+"""
+Student Result Management System
+Cohort Statistics
+EduTech Solutions
+
+Keeps class-level statistics up to date as students are added, changed
+and removed, instead of recomputing them from the whole cohort:
+    
+    RunningStats       count, mean and variance (Welford's method), per
+                       subject and for the overall percentage
+    sorted marks       one sorted array per subject, and one of the graded
+                       students' percentages, for min/max, percentiles
+                       and rank
+    grade counts       number of students with each grade
+
+Like the search indexes, the statistics follow the store through a
+change tracker ('analytics'). Each changed student's old values are
+taken out and the new ones put in; a large batch (e.g. a finished load)
+rebuilds everything with one sort instead. Queries then take constant
+time (mean, deviation, min/max, percentiles, grade counts) or a binary
+search (rank).
+"""
+
+import bisect
+import math
+from array import array
+
+from student_store import Grade
+
+REBUILD_THRESHOLD = 1000   # Changed students above which the statistics are rebuilt
+EMPTY = -1                 # counted_ids entry of a row that is not counted
+UNGRADED = (Grade.NONE, Grade.NA)  # Not counted in the percentage statistics
+
+
+class RunningStats:
+    """Count, mean and variance of a set of values that can grow and shrink."""
+    
+    __slots__ = ('count', 'mean', 'm2')
+    
+    def __init__(self, values=()):
+        """
+        Args:
+            values (list): Initial values, summed in two passes
+        """
+        self.count = len(values)
+        self.mean = math.fsum(values) / self.count if self.count else 0.0
+        # Sum of squared differences from the mean
+        self.m2 = math.fsum((value - self.mean) ** 2 for value in values)
+    
+    def add(self, value):
+        """Add a value (Welford's update)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    def remove(self, value):
+        """Remove a value that was added before."""
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+    
+    @property
+    def variance(self):
+        """Population variance of the values (0.0 if there are none)."""
+        return self.m2 / self.count if self.count else 0.0
+    
+    @property
+    def std(self):
+        """Population standard deviation of the values."""
+        return math.sqrt(self.variance)
+
+
+def _remove_value(values, value):
+    """Remove one occurrence of a value from a sorted array."""
+    del values[bisect.bisect_left(values, value)]
+
+
+def percentile_of(values, percent):
+    """
+    Return a percentile of a sorted array, interpolating between neighbours.
+    
+    Args:
+        values (array): Sorted values
+        percent (float): Percentile between 0 and 100
+    
+    Returns:
+        float: The percentile, or None if there are no values
+    """
+    if not values:
+        return None
+    position = (len(values) - 1) * min(max(percent, 0.0), 100.0) / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class CohortAnalytics:
+    """Running statistics, percentiles, grade counts and ranks of a CohortStore."""
+    
+    def __init__(self, store):
+        """
+        Compute the statistics of a store and start following its changes.
+        
+        Args:
+            store (CohortStore): Store to analyse
+        """
+        self.store = store
+        store.track_changes('analytics')
+        self.rebuild()
+    
+    # ============================================
+    # MAINTENANCE
+    # ============================================
+    def rebuild(self):
+        """Recompute every statistic from the store."""
+        store = self.store
+        store.pop_changes('analytics')
+        width = store.width
+        self.width = width
+        
+        # Values each row was counted with, so they can be taken out later
+        self.counted_ids = array('q', (EMPTY if student_id is None else student_id
+                                       for student_id in store.ids))
+        self.counted_marks = array('d', store.marks)
+        self.counted_percentage = array('d', store.percentage)
+        self.counted_grades = array('B', store.grade_codes)
+        
+        # Free rows have no marks and no grade, so whole columns can be read
+        self.subject_marks = []
+        self.subject_stats = []
+        for column in range(width):
+            marks = sorted(mark for mark in store.marks[column::width] if mark == mark)
+            self.subject_marks.append(array('d', marks))
+            self.subject_stats.append(RunningStats(marks))
+        
+        percentages = sorted(percentage for percentage, grade
+                             in zip(store.percentage, store.grade_codes) if grade not in UNGRADED)
+        self.percentages = array('d', percentages)
+        self.percentage_stats = RunningStats(percentages)
+        
+        self.grade_counts = {}
+        for grade in store.grade_codes:
+            self.grade_counts[grade] = self.grade_counts.get(grade, 0) + 1
+    
+    def update(self):
+        """Bring the statistics up to date with the students changed since the last update."""
+        changed_ids = self.store.pop_changes('analytics')
+        if not changed_ids:
+            return
+        
+        store = self.store
+        # Many changes, a cleared store or a new subject: start again
+        if (len(changed_ids) > REBUILD_THRESHOLD or len(store.ids) < len(self.counted_ids)
+                or store.width != self.width):
+            self.rebuild()
+            return
+        
+        while len(self.counted_ids) < len(store.ids):  # Store grew
+            self.counted_ids.append(EMPTY)
+            self.counted_marks.extend([math.nan] * self.width)
+            self.counted_percentage.append(0.0)
+            self.counted_grades.append(0)
+        
+        # Rows released by removed students still hold their old values
+        if any(student_id not in store.rows for student_id in changed_ids):
+            for row in store.free_rows:
+                if self.counted_ids[row] != EMPTY:
+                    self._remove_row(row)
+        
+        for student_id in changed_ids:
+            row = store.rows.get(student_id)
+            if row is None:
+                continue
+            if self.counted_ids[row] != EMPTY:
+                self._remove_row(row)
+            self._add_row(row)
+    
+    def _add_row(self, row):
+        """Count a row's current marks and results."""
+        store = self.store
+        start = row * self.width
+        self.counted_ids[row] = store.ids[row]
+        for column in range(self.width):
+            mark = store.marks[start + column]
+            self.counted_marks[start + column] = mark
+            if mark == mark:
+                self.subject_stats[column].add(mark)
+                bisect.insort(self.subject_marks[column], mark)
+        
+        grade = store.grade_codes[row]
+        percentage = store.percentage[row]
+        self.counted_grades[row] = grade
+        self.counted_percentage[row] = percentage
+        self.grade_counts[grade] = self.grade_counts.get(grade, 0) + 1
+        if grade not in UNGRADED:
+            self.percentage_stats.add(percentage)
+            bisect.insort(self.percentages, percentage)
+    
+    def _remove_row(self, row):
+        """Take out the values a row was counted with."""
+        start = row * self.width
+        for column in range(self.width):
+            mark = self.counted_marks[start + column]
+            if mark == mark:
+                self.subject_stats[column].remove(mark)
+                _remove_value(self.subject_marks[column], mark)
+        
+        grade = self.counted_grades[row]
+        self.grade_counts[grade] -= 1
+        if grade not in UNGRADED:
+            percentage = self.counted_percentage[row]
+            self.percentage_stats.remove(percentage)
+            _remove_value(self.percentages, percentage)
+        self.counted_ids[row] = EMPTY
+    
+    # ============================================
+    # QUERIES
+    # ============================================
+    def subject_summary(self, subject):
+        """
+        Return the statistics of one subject's marks.
+        
+        Returns:
+            dict: {'count', 'mean', 'std', 'min', 'median', 'max'}, the
+                values are None when nobody has a mark in the subject
+        """
+        self.update()
+        column = self.store.subject_index[subject]
+        return self._summary(self.subject_stats[column], self.subject_marks[column])
+    
+    def percentage_summary(self):
+        """Return the statistics of the graded students' percentages (see subject_summary)."""
+        self.update()
+        return self._summary(self.percentage_stats, self.percentages)
+    
+    def summary(self):
+        """
+        Return the statistics of every subject and of the overall percentage.
+        
+        Returns:
+            list: (label, summary) pairs, subjects first in column order,
+                then 'Overall %'
+        """
+        self.update()
+        rows = [(subject, self._summary(self.subject_stats[column], self.subject_marks[column]))
+                for column, subject in enumerate(self.store.subjects)]
+        rows.append(('Overall %', self._summary(self.percentage_stats, self.percentages)))
+        return rows
+    
+    def _summary(self, stats, values):
+        if not values:
+            return {'count': 0, 'mean': None, 'std': None,
+                    'min': None, 'median': None, 'max': None}
+        return {
+            'count': stats.count,
+            'mean': stats.mean,
+            'std': stats.std,
+            'min': values[0],
+            'median': percentile_of(values, 50),
+            'max': values[-1]
+        }
+    
+    def percentile(self, percent, subject=None):
+        """
+        Return a percentile of a subject's marks, or of the overall percentage.
+        
+        Args:
+            percent (float): Percentile between 0 and 100
+            subject (str): Subject name, None for the overall percentage
+        
+        Returns:
+            float: The percentile, or None if there are no values
+        """
+        self.update()
+        if subject is None:
+            return percentile_of(self.percentages, percent)
+        return percentile_of(self.subject_marks[self.store.subject_index[subject]], percent)
+    
+    def grade_distribution(self):
+        """
+        Return the number of students with each grade.
+        
+        Returns:
+            dict: {grade letter: count}, best grade first (in the order of
+                the store's grading policy), grades nobody has are left out
+        """
+        self.update()
+        labels = self.store.grade_labels
+        rank = self.store.policy.rank
+        codes = sorted((code for code, count in self.grade_counts.items()
+                        if count and labels[code]),
+                       key=lambda code: (rank(labels[code]), code), reverse=True)
+        return {labels[code]: self.grade_counts[code] for code in codes}
+    
+    def rank(self, student_id):
+        """
+        Return a student's position in the class by overall percentage.
+        
+        Students with the same percentage share a rank (1 is the best).
+        
+        Returns:
+            tuple: (rank, number of graded students), or None if the student
+                does not exist or has no marks
+        """
+        self.update()
+        row = self.store.rows.get(student_id)
+        if row is None or self.counted_grades[row] in UNGRADED:
+            return None
+        above = len(self.percentages) - bisect.bisect_right(
+            self.percentages, self.counted_percentage[row])
+        return above + 1, len(self.percentages)
\ No newline at end of file
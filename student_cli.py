@@ -0,0 +1,485 @@
+"""
+Student Result Management System
+Command-Line Interface
+EduTech Solutions
+
+Headless entry point for servers without a display. It uses the same
+student model and data files as the GUI and never imports tkinter.
+
+Usage:
+    python student_cli.py import marks.csv [--data-file student_data.db]
+    python student_cli.py grade
+    python student_cli.py report [--output report.txt]
+    python student_cli.py export export.csv
+    python student_cli.py export results.html [--batch-size 2000]
+    python student_cli.py stats [--percentile 90] [--rank 101]
+    python student_cli.py --metrics metrics.json --profile grade.prof grade
+    python student_cli.py --workers 4 grade --batch-size 25000
+    python student_cli.py --policy physics.json grade
+    python student_cli.py term record "2026 T1"
+    python student_cli.py term progress 101 102
+    python student_cli.py serve [--host 127.0.0.1] [--port 8080]
+    python student_cli.py cohort add "2026 10A" class10a.json [--compression lzma]
+    python student_cli.py cohort list
+    python student_cli.py cohort find 101 102
+    python student_cli.py --data-file "student_data.cohorts/2026 10A.jsonl.z" report
+
+Imports are streamed: source rows are grouped into students, graded in
+batches and written to the data file one batch at a time, so memory use
+depends on the batch size rather than the size of the import (apart from
+the set of IDs read, kept to report an ID repeated in the source). Batches are
+graded and formatted by a pool of worker processes, with the standard
+grading policy or the one given with --policy (see student_grading). A JSON data
+file keeps its journal in memory while it is compacted; use a .db data
+file for cohorts of millions of students.
+
+The term command records the data file's marks as a term in the history
+file next to it (see student_history) and shows students' progress over
+the recorded terms. The serve command answers result lookups over HTTP
+(see student_server).
+
+Exports to .txt, .csv or .html stream the report a batch of students at a
+time (see student_export), so a cohort of any size is exported in the
+same memory.
+
+The cohort command keeps each class or term in its own compressed shard
+next to the data file (see student_shards). Any command works on one
+cohort when --data-file names its shard.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+from student_analytics import CohortAnalytics
+from student_files import StudentFileReader
+from student_export import (DEFAULT_EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_data_file,
+                            storage_record_chunks)
+from student_grading import DEFAULT_POLICY, load_policy
+from student_history import history_file, load_history, write_history
+from student_import import ImportErrors, iter_csv_records, parse_mark
+from student_metrics import METRICS, instrumented
+from student_parallel import grade_record_stream, report_record_stream
+from student_reports import report_header
+from student_shards import (COMPRESSIONS, DEFAULT_COMPRESSION, ShardManifest, cohort_directory,
+                            read_manifest, shard_path)
+from student_storage import convert, open_storage
+from student_sync import DataFileSync, FileLock
+from student_store import DEFAULT_SUBJECTS, CohortStore
+
+DEFAULT_DATA_FILE = "student_data.json"
+DEFAULT_BATCH_SIZE = 10000  # Students graded and written at a time
+MAX_REPORTED_ERRORS = 20    # Invalid rows listed individually
+
+
+# ============================================
+# SOURCE READERS
+# ============================================
+def iter_json_records(source_file, errors, counter, policy=DEFAULT_POLICY):
+    """
+    Yield student records from a .json or .jsonl student data file.
+    
+    Stored results are ignored; the records are graded again on import.
+    """
+    seen_ids = set()
+    with StudentFileReader(source_file) as reader:
+        for student_id, record in reader:
+            counter[0] += 1
+            if student_id in seen_ids:
+                errors.add(counter[0], f"Student ID {student_id} appears more than once in the file")
+                continue
+            seen_ids.add(student_id)
+            try:
+                name = str(record['name']).strip()
+                if not name:
+                    raise ValueError("Student name is missing")
+                marks = {subject: parse_mark(subject, mark, policy.maximum(subject))
+                         for subject, mark in record.get('marks', {}).items()}
+            except (KeyError, TypeError, ValueError) as error:
+                errors.add(counter[0], f"student {student_id}: {error}")
+                continue
+            yield student_id, {'name': name, 'marks': marks}
+
+
+# ============================================
+# COMMANDS
+# ============================================
+def import_command(args):
+    """Stream a CSV or JSON source into the data file."""
+    errors = ImportErrors(limit=MAX_REPORTED_ERRORS)
+    rows_read = [0]
+    sync = DataFileSync(args.data_file)
+    
+    start = time.perf_counter()
+    if args.source.lower().endswith('.csv'):
+        source = open(args.source, newline='', encoding='utf-8-sig')
+        records = ((student_id, record) for _, student_id, record
+                   in iter_csv_records(source, errors, rows_read, args.policy))
+    else:
+        source = None
+        records = iter_json_records(args.source, errors, rows_read, args.policy)
+    
+    try:
+        # Other programs see the import once it is complete
+        imported = sync.merge_records(
+            grade_record_stream(records, args.workers, args.batch_size, args.policy),
+            replace=args.replace)
+    finally:
+        if source is not None:
+            source.close()
+    elapsed = time.perf_counter() - start
+    
+    print(f"Imported {imported} students ({rows_read[0]} rows) into {args.data_file}")
+    if errors.count:
+        print(f"{errors.count} invalid rows were skipped:", file=sys.stderr)
+        errors.report()
+    print_rate(rows_read[0], "rows", elapsed)
+    return 1 if errors.count else 0
+
+
+def grade_command(args):
+    """Recalculate every student's results in the data file."""
+    sync = DataFileSync(args.data_file)
+    if not sync.storage.exists():
+        print(f"No data file found: {args.data_file}", file=sys.stderr)
+        return 1
+    
+    graded = [0]
+    start = time.perf_counter()
+    
+    def regrade(stream):
+        for batch in grade_record_stream(stream, args.workers, args.batch_size, args.policy):
+            graded[0] += len(batch)
+            yield from batch
+    
+    sync.rewrite(regrade)
+    elapsed = time.perf_counter() - start
+    
+    print(f"Graded {graded[0]} students in {args.data_file}")
+    print_rate(graded[0], "students", elapsed)
+    return 0
+
+
+def report_command(args):
+    """Write the detailed results report."""
+    storage = open_storage(args.data_file)
+    if not storage.exists():
+        print(f"No data file found: {args.data_file}", file=sys.stderr)
+        return 1
+    
+    written = 0
+    start = time.perf_counter()
+    # In student ID order, as "View All Results", whatever the order of the file
+    students, _, chunks = storage_record_chunks(storage, args.batch_size)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        output.write(report_header(students))
+        
+        def records():
+            nonlocal written
+            for student_id, record in itertools.chain.from_iterable(chunks):
+                written += 1
+                yield student_id, record
+        
+        for sections in report_record_stream(records(), args.workers, args.batch_size,
+                                             args.policy):
+            output.write(sections)
+    finally:
+        chunks.close()
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+    
+    print_rate(written, "students", elapsed)
+    return 0
+
+
+def export_command(args):
+    """Export the data file as a text, CSV or HTML report, or as JSON, JSON-Lines or SQLite."""
+    storage = open_storage(args.data_file)
+    if not storage.exists():
+        print(f"No data file found: {args.data_file}", file=sys.stderr)
+        return 1
+    
+    start = time.perf_counter()
+    if os.path.splitext(args.target)[1].lower() in EXPORT_FORMATS:
+        # Streamed a chunk at a time (see storage_record_chunks)
+        exported, size = export_data_file(storage, args.target, args.policy, args.batch_size)
+        print(f"Wrote {size / 1024:.0f} KB", file=sys.stderr)
+    else:
+        exported = convert(args.data_file, args.target)
+    elapsed = time.perf_counter() - start
+    
+    print(f"Exported {exported} students to {args.target}")
+    print_rate(exported, "students", elapsed)
+    return 0
+
+
+def stats_command(args):
+    """Print per-subject statistics, the grade distribution and student ranks."""
+    storage = open_storage(args.data_file)
+    if not storage.exists():
+        print(f"No data file found: {args.data_file}", file=sys.stderr)
+        return 1
+    
+    # Statistics use the stored results, as shown in the GUI
+    store = CohortStore(DEFAULT_SUBJECTS, args.policy)
+    stream = storage.read()
+    try:
+        while stream.load_into(store, args.batch_size) == args.batch_size:
+            pass
+    finally:
+        stream.close()
+    analytics = CohortAnalytics(store)
+    
+    def value(number):
+        return f"{'-':>8}" if number is None else f"{number:>8.1f}"
+    
+    print(f"Statistics for {len(store)} students in {args.data_file}")
+    print(f"{'Subject':<20} {'Students':>8} {'Mean':>8} {'Std Dev':>8} {'Min':>8} "
+          f"{'Median':>8} {'Max':>8} {f'P{args.percentile:g}':>8}")
+    for label, summary in analytics.summary():
+        subject = None if label == 'Overall %' else label
+        print(f"{label:<20} {summary['count']:>8} {value(summary['mean'])} "
+              f"{value(summary['std'])} {value(summary['min'])} {value(summary['median'])} "
+              f"{value(summary['max'])} {value(analytics.percentile(args.percentile, subject))}")
+    
+    print()
+    print("Grades: " + "  ".join(f"{grade}: {count}"
+                                 for grade, count in analytics.grade_distribution().items()))
+    for student_id in args.rank or ():
+        rank = analytics.rank(student_id)
+        if rank is None:
+            print(f"Student {student_id}: not ranked (unknown ID or no marks)")
+        else:
+            print(f"Student {student_id}: rank {rank[0]} of {rank[1]}")
+    return 0
+
+
+def term_command(args):
+    """Record the data file as a term, list the terms or show students' progress."""
+    path = history_file(args.data_file)
+    try:
+        history = load_history(path)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read term history: {e}", file=sys.stderr)
+        return 1
+    
+    if args.term_command == 'record':
+        storage = open_storage(args.data_file)
+        if not storage.exists():
+            print(f"No data file found: {args.data_file}", file=sys.stderr)
+            return 1
+        stream = storage.read()
+        try:
+            term = history.record_term(
+                args.name, ((student_id, record['marks']) for student_id, record in stream),
+                args.subjects)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        finally:
+            stream.close()
+        write_history(history.to_dict(), path)
+        print(f"Recorded term {term.name}: {term.students} students, "
+              f"{term.changed} changed since the previous term")
+        print(f"{len(history)} terms stored as {history.delta_count()} student deltas in {path}")
+        
+    elif args.term_command == 'list':
+        print(f"{'Term':<30} {'Subjects':>8} {'Students':>8} {'Changed':>8}")
+        for term in history.terms:
+            print(f"{term.name:<30} {len(term.subjects):>8} {term.students:>8} {term.changed:>8}")
+            
+    else:
+        for student_id in args.student_ids:
+            progress = history.progress(student_id, args.policy)
+            if not progress:
+                print(f"Student {student_id}: no recorded terms")
+                continue
+            print(f"Student {student_id}:")
+            previous = None
+            for term, total_marks, percentage, grade in progress:
+                change = '' if previous is None else f" ({percentage - previous:+.1f})"
+                print(f"  {term:<30} {total_marks:>8.1f} {percentage:>6.1f}% {grade:<4}{change}"
+                      .rstrip())
+                previous = percentage
+    return 0
+
+
+def cohort_command(args):
+    """Add a cohort shard from a data file, list the cohorts or find students' cohorts."""
+    directory = cohort_directory(args.data_file)
+    try:
+        manifest = read_manifest(directory)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read cohorts: {e}", file=sys.stderr)
+        return 1
+    
+    if args.cohort_command == 'add':
+        if args.name.strip() in manifest.shards:
+            print(f"Cohort {args.name.strip()} already exists", file=sys.stderr)
+            return 1
+        try:
+            target = shard_path(directory, args.name, args.compression)
+            os.makedirs(directory, exist_ok=True)
+            with FileLock(target):
+                copied = convert(args.source, target)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        shard = ShardManifest.load(directory).shards[args.name.strip()]
+        print(f"Added cohort {args.name.strip()}: {copied} students, "
+              f"{shard['bytes'] / 1024:.1f} KB ({shard['compression']}) in {target}")
+              
+    elif args.cohort_command == 'list':
+        print(f"{'Cohort':<30} {'Students':>8} {'KB':>10} {'Compression':>11}")
+        for cohort in manifest.cohorts():
+            shard = manifest.shards[cohort]
+            print(f"{cohort:<30} {shard['students']:>8} {shard['bytes'] / 1024:>10.1f} "
+                  f"{shard['compression']:>11}")
+                  
+    else:
+        for student_id in args.student_ids:
+            cohort = manifest.find(student_id)
+            if cohort is None:
+                print(f"Student {student_id}: not in any cohort")
+            else:
+                print(f"Student {student_id}: {cohort} ({manifest.shard_file(cohort)})")
+    return 0
+
+
+def serve_command(args):
+    """Serve the data file over the HTTP/JSON API until interrupted."""
+    # Imported here so the other commands do not load asyncio
+    from student_server import serve
+    serve(args.data_file, args.host, args.port, args.policy)
+    return 0
+
+
+def print_rate(count, unit, elapsed):
+    """Print how many records were processed per second (to stderr)."""
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {count} {unit} in {elapsed:.2f} s ({rate:,.0f} {unit}/s)", file=sys.stderr)
+
+
+# ============================================
+# MAIN PROGRAM ENTRY POINT
+# ============================================
+def main(argv=None):
+    """Parse command line arguments and run the selected command."""
+    parser = argparse.ArgumentParser(description="Student Result System (headless)")
+    parser.add_argument('--data-file', default=DEFAULT_DATA_FILE,
+                        help="data file to use (.json, .jsonl, .db or a cohort shard)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for grading and reports (default: one per core)")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="collect operation timings and write them to FILE "
+                             "(.prom/.txt: Prometheus text, else JSON)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="profile the command with cProfile and write the statistics to FILE")
+    parser.add_argument('--policy', metavar='FILE',
+                        help="grading policy (JSON) for grading, imports and reports "
+                             "(default: the standard A-F policy)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    import_parser = subparsers.add_parser('import', help="import marks from CSV or JSON")
+    import_parser.add_argument('source', help="source file (.csv, .json or .jsonl)")
+    import_parser.add_argument('--replace', action='store_true',
+                               help="replace the data file instead of merging")
+    import_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    
+    grade_parser = subparsers.add_parser('grade', help="recalculate every student's results")
+    grade_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    
+    report_parser = subparsers.add_parser('report', help="write the detailed results report")
+    report_parser.add_argument('--output', default='-', help="report file (default: stdout)")
+    report_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    
+    export_parser = subparsers.add_parser(
+        'export', help="export a text, CSV or HTML report, or copy to JSON or SQLite")
+    export_parser.add_argument('target',
+                               help="file to write (.txt, .csv, .html, .json, .jsonl or .db)")
+    export_parser.add_argument('--batch-size', type=int, default=DEFAULT_EXPORT_CHUNK_SIZE,
+                               help="students rendered at a time")
+    
+    stats_parser = subparsers.add_parser('stats', help="print cohort statistics and ranks")
+    stats_parser.add_argument('--percentile', type=float, default=90.0,
+                              help="percentile shown for each subject (default: 90)")
+    stats_parser.add_argument('--rank', type=int, nargs='+', metavar='STUDENT_ID',
+                              help="print the class rank of these students")
+    stats_parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    
+    term_parser = subparsers.add_parser('term', help="record terms and show progress over terms")
+    term_subparsers = term_parser.add_subparsers(dest='term_command', required=True)
+    record_parser = term_subparsers.add_parser(
+        'record', help="record the data file's marks as a term (the last term's name replaces it)")
+    record_parser.add_argument('name', help="term name, e.g. \"2026 T1\"")
+    record_parser.add_argument('--subjects', nargs='+', default=DEFAULT_SUBJECTS,
+                               help="subjects of the term (subjects with marks are added)")
+    term_subparsers.add_parser('list', help="list the recorded terms")
+    progress_parser = term_subparsers.add_parser('progress',
+                                                 help="show students' results in each term")
+    progress_parser.add_argument('student_ids', type=int, nargs='+', metavar='STUDENT_ID')
+    
+    cohort_parser = subparsers.add_parser(
+        'cohort', help="keep classes or terms in compressed shards next to the data file")
+    cohort_subparsers = cohort_parser.add_subparsers(dest='cohort_command', required=True)
+    add_parser = cohort_subparsers.add_parser('add', help="copy a data file into a new cohort")
+    add_parser.add_argument('name', help="cohort name, e.g. \"2026 10A\"")
+    add_parser.add_argument('source', help="data file to copy (.json, .jsonl, .snap or .db)")
+    add_parser.add_argument('--compression', choices=sorted(COMPRESSIONS),
+                            default=DEFAULT_COMPRESSION,
+                            help="zlib (default, faster) or lzma (smaller)")
+    cohort_subparsers.add_parser('list', help="list the cohorts")
+    find_parser = cohort_subparsers.add_parser('find', help="show the cohort of students")
+    find_parser.add_argument('student_ids', type=int, nargs='+', metavar='STUDENT_ID')
+    
+    serve_parser = subparsers.add_parser('serve', help="serve results over an HTTP/JSON API")
+    serve_parser.add_argument('--host', default='127.0.0.1',
+                              help="address to listen on (default: this computer only)")
+    serve_parser.add_argument('--port', type=int, default=8080, help="port (0: any free port)")
+    
+    args = parser.parse_args(argv)
+    try:
+        args.policy = load_policy(args.policy) if args.policy else DEFAULT_POLICY
+    except (OSError, ValueError) as e:
+        print(f"Cannot read grading policy: {e}", file=sys.stderr)
+        return 2
+    
+    commands = {
+        'import': import_command,
+        'grade': grade_command,
+        'report': report_command,
+        'export': export_command,
+        'stats': stats_command,
+        'term': term_command,
+        'cohort': cohort_command,
+        'serve': serve_command
+    }
+    
+    command = commands[args.command]
+    if args.metrics:
+        METRICS.enable()
+        command = instrumented(f'cli_{args.command}')(command)
+    if args.profile:
+        METRICS.start_profile()
+    try:
+        return command(args)
+    except (OSError, ValueError) as e:
+        # An unreadable source or data file, or a CSV header without the ID and name columns
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        if args.profile:
+            METRICS.stop_profile(args.profile)
+        if args.metrics:
+            METRICS.export(args.metrics)
+
+
+# ============================================
+# PROGRAM EXECUTION
+# ============================================
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
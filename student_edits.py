@@ -0,0 +1,445 @@
+"""
+Student Result Management System
+Edit Batches and Undo
+EduTech Solutions
+
+Updates and deletes of existing students, applied in batches. A batch
+(e.g. correcting one subject's marks for the whole cohort) changes the
+store at once but leaves the results to be recalculated, so the caller
+recalculates, redraws and saves the affected students once per batch
+rather than once per edit.
+
+Every committed batch is kept in a change log for undo and redo. The log
+is compact: for a student that was updated, only the name (if it changed)
+and the marks that changed are kept, before and after; whole records are
+only kept for students who were added or deleted.
+    
+    log = EditLog(store)
+    with log.batch("Mathematics +5") as batch:
+        batch.adjust_subject('Mathematics', 5)
+    changed_ids = batch.changed_ids    # Recalculate, redraw and save these
+    log.undo()                         # Returns the IDs changed back
+"""
+
+EDIT_HISTORY_LIMIT = 100  # Batches kept for undo
+
+
+class StudentChange:
+    """Before and after state of one student changed by a batch."""
+    
+    __slots__ = ('student_id', 'before', 'after')
+    
+    def __init__(self, student_id, before, after):
+        """
+        Args:
+            student_id (int): Student ID
+            before (tuple): (name, {subject: mark}) before the batch, None if
+                the student did not exist
+            after (tuple): (name, {subject: mark}) after the batch, None if
+                the student was deleted
+        
+        When the student exists on both sides, the states are partial: the
+        name is None unless it changed, the marks hold only the subjects
+        that changed, and a mark of None is a missing mark.
+        """
+        self.student_id = student_id
+        self.before = before
+        self.after = after
+    
+    @classmethod
+    def compare(cls, student_id, before, after):
+        """
+        Return the compact change between two full states, None if equal.
+        
+        Args:
+            student_id (int): Student ID
+            before (tuple): Full (name, marks) state, None if absent
+            after (tuple): Full (name, marks) state, None if absent
+        """
+        if before == after:
+            return None
+        if before is None or after is None:
+            return cls(student_id, before, after)
+        
+        old_name, old_marks = before
+        new_name, new_marks = after
+        changed = [subject for subject in old_marks.keys() | new_marks.keys()
+                   if old_marks.get(subject) != new_marks.get(subject)]
+        return cls(
+            student_id,
+            (old_name if old_name != new_name else None,
+             {subject: old_marks.get(subject) for subject in changed}),
+            (new_name if old_name != new_name else None,
+             {subject: new_marks.get(subject) for subject in changed})
+        )
+    
+    def apply(self, store, undo=False):
+        """
+        Put a student into the state before (undo) or after the batch.
+        
+        Returns:
+            int: Row of the student, None if the student was removed
+        """
+        target, source = (self.before, self.after) if undo else (self.after, self.before)
+        student_id = self.student_id
+        if target is None:
+            if student_id in store:
+                store.remove_student(student_id)
+            return None
+        
+        name, marks = target
+        if source is None or student_id not in store:
+            return store.add_student(student_id, name, marks)
+        
+        row = store.rows[student_id]
+        if name is not None:
+            store.names[row] = name
+        for subject, mark in marks.items():
+            if mark is None:
+                store.delete_mark(row, subject)
+            else:
+                store.set_mark(row, subject, mark)
+        store.mark_changed(row)
+        return row
+
+
+class EditBatch:
+    """
+    Edits of existing (and new) students applied as one undoable batch.
+    
+    Edits change the store as they are made. Marks are checked against
+    the store's grading policy; an invalid edit raises ValueError before
+    it changes anything, and rollback() undoes the edits made so far.
+    """
+    
+    def __init__(self, store, description=''):
+        """
+        Args:
+            store (CohortStore): Store the edits are made in
+            description (str): Shown for the batch in undo and redo
+        """
+        self.store = store
+        self.description = description
+        self.before = {}       # Dictionary {student_id: full state when first edited}
+        self.changes = []      # List of StudentChange, set by commit()
+        self.changed_ids = set()  # IDs of the students the batch changed, set by commit()
+    
+    def __len__(self):
+        return len(self.changes)
+    
+    def _state(self, student_id):
+        """Return the full (name, marks) state of a student, None if absent."""
+        row = self.store.rows.get(student_id)
+        if row is None:
+            return None
+        return (self.store.names[row], self.store.row_marks(row))
+    
+    def _touch(self, student_id):
+        """Remember a student's state before the batch first changes it."""
+        if student_id not in self.before:
+            self.before[student_id] = self._state(student_id)
+    
+    def _row(self, student_id):
+        """Return the row of an existing student."""
+        row = self.store.rows.get(student_id)
+        if row is None:
+            raise KeyError(f"Student ID {student_id} not found")
+        return row
+    
+    def check_mark(self, subject, mark):
+        """
+        Return a mark as a float after checking it against the subject's maximum.
+        
+        Raises:
+            ValueError: If the mark is not a number or out of range
+        """
+        try:
+            mark = float(mark)
+        except (TypeError, ValueError):
+            raise ValueError(f"Mark for {subject} must be a number")
+        maximum = self.store.policy.maximum(subject)
+        if not 0 <= mark <= maximum:
+            raise ValueError(f"Mark for {subject} must be between 0 and {maximum:g}")
+        return mark
+    
+    # ============================================
+    # EDITS
+    # ============================================
+    def add_student(self, student_id, name, marks=None):
+        """
+        Add a new student.
+        
+        Raises:
+            ValueError: If the ID is taken or a mark is invalid
+        """
+        if student_id in self.store:
+            raise ValueError(f"Student ID {student_id} already exists")
+        marks = {subject: self.check_mark(subject, mark) for subject, mark in (marks or {}).items()}
+        self._touch(student_id)
+        self.store.add_student(student_id, name, marks)
+    
+    def update_student(self, student_id, name=None, marks=None):
+        """
+        Change a student's name and replace their marks.
+        
+        Args:
+            student_id (int): Student ID
+            name (str): New name, None to keep it
+            marks (dict): New {subject: mark} marks, subjects left out become
+                missing; None keeps the marks
+        
+        Raises:
+            KeyError: If there is no such student
+            ValueError: If a mark is invalid
+        """
+        row = self._row(student_id)
+        if marks is not None:
+            marks = {subject: self.check_mark(subject, mark) for subject, mark in marks.items()}
+        self._touch(student_id)
+        if name is not None:
+            self.store.names[row] = name
+        if marks is not None:
+            for subject in self.store.subjects:
+                if subject not in marks:
+                    self.store.delete_mark(row, subject)
+            for subject, mark in marks.items():
+                self.store.set_mark(row, subject, mark)
+    
+    def remove_student(self, student_id):
+        """
+        Delete a student.
+        
+        Raises:
+            KeyError: If there is no such student
+        """
+        self._row(student_id)
+        self._touch(student_id)
+        self.store.remove_student(student_id)
+    
+    def set_mark(self, student_id, subject, mark):
+        """Set one mark of a student; a mark of None makes it missing."""
+        row = self._row(student_id)
+        if mark is not None:
+            mark = self.check_mark(subject, mark)
+        self._touch(student_id)
+        if mark is None:
+            self.store.delete_mark(row, subject)
+        else:
+            self.store.set_mark(row, subject, mark)
+    
+    def set_subject_marks(self, subject, marks):
+        """
+        Set one subject's mark for many students.
+        
+        Args:
+            subject (str): Subject name
+            marks (dict): {student_id: mark}, None makes the mark missing
+        """
+        for student_id, mark in marks.items():
+            self.set_mark(student_id, subject, mark)
+    
+    def adjust_subject(self, subject, amount, student_ids=None):
+        """
+        Add an amount to one subject's marks (e.g. a marking correction).
+        
+        Adjusted marks are kept between 0 and the subject's maximum;
+        students without a mark in the subject are left alone.
+        
+        Args:
+            subject (str): Subject name
+            amount (float): Marks to add, negative to take away
+            student_ids (iterable): Students to adjust, None for everyone
+        
+        Returns:
+            int: Number of marks changed
+        
+        Raises:
+            ValueError: If the subject is unknown
+        """
+        column = self.store.subject_index.get(subject)
+        if column is None:
+            raise ValueError(f"Unknown subject: {subject}")
+        maximum = self.store.policy.maximum(subject)
+        store = self.store
+        width = store.width
+        rows = store.rows
+        if student_ids is None:
+            student_ids = list(rows)
+        
+        changed = 0
+        for student_id in student_ids:
+            row = rows.get(student_id)
+            if row is None:
+                continue
+            mark = store.marks[row * width + column]
+            if mark != mark:  # Missing
+                continue
+            adjusted = min(max(mark + amount, 0.0), maximum)
+            if adjusted != mark:
+                self._touch(student_id)
+                store.set_mark(row, subject, adjusted)
+                changed += 1
+        return changed
+    
+    # ============================================
+    # COMMIT AND ROLLBACK
+    # ============================================
+    def commit(self):
+        """
+        Record the batch's changes and report them to the change trackers.
+        
+        Students edited back to their old state are left out. Marks can
+        change without changing a student's results, so every changed
+        student is reported here rather than by the recalculation.
+        
+        Returns:
+            set: IDs of the students the batch changed
+        """
+        self.changes = []
+        for student_id, before in self.before.items():
+            change = StudentChange.compare(student_id, before, self._state(student_id))
+            if change is not None:
+                self.changes.append(change)
+        self.changed_ids = {change.student_id for change in self.changes}
+        
+        store = self.store
+        for student_id in self.changed_ids:
+            if student_id in store:
+                store.mark_changed(store.rows[student_id])
+        return self.changed_ids
+    
+    def rollback(self):
+        """Put every student edited by the batch back as it was."""
+        for student_id, before in self.before.items():
+            change = StudentChange.compare(student_id, before, self._state(student_id))
+            if change is not None:
+                change.apply(self.store, undo=True)
+        self.before = {}
+    
+    def undo(self):
+        """Undo a committed batch. Returns the IDs changed back."""
+        for change in reversed(self.changes):
+            change.apply(self.store, undo=True)
+        return self.changed_ids
+    
+    def redo(self):
+        """Redo a committed batch after undo(). Returns the IDs changed again."""
+        for change in self.changes:
+            change.apply(self.store)
+        return self.changed_ids
+
+
+class EditLog:
+    """Undo and redo stacks of the batches committed in a store."""
+    
+    def __init__(self, store, limit=EDIT_HISTORY_LIMIT):
+        """
+        Args:
+            store (CohortStore): Store the batches are made in
+            limit (int): Batches kept for undo, the oldest are dropped first
+        """
+        self.store = store
+        self.limit = limit
+        self.undo_stack = []  # Committed batches, most recent last
+        self.redo_stack = []  # Undone batches, most recently undone last
+    
+    def batch(self, description=''):
+        """
+        Start a batch of edits, committed when the with block ends.
+        
+        An exception in the block rolls the batch back and is raised again.
+        
+        Returns:
+            EditBatch: The batch (as the with target)
+        """
+        return _BatchContext(self, EditBatch(self.store, description))
+    
+    def commit(self, batch):
+        """
+        Commit a batch and keep it for undo.
+        
+        Returns:
+            set: IDs of the students the batch changed
+        """
+        changed_ids = batch.commit()
+        if batch.changes:
+            self.undo_stack.append(batch)
+            del self.undo_stack[:-self.limit]
+            self.redo_stack = []
+        return changed_ids
+    
+    def can_undo(self):
+        return bool(self.undo_stack)
+    
+    def can_redo(self):
+        return bool(self.redo_stack)
+    
+    def undo(self):
+        """
+        Undo the most recent batch.
+        
+        Returns:
+            EditBatch: The batch undone (its changed_ids need refreshing), None if none
+        """
+        if not self.undo_stack:
+            return None
+        batch = self.undo_stack.pop()
+        batch.undo()
+        self.redo_stack.append(batch)
+        return batch
+    
+    def redo(self):
+        """
+        Redo the most recently undone batch.
+        
+        Returns:
+            EditBatch: The batch redone, None if none
+        """
+        if not self.redo_stack:
+            return None
+        batch = self.redo_stack.pop()
+        batch.redo()
+        self.undo_stack.append(batch)
+        return batch
+    
+    def clear(self):
+        """Forget every batch (e.g. after the records were replaced)."""
+        self.undo_stack = []
+        self.redo_stack = []
+    
+    def discard(self, student_ids):
+        """
+        Forget the batches that changed some students (e.g. changed by another program).
+        
+        Undoing such a batch would overwrite the other change, and batches
+        are undone in order, so every batch before it is forgotten too.
+        """
+        student_ids = set(student_ids)
+        for position in range(len(self.undo_stack) - 1, -1, -1):
+            if not self.undo_stack[position].changed_ids.isdisjoint(student_ids):
+                del self.undo_stack[:position + 1]
+                break
+        if any(not batch.changed_ids.isdisjoint(student_ids) for batch in self.redo_stack):
+            self.redo_stack = []
+    
+    def change_count(self):
+        """Return the number of student changes kept for undo and redo."""
+        return sum(len(batch) for batch in self.undo_stack + self.redo_stack)
+
+
+class _BatchContext:
+    """Commits a batch when a with block ends, rolls it back on an error."""
+    
+    def __init__(self, log, batch):
+        self.log = log
+        self.batch = batch
+    
+    def __enter__(self):
+        return self.batch
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.log.commit(self.batch)
+        else:
+            self.batch.rollback()
+        return False
\ No newline at end of file
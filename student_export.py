@@ -0,0 +1,430 @@
+"""
+Student Result Management System
+Report Export
+EduTech Solutions
+
+Writes the results of a whole cohort to a file for printing or archiving:
+    
+    results.txt    the detailed report, as in "View All Results"
+    results.csv    one row per student (the layout accepted by import)
+    results.html   a printable table, its header repeated on every page
+
+The export is a pipeline of generators: records are taken a chunk at a
+time in student ID order, each chunk is rendered to text, and the text
+goes out through a buffer written to the file in blocks of a fixed size.
+Only one chunk is held at a time, so memory use does not grow with the
+cohort (exporting from a CohortStore only adds its sorted list of IDs).
+A data file whose students are not in ID order (a JSON file saved with
+its keys sorted as text) is loaded into a CohortStore and exported from
+it instead.
+The file is written under a temporary name and renamed once complete, so
+a cancelled or failed export leaves no partial file behind.
+
+The GUI runs an ExportJob on the I/O thread; the command-line tool
+exports a data file with export_data_file.
+"""
+
+import csv
+import html
+import io
+import os
+import threading
+
+from student_grading import DEFAULT_POLICY
+from student_parallel import batched
+from student_reports import format_student_reports, report_header
+from student_store import DEFAULT_SUBJECTS, CohortStore
+
+EXPORT_FORMATS = {'.txt': 'text', '.csv': 'csv', '.html': 'html', '.htm': 'html'}
+DEFAULT_EXPORT_CHUNK_SIZE = 2000  # Students rendered at a time
+WRITE_BUFFER_SIZE = 256 * 1024    # Bytes written to the file at a time
+PART_SUFFIX = '.part'             # Name of the file until the export is complete
+
+
+def export_format(target_file):
+    """
+    Return the export format of a file, from its extension.
+    
+    Raises:
+        ValueError: If the extension is not .txt, .csv, .html or .htm
+    """
+    extension = os.path.splitext(target_file)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Cannot export to {target_file}: use a .txt, .csv or .html file")
+    return EXPORT_FORMATS[extension]
+
+
+# ============================================
+# RENDERERS
+# ============================================
+class TextExport:
+    """The detailed report, in the layout of the "View All Results" window."""
+    
+    def __init__(self, subjects, policy=DEFAULT_POLICY):
+        self.policy = policy
+    
+    def header(self, student_count):
+        return report_header(student_count)
+    
+    def sections(self, records):
+        return format_student_reports(records, self.policy)
+    
+    def footer(self):
+        return ''
+
+
+class CsvExport:
+    """One row per student: marks of every subject, then the results."""
+    
+    def __init__(self, subjects, policy=DEFAULT_POLICY):
+        self.subjects = subjects
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+    
+    def _take(self):
+        """Return the text written to the buffer so far and empty it."""
+        text = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return text
+    
+    def header(self, student_count):
+        self.writer.writerow(['student_id', 'name'] + self.subjects
+                             + ['total_marks', 'percentage', 'grade'])
+        return self._take()
+    
+    def sections(self, records):
+        for student_id, record in records:
+            marks = record['marks']
+            self.writer.writerow([student_id, record['name']]
+                                 + [marks.get(subject, '') for subject in self.subjects]
+                                 + [record['total_marks'], f"{record['percentage']:.2f}",
+                                    record['grade']])
+        return self._take()
+    
+    def footer(self):
+        return ''
+
+
+class HtmlExport:
+    """A printable HTML table with one row per student."""
+    
+    STYLE = ("body { font-family: Arial, sans-serif; font-size: 10pt; }\n"
+             "table { border-collapse: collapse; width: 100%; }\n"
+             "th, td { border: 1px solid #999; padding: 2px 6px; }\n"
+             "th { background: #eee; }\n"
+             "td.number { text-align: right; }\n"
+             "thead { display: table-header-group; }\n"  # Repeated on every printed page
+             "tr { page-break-inside: avoid; }\n")
+    
+    def __init__(self, subjects, policy=DEFAULT_POLICY):
+        self.subjects = subjects
+        self.policy = policy
+    
+    def header(self, student_count):
+        columns = (["Student ID", "Name"]
+                   + [f"{subject} (/{self.policy.maximum(subject):g})"
+                      for subject in self.subjects]
+                   + ["Total Marks", "Percentage", "Grade"])
+        cells = ''.join(f"<th>{html.escape(column)}</th>" for column in columns)
+        return ("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+                "<title>Student Results Report</title>\n"
+                f"<style>\n{self.STYLE}</style>\n</head>\n<body>\n"
+                "<h1>Student Results Report</h1>\n"
+                f"<p>Generated: {student_count} students</p>\n"
+                f"<table>\n<thead><tr>{cells}</tr></thead>\n<tbody>\n")
+    
+    def sections(self, records):
+        rows = []
+        for student_id, record in records:
+            marks = record['marks']
+            cells = [f"<td class=\"number\">{student_id}</td>",
+                     f"<td>{html.escape(record['name'])}</td>"]
+            for subject in self.subjects:
+                mark = marks.get(subject)
+                cells.append(f"<td class=\"number\">{'' if mark is None else f'{mark:g}'}</td>")
+            total = (f"{record['total_marks']:.1f}/{self.policy.max_total(marks):g}"
+                     if marks else "")
+            cells.append(f"<td class=\"number\">{total}</td>")
+            cells.append(f"<td class=\"number\">{record['percentage']:.1f}%</td>")
+            cells.append(f"<td>{html.escape(record['grade'])}</td>")
+            rows.append(f"<tr>{''.join(cells)}</tr>\n")
+        return ''.join(rows)
+    
+    def footer(self):
+        return "</tbody>\n</table>\n</body>\n</html>\n"
+
+
+RENDERERS = {'text': TextExport, 'csv': CsvExport, 'html': HtmlExport}
+
+
+# ============================================
+# RECORD SOURCES
+# ============================================
+def store_record_chunks(store, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE):
+    """
+    Yield a store's students in ID order, a chunk of records at a time.
+    
+    Results are exported as stored, so calculate them first.
+    
+    Yields:
+        list: (student_id, record) pairs of the next chunk
+    """
+    subjects = store.subjects
+    width = len(subjects)
+    for block in batched(sorted(store.rows), chunk_size):
+        names, marks, total_marks, percentage, grades = store.copy_rows(block)
+        records = []
+        for index, student_id in enumerate(block):
+            start = index * width
+            records.append((student_id, {
+                'name': names[index],
+                'marks': {subject: mark for subject, mark
+                          in zip(subjects, marks[start:start + width])
+                          if mark == mark},  # NaN marks a missing subject
+                'total_marks': total_marks[index],
+                'percentage': percentage[index],
+                'grade': grades[index]
+            }))
+        yield records
+
+
+def scan_storage(storage):
+    """
+    Read a data file once for what an export needs before its first row.
+    
+    Returns:
+        tuple: (records, subjects, in_order) - the number of records, the
+            standard subjects then every other subject with a saved mark,
+            and whether the student IDs ascend through the file
+    """
+    records = 0
+    subjects = list(DEFAULT_SUBJECTS)
+    in_order = True
+    last_id = None
+    stream = storage.read()
+    try:
+        for student_id, record in stream:
+            records += 1
+            if last_id is not None and student_id <= last_id:
+                in_order = False
+            last_id = student_id
+            for subject in record['marks']:
+                if subject not in subjects:
+                    subjects.append(subject)
+    finally:
+        stream.close()
+    return records, subjects, in_order
+
+
+def storage_record_chunks(storage, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE):
+    """
+    Return the students of a data file in ID order, a chunk of records at a time.
+    
+    The file is scanned once for the number of students and the subjects.
+    A file in ID order is then streamed; one that is not is loaded into a
+    CohortStore (compact columns, not a dictionary per student) and its
+    students taken from there.
+    
+    Args:
+        storage (StorageBackend): Storage of the data file
+        chunk_size (int): Students per chunk
+    
+    Returns:
+        tuple: (students, subjects, chunks) - chunks yields lists of
+            (student_id, record) pairs; close it if it is not read to the end
+    """
+    students, subjects, in_order = scan_storage(storage)
+    if in_order:
+        return students, subjects, _stream_chunks(storage, chunk_size)
+    
+    store = CohortStore(subjects)
+    stream = storage.read()
+    try:
+        while stream.load_into(store, chunk_size):
+            pass
+    finally:
+        stream.close()
+    return len(store), subjects, store_record_chunks(store, chunk_size)
+
+
+def _stream_chunks(storage, chunk_size):
+    """Yield the records of a data file as read, a chunk at a time."""
+    stream = storage.read()
+    try:
+        yield from batched(stream, chunk_size)
+    finally:
+        stream.close()
+
+
+# ============================================
+# WRITING
+# ============================================
+class BlockWriter:
+    """Encodes text and writes it to a binary file in blocks of a fixed size."""
+    
+    def __init__(self, file, block_size=WRITE_BUFFER_SIZE):
+        """
+        Args:
+            file: Binary file opened for writing, unbuffered
+            block_size (int): Bytes per write
+        """
+        self.file = file
+        self.block_size = block_size
+        self.buffer = bytearray()
+        self.bytes_written = 0
+    
+    def write(self, text):
+        """Add text, writing every full block."""
+        self.buffer += text.encode('utf-8')
+        if len(self.buffer) < self.block_size:
+            return
+        view = memoryview(self.buffer)
+        start = 0
+        while len(self.buffer) - start >= self.block_size:
+            self.file.write(view[start:start + self.block_size])
+            start += self.block_size
+        view.release()
+        del self.buffer[:start]
+        self.bytes_written += start
+    
+    def flush(self):
+        """Write what is left in the buffer (the last, partial block)."""
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.bytes_written += len(self.buffer)
+            self.buffer = bytearray()
+
+
+def write_export(target_file, texts, block_size=WRITE_BUFFER_SIZE, stop_event=None):
+    """
+    Write a stream of text to a file, replacing it once the stream is complete.
+    
+    Args:
+        target_file (str): File to write
+        texts (iterable): Text to write, in order
+        block_size (int): Bytes per write
+        stop_event (threading.Event): Set to stop early; nothing is written then
+    
+    Returns:
+        int: Bytes written, None if stopped
+    """
+    part_file = target_file + PART_SUFFIX
+    try:
+        with open(part_file, 'wb', buffering=0) as file:
+            writer = BlockWriter(file, block_size)
+            for text in texts:
+                if stop_event is not None and stop_event.is_set():
+                    break
+                writer.write(text)
+            else:
+                writer.flush()
+                os.fsync(file.fileno())
+        if stop_event is not None and stop_event.is_set():
+            os.remove(part_file)
+            return None
+        os.replace(part_file, target_file)
+    except BaseException:
+        if os.path.exists(part_file):
+            os.remove(part_file)
+        raise
+    return writer.bytes_written
+
+
+def render_export(renderer, student_count, chunks, on_chunk=None):
+    """
+    Yield the text of an export: the header, each chunk's sections, the footer.
+    
+    Args:
+        renderer: TextExport, CsvExport or HtmlExport
+        student_count (int): Students in the export, for the header
+        chunks (iterable): Lists of (student_id, record) pairs, in ID order
+        on_chunk (callable): on_chunk(count) after each chunk is rendered
+    """
+    yield renderer.header(student_count)
+    for records in chunks:
+        yield renderer.sections(records)
+        if on_chunk is not None:
+            on_chunk(len(records))
+    yield renderer.footer()
+
+
+def export_data_file(storage, target_file, policy=DEFAULT_POLICY,
+                     chunk_size=DEFAULT_EXPORT_CHUNK_SIZE):
+    """
+    Export the students of a data file in ID order, streamed from the storage.
+    
+    Args:
+        storage (StorageBackend): Storage of the data file
+        target_file (str): .txt, .csv or .html file to write
+        policy (GradingPolicy): Policy the results were graded with
+        chunk_size (int): Students rendered at a time
+    
+    Returns:
+        tuple: (students exported, bytes written)
+    """
+    renderer_class = RENDERERS[export_format(target_file)]
+    # The header needs the number of students, and tables every subject for their columns
+    students, subjects, chunks = storage_record_chunks(storage, chunk_size)
+    renderer = renderer_class(subjects, policy)
+    exported = [0]
+    
+    def count(students):
+        exported[0] += students
+    
+    try:
+        size = write_export(target_file, render_export(renderer, students, chunks, count))
+    finally:
+        chunks.close()
+    return exported[0], size
+
+
+class ExportJob:
+    """
+    Exports a snapshot of the students to a file, for IOWorker.submit.
+    
+    The store must be a copy (see CohortStore.copy) with current results,
+    since it is read on the worker thread while the GUI goes on; the GUI
+    may only read the progress.
+    """
+    
+    def __init__(self, target_file, store, chunk_size=DEFAULT_EXPORT_CHUNK_SIZE):
+        """
+        Args:
+            target_file (str): .txt, .csv or .html file to write
+            store (CohortStore): Snapshot of the students to export
+            chunk_size (int): Students rendered between checks for cancellation
+        
+        Raises:
+            ValueError: If the file extension is not an export format
+        """
+        self.target_file = target_file
+        self.renderer = RENDERERS[export_format(target_file)](store.subjects, store.policy)
+        self.store = store
+        self.chunk_size = chunk_size
+        self.total = len(store)
+        self.exported = 0
+        self.stop_event = threading.Event()
+    
+    @property
+    def progress(self):
+        """Fraction of the students exported so far (0.0 - 1.0)."""
+        return self.exported / self.total if self.total else 1.0
+    
+    def cancel(self):
+        """Ask the job to stop at the next chunk; the file is not written."""
+        self.stop_event.set()
+    
+    def _count(self, students):
+        self.exported += students
+    
+    def __call__(self):
+        """
+        Run the export (worker thread).
+        
+        Returns:
+            int: Bytes written, or None if cancelled
+        """
+        texts = render_export(self.renderer, self.total,
+                              store_record_chunks(self.store, self.chunk_size), self._count)
+        return write_export(self.target_file, texts, stop_event=self.stop_event)
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+Student Result Management System
+Student Data Files
+EduTech Solutions
+
+Incremental reading of student data files. Two layouts are supported:
+    
+    student_data.json   {"101": {"name": ..., "marks": {...}, ...}, ...}
+    student_data.jsonl  one {"id": 101, "name": ..., ...} record per line
+
+Records are parsed one at a time, so the whole file never has to be held
+in memory as one decoded object.
+"""
+
+import codecs
+import json
+import os
+
+DEFAULT_CHUNK_SIZE = 64 * 1024  # Bytes read from disk at a time
+
+
+def is_json_lines(file_path):
+    """Return True if the file uses the JSON-Lines layout."""
+    return file_path.endswith('.jsonl')
+
+
+def student_record(student):
+    """
+    Return the JSON-serializable record for a student.
+    
+    Args:
+        student (Student): Student to convert
+    
+    Returns:
+        dict: {'name', 'marks', 'total_marks', 'percentage', 'grade'}
+    """
+    return {
+        'name': student.name,
+        'marks': dict(student.marks),
+        'total_marks': student.total_marks,
+        'percentage': student.percentage,
+        'grade': student.grade
+    }
+
+
+def iter_student_records(students):
+    """
+    Yield the records of a collection in ascending ID order.
+    
+    Args:
+        students (StudentCollection): Students to convert
+    
+    Yields:
+        tuple: (student_id, record)
+    """
+    for student_id in sorted(students.keys()):
+        yield student_id, student_record(students[student_id])
+
+
+def write_json_lines(file, records):
+    """
+    Write records to an open text file, one JSON record per line.
+    
+    Args:
+        file: Text file opened for writing
+        records (iterable): (student_id, record) pairs
+    """
+    for student_id, record in records:
+        line = {'id': student_id}
+        line.update(record)
+        file.write(json.dumps(line, sort_keys=True) + '\n')
+
+
+def write_json_object(file, records):
+    """
+    Write records as one JSON object, in the original indented layout.
+    
+    The output matches json.dump(data, indent=4, sort_keys=True) but is
+    written one student at a time instead of building the whole dictionary.
+    
+    Args:
+        file: Text file opened for writing
+        records (iterable): (student_id, record) pairs in ascending ID order
+    """
+    file.write('{')
+    written = False
+    for student_id, record in records:
+        file.write(',\n    ' if written else '\n    ')
+        text = json.dumps(record, indent=4, sort_keys=True)
+        file.write(json.dumps(str(student_id)) + ': ' + text.replace('\n', '\n    '))
+        written = True
+    file.write('\n}' if written else '}')
+
+
+# ============================================
+# INCREMENTAL READER
+# ============================================
+class StudentFileReader:
+    """Iterates over (student_id, record) pairs of a student data file."""
+    
+    def __init__(self, file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Open a student data file for incremental reading.
+        
+        Args:
+            file_path (str): Path of a .json or .jsonl data file
+            chunk_size (int): Bytes read from disk at a time
+        """
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self.total_bytes = os.path.getsize(file_path)
+        self.bytes_read = 0
+        
+        self._file = open(file_path, 'rb')
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''   # Decoded text not yet parsed
+        self._pos = 0       # Parse position within the buffer
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __iter__(self):
+        if is_json_lines(self.file_path):
+            return self._iter_json_lines()
+        return self._iter_json_object()
+    
+    @property
+    def progress(self):
+        """Fraction of the file read so far (0.0 - 1.0)."""
+        if not self.total_bytes:
+            return 1.0
+        return min(1.0, self.bytes_read / self.total_bytes)
+    
+    def close(self):
+        """Close the underlying file."""
+        self._file.close()
+    
+    # ============================================
+    # JSON-LINES LAYOUT
+    # ============================================
+    def _iter_json_lines(self):
+        for line in self._file:
+            self.bytes_read += len(line)
+            if line.strip():
+                record = json.loads(line)
+                yield int(record.pop('id')), record
+        self.close()  # Release the file as soon as it has been read
+    
+    # ============================================
+    # JSON OBJECT LAYOUT
+    # ============================================
+    def _iter_json_object(self):
+        if self._next_char() != '{':
+            raise ValueError("Student data file must contain a JSON object")
+        self._pos += 1
+        if self._next_char() == '}':
+            self.close()
+            return
+        
+        while True:
+            # "student_id": {record}
+            student_id = self._decode_value()
+            if self._next_char() != ':':
+                raise ValueError(f"Expected ':' after student ID {student_id!r}")
+            self._pos += 1
+            self._next_char()
+            record = self._decode_value()
+            yield int(student_id), record
+            
+            # Either another record follows or the object ends
+            separator = self._next_char()
+            self._pos += 1
+            if separator == '}':
+                self.close()  # Release the file as soon as it has been read
+                return
+            if separator != ',':
+                raise ValueError(f"Expected ',' or '}}' after student ID {student_id!r}")
+            self._next_char()
+    
+    def _read_more(self):
+        """Append the next chunk of the file to the buffer, False at end of file."""
+        chunk = self._file.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        
+        # Drop the part of the buffer that has already been parsed
+        self._buffer = self._buffer[self._pos:] + self._text.decode(chunk, final=not chunk)
+        self._pos = 0
+        return bool(chunk)
+    
+    def _next_char(self):
+        """Skip whitespace and return the next character ('' at end of file)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ''
+    
+    def _decode_value(self):
+        """Decode one JSON value at the parse position, reading more if needed."""
+        while True:
+            try:
+                value, self._pos = self._decoder.raw_decode(self._buffer, self._pos)
+                return value
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk
+                if not self._read_more():
+                    raise
\ No newline at end of file
@@ -0,0 +1,274 @@
+"""
+Student Result Management System
+Grading Policies
+EduTech Solutions
+
+A grading policy says how a student's marks become a percentage and a
+grade, so each course can use its own scheme:
+    
+    subject weights    how much each subject counts towards the percentage
+    subject maximums   what each subject is marked out of
+    grade bands        minimum percentage of each grade (e.g. A+, A, A-)
+
+The percentage is the weighted mean of the marked subjects' scores
+(mark / maximum); a subject with no mark does not count. Total marks are
+the plain sum of the marks, out of the maximums of the marked subjects.
+The standard policy (every subject out of 100 with the same weight,
+A/B/C/D from 90/80/70/60) gives exactly the original results.
+
+A policy is compiled once per subject layout (compile_policy): weights
+and maximums become per-column factors for the batch engine, the bands a
+sorted table searched with bisect (numpy.searchsorted in a batch), and
+the results of single rows are memoized by their marks (useful when
+many students share marks, e.g. few subjects or whole-number marks). Policies are
+stored as JSON:
+    
+    {"name": "Physics 2026",
+     "bands": [[93, "A"], [90, "A-"], [87, "B+"], [83, "B"], [80, "B-"], [60, "C"]],
+     "fail_grade": "F",
+     "subjects": {"Mathematics": {"weight": 2, "maximum": 50}}}
+"""
+
+import bisect
+import functools
+import json
+
+DEFAULT_SUBJECTS = ['Mathematics', 'Science', 'English', 'History', 'Computer Science']
+MAX_SUBJECT_MARK = 100   # Each subject is marked out of 100 unless a policy says otherwise
+
+# Grade boundaries as (minimum percentage, grade), highest first
+GRADE_BOUNDARIES = [(90, 'A'), (80, 'B'), (70, 'C'), (60, 'D')]
+FAIL_GRADE = 'F'         # Below 60%
+NO_MARKS_GRADE = 'N/A'   # Student has no marks recorded
+
+RESULT_CACHE_SIZE = 65536  # Memoized row results per compiled policy
+
+
+class GradingPolicy:
+    """Subject weights and maximums and grade bands of one grading scheme."""
+    
+    def __init__(self, name="Standard", bands=GRADE_BOUNDARIES, fail_grade=FAIL_GRADE,
+                 subjects=None, default_weight=1.0, default_maximum=MAX_SUBJECT_MARK):
+        """
+        Create a policy. Policies are immutable, so they can be shared and
+        used as cache keys.
+        
+        Args:
+            name (str): Name shown to users
+            bands (list): (minimum percentage, grade) pairs, in any order
+            fail_grade (str): Grade below the lowest band
+            subjects (dict): {subject: {'weight': ..., 'maximum': ...}} for
+                subjects that differ from the defaults
+            default_weight (float): Weight of other subjects
+            default_maximum (float): Maximum mark of other subjects
+        
+        Raises:
+            ValueError: If a weight or maximum is not positive, or a band
+                repeats a minimum or grade
+        """
+        self.name = str(name)
+        self.bands = tuple(sorted(((float(minimum), str(grade)) for minimum, grade in bands),
+                                  reverse=True))
+        self.fail_grade = str(fail_grade)
+        self.default_weight = float(default_weight)
+        self.default_maximum = float(default_maximum)
+        self.subject_rules = {}  # Dictionary {subject: (weight, maximum)}
+        for subject, rule in (subjects or {}).items():
+            self.subject_rules[subject] = (float(rule.get('weight', self.default_weight)),
+                                           float(rule.get('maximum', self.default_maximum)))
+        
+        grades = [grade for _, grade in self.bands] + [self.fail_grade]
+        if len(set(grades)) != len(grades) or NO_MARKS_GRADE in grades or '' in grades:
+            raise ValueError("Every band needs its own grade, different from the fail grade")
+        if len({minimum for minimum, _ in self.bands}) != len(self.bands):
+            raise ValueError("Two grade bands have the same minimum percentage")
+        rules = list(self.subject_rules.values()) + [(self.default_weight, self.default_maximum)]
+        if any(weight <= 0 or maximum <= 0 for weight, maximum in rules):
+            raise ValueError("Subject weights and maximums must be greater than 0")
+        
+        # Bisect table: ascending minimums, ladder[i] is the grade below bounds[i]
+        self.bounds = tuple(minimum for minimum, _ in reversed(self.bands))
+        self.ladder = (self.fail_grade,) + tuple(grade for _, grade in reversed(self.bands))
+        self.key = (self.name, self.bands, self.fail_grade, self.default_weight,
+                    self.default_maximum, tuple(sorted(self.subject_rules.items())))
+    
+    def __eq__(self, other):
+        return isinstance(other, GradingPolicy) and self.key == other.key
+    
+    def __hash__(self):
+        return hash(self.key)
+    
+    def __repr__(self):
+        return f"GradingPolicy({self.name!r})"
+    
+    # ============================================
+    # RULES
+    # ============================================
+    def weight(self, subject):
+        """Return the weight of a subject."""
+        return self.subject_rules.get(subject, (self.default_weight,))[0]
+    
+    def maximum(self, subject):
+        """Return the mark a subject is marked out of."""
+        return self.subject_rules.get(subject, (None, self.default_maximum))[1]
+    
+    def max_total(self, subjects):
+        """Return the most total marks a student can get in some subjects."""
+        return sum(self.maximum(subject) for subject in subjects)
+    
+    def grade(self, percentage):
+        """Return the grade for a percentage (bisect over the band table)."""
+        return self.ladder[bisect.bisect_right(self.bounds, percentage)]
+    
+    def grades(self):
+        """Return the policy's grades, best first."""
+        return list(reversed(self.ladder))
+    
+    def rank(self, grade):
+        """
+        Return a sort key for a grade: higher for better grades, -1 for
+        grades this policy does not give (e.g. N/A).
+        """
+        try:
+            return self.ladder.index(grade)
+        except ValueError:
+            return -1
+    
+    # ============================================
+    # PERSISTENCE
+    # ============================================
+    def to_dict(self):
+        """Return the policy as a JSON-serializable dictionary."""
+        return {
+            'name': self.name,
+            'bands': [[minimum, grade] for minimum, grade in self.bands],
+            'fail_grade': self.fail_grade,
+            'default_weight': self.default_weight,
+            'default_maximum': self.default_maximum,
+            'subjects': {subject: {'weight': weight, 'maximum': maximum}
+                         for subject, (weight, maximum) in sorted(self.subject_rules.items())}
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a policy from a dictionary written by to_dict (or by hand).
+        
+        Raises:
+            ValueError: If the dictionary is not a valid policy
+        """
+        try:
+            return cls(
+                name=data.get('name', "Custom"),
+                bands=data.get('bands', GRADE_BOUNDARIES),
+                fail_grade=data.get('fail_grade', FAIL_GRADE),
+                subjects=data.get('subjects'),
+                default_weight=data.get('default_weight', 1.0),
+                default_maximum=data.get('default_maximum', MAX_SUBJECT_MARK)
+            )
+        except (AttributeError, TypeError) as e:
+            raise ValueError(f"Invalid grading policy: {e}")
+
+
+DEFAULT_POLICY = GradingPolicy()
+
+
+def load_policy(file_path):
+    """
+    Read a grading policy from a JSON file.
+    
+    Raises:
+        ValueError: If the file is not a valid policy
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return GradingPolicy.from_dict(json.load(file))
+
+
+def save_policy(policy, file_path):
+    """Write a grading policy to a JSON file."""
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(policy.to_dict(), file, indent=4)
+
+
+# ============================================
+# COMPILED POLICIES
+# ============================================
+class CompiledPolicy:
+    """A policy applied to one subject layout (the columns of a store)."""
+    
+    def __init__(self, policy, subjects):
+        """
+        Args:
+            policy (GradingPolicy): Policy to compile
+            subjects (tuple): Subject of each column
+        """
+        self.policy = policy
+        self.subjects = subjects
+        self.weights = [policy.weight(subject) for subject in subjects]
+        # Each mark is scaled to out of 100 and weighted in one multiplication
+        self.factors = [weight * MAX_SUBJECT_MARK / policy.maximum(subject)
+                        for weight, subject in zip(self.weights, subjects)]
+        # Every subject out of 100 with weight 1: the percentage is a plain mean
+        self.uniform = all(weight == 1.0 for weight in self.weights) and \
+            all(factor == 1.0 for factor in self.factors)
+        self.cache = {}  # Dictionary {marks as bytes: results}
+    
+    def results(self, marks):
+        """
+        Return the results of one row, memoized by its marks.
+        
+        Args:
+            marks (array): Mark of each column, NaN where missing
+        
+        Returns:
+            tuple: (total_marks, percentage, grade)
+        """
+        key = marks.tobytes()
+        results = self.cache.get(key)
+        if results is None:
+            if len(self.cache) >= RESULT_CACHE_SIZE:
+                self.cache.clear()
+            results = self.cache[key] = self.calculate(marks)
+        return results
+    
+    def calculate(self, marks):
+        """Calculate the results of one row (see results)."""
+        if self.uniform:
+            row_marks = [mark for mark in marks if mark == mark]
+            if not row_marks:
+                return 0.0, 0.0, NO_MARKS_GRADE
+            total_marks = sum(row_marks)
+            percentage = (total_marks / (len(row_marks) * MAX_SUBJECT_MARK)) * 100
+            return total_marks, percentage, self.policy.grade(percentage)
+        
+        total_marks = 0.0
+        weighted = 0.0
+        weight_sum = 0.0
+        for mark, weight, factor in zip(marks, self.weights, self.factors):
+            if mark == mark:
+                total_marks += mark
+                weighted += mark * factor
+                weight_sum += weight
+        
+        # If no marks, set defaults
+        if not weight_sum:
+            return 0.0, 0.0, NO_MARKS_GRADE
+        
+        percentage = (weighted / (weight_sum * MAX_SUBJECT_MARK)) * 100
+        return total_marks, percentage, self.policy.grade(percentage)
+
+
+@functools.lru_cache(maxsize=64)
+def compile_policy(policy, subjects):
+    """
+    Return a policy compiled for a subject layout (cached).
+    
+    Args:
+        policy (GradingPolicy): Policy to compile
+        subjects (tuple): Subject of each column
+    
+    Returns:
+        CompiledPolicy: The compiled policy, shared by every store with
+            the same policy and subjects
+    """
+    return CompiledPolicy(policy, subjects)
\ No newline at end of file
@@ -0,0 +1,363 @@
+"""
+Student Result Management System
+Term History
+EduTech Solutions
+
+Marks of past terms, so a re-sit or a new term does not overwrite a
+student's earlier results. The current marks stay in the student store;
+recording a term saves them under the term's name.
+
+Terms are stored as deltas: for each student, only the marks that differ
+from the student's previous term are kept (a removed mark is stored as
+None, a student who left as a None delta). Each term has its own subject
+list; marks of subjects a term does not have are not carried into it, so
+dropping a subject costs nothing per student. A term's marks are rebuilt
+on demand by replaying the deltas, and rebuilt student histories are kept
+in a small LRU cache, which makes "progress over terms" queries cheap.
+
+History is saved next to the data file as JSON:
+    
+    {"terms": [{"name": "2026 T1", "subjects": [...], "students": 120, "changed": 120}, ...],
+     "changes": {"101": [[0, {"Mathematics": 72.0}], [1, {"Mathematics": 80.0}]], ...}}
+"""
+
+import json
+import os
+import tempfile
+from array import array
+from collections import OrderedDict
+
+from student_grading import DEFAULT_POLICY, compile_policy
+from student_store import MISSING
+
+HISTORY_SUFFIX = '.history.json'  # Replaces the data file's extension
+HISTORY_CACHE_SIZE = 4096         # Student histories kept rebuilt
+
+
+class Term:
+    """Name, subjects and size of one recorded term."""
+    
+    __slots__ = ('name', 'subjects', 'students', 'changed')
+    
+    def __init__(self, name, subjects, students=0, changed=0):
+        """
+        Args:
+            name (str): Term name, e.g. "2026 T1" or "2026 T1 re-sit"
+            subjects (tuple): Subjects taught in the term
+            students (int): Students with a record in the term
+            changed (int): Students whose marks differ from the term before
+        """
+        self.name = name
+        self.subjects = tuple(subjects)
+        self.students = students
+        self.changed = changed
+    
+    def to_dict(self):
+        """Return the term as a JSON-serializable dictionary."""
+        return {'name': self.name, 'subjects': list(self.subjects),
+                'students': self.students, 'changed': self.changed}
+
+
+class TermHistory:
+    """Marks of every recorded term, stored as per-student deltas."""
+    
+    def __init__(self, cache_size=HISTORY_CACHE_SIZE):
+        """
+        Args:
+            cache_size (int): Student histories kept rebuilt
+        """
+        self.terms = []         # List of Term, oldest first
+        self.term_index = {}    # Dictionary {term name: position in terms}
+        self.changes = {}       # Dictionary {student_id: [(term position, delta)]}
+        self.latest = None      # {student_id: marks} of the last term, rebuilt when needed
+        self.cache = OrderedDict()  # {student_id: marks of each term}, least recent first
+        self.cache_size = cache_size
+    
+    def __len__(self):
+        return len(self.terms)
+    
+    def __contains__(self, name):
+        return name in self.term_index
+    
+    def term_names(self):
+        """Return the term names, oldest first."""
+        return [term.name for term in self.terms]
+    
+    def delta_count(self):
+        """Return the number of stored deltas (a full copy would store students x terms)."""
+        return sum(len(changes) for changes in self.changes.values())
+    
+    # ============================================
+    # RECORDING TERMS
+    # ============================================
+    def record_term(self, name, records, subjects=()):
+        """
+        Record the marks of a term.
+        
+        Recording the last term again (e.g. after re-sits) replaces it;
+        earlier terms cannot be changed.
+        
+        Args:
+            name (str): Term name
+            records (iterable): (student_id, {subject: mark}) pairs of every
+                student in the term
+            subjects (list): Subjects of the term; subjects that have marks
+                are added to it
+        
+        Returns:
+            Term: The recorded term
+        
+        Raises:
+            ValueError: If name is an earlier term or empty
+        """
+        name = str(name).strip()
+        if not name:
+            raise ValueError("The term needs a name")
+        if name in self.term_index:
+            if self.term_index[name] != len(self.terms) - 1:
+                raise ValueError(f"Term {name!r} is not the last term and cannot be recorded again")
+            self._drop_last_term()
+        
+        previous = self.latest_marks()
+        position = len(self.terms)
+        term_subjects = list(subjects)
+        current = {}
+        for student_id, marks in records:
+            current[student_id] = {subject: float(mark) for subject, mark in marks.items()}
+        known = set(term_subjects)
+        for marks in current.values():
+            for subject in marks:
+                if subject not in known:
+                    known.add(subject)
+                    term_subjects.append(subject)
+        
+        changed = 0
+        for student_id, marks in current.items():
+            base = previous.get(student_id)
+            if base is None:
+                # New (or returning) student: the delta is every mark
+                delta = dict(marks)
+            else:
+                delta = {subject: mark for subject, mark in marks.items()
+                         if base.get(subject) != mark}
+                # Marks of subjects the term does not have are dropped anyway
+                delta.update((subject, None) for subject in base
+                             if subject not in marks and subject in known)
+                if not delta:
+                    continue
+            self.changes.setdefault(student_id, []).append((position, delta))
+            changed += 1
+        
+        # Students missing from this term left
+        for student_id in previous:
+            if student_id not in current:
+                self.changes[student_id].append((position, None))
+        
+        term = Term(name, term_subjects, len(current), changed)
+        self.terms.append(term)
+        self.term_index[name] = position
+        self.latest = current
+        return term
+    
+    def _drop_last_term(self):
+        """Remove the last term's deltas so it can be recorded again."""
+        position = len(self.terms) - 1
+        for student_id in list(self.changes):
+            changes = self.changes[student_id]
+            if changes[-1][0] == position:
+                changes.pop()
+                if not changes:
+                    del self.changes[student_id]
+        del self.term_index[self.terms.pop().name]
+        self.latest = None
+        self.cache.clear()
+    
+    # ============================================
+    # REBUILDING TERMS
+    # ============================================
+    def history(self, student_id):
+        """
+        Return a student's marks in every term (cached).
+        
+        Args:
+            student_id (int): Student ID
+        
+        Returns:
+            list: {subject: mark} of each term, oldest first, None for terms
+                the student was not in. Terms without changes share one
+                dictionary, so the result must not be modified.
+        """
+        views = self.cache.get(student_id)
+        if views is not None and len(views) == len(self.terms):
+            self.cache.move_to_end(student_id)
+            return views
+        
+        views = self._replay(student_id, len(self.terms))
+        self.cache[student_id] = views
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return views
+    
+    def _replay(self, student_id, term_count):
+        """Rebuild a student's marks in the first term_count terms from the deltas."""
+        changes = self.changes.get(student_id, ())
+        views = []
+        marks = None
+        next_change = 0
+        subjects = None
+        for position in range(term_count):
+            term = self.terms[position]
+            if marks is not None and term.subjects != subjects:
+                # Marks of subjects the term does not have are not carried over
+                allowed = set(term.subjects)
+                marks = {subject: mark for subject, mark in marks.items() if subject in allowed}
+            subjects = term.subjects
+            
+            if next_change < len(changes) and changes[next_change][0] == position:
+                delta = changes[next_change][1]
+                next_change += 1
+                if delta is None:
+                    marks = None
+                else:
+                    marks = dict(marks or {})
+                    for subject, mark in delta.items():
+                        if mark is None:
+                            marks.pop(subject, None)
+                        else:
+                            marks[subject] = mark
+            views.append(marks)
+        return views
+    
+    def term_marks(self, name):
+        """
+        Rebuild the marks of every student in one term.
+        
+        Args:
+            name (str): Term name
+        
+        Returns:
+            dict: {student_id: {subject: mark}} of the students in the term
+        
+        Raises:
+            KeyError: If there is no such term
+        """
+        position = self.term_index[name]
+        if position == len(self.terms) - 1 and self.latest is not None:
+            return self.latest
+        marks = {}
+        for student_id in self.changes:
+            views = self.cache.get(student_id)
+            if views is None or len(views) != len(self.terms):
+                views = self._replay(student_id, position + 1)
+            if views[position] is not None:
+                marks[student_id] = views[position]
+        return marks
+    
+    def latest_marks(self):
+        """Return {student_id: marks} of the last term ({} before the first one)."""
+        if not self.terms:
+            return {}
+        if self.latest is None:
+            self.latest = self.term_marks(self.terms[-1].name)
+        return self.latest
+    
+    # ============================================
+    # QUERIES
+    # ============================================
+    def progress(self, student_id, policy=DEFAULT_POLICY):
+        """
+        Return a student's results in each term they were in.
+        
+        Results are graded with the term's subjects, so terms with
+        different subjects compare like the GUI would have shown them.
+        
+        Args:
+            student_id (int): Student ID
+            policy (GradingPolicy): How marks are turned into results
+        
+        Returns:
+            list: (term name, total_marks, percentage, grade), oldest first
+        """
+        results = []
+        for term, marks in zip(self.terms, self.history(student_id)):
+            if marks is None:
+                continue
+            compiled = compile_policy(policy, term.subjects)
+            row = array('d', [marks.get(subject, MISSING) for subject in term.subjects])
+            results.append((term.name,) + compiled.results(row))
+        return results
+    
+    # ============================================
+    # PERSISTENCE
+    # ============================================
+    def to_dict(self):
+        """Return the history as a JSON-serializable dictionary."""
+        return {
+            'terms': [term.to_dict() for term in self.terms],
+            'changes': {str(student_id): [[position, delta] for position, delta in changes]
+                        for student_id, changes in self.changes.items()}
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create a history from a dictionary written by to_dict.
+        
+        Raises:
+            ValueError: If the dictionary is not a valid history
+        """
+        history = cls()
+        try:
+            for term in data.get('terms', []):
+                history.term_index[term['name']] = len(history.terms)
+                history.terms.append(Term(term['name'], term['subjects'],
+                                          term.get('students', 0), term.get('changed', 0)))
+            for student_id, changes in data.get('changes', {}).items():
+                history.changes[int(student_id)] = [(int(position), delta)
+                                                    for position, delta in changes]
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid term history: {e}")
+        return history
+
+
+def history_file(data_file):
+    """Return the path of the history file kept next to a data file."""
+    return os.path.splitext(data_file)[0] + HISTORY_SUFFIX
+
+
+def load_history(file_path):
+    """
+    Read a term history file; a missing file gives an empty history.
+    
+    Raises:
+        ValueError: If the file is not a valid history
+    """
+    if not os.path.exists(file_path):
+        return TermHistory()
+    with open(file_path, 'r', encoding='utf-8') as file:
+        try:
+            return TermHistory.from_dict(json.load(file))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid term history: {e}")
+
+
+def write_history(data, file_path):
+    """
+    Atomically write a history dictionary (TermHistory.to_dict) to a file.
+    
+    Takes the dictionary rather than the history so the GUI can write it
+    on the I/O thread while new terms are recorded.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    handle, temp_path = tempfile.mkstemp(
+        prefix=os.path.basename(file_path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
\ No newline at end of file
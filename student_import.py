@@ -0,0 +1,300 @@
+"""
+Student Result Management System
+Bulk Import
+EduTech Solutions
+
+Reads new students from CSV files, for the CLI's import command and the
+GUI's Import CSV button. Rows are checked with the rules of the Add
+Student form (numeric ID, a name, marks between 0 and the subject's
+maximum, 100 unless the grading policy says otherwise), an ID may only
+appear once in the file and, for the GUI, not be taken already. Invalid
+rows are collected in an error report instead of stopping the import at
+the first one.
+
+Two CSV layouts are accepted, told apart by the header row:
+    
+    student_id,name,subject,mark             one row per mark; rows of
+                                             one student must be adjacent
+    student_id,name,Mathematics,Science,...  one row per student, empty
+                                             cells are missing marks
+"""
+
+import csv
+import math
+import sys
+import threading
+from array import array
+
+from student_parallel import batched
+from student_grading import DEFAULT_POLICY, MAX_SUBJECT_MARK
+from student_store import MISSING
+
+DEFAULT_IMPORT_BATCH_SIZE = 5000  # Students validated and added at a time
+
+
+class ImportErrors:
+    """Collects invalid source rows for a report instead of stopping at the first one."""
+    
+    def __init__(self, limit=None):
+        """
+        Args:
+            limit (int): Errors kept for the report, None keeps every one
+                (all of them are counted)
+        """
+        self.count = 0
+        self.limit = limit
+        self.errors = []  # List of (line number, message)
+    
+    def add(self, line_number, message):
+        """Record an invalid row."""
+        self.count += 1
+        if self.limit is None or len(self.errors) < self.limit:
+            self.errors.append((line_number, str(message)))
+    
+    def sorted(self):
+        """Return the recorded errors in line order."""
+        return sorted(self.errors, key=lambda error: error[0])
+    
+    def report(self, file=sys.stderr):
+        """Print the recorded errors."""
+        for line_number, message in self.sorted():
+            print(f"  skipped line {line_number}: {message}", file=file)
+        if self.count > len(self.errors):
+            print(f"  ... and {self.count - len(self.errors)} more invalid rows", file=file)
+    
+    def write_csv(self, file_path):
+        """Write the recorded errors to a CSV file (line, problem)."""
+        with open(file_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['line', 'problem'])
+            writer.writerows(self.sorted())
+
+
+# ============================================
+# VALIDATION
+# ============================================
+def parse_student_id(value):
+    """Return a student ID parsed the same way as the GUI form, or raise ValueError."""
+    value = (value or '').strip()
+    if not value.isdigit():
+        raise ValueError(f"Student ID must be a number, got {value!r}")
+    return int(value)
+
+
+def parse_mark(subject, value, maximum=MAX_SUBJECT_MARK):
+    """Return a mark between 0 and maximum, or raise ValueError."""
+    try:
+        mark = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Mark for {subject} must be a number, got {value!r}")
+    # float() also reads "nan" and "inf", which no range check catches (NaN is a missing mark)
+    if not math.isfinite(mark):
+        raise ValueError(f"Mark for {subject} must be a number, got {value!r}")
+    if mark < 0 or mark > maximum:
+        raise ValueError(f"Mark for {subject} must be between 0 and {maximum:g}!")
+    return mark
+
+
+def iter_csv_records(file, errors, counter, policy=DEFAULT_POLICY):
+    """
+    Yield student records from a CSV file (see the module docstring for layouts).
+    
+    Args:
+        file: Text file opened for reading
+        errors (ImportErrors): Collects rows that fail validation
+        counter (list): counter[0] is increased for every data row read
+        policy (GradingPolicy): Gives the maximum mark of each subject
+    
+    Yields:
+        tuple: (line_number, student_id, {'name': ..., 'marks': {...}}), the
+            line number is that of the student's first row. A student ID
+            seen earlier in the file is reported as an error instead.
+    
+    Raises:
+        ValueError: If the header has no student ID or name column
+    """
+    reader = csv.reader(file)
+    header = [column.strip() for column in next(reader, [])]
+    columns = [column.lower() for column in header]
+    if 'name' not in columns or not ('id' in columns or 'student_id' in columns):
+        raise ValueError("The CSV header needs a student_id (or id) and a name column")
+    id_column = columns.index('id') if 'id' in columns else columns.index('student_id')
+    name_column = columns.index('name')
+    seen_ids = set()
+    
+    def repeated(line_number, student_id):
+        errors.add(line_number, f"Student ID {student_id} appears more than once in the file")
+    
+    if 'subject' in columns and 'mark' in columns:
+        subject_column = columns.index('subject')
+        mark_column = columns.index('mark')
+        current_id, current, first_line = None, None, None
+        for line_number, row in enumerate(reader, start=2):
+            counter[0] += 1
+            if not any(row):
+                continue
+            try:
+                student_id = parse_student_id(row[id_column])
+                subject = row[subject_column].strip()
+                mark = parse_mark(subject, row[mark_column], policy.maximum(subject))
+            except (IndexError, ValueError) as error:
+                errors.add(line_number, error)
+                continue
+            
+            if student_id != current_id:
+                if current is not None:
+                    yield first_line, current_id, current
+                current_id, current, first_line = student_id, None, line_number
+                if student_id not in seen_ids:  # Rows of one student must be adjacent
+                    seen_ids.add(student_id)
+                    current = {'name': '', 'marks': {}}
+            if current is None:
+                repeated(line_number, student_id)
+                continue
+            if not current['name'] and row[name_column].strip():
+                current['name'] = row[name_column].strip()
+            current['marks'][subject] = mark
+        if current is not None:
+            yield first_line, current_id, current
+    else:
+        subjects = [(column, header[column], policy.maximum(header[column]))
+                    for column in range(len(header)) if column not in (id_column, name_column)]
+        for line_number, row in enumerate(reader, start=2):
+            counter[0] += 1
+            if not any(row):
+                continue
+            try:
+                student_id = parse_student_id(row[id_column])
+                name = row[name_column].strip()
+                if not name:
+                    raise ValueError("Student name is missing")
+                marks = {}
+                for column, subject, maximum in subjects:
+                    if column < len(row) and row[column].strip():
+                        marks[subject] = parse_mark(subject, row[column], maximum)
+            except (IndexError, ValueError) as error:
+                errors.add(line_number, error)
+                continue
+            if student_id in seen_ids:
+                repeated(line_number, student_id)
+                continue
+            seen_ids.add(student_id)
+            yield line_number, student_id, {'name': name, 'marks': marks}
+
+
+# ============================================
+# GUI IMPORT
+# ============================================
+class CsvImportJob:
+    """
+    Reads and validates a CSV file of new students, for IOWorker.submit.
+    
+    The file is read on the worker thread in batches of students: each
+    batch is checked for missing names (IDs repeated in the file are
+    reported by iter_csv_records), and its marks are put into a block of
+    columns. The application's students
+    are not touched until commit() runs on the main thread, which adds
+    every valid student in one go.
+    """
+    
+    def __init__(self, source_file, batch_size=DEFAULT_IMPORT_BATCH_SIZE, policy=DEFAULT_POLICY):
+        """
+        Args:
+            source_file (str): Path of the CSV file
+            batch_size (int): Students validated at a time, and checked for
+                cancellation in between
+            policy (GradingPolicy): Gives the maximum mark of each subject
+        """
+        self.source_file = source_file
+        self.batch_size = batch_size
+        self.policy = policy
+        self.errors = ImportErrors()
+        self.rows_read = [0]
+        self.batches = []  # (line numbers, ids, names, subjects, marks) of valid students
+        self.stop_event = threading.Event()
+    
+    @property
+    def valid_count(self):
+        """Number of students that passed validation so far."""
+        return sum(len(batch[1]) for batch in self.batches)
+    
+    def cancel(self):
+        """Ask the job to stop at the next batch."""
+        self.stop_event.set()
+    
+    def __call__(self):
+        """
+        Read and validate the file (worker thread).
+        
+        Returns:
+            CsvImportJob: This job, or None if cancelled
+        """
+        with open(self.source_file, newline='', encoding='utf-8-sig') as file:
+            records = iter_csv_records(file, self.errors, self.rows_read, self.policy)
+            for batch in batched(records, self.batch_size):
+                if self.stop_event.is_set():
+                    return None
+                self._add_batch(batch)
+        return self
+    
+    def _add_batch(self, batch):
+        """Validate a batch of records and keep the valid ones as columns."""
+        lines, ids, names, row_marks = [], [], [], []
+        subjects = {}  # Dictionary {subject: column} of the batch
+        for line_number, student_id, record in batch:
+            if not record['name']:
+                self.errors.add(line_number, f"Student {student_id}: name is missing")
+                continue
+            for subject in record['marks']:
+                subjects.setdefault(subject, len(subjects))
+            lines.append(line_number)
+            ids.append(student_id)
+            names.append(record['name'])
+            row_marks.append(record['marks'])
+        
+        width = len(subjects)
+        marks = array('d', [MISSING]) * (len(ids) * width)
+        for index, student_marks in enumerate(row_marks):
+            for subject, mark in student_marks.items():
+                marks[index * width + subjects[subject]] = mark
+        self.batches.append((lines, ids, names, list(subjects), marks))
+    
+    def commit(self, students):
+        """
+        Add the valid students to a collection (main thread).
+        
+        Students whose ID is in the collection already are reported as
+        duplicates instead. The new students' results are not calculated
+        yet, so the next refresh grades them in one batch.
+        
+        Args:
+            students (StudentCollection): Collection to add to
+        
+        Returns:
+            int: Number of students added
+        """
+        store = students.store
+        added = 0
+        for lines, ids, names, subjects, marks in self.batches:
+            width = len(subjects)
+            keep = []
+            for index, student_id in enumerate(ids):
+                if student_id in store.rows:
+                    self.errors.add(lines[index], f"Student ID {student_id} already exists")
+                else:
+                    keep.append(index)
+            if len(keep) < len(ids):
+                ids = [ids[index] for index in keep]
+                names = [names[index] for index in keep]
+                marks = array('d', (mark for index in keep
+                                    for mark in marks[index * width:(index + 1) * width]))
+            
+            count = len(ids)
+            if not count:
+                continue
+            no_results = array('d', bytes(8 * count))
+            store.append_rows(ids, names, subjects, marks, no_results, no_results,
+                              array('B', bytes(count)), store.grade_labels)
+            added += count
+        self.batches = []
+        return added
\ No newline at end of file
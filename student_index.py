@@ -0,0 +1,230 @@
+"""
+Student Result Management System
+Secondary Indexes
+EduTech Solutions
+
+Search by name prefix, grade and percentage range without scanning the
+cohort. The indexes are arrays of store rows:
+    
+    name_order         rows sorted by (name, ID), case-insensitive
+    percentage_order   rows sorted by (percentage, ID)
+    grade_buckets      {grade code: rows with that grade}
+
+They follow the store through its 'index' change tracker. A few changes
+(e.g. adding one student) are applied in place; a large batch (e.g. a
+finished load) rebuilds the indexes with one sort instead.
+"""
+
+import re
+from array import array
+
+REBUILD_THRESHOLD = 1000   # Changed students above which the indexes are rebuilt
+EMPTY = -1                 # indexed_ids entry of a row that is not indexed
+
+# Query syntax for StudentIndex.search
+GRADE_QUERY = re.compile(r'^grade\s*[:=]?\s*(\S+)$', re.IGNORECASE)
+RANGE_QUERY = re.compile(r'^(\d+(?:\.\d+)?)\s*(?:-|\.\.)\s*(\d+(?:\.\d+)?)%?$')
+
+
+def _search(order, key, target):
+    """Return the first position in order whose key(row) is not less than target."""
+    low, high = 0, len(order)
+    while low < high:
+        middle = (low + high) // 2
+        if key(order[middle]) < target:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+class StudentIndex:
+    """Name, grade and percentage indexes over a CohortStore."""
+    
+    def __init__(self, store):
+        """
+        Build the indexes for a store and start following its changes.
+        
+        Args:
+            store (CohortStore): Store to index
+        """
+        self.store = store
+        store.track_changes('index')
+        self.rebuild()
+    
+    # ============================================
+    # KEYS
+    # ============================================
+    def name_key(self, row):
+        """Sort key of a row in the name index."""
+        return self.indexed_names[row].casefold(), self.indexed_ids[row]
+    
+    def percentage_key(self, row):
+        """Sort key of a row in the percentage index."""
+        return self.indexed_percentage[row], self.indexed_ids[row]
+    
+    # ============================================
+    # MAINTENANCE
+    # ============================================
+    def rebuild(self):
+        """Rebuild every index from the store."""
+        store = self.store
+        store.pop_changes('index')
+        count = len(store.ids)
+        
+        # Values each row was indexed under, so it can be found again later
+        self.indexed_ids = array('q', (EMPTY if student_id is None else student_id
+                                       for student_id in store.ids))
+        self.indexed_names = list(store.names)
+        self.indexed_percentage = array('d', store.percentage)
+        self.indexed_grades = array('B', store.grade_codes)
+        
+        rows = [row for row in range(count) if store.ids[row] is not None]
+        self.name_order = array('q', sorted(rows, key=self.name_key))
+        self.percentage_order = array('q', sorted(rows, key=self.percentage_key))
+        
+        self.grade_buckets = {}
+        self.bucket_position = array('q', [EMPTY]) * count
+        for row in rows:
+            bucket = self.grade_buckets.setdefault(self.indexed_grades[row], array('q'))
+            self.bucket_position[row] = len(bucket)
+            bucket.append(row)
+    
+    def update(self):
+        """Bring the indexes up to date with the students changed since the last update."""
+        changed_ids = self.store.pop_changes('index')
+        if not changed_ids:
+            return
+        
+        store = self.store
+        # Many changes, or a cleared store: one sort beats many inserts
+        if len(changed_ids) > REBUILD_THRESHOLD or len(store.ids) < len(self.indexed_ids):
+            self.rebuild()
+            return
+        
+        while len(self.indexed_ids) < len(store.ids):  # Store grew
+            self.indexed_ids.append(EMPTY)
+            self.indexed_names.append('')
+            self.indexed_percentage.append(0.0)
+            self.indexed_grades.append(0)
+            self.bucket_position.append(EMPTY)
+        
+        # Rows released by removed students still hold their old entries
+        if any(student_id not in store.rows for student_id in changed_ids):
+            for row in store.free_rows:
+                if self.indexed_ids[row] != EMPTY:
+                    self._remove_row(row)
+        
+        for student_id in changed_ids:
+            row = store.rows.get(student_id)
+            if row is None:
+                continue
+            if self.indexed_ids[row] != EMPTY:
+                self._remove_row(row)
+            self._insert_row(row)
+    
+    def _insert_row(self, row):
+        """Add a row to every index under its current values."""
+        store = self.store
+        self.indexed_ids[row] = store.ids[row]
+        self.indexed_names[row] = store.names[row]
+        self.indexed_percentage[row] = store.percentage[row]
+        self.indexed_grades[row] = store.grade_codes[row]
+        
+        self.name_order.insert(
+            _search(self.name_order, self.name_key, self.name_key(row)), row)
+        self.percentage_order.insert(
+            _search(self.percentage_order, self.percentage_key, self.percentage_key(row)), row)
+        
+        bucket = self.grade_buckets.setdefault(self.indexed_grades[row], array('q'))
+        self.bucket_position[row] = len(bucket)
+        bucket.append(row)
+    
+    def _remove_row(self, row):
+        """Remove a row from every index, using the values it was indexed under."""
+        del self.name_order[_search(self.name_order, self.name_key, self.name_key(row))]
+        del self.percentage_order[
+            _search(self.percentage_order, self.percentage_key, self.percentage_key(row))]
+        
+        # Swap the last row of the bucket into the gap
+        bucket = self.grade_buckets[self.indexed_grades[row]]
+        position = self.bucket_position[row]
+        last_row = bucket.pop()
+        if last_row != row:
+            bucket[position] = last_row
+            self.bucket_position[last_row] = position
+        
+        self.indexed_ids[row] = EMPTY
+        self.indexed_names[row] = ''
+        self.bucket_position[row] = EMPTY
+    
+    # ============================================
+    # QUERIES
+    # ============================================
+    def find_by_name(self, prefix, limit=50):
+        """
+        Find students whose name starts with a prefix (case-insensitive).
+        
+        Returns:
+            tuple: (number of matches, up to limit student IDs in name order)
+        """
+        prefix = prefix.casefold()
+        start = _search(self.name_order, self.name_key, (prefix, EMPTY))
+        end = _search(self.name_order, self.name_key, (prefix + '\U0010ffff', EMPTY))
+        rows = self.name_order[start:min(end, start + limit)]
+        return end - start, [self.indexed_ids[row] for row in rows]
+    
+    def find_by_grade(self, grade, limit=50):
+        """
+        Find students with a final grade.
+        
+        Returns:
+            tuple: (number of matches, up to limit student IDs)
+        """
+        code = self.store.grade_lookup.get(grade)
+        bucket = self.grade_buckets.get(code, ())
+        return len(bucket), [self.indexed_ids[row] for row in bucket[:limit]]
+    
+    def find_by_percentage(self, minimum, maximum, limit=50):
+        """
+        Find students whose percentage lies in a range (both ends included).
+        
+        Returns:
+            tuple: (number of matches, up to limit student IDs, lowest first)
+        """
+        start = _search(self.percentage_order, self.percentage_key, (minimum, EMPTY))
+        end = _search(self.percentage_order, self.percentage_key,
+                      (maximum, float('inf')))
+        rows = self.percentage_order[start:min(end, start + limit)]
+        return max(0, end - start), [self.indexed_ids[row] for row in rows]
+    
+    def search(self, query, limit=50):
+        """
+        Run a search typed by the user.
+            
+            12345        student ID
+            grade:A      final grade
+            80-90        percentage range
+            anything     name prefix
+        
+        Returns:
+            tuple: (number of matches, up to limit student IDs)
+        """
+        self.update()
+        query = query.strip()
+        if not query:
+            return 0, []
+        
+        if query.isdigit():
+            student_id = int(query)
+            return (1, [student_id]) if student_id in self.store.rows else (0, [])
+        
+        match = GRADE_QUERY.match(query)
+        if match:
+            return self.find_by_grade(match.group(1).upper(), limit)
+        
+        match = RANGE_QUERY.match(query)
+        if match:
+            return self.find_by_percentage(float(match.group(1)), float(match.group(2)), limit)
+        
+        return self.find_by_name(query, limit)
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Student Result Management System
+Background File I/O
+EduTech Solutions
+
+Saving and loading touch the disk (sometimes a slow network drive) and
+encode or decode every record, so the GUI runs them on one background
+thread instead of in Tk callbacks. Jobs run one at a time in the order
+they were submitted, so a load queued after a save always sees the saved
+data. Tk widgets may only be used from the main thread: results are put
+on a queue, and the main loop picks them up with root.after and runs each
+job's callback there.
+"""
+
+import queue
+import threading
+
+from student_index import StudentIndex
+from student_store import StudentCollection
+from student_sync import FileLock, store_digests
+
+POLL_INTERVAL_MS = 50  # How often the main loop checks for finished jobs
+
+
+class IOWorker:
+    """Single background thread that runs file jobs for a Tk application."""
+    
+    def __init__(self, root):
+        """
+        Start the worker thread.
+        
+        Args:
+            root: Tk root window, used to schedule result checks
+        """
+        self.root = root
+        self.jobs = queue.Queue()      # (function, args, on_done, on_error), None to stop
+        self.results = queue.Queue()   # (callback, value) of finished jobs
+        self.pending = 0               # Jobs submitted whose callbacks have not run
+        self.polling = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    @property
+    def busy(self):
+        """True while a job is queued, running or waiting for its callback."""
+        return self.pending > 0
+    
+    def submit(self, function, *args, on_done=None, on_error=None):
+        """
+        Run function(*args) on the worker thread.
+        
+        Args:
+            function (callable): Job to run. It must not touch Tk widgets.
+            on_done (callable): Called on the main thread with the result
+            on_error (callable): Called on the main thread with the exception
+                if the job fails. Without it the exception is raised in the
+                main loop.
+        """
+        self.pending += 1
+        self.jobs.put((function, args, on_done, on_error))
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+    
+    def close(self, timeout=None):
+        """
+        Stop the worker once the queued jobs have run.
+        
+        Blocks until the thread has finished (or the timeout runs out), so
+        the application does not exit in the middle of a write. Callbacks
+        of jobs finishing now are not run.
+        """
+        self.jobs.put(None)
+        self.thread.join(timeout)
+    
+    def _run(self):
+        """Worker thread: run jobs until close() is called."""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            function, args, on_done, on_error = job
+            try:
+                result = function(*args)
+            except Exception as error:
+                self.results.put((on_error, error, True))
+            else:
+                self.results.put((on_done, result, False))
+    
+    def _poll(self):
+        """Main loop: run the callbacks of finished jobs."""
+        try:
+            while True:
+                try:
+                    callback, value, failed = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                self.pending -= 1
+                if callback is not None:
+                    callback(value)
+                elif failed:
+                    raise value
+        finally:
+            # Keep polling even if a callback failed
+            if self.pending:
+                self.root.after(POLL_INTERVAL_MS, self._poll)
+            else:
+                self.polling = False
+
+
+class LoadJob:
+    """
+    Reads every saved record into a new collection, for IOWorker.submit.
+    
+    The collection belongs to the worker thread until the job returns; the
+    GUI keeps showing the current records meanwhile and may only read the
+    progress. The search indexes of the new records are built here too.
+    """
+    
+    def __init__(self, storage, subjects, chunk_size=5000):
+        """
+        Args:
+            storage (StorageBackend): Storage of the data file
+            subjects (list): Subject columns of the new collection
+            chunk_size (int): Records read between checks for cancellation
+        """
+        self.storage = storage
+        self.students = StudentCollection(subjects)
+        self.chunk_size = chunk_size
+        self.stream = None
+        self.version = None  # storage.version() when the read started
+        self.digests = None  # {student_id: digest} of the records read, for DataFileSync
+        self.stop_event = threading.Event()
+    
+    @property
+    def progress(self):
+        """Fraction of the data file read so far (0.0 - 1.0)."""
+        stream = self.stream
+        return stream.progress if stream is not None else 0.0
+    
+    def cancel(self):
+        """Ask the job to stop at the next chunk."""
+        self.stop_event.set()
+    
+    def __call__(self):
+        """
+        Run the load (worker thread).
+        
+        Returns:
+            StudentIndex: Indexes of the loaded students, or None if cancelled
+        """
+        # Another program's checkpoint replaces the snapshot and then empties
+        # the journal; under the shared lock this load opens the snapshot and
+        # replays the journal (with its first chunk) as one consistent pair.
+        # The rest is read from the open snapshot, so writers are not held up.
+        lock = FileLock(self.storage.data_file, exclusive=False)
+        lock.acquire()
+        try:
+            self.version = self.storage.version()
+            self.stream = self.storage.read()
+            complete = (self.stream.load_into(self.students.store, self.chunk_size)
+                        < self.chunk_size)
+        except BaseException:
+            if self.stream is not None:
+                self.stream.close()
+            raise
+        finally:
+            lock.release()
+        try:
+            while not complete and not self.stop_event.is_set():
+                if self.stream.load_into(self.students.store, self.chunk_size) < self.chunk_size:
+                    break
+        finally:
+            self.stream.close()
+        if self.stop_event.is_set():
+            return None
+        self.digests = store_digests(self.students.store)
+        return StudentIndex(self.students.store)
\ No newline at end of file
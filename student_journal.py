@@ -0,0 +1,232 @@
+"""
+Student Result Management System
+Write-Ahead Journal
+EduTech Solutions
+
+Saving appends one compact JSON line per changed student to a journal
+file next to the data file:
+    
+    student_data.json           last snapshot (same layout as before)
+    student_data.json.journal   {"op": "put", "id": 101, ...} per line
+
+Once the journal grows past half the size of the snapshot, a checkpoint
+writes a new snapshot to a temporary file, fsyncs it, renames it over the
+old one and empties the journal. Loading replays the journal on top of
+the last snapshot, so a crash never leaves a half-written data file.
+The snapshot format is up to the caller (see student_snapshot for the
+binary one); by default it is the JSON layout matching the extension.
+"""
+
+import io
+import json
+import os
+import tempfile
+
+from student_files import is_json_lines, student_record, write_json_lines, write_json_object
+
+MIN_CHECKPOINT_BYTES = 64 * 1024  # Smaller journals never trigger a checkpoint
+DEFAULT_FILE_MODE = 0o644         # Permissions of a new snapshot file
+
+
+class StudentJournal:
+    """Append-only change log with atomic snapshot checkpoints."""
+    
+    def __init__(self, data_file, fsync=True, write_snapshot=None):
+        """
+        Initialize the journal for a data file.
+        
+        Args:
+            data_file (str): Path of the snapshot (.json, .jsonl or .snap)
+            fsync (bool): Flush every append to disk before returning
+            write_snapshot (callable): write_snapshot(file, records) writes
+                records to a binary file. Defaults to the JSON layout.
+        """
+        self.data_file = data_file
+        self.journal_file = data_file + '.journal'
+        self.fsync = fsync
+        self.write_snapshot = write_snapshot or self.write_json
+    
+    def exists(self):
+        """Return True if there is a snapshot or journal to load."""
+        return os.path.exists(self.data_file) or os.path.exists(self.journal_file)
+    
+    def journal_size(self):
+        """Return the size of the journal file in bytes."""
+        try:
+            return os.path.getsize(self.journal_file)
+        except OSError:
+            return 0
+    
+    # ============================================
+    # JOURNAL
+    # ============================================
+    def append(self, students, student_ids):
+        """
+        Log the current state of some students.
+        
+        Args:
+            students (StudentCollection): Current records
+            student_ids (iterable): IDs to log. An ID that is no longer in
+                the collection is logged as a delete.
+        
+        Returns:
+            int: Number of journal entries written
+        """
+        entries = []
+        for student_id in sorted(student_ids):
+            if student_id in students:
+                entries.append((student_id, student_record(students[student_id])))
+            else:
+                entries.append((student_id, None))
+        return self.append_records(entries)
+    
+    def append_records(self, entries):
+        """
+        Log a batch of records.
+        
+        Args:
+            entries (iterable): (student_id, record) pairs, a record of None
+                logs a delete
+        
+        Returns:
+            int: Number of journal entries written
+        """
+        lines = []
+        for student_id, record in entries:
+            if record is None:
+                entry = {'op': 'delete', 'id': student_id}
+            else:
+                entry = {'op': 'put', 'id': student_id}
+                entry.update(record)
+            lines.append(json.dumps(entry, separators=(',', ':')) + '\n')
+        
+        if lines:
+            with open(self.journal_file, 'a') as file:
+                file.writelines(lines)
+                file.flush()
+                if self.fsync:
+                    os.fsync(file.fileno())
+        return len(lines)
+    
+    def replay(self):
+        """
+        Yield the journal entries written since the last checkpoint.
+        
+        A final line cut short by a crash is ignored.
+        
+        Yields:
+            tuple: (student_id, record) for a put, (student_id, None) for a delete
+        """
+        if not os.path.exists(self.journal_file):
+            return
+        
+        with open(self.journal_file, 'rb') as file:
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break  # Torn write, the entry never completed
+                yield parse_entry(line)
+    
+    def read_since(self, offset):
+        """
+        Read the entries appended after a byte offset (e.g. by another program).
+        
+        Args:
+            offset (int): End of the entries already seen, from an earlier
+                read_since or journal_size
+        
+        Returns:
+            tuple: (entries, offset) with entries as (student_id, record or
+                None) pairs and the offset just after the last complete entry
+        """
+        entries = []
+        try:
+            file = open(self.journal_file, 'rb')
+        except FileNotFoundError:
+            return entries, offset
+        with file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b'\n'):
+                    break  # Still being written, read it next time
+                entries.append(parse_entry(line))
+                offset += len(line)
+        return entries, offset
+    
+    # ============================================
+    # CHECKPOINTS
+    # ============================================
+    def needs_checkpoint(self):
+        """Return True when the journal should be compacted into a snapshot."""
+        if not os.path.exists(self.data_file):
+            return True
+        journal_size = self.journal_size()
+        return journal_size > max(MIN_CHECKPOINT_BYTES, os.path.getsize(self.data_file) // 2)
+    
+    def write_json(self, file, records):
+        """Write records to a binary file in the JSON layout of the data file."""
+        text = io.TextIOWrapper(file, encoding='utf-8')
+        if is_json_lines(self.data_file):
+            write_json_lines(text, records)
+        else:
+            write_json_object(text, records)
+        text.flush()
+        text.detach()  # Leave the binary file open for the caller
+    
+    def checkpoint(self, records, write_snapshot=None):
+        """
+        Atomically replace the snapshot with every record and empty the journal.
+        
+        Args:
+            records (iterable): (student_id, record) pairs in ascending ID order
+            write_snapshot (callable): Writer to use instead of the journal's
+        """
+        directory = os.path.dirname(os.path.abspath(self.data_file))
+        handle, temp_path = tempfile.mkstemp(
+            prefix=os.path.basename(self.data_file) + '.', suffix='.tmp', dir=directory)
+        try:
+            # mkstemp creates the file private to the user, keep the old permissions
+            try:
+                mode = os.stat(self.data_file).st_mode & 0o777
+            except OSError:
+                mode = DEFAULT_FILE_MODE
+            os.chmod(temp_path, mode)
+            
+            with os.fdopen(handle, 'wb') as file:
+                (write_snapshot or self.write_snapshot)(file, records)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.data_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        sync_directory(directory)
+        
+        # The snapshot now holds every change, so the journal can start over.
+        # A crash before this point only replays entries already in the snapshot.
+        with open(self.journal_file, 'w') as file:
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def parse_entry(line):
+    """Return (student_id, record) for a journal line, record None for a delete."""
+    entry = json.loads(line)
+    student_id = int(entry.pop('id'))
+    if entry.pop('op') == 'delete':
+        return student_id, None
+    return student_id, entry
+
+
+def sync_directory(directory):
+    """Flush a directory entry (e.g. after a rename) to disk where supported."""
+    try:
+        handle = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # Directories cannot be opened on Windows
+    try:
+        os.fsync(handle)
+    except OSError:
+        pass
+    finally:
+        os.close(handle)
\ No newline at end of file
@@ -0,0 +1,328 @@
+"""
+Student Result Management System
+Instrumentation
+EduTech Solutions
+
+Opt-in timing of the key operations (adding students, grading, refreshing
+the table, reports, saving and loading). Each instrumented operation
+records a call count, a histogram of durations and, while tracemalloc is
+tracing, the change in allocated memory.
+
+Instrumentation is off by default and costs one flag check per call
+while it is off. Turn it on with enable(), from the diagnostics window,
+with the CLI's --metrics option or by setting SRS_METRICS=1. Collected
+metrics can be exported as JSON or in the Prometheus text format:
+    
+    python student_cli.py --metrics metrics.prom grade
+
+A session can also be captured with cProfile (start_profile/stop_profile)
+or as a tracemalloc snapshot (take_memory_snapshot). process_uptime()
+measures startup (the GUI records its time to first paint and to loaded).
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Upper bounds of the duration histogram buckets, in seconds
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+METRIC_PREFIX = 'student_results'
+
+
+class OperationStats:
+    """Call count, duration histogram and allocation total of one operation."""
+    
+    __slots__ = ('calls', 'errors', 'total_seconds', 'max_seconds', 'buckets',
+                 'allocated_bytes')
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(BUCKETS)  # Calls per bucket (not cumulative)
+        self.allocated_bytes = 0           # Net change while tracemalloc was tracing
+    
+    def record(self, seconds, allocated, failed):
+        """Add one call."""
+        self.calls += 1
+        self.errors += failed
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+        self.allocated_bytes += allocated
+    
+    def quantile(self, fraction):
+        """
+        Estimate a quantile of the durations from the histogram.
+        
+        Returns:
+            float: Upper bound of the bucket holding the quantile (the
+                maximum for the last bucket), 0.0 if there were no calls
+        """
+        if not self.calls:
+            return 0.0
+        target = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return min(BUCKETS[index], self.max_seconds)
+        return self.max_seconds
+    
+    def to_dict(self):
+        """Return the statistics as a JSON-serializable dictionary."""
+        return {
+            'calls': self.calls,
+            'errors': self.errors,
+            'total_seconds': self.total_seconds,
+            'mean_seconds': self.total_seconds / self.calls if self.calls else 0.0,
+            'max_seconds': self.max_seconds,
+            'p50_seconds': self.quantile(0.5),
+            'p95_seconds': self.quantile(0.95),
+            'allocated_bytes': self.allocated_bytes,
+            'buckets': {('+Inf' if bound == float('inf') else repr(bound)): count
+                        for bound, count in zip(BUCKETS, self.buckets)}
+        }
+
+
+class Metrics:
+    """Registry of operation statistics and session profilers."""
+    
+    def __init__(self):
+        self.enabled = False
+        self.operations = {}      # Dictionary {operation name: OperationStats}
+        self.lock = threading.Lock()  # Operations also run on the I/O thread
+        self.profiler = None      # cProfile.Profile while a profile is being captured
+        self.started_tracemalloc = False  # tracemalloc was started by track_allocations()
+    
+    # ============================================
+    # SWITCHES
+    # ============================================
+    def enable(self, track_allocations=False):
+        """
+        Start collecting metrics.
+        
+        Args:
+            track_allocations (bool): Also start tracemalloc, so operations
+                record how much memory they allocated. This slows every
+                allocation down noticeably.
+        """
+        self.enabled = True
+        if track_allocations:
+            self.track_allocations(True)
+    
+    def disable(self):
+        """Stop collecting metrics (collected ones are kept)."""
+        self.enabled = False
+        self.track_allocations(False)
+    
+    def track_allocations(self, on):
+        """
+        Start or stop tracemalloc for allocation deltas.
+        
+        Only stops tracemalloc if it was started here, not if the
+        application was run with python -X tracemalloc.
+        """
+        if on and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracemalloc = True
+        elif not on and self.started_tracemalloc:
+            tracemalloc.stop()
+            self.started_tracemalloc = False
+    
+    def reset(self):
+        """Forget every collected metric."""
+        with self.lock:
+            self.operations = {}
+    
+    # ============================================
+    # RECORDING
+    # ============================================
+    def record(self, name, seconds, allocated=0, failed=False):
+        """Record one call of an operation."""
+        with self.lock:
+            stats = self.operations.get(name)
+            if stats is None:
+                stats = self.operations[name] = OperationStats()
+            stats.record(seconds, allocated, failed)
+    
+    def call(self, name, function, *args, **kwargs):
+        """Call a function and record it as one call of an operation."""
+        tracing = tracemalloc.is_tracing()
+        allocated = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = function(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            seconds = time.perf_counter() - start
+            if tracing and tracemalloc.is_tracing():
+                allocated = tracemalloc.get_traced_memory()[0] - allocated
+            else:
+                allocated = 0
+            self.record(name, seconds, allocated, failed)
+    
+    def snapshot(self):
+        """Return a copy of every operation's statistics as dictionaries."""
+        with self.lock:
+            return {name: stats.to_dict() for name, stats in sorted(self.operations.items())}
+    
+    # ============================================
+    # EXPORT
+    # ============================================
+    def to_json(self):
+        """Return the collected metrics as a JSON document."""
+        return json.dumps({
+            'enabled': self.enabled,
+            'tracking_allocations': tracemalloc.is_tracing(),
+            'operations': self.snapshot()
+        }, indent=2)
+    
+    def to_prometheus(self):
+        """Return the collected metrics in the Prometheus text exposition format."""
+        seconds = f'{METRIC_PREFIX}_operation_seconds'
+        errors = f'{METRIC_PREFIX}_operation_errors_total'
+        allocated = f'{METRIC_PREFIX}_operation_allocated_bytes_total'
+        lines = [
+            f'# HELP {seconds} Time spent in instrumented operations.',
+            f'# TYPE {seconds} histogram'
+        ]
+        operations = self.snapshot()
+        for name, stats in operations.items():
+            cumulative = 0
+            for bound, count in stats['buckets'].items():
+                cumulative += count
+                lines.append(f'{seconds}_bucket{{operation="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{seconds}_sum{{operation="{name}"}} {stats["total_seconds"]!r}')
+            lines.append(f'{seconds}_count{{operation="{name}"}} {stats["calls"]}')
+        
+        lines += [f'# HELP {errors} Instrumented operations that raised an exception.',
+                  f'# TYPE {errors} counter']
+        lines += [f'{errors}{{operation="{name}"}} {stats["errors"]}'
+                  for name, stats in operations.items()]
+        
+        lines += [f'# HELP {allocated} Net memory allocated by operations while tracemalloc was tracing.',
+                  f'# TYPE {allocated} counter']
+        lines += [f'{allocated}{{operation="{name}"}} {stats["allocated_bytes"]}'
+                  for name, stats in operations.items()]
+        return '\n'.join(lines) + '\n'
+    
+    def export(self, file_path):
+        """
+        Write the collected metrics to a file.
+        
+        Files ending in .prom or .txt get the Prometheus text format,
+        anything else JSON.
+        """
+        if file_path.lower().endswith(('.prom', '.txt')):
+            text = self.to_prometheus()
+        else:
+            text = self.to_json()
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(text)
+    
+    # ============================================
+    # SESSION CAPTURE
+    # ============================================
+    def start_profile(self):
+        """Start profiling the calling thread (usually the Tk main loop) with cProfile."""
+        if self.profiler is None:
+            import cProfile  # Only needed while profiling
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+    
+    def stop_profile(self, file_path):
+        """
+        Stop profiling and write the statistics for pstats/snakeviz.
+        
+        Returns:
+            bool: False if no profile was being captured
+        """
+        if self.profiler is None:
+            return False
+        self.profiler.disable()
+        self.profiler.dump_stats(file_path)
+        self.profiler = None
+        return True
+    
+    def take_memory_snapshot(self, file_path, limit=25):
+        """
+        Write a tracemalloc snapshot and a summary of the largest allocations.
+        
+        tracemalloc is started if it is not tracing yet; the snapshot then
+        only covers allocations made since. The snapshot goes to file_path
+        (load it with tracemalloc.Snapshot.load) and the summary to
+        file_path + '.txt'.
+        
+        Returns:
+            bool: False if tracemalloc had to be started, so the snapshot
+                could not include anything yet
+        """
+        if not tracemalloc.is_tracing():
+            self.track_allocations(True)
+            return False
+        
+        snapshot = tracemalloc.take_snapshot()
+        snapshot.dump(file_path)
+        with open(file_path + '.txt', 'w', encoding='utf-8') as file:
+            for statistic in snapshot.statistics('lineno')[:limit]:
+                file.write(f"{statistic}\n")
+        return True
+
+
+METRICS = Metrics()
+
+
+# ============================================
+# STARTUP TIMING
+# ============================================
+def _process_age():
+    """Return how long ago the process started according to the OS, or None."""
+    try:
+        with open('/proc/self/stat') as file:
+            # Fields after the command name; the start time is field 22 of the line
+            start_ticks = int(file.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as file:
+            uptime = float(file.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None  # Not Linux
+
+
+# perf_counter() value at process start. Where the OS cannot tell, the
+# import of this module (early in startup) stands in for it.
+_PROCESS_STARTED = time.perf_counter() - (_process_age() or 0.0)
+
+
+def process_uptime():
+    """Return the seconds since the process started."""
+    return time.perf_counter() - _PROCESS_STARTED
+
+if os.environ.get('SRS_METRICS'):
+    METRICS.enable(track_allocations=os.environ['SRS_METRICS'] == 'alloc')
+
+
+def instrumented(name):
+    """
+    Decorator that records every call of a function as an operation.
+    
+    While instrumentation is disabled the wrapper only checks a flag.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not METRICS.enabled:
+                return function(*args, **kwargs)
+            return METRICS.call(name, function, *args, **kwargs)
+        return wrapper
+    return decorate
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Student Result Management System
+Parallel Grading and Reports
+EduTech Solutions
+
+Splits a cohort into chunks of rows and hands them to a pool of worker
+processes. Workers receive compact array copies of their rows rather
+than Student objects, and results are collected in submission order, so
+a report comes out in ID order however the work was scheduled.
+
+With one worker everything runs in the calling process, which avoids the
+cost of starting processes and copying rows for small cohorts.
+"""
+
+import itertools
+import os
+from collections import deque
+
+from student_reports import format_report_block, format_student_reports, report_header
+from student_grading import DEFAULT_POLICY, DEFAULT_SUBJECTS
+from student_store import calculate_block, grade_records
+
+DEFAULT_CHUNK_SIZE = 25000  # Students per task sent to a worker
+
+
+def default_workers():
+    """Return the number of worker processes to use by default (one per core)."""
+    return os.cpu_count() or 1
+
+
+def batched(iterable, size):
+    """
+    Split an iterable into lists of at most size items.
+    
+    Yields:
+        list: Next batch of items
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def ordered_map(function, tasks, workers=None):
+    """
+    Run a function over a stream of tasks, yielding results in task order.
+    
+    At most two tasks per worker are in flight, so tasks can be generated
+    lazily from a stream without the whole input being held in memory.
+    
+    Args:
+        function (callable): Module-level function (it is pickled by name)
+        tasks (iterable): Argument tuples, one per call
+        workers (int): Worker processes, default one per core. 1 runs
+            every task in the calling process.
+    
+    Yields:
+        Results of function(*task), in the order of tasks
+    """
+    workers = workers or default_workers()
+    if workers <= 1:
+        for task in tasks:
+            yield function(*task)
+        return
+    
+    # Imported here: multiprocessing is slow to import and only needed with workers
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for task in tasks:
+                pending.append(executor.submit(function, *task))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Stopped early (error or consumer gave up): drop queued tasks
+            for future in pending:
+                future.cancel()
+
+
+# ============================================
+# IN-MEMORY COHORTS
+# ============================================
+def calculate_parallel(store, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Calculate results for every row of a CohortStore across worker processes.
+    
+    Change sets are updated exactly as by CohortStore.calculate_all.
+    
+    Args:
+        store (CohortStore): Store to calculate
+        workers (int): Worker processes, default one per core
+        chunk_size (int): Rows per task
+    
+    Returns:
+        int: Number of rows whose results changed
+    """
+    width = store.width
+    if not width:
+        store.calculate_all()
+        return len(store.rows)
+    
+    count = len(store.ids)
+    tasks = ((store.subjects, store.marks[start * width:(start + chunk_size) * width],
+              store.policy)
+             for start in range(0, count, chunk_size))
+    
+    start = 0
+    changed = 0
+    for total_marks, percentage, grade_codes, grade_labels in ordered_map(
+            calculate_block, tasks, workers):
+        changed += len(store.apply_results(start, total_marks, percentage, grade_codes,
+                                           grade_labels))
+        start += len(total_marks)
+    return changed
+
+
+def render_report(store, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield the detailed results report of a CohortStore in ID order.
+    
+    Results are reported as stored, so calculate them first.
+    
+    Args:
+        store (CohortStore): Store to report on
+        workers (int): Worker processes, default one per core
+        chunk_size (int): Students formatted per task
+    
+    Yields:
+        str: The report header, then the sections of one chunk of students
+    """
+    student_ids = sorted(store.rows)
+    yield report_header(len(student_ids))
+    
+    tasks = ((store.subjects, block) + store.copy_rows(block) + (store.policy,)
+             for block in batched(student_ids, chunk_size))
+    yield from ordered_map(format_report_block, tasks, workers)
+
+
+# ============================================
+# RECORD STREAMS
+# ============================================
+def grade_record_stream(records, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                        policy=DEFAULT_POLICY):
+    """
+    Grade a stream of (student_id, record) pairs a chunk at a time.
+    
+    Yields:
+        list: Graded (student_id, record) pairs, in input order
+    """
+    tasks = ((batch, DEFAULT_SUBJECTS, policy) for batch in batched(records, chunk_size))
+    return ordered_map(grade_records, tasks, workers)
+
+
+def report_record_stream(records, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                         policy=DEFAULT_POLICY):
+    """
+    Format the report sections of a stream of (student_id, record) pairs.
+    
+    Yields:
+        str: The sections of one chunk of students, in input order
+    """
+    tasks = ((batch, policy) for batch in batched(records, chunk_size))
+    return ordered_map(format_student_reports, tasks, workers)
\ No newline at end of file
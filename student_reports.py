@@ -0,0 +1,104 @@
+"""
+Student Result Management System
+Report Formatting
+EduTech Solutions
+
+Text of the detailed results report, shared by the "View All Results"
+window and the command-line report so both print the same layout.
+"""
+
+from student_grading import DEFAULT_POLICY
+
+REPORT_RULE = "=" * 70    # Above and below the report header
+STUDENT_RULE = "-" * 50   # After each student
+
+
+def report_header(student_count):
+    """
+    Return the report header.
+    
+    Args:
+        student_count (int): Number of students in the report
+    
+    Returns:
+        str: Header text, ending with a blank line
+    """
+    return (f"{REPORT_RULE}\n"
+            "STUDENT RESULTS REPORT\n"
+            f"Generated: {student_count} students\n"
+            f"{REPORT_RULE}\n\n")
+
+
+def format_student_report(student_id, record, policy=DEFAULT_POLICY):
+    """
+    Return one student's section of the report.
+    
+    Args:
+        student_id (int): Student ID
+        record (dict): Record as written by student_files.student_record
+        policy (GradingPolicy): Policy the results were graded with, for
+            the maximum marks
+    
+    Returns:
+        str: Section text, ending with a blank line
+    """
+    lines = [f"Student ID: {student_id}", f"Name: {record['name']}"]
+    
+    if record['marks']:
+        lines.append("Subject Marks:")
+        for subject, mark in record['marks'].items():
+            lines.append(f"  • {subject}: {mark}/{policy.maximum(subject):g}")
+        lines.append(f"Total Marks: {record['total_marks']:.1f}"
+                     f"/{policy.max_total(record['marks']):g}")
+    else:
+        lines.append("No marks recorded.")
+    
+    lines.append(f"Percentage: {record['percentage']:.1f}%")
+    lines.append(f"Final Grade: {record['grade']}")
+    lines.append(STUDENT_RULE)
+    return "\n".join(lines) + "\n\n"
+
+
+def format_student_reports(records, policy=DEFAULT_POLICY):
+    """
+    Return the report sections of a batch of records, in the given order.
+    
+    Args:
+        records (list): (student_id, record) pairs
+        policy (GradingPolicy): Policy the results were graded with
+    
+    Returns:
+        str: Concatenated sections
+    """
+    return ''.join(format_student_report(student_id, record, policy)
+                   for student_id, record in records)
+
+
+def format_report_block(subjects, student_ids, names, marks, total_marks, percentage, grades,
+                        policy=DEFAULT_POLICY):
+    """
+    Return the report sections of a block of rows copied out of a store.
+    
+    Runs in worker processes (see student_parallel); the arguments are the
+    subjects, the IDs, the columns returned by CohortStore.copy_rows and
+    the store's grading policy.
+    
+    Returns:
+        str: Concatenated sections, in the order of student_ids
+    """
+    width = len(subjects)
+    sections = []
+    for index, student_id in enumerate(student_ids):
+        start = index * width
+        student_marks = {}
+        for subject, mark in zip(subjects, marks[start:start + width]):
+            if mark == mark:  # NaN marks a missing subject
+                student_marks[subject] = mark
+        sections.append(format_student_report(student_id, {
+            'name': names[index],
+            'marks': student_marks,
+            'total_marks': total_marks[index],
+            'percentage': percentage[index],
+            'grade': grades[index]
+        }, policy))
+    return ''.join(sections)
\ No newline at end of file
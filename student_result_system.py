@@ -6,63 +6,33 @@ Developer: [Your Name]
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-import json
+from tkinter import ttk, messagebox, filedialog, simpledialog
+import bisect
 import os
+import sys
 
-# ============================================
-# STUDENT CLASS DEFINITION
-# ============================================
-class Student:
-    
-    def __init__(self, student_id, name):
-        """
-        Initialize a student object.
-        
-        Args:
-            student_id (int): Unique student identifier
-            name (str): Student's full name
-        """
-        self.student_id = student_id      # Integer
-        self.name = name                  # String
-        self.marks = {}                   # Dictionary {subject: mark}
-        self.total_marks = 0.0            # Float
-        self.percentage = 0.0             # Float
-        self.grade = ''                   # String
-    
-    def calculate_results(self):
-        """Calculate total marks, percentage, and assign final grade."""
-        
-        # If no marks, set defaults
-        if not self.marks:
-            self.total_marks = 0.0
-            self.percentage = 0.0
-            self.grade = 'N/A'
-            return
-        
-        # Calculate total marks from all subjects
-        self.total_marks = sum(self.marks.values())
-        
-        # Calculate percentage (each subject out of 100)
-        total_subjects = len(self.marks)
-        max_possible_marks = total_subjects * 100
-        if max_possible_marks > 0:
-            self.percentage = (self.total_marks / max_possible_marks) * 100
-        else:
-            self.percentage = 0.0
-        
-        # Assign grade based on percentage
-        if self.percentage >= 90:
-            self.grade = 'A'
-        elif self.percentage >= 80:
-            self.grade = 'B'
-        elif self.percentage >= 70:
-            self.grade = 'C'
-        elif self.percentage >= 60:
-            self.grade = 'D'
-        else:
-            self.grade = 'F'  # Below 60%
-
+from report_window import ReportWindow
+from cohort_window import CohortWindow
+from statistics_window import StatisticsWindow
+from student_analytics import CohortAnalytics
+from diagnostics_window import DiagnosticsWindow
+from history_window import HistoryWindow
+from import_window import ImportReportWindow
+from student_edits import EditLog
+from student_export import EXPORT_FORMATS, ExportJob
+from student_io import IOWorker, LoadJob
+from student_metrics import METRICS, instrumented, process_uptime
+from student_parallel import DEFAULT_CHUNK_SIZE, calculate_parallel
+from student_grading import DEFAULT_POLICY, load_policy
+from student_history import history_file, load_history, write_history
+from student_import import DEFAULT_IMPORT_BATCH_SIZE, CsvImportJob
+from student_index import StudentIndex
+from student_storage import open_storage
+from student_shards import (ShardCache, cohort_directory, cohort_name, is_shard_file,
+                            read_manifest, store_memory)
+from student_store import DEFAULT_SUBJECTS, StudentCollection, load_numpy
+from student_sync import ConflictError, DataFileSync, apply_records, same_record
+from virtual_table import VirtualTable
 
 # ============================================
 # MAIN APPLICATION CLASS
@@ -70,15 +40,16 @@ class Student:
 class ResultManagementSystem:
     """Main GUI application for managing student results."""
     
-    def __init__(self, root):
+    def __init__(self, root, data_file="student_data.json"):
         """
         Initialize the main application window.
         
         Args:
             root: Tkinter root window
+            data_file (str): Data file, or cohort shard, loaded at startup
         """
         self.root = root
-        self.root.title("EduTech Solutions - Student Result System")
+        self.root.title(self.window_title(data_file))
         self.root.geometry("1000x700")
         
         # Configure grid weights for resizing
@@ -86,18 +57,72 @@ class ResultManagementSystem:
         self.root.grid_columnconfigure(0, weight=1)
         
         # Data storage
-        self.students = {}  # Dictionary: {student_id: Student object}
-        self.subjects = ['Mathematics', 'Science', 'English', 'History', 'Computer Science']
-        self.data_file = "student_data.json"
-        
-        # Load existing data if available
-        self.load_from_file()
+        self.subjects = list(DEFAULT_SUBJECTS)
+        self.policy = DEFAULT_POLICY  # Grading policy of every collection shown
+        self.students = StudentCollection(self.subjects)  # {student_id: Student view}
+        self.students.store.track_changes()
+        self.students.store.track_changes('unsaved')  # Changes not yet saved
+        self.index = StudentIndex(self.students.store)  # Name, grade and percentage search
+        self.edits = EditLog(self.students.store)  # Undo and redo of edit batches
+        self.edit_save_delay_ms = 500  # Edits made within this time are saved together
+        self.search_ids = []      # Student IDs listed in the search results
+        self.search_limit = 50    # Search results shown at a time
+        self.analytics = None     # CohortAnalytics, created when statistics are first shown
+        self.statistics_window = None  # Open StatisticsWindow, if any
+        self.diagnostics_window = None  # Open DiagnosticsWindow, if any
+        self.history = None       # TermHistory, read when the history is first shown
+        self.history_window = None  # Open HistoryWindow, if any
+        self.tree_ids = []  # Student IDs shown in the table, sorted
+        self.filled_rows = 0       # Rows of tree_ids inserted so far by a rebuild
+        self.fill_after_id = None  # Scheduled insertion of the next rows
+        self.table_fill_chunk = 500  # Rows inserted per frame when the table is rebuilt
+        self.virtual_mode = False  # True while the table renders only visible rows
+        self.virtual_table_threshold = 5000  # Students before switching to virtual mode
+        self.data_file = data_file
+        
+        # Large reports (and large grading batches without NumPy) use worker processes
+        self.parallel_threshold = 100000  # Students before using worker processes
+        self.parallel_workers = None      # Worker processes, None = one per core
+        self.parallel_chunk_size = DEFAULT_CHUNK_SIZE  # Students per worker task
+        self.report_chunk_size = 2000     # Students per chunk added to the report window
+        
+        # Chunked loading state
+        # Background file I/O (saves and loads run on one worker thread)
+        self.io = IOWorker(self.root)
+        self.load_chunk_size = 5000  # Records read between checks for a cancelled load
+        self.load_poll_ms = 100      # How often load progress is shown
+        self.load_job = None         # LoadJob while a load is running
+        self.load_quiet = False      # Skip the success message for this load
+        self.saves_running = 0       # Saves queued or running on the I/O thread
+        self.save_pending = False    # Another save was requested meanwhile
+        self.save_after_id = None    # Scheduled start of the next save
+        self.save_notify = False     # Show a message when the next save finishes
+        self.save_callbacks = []     # Run when the next save finishes (e.g. exit)
+        self.autosave_interval_ms = 60000  # Unsaved changes are saved this often
+        self.import_job = None       # CsvImportJob while a CSV file is being validated
+        self.import_batch_size = DEFAULT_IMPORT_BATCH_SIZE  # Students validated at a time
+        self.export_job = None       # ExportJob while a report is being exported
+        self.export_chunk_size = 2000  # Students rendered between checks for a cancelled export
+        
+        # Other machines sharing the data file
+        self.sync = DataFileSync(self.data_file)  # Version of the file the records match
+        self.watch_var = tk.BooleanVar(value=True)  # Pick up other machines' saves
+        self.watch_interval_ms = 3000  # How often the data file is checked for changes
+        self.sync_running = False      # Changes are being read from the data file
+        
+        # Cohorts kept in shards (see student_shards)
+        self.cohort_window = None  # Open CohortWindow, if any
+        self.cohort_cache_bytes = 256 * 1024 * 1024  # Memory for recently viewed cohorts
+        self.cohort_cache = ShardCache(self.cohort_cache_bytes)
         
         # Create GUI components
         self.create_widgets()
         
-        # Refresh student list display
-        self.refresh_student_list()
+        # Everything slow waits until the window is on screen
+        self.startup_times = {}  # Seconds from process start: {'first_paint': ..., 'loaded': ...}
+        self.root.after_idle(self.finish_startup)
+        self.root.after(self.autosave_interval_ms, self.autosave)
+        self.root.after(self.watch_interval_ms, self.watch_data_file)
     
     # ============================================
     # GUI CREATION METHODS
@@ -181,6 +206,47 @@ class ResultManagementSystem:
         )
         clear_btn.pack(side=tk.LEFT, padx=5)
         
+        # Editing existing students
+        edit_frame = ttk.Frame(input_frame)
+        edit_frame.grid(row=len(self.subjects)+4, column=0, columnspan=2, pady=(5, 0))
+        edit_buttons = [
+            ("✏️ Update Student", self.update_student),
+            ("❌ Delete Student", self.delete_student),
+            ("🔧 Correct Subject", self.adjust_subject)
+        ]
+        for text, command in edit_buttons:
+            btn = ttk.Button(edit_frame, text=text, command=command, width=15)
+            btn.pack(side=tk.LEFT, padx=5)
+        
+        undo_frame = ttk.Frame(input_frame)
+        undo_frame.grid(row=len(self.subjects)+5, column=0, columnspan=2, pady=(5, 0))
+        ttk.Button(undo_frame, text="↩️ Undo", command=self.undo_edit, width=15).pack(
+            side=tk.LEFT, padx=5)
+        ttk.Button(undo_frame, text="↪️ Redo", command=self.redo_edit, width=15).pack(
+            side=tk.LEFT, padx=5)
+        self.root.bind('<Control-z>', self.undo_edit)
+        self.root.bind('<Control-y>', self.redo_edit)
+        
+        # Search box with type-ahead results
+        search_frame = ttk.LabelFrame(input_frame, text="🔍 Search", padding="10")
+        search_frame.grid(row=len(self.subjects)+6, column=0, columnspan=2,
+                          pady=(20, 0), sticky=(tk.E, tk.W))
+        
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, font=('Arial', 10))
+        search_entry.pack(fill=tk.X)
+        self.search_var.trace_add('write', lambda *args: self.search_students())
+        
+        ttk.Label(search_frame, text="Name, ID, grade:A or a range such as 80-90",
+                  font=('Arial', 8, 'italic')).pack(anchor=tk.W, pady=(2, 5))
+        
+        self.search_results = tk.Listbox(search_frame, height=6, font=('Consolas', 9))
+        self.search_results.pack(fill=tk.X)
+        self.search_results.bind('<<ListboxSelect>>', self.on_search_select)
+        
+        self.search_count_label = ttk.Label(search_frame, text="", font=('Arial', 8))
+        self.search_count_label.pack(anchor=tk.W)
+        
         # ========== RIGHT PANEL: Student Records Table ==========
         table_frame = ttk.LabelFrame(main_frame, text="Student Records", padding="15")
         table_frame.grid(row=1, column=1, sticky=(tk.N, tk.S, tk.E, tk.W))
@@ -204,16 +270,28 @@ class ResultManagementSystem:
             self.tree.column(col, width=column_widths[col], anchor='center')
         
         # Add scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.tree_scrollbar.set)
         
         # Grid layout for tree and scrollbar
         self.tree.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.E, tk.W))
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.tree_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
         
         # Bind selection event
         self.tree.bind('<<TreeviewSelect>>', self.on_student_select)
         
+        # Virtual scrolling table for large cohorts (shown in place of the tree)
+        self.virtual_table = VirtualTable(
+            table_frame,
+            columns,
+            column_widths,
+            row_count=lambda: len(self.tree_ids),
+            row_values=lambda index: self.student_row_values(self.tree_ids[index]),
+            command=self.on_student_select
+        )
+        self.virtual_table.grid(row=0, column=0, columnspan=2, sticky=(tk.N, tk.S, tk.E, tk.W))
+        self.virtual_table.grid_remove()
+        
         # ========== BOTTOM PANEL: System Controls ==========
         control_frame = ttk.Frame(main_frame)
         control_frame.grid(row=2, column=0, columnspan=2, pady=(20, 0))
@@ -221,14 +299,23 @@ class ResultManagementSystem:
         # Control buttons
         buttons = [
             ("📋 View All Results", self.view_all_results),
+            ("📤 Export Report", self.export_report),
+            ("📊 Statistics", self.show_statistics),
+            ("🩺 Diagnostics", self.show_diagnostics),
             ("💾 Save Records", self.save_to_file),
             ("📂 Load Records", self.load_from_file),
+            ("📥 Import CSV", self.import_csv),
+            ("🎓 Grading Policy", self.choose_policy),
+            ("📚 Term History", self.show_history),
+            ("🏫 Cohorts", self.show_cohorts),
             ("❌ Exit", self.exit_program)
         ]
         
-        for text, command in buttons:
+        # Two rows, so every button fits the window
+        per_row = (len(buttons) + 1) // 2
+        for index, (text, command) in enumerate(buttons):
             btn = ttk.Button(control_frame, text=text, command=command, width=15)
-            btn.pack(side=tk.LEFT, padx=5)
+            btn.grid(row=index // per_row, column=index % per_row, padx=5, pady=2)
         
         # Status label
         self.status_label = ttk.Label(
@@ -237,71 +324,123 @@ class ResultManagementSystem:
             font=('Arial', 9, 'italic')
         )
         self.status_label.grid(row=3, column=0, columnspan=2, pady=(10, 0), sticky=tk.W)
+        
+        watch_check = ttk.Checkbutton(
+            main_frame,
+            text="Watch data file for changes by others",
+            variable=self.watch_var
+        )
+        watch_check.grid(row=3, column=1, pady=(10, 0), sticky=tk.E)
+        
+        # Load progress (only shown while records are loading)
+        self.load_frame = ttk.Frame(main_frame)
+        self.load_frame.grid(row=4, column=0, columnspan=2, pady=(5, 0), sticky=(tk.E, tk.W))
+        self.load_progress = ttk.Progressbar(
+            self.load_frame,
+            orient=tk.HORIZONTAL,
+            mode='determinate',
+            maximum=100
+        )
+        self.load_progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        cancel_btn = ttk.Button(
+            self.load_frame,
+            text="Cancel Load",
+            command=self.cancel_load,
+            width=15
+        )
+        cancel_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self.load_frame.grid_remove()
+        
+        # Export progress (only shown while a report is being exported)
+        self.export_frame = ttk.Frame(main_frame)
+        self.export_frame.grid(row=5, column=0, columnspan=2, pady=(5, 0), sticky=(tk.E, tk.W))
+        self.export_progress = ttk.Progressbar(
+            self.export_frame,
+            orient=tk.HORIZONTAL,
+            mode='determinate',
+            maximum=100
+        )
+        self.export_progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        cancel_export_btn = ttk.Button(
+            self.export_frame,
+            text="Cancel Export",
+            command=self.cancel_export,
+            width=15
+        )
+        cancel_export_btn.pack(side=tk.LEFT, padx=(10, 0))
+        self.export_frame.grid_remove()
+    
+    def finish_startup(self):
+        """
+        Start the work deferred until the window is drawn.
+        
+        Runs at the first idle moment of the main loop, so the window is
+        painted before anything slow happens. NumPy is then imported and the
+        data file read on the I/O thread while the window is already usable;
+        the table fills in as the records arrive.
+        """
+        
+        self.root.update_idletasks()  # Draw whatever is still pending
+        self.record_startup('first_paint')
+        # Imported before the load finishes, so the first batch is graded with it
+        self.io.submit(load_numpy)
+        self.load_from_file(quiet=True)
+        if self.load_job is None:  # Nothing to load
+            self.record_startup('loaded')
+    
+    def record_startup(self, stage):
+        """
+        Record the time from process start to a startup stage, once.
+        
+        The times are kept in startup_times and, while instrumentation is
+        on, recorded as the operations startup_first_paint and startup_loaded.
+        
+        Returns:
+            float: Seconds since process start, None if already recorded
+        """
+        
+        if stage in self.startup_times:
+            return None
+        seconds = process_uptime()
+        self.startup_times[stage] = seconds
+        if METRICS.enabled:
+            METRICS.record(f'startup_{stage}', seconds)
+        return seconds
     
     # ============================================
     # CORE FUNCTIONALITY METHODS
     # ============================================
+    @instrumented('add_student')
     def add_student(self):
         """Add a new student record from form data."""
         
-        # Get and validate student ID
-        student_id_str = self.id_var.get().strip()
-        if not student_id_str:
-            messagebox.showwarning("Missing Information", "Please enter a Student ID!")
+        if self.edits_blocked():
             return
-        
-        if not student_id_str.isdigit():
-            messagebox.showwarning("Invalid Input", "Student ID must be a number!")
+        form = self.read_form()
+        if form is None:
             return
-        
-        student_id = int(student_id_str)
+        student_id, name, marks = form
         
         # Check for duplicate ID
         if student_id in self.students:
             messagebox.showwarning(
                 "Duplicate ID", 
-                f"Student ID {student_id} already exists!\nPlease use a different ID."
+                f"Student ID {student_id} already exists!\n"
+                f"Use Update Student to change it, or a different ID."
             )
             return
-        
-        # Get and validate student name
-        name = self.name_var.get().strip()
-        if not name:
-            messagebox.showwarning("Missing Information", "Please enter a Student Name!")
+        cohort = self.find_cohort(student_id)
+        if cohort is not None and not (is_shard_file(self.data_file)
+                                       and cohort == cohort_name(self.data_file)):
+            messagebox.showwarning(
+                "Duplicate ID", 
+                f"Student ID {student_id} is already in cohort {cohort}!\n"
+                f"Open that cohort to change the student, or use a different ID."
+            )
             return
         
-        # Create new student object
-        new_student = Student(student_id, name)
-        
-        # Collect and validate marks
-        marks_entered = False
-        for subject in self.subjects:
-            mark_str = self.marks_vars[subject].get().strip()
-            
-            if mark_str:  # If mark is provided
-                try:
-                    mark = float(mark_str)
-                    
-                    # Validate mark range (0-100)
-                    if mark < 0 or mark > 100:
-                        messagebox.showwarning(
-                            "Invalid Mark", 
-                            f"Mark for {subject} must be between 0 and 100!"
-                        )
-                        return
-                    
-                    new_student.marks[subject] = mark
-                    marks_entered = True
-                    
-                except ValueError:
-                    messagebox.showwarning(
-                        "Invalid Input", 
-                        f"Mark for {subject} must be a number!"
-                    )
-                    return
-        
         # If no marks entered, show warning but allow creation
-        if not marks_entered:
+        if not marks:
             response = messagebox.askyesno(
                 "No Marks Entered", 
                 "No marks entered for this student. Create student without marks?"
@@ -309,14 +448,10 @@ class ResultManagementSystem:
             if not response:
                 return
         
-        # Add student to collection
-        self.students[student_id] = new_student
-        
-        # Calculate initial results
-        new_student.calculate_results()
-        
-        # Update display
-        self.refresh_student_list()
+        # Add student to collection (graded and drawn by the batch refresh)
+        with self.edits.batch(f"Add student {student_id}") as batch:
+            batch.add_student(student_id, name, marks)
+        self.finish_edit(batch)
         
         # Show success message
         messagebox.showinfo(
@@ -324,12 +459,209 @@ class ResultManagementSystem:
             f"Student added successfully!\n\n"
             f"ID: {student_id}\n"
             f"Name: {name}\n"
-            f"Grade: {new_student.grade}"
+            f"Grade: {self.students[student_id].grade}"
         )
         
         # Clear form for next entry
         self.clear_form()
     
+    def update_student(self):
+        """Replace the name and marks of the student in the form with the form data."""
+        
+        if self.edits_blocked():
+            return
+        form = self.read_form()
+        if form is None:
+            return
+        student_id, name, marks = form
+        
+        if student_id not in self.students:
+            messagebox.showwarning(
+                "Student Not Found", 
+                f"Student with ID {student_id} not found!\n"
+                f"Use Add Student to create a new student."
+            )
+            return
+        
+        with self.edits.batch(f"Update student {student_id}") as batch:
+            batch.update_student(student_id, name, marks)
+        if not self.finish_edit(batch):
+            self.status_label.config(
+                text=f"No changes to student {student_id}. Total Students: {len(self.students)}")
+            return
+        
+        messagebox.showinfo(
+            "Success", 
+            f"Student updated successfully!\n\n"
+            f"ID: {student_id}\n"
+            f"Name: {name}\n"
+            f"Grade: {self.students[student_id].grade}"
+        )
+    
+    def delete_student(self):
+        """Delete the student whose ID is in the form (undo brings them back)."""
+        
+        if self.edits_blocked():
+            return
+        student_id_str = self.id_var.get().strip()
+        if not student_id_str.isdigit() or int(student_id_str) not in self.students:
+            messagebox.showwarning(
+                "Student Not Found", 
+                "Select a student in the table, or enter the ID of an existing student."
+            )
+            return
+        
+        student_id = int(student_id_str)
+        name = self.students[student_id].name
+        if not messagebox.askyesno(
+                "Delete Student", 
+                f"Delete student {student_id} ({name})?\n"
+                f"Use Undo to bring the student back."):
+            return
+        
+        with self.edits.batch(f"Delete student {student_id}") as batch:
+            batch.remove_student(student_id)
+        self.finish_edit(batch)
+        self.clear_form()
+    
+    def adjust_subject(self):
+        """Add (or take away) marks in one subject for every student, as one batch."""
+        
+        if self.edits_blocked():
+            return
+        subject = simpledialog.askstring(
+            "Correct Subject Marks",
+            f"Subject ({', '.join(self.subjects)}):",
+            initialvalue=self.subjects[0], parent=self.root)
+        if not subject:
+            return
+        subject = subject.strip()
+        if subject not in self.students.store.subject_index:
+            messagebox.showwarning("Unknown Subject", f"There is no subject {subject}!")
+            return
+        amount = simpledialog.askfloat(
+            "Correct Subject Marks",
+            f"Marks to add to every {subject} mark (negative to take away):",
+            parent=self.root)
+        if not amount:
+            return
+        
+        with self.edits.batch(f"{subject} {amount:+g}") as batch:
+            changed = batch.adjust_subject(subject, amount)
+        self.finish_edit(batch)
+        self.status_label.config(
+            text=f"{subject} {amount:+g}: {changed} marks changed. "
+                 f"Total Students: {len(self.students)}")
+    
+    def undo_edit(self, event=None):
+        """Undo the last batch of edits."""
+        
+        if self.edits_blocked():
+            return
+        batch = self.edits.undo()
+        if batch is None:
+            self.status_label.config(text=f"Nothing to undo. Total Students: {len(self.students)}")
+            return
+        self.finish_edit(batch)
+        self.status_label.config(
+            text=f"Undone: {batch.description}. Total Students: {len(self.students)}")
+    
+    def redo_edit(self, event=None):
+        """Redo the last batch of edits undone."""
+        
+        if self.edits_blocked():
+            return
+        batch = self.edits.redo()
+        if batch is None:
+            self.status_label.config(text=f"Nothing to redo. Total Students: {len(self.students)}")
+            return
+        self.finish_edit(batch)
+        self.status_label.config(
+            text=f"Redone: {batch.description}. Total Students: {len(self.students)}")
+    
+    def edits_blocked(self):
+        """Return True (after telling the user) if records cannot be edited now."""
+        
+        if self.load_job is not None or self.import_job is not None:
+            messagebox.showinfo("Busy", "Please wait for the running load or import to finish.")
+            return True
+        return False
+    
+    def finish_edit(self, batch):
+        """
+        Show and save the students changed by a batch of edits.
+        
+        However many students the batch changed, they are recalculated in
+        one batch, the table is patched once and one save writes them.
+        
+        Args:
+            batch (EditBatch): Committed, undone or redone batch
+        
+        Returns:
+            bool: True if the batch changed any student
+        """
+        
+        if not batch.changed_ids:
+            return False
+        self.refresh_student_list()
+        self.request_save(delay_ms=self.edit_save_delay_ms)
+        return True
+    
+    def read_form(self):
+        """
+        Read and validate the student ID, name and marks in the form.
+        
+        Returns:
+            tuple: (student_id, name, {subject: mark}), None (after a
+                warning) if the form is not valid
+        """
+        
+        # Get and validate student ID
+        student_id_str = self.id_var.get().strip()
+        if not student_id_str:
+            messagebox.showwarning("Missing Information", "Please enter a Student ID!")
+            return None
+        
+        if not student_id_str.isdigit():
+            messagebox.showwarning("Invalid Input", "Student ID must be a number!")
+            return None
+        
+        student_id = int(student_id_str)
+        
+        # Get and validate student name
+        name = self.name_var.get().strip()
+        if not name:
+            messagebox.showwarning("Missing Information", "Please enter a Student Name!")
+            return None
+        
+        # Collect and validate marks
+        marks = {}
+        for subject in self.subjects:
+            mark_str = self.marks_vars[subject].get().strip()
+            
+            if mark_str:  # If mark is provided
+                try:
+                    mark = float(mark_str)
+                except ValueError:
+                    messagebox.showwarning(
+                        "Invalid Input", 
+                        f"Mark for {subject} must be a number!"
+                    )
+                    return None
+                
+                # Validate mark range (0 to the subject's maximum, usually 100)
+                maximum = self.policy.maximum(subject)
+                if mark < 0 or mark > maximum:
+                    messagebox.showwarning(
+                        "Invalid Mark", 
+                        f"Mark for {subject} must be between 0 and {maximum:g}!"
+                    )
+                    return None
+                
+                marks[subject] = mark
+        
+        return student_id, name, marks
+    
     def calculate_grade(self):
         """Calculate and display grade for a student."""
         
@@ -366,8 +698,9 @@ class ResultManagementSystem:
         if student.marks:
             result_message += "Subject Marks:\n"
             for subject, mark in student.marks.items():
-                result_message += f"  • {subject}: {mark}/100\n"
-            result_message += f"\nTotal Marks: {student.total_marks:.1f}/500\n"
+                result_message += f"  • {subject}: {mark}/{self.policy.maximum(subject):g}\n"
+            result_message += (f"\nTotal Marks: {student.total_marks:.1f}"
+                               f"/{self.policy.max_total(student.marks):g}\n")
         else:
             result_message += "No marks recorded.\n\n"
         
@@ -380,6 +713,7 @@ class ResultManagementSystem:
         # Update display
         self.refresh_student_list()
     
+    @instrumented('view_all_results')
     def view_all_results(self):
         """Display detailed view of all student results."""
         
@@ -387,211 +721,1023 @@ class ResultManagementSystem:
             messagebox.showinfo("No Records", "No student records available.")
             return
         
-        # Create new window for detailed results
-        results_window = tk.Toplevel(self.root)
-        results_window.title("📄 All Student Results - Detailed View")
-        results_window.geometry("800x500")
+        # Ensure calculations are current (one batch for the whole cohort)
+        self.calculate_students()
         
-        # Title
-        title_label = ttk.Label(
-            results_window, 
-            text="📋 Complete Student Results Report",
-            font=('Arial', 14, 'bold')
+        # Open the report window at once; it renders a snapshot of the
+        # cohort in the background (large reports in worker processes)
+        workers = self.parallel_workers if len(self.students) >= self.parallel_threshold else 1
+        ReportWindow(self.root, self.students.store.copy(), workers, self.report_chunk_size)
+    
+    def export_report(self):
+        """
+        Export the results of every student to a text, CSV or HTML file.
+        
+        The report is streamed from a snapshot of the records on the I/O
+        thread (see student_export), so the window stays usable and any
+        cohort size is exported in the same memory.
+        """
+        
+        if not self.students:
+            messagebox.showinfo("No Records", "No student records available.")
+            return
+        if self.export_job is not None:
+            messagebox.showinfo("Export In Progress", "A report is already being exported.")
+            return
+        
+        target_file = filedialog.asksaveasfilename(
+            title="Export Report",
+            defaultextension=".html",
+            filetypes=[("HTML report", "*.html"), ("CSV file", "*.csv"),
+                       ("Text report", "*.txt")]
+        )
+        if not target_file:
+            return
+        if os.path.splitext(target_file)[1].lower() not in EXPORT_FORMATS:
+            messagebox.showerror("Export Error",
+                                 "Please export to a .html, .csv or .txt file.")
+            return
+        
+        # Results are exported as stored, so make sure they are current
+        self.calculate_students()
+        job = ExportJob(target_file, self.students.store.copy(), self.export_chunk_size)
+        self.export_job = job
+        self.io.submit(
+            instrumented('export_report')(job),
+            on_done=lambda size: self.finish_export(job, size),
+            on_error=lambda error: self.finish_export(job, None, error)
         )
-        title_label.pack(pady=(10, 20))
         
-        # Create text widget with scrollbar
-        text_frame = ttk.Frame(results_window)
-        text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self.export_progress['value'] = 0
+        self.export_frame.grid()
+        self.root.after(self.load_poll_ms, self.show_export_progress)
+    
+    def show_export_progress(self):
+        """Update the progress bar while an export is running."""
+        
+        job = self.export_job
+        if job is None:
+            return
         
-        text_widget = tk.Text(text_frame, wrap=tk.WORD, font=('Consolas', 10))
-        scrollbar = ttk.Scrollbar(text_frame, orient=tk.VERTICAL, command=text_widget.yview)
-        text_widget.configure(yscrollcommand=scrollbar.set)
+        progress = job.progress
+        self.export_progress['value'] = progress * 100
+        self.status_label.config(
+            text=f"Exporting report... {job.exported} of {job.total} students ({progress:.0%})")
+        self.root.after(self.load_poll_ms, self.show_export_progress)
+    
+    def cancel_export(self):
+        """Stop a running export; no file is written."""
+        
+        if self.export_job is not None:
+            self.export_job.cancel()
+            self.export_job = None
+            self.export_frame.grid_remove()
+            self.status_label.config(
+                text=f"Export cancelled. Total Students: {len(self.students)}")
+    
+    def finish_export(self, job, size, error=None):
+        """
+        Report the result of an export.
         
-        text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        Args:
+            job (ExportJob): The finished export
+            size (int): Bytes written, None if cancelled or failed
+            error (Exception): Error that stopped the export, if any
+        """
         
-        # Insert report header
-        text_widget.insert(tk.END, "=" * 70 + "\n")
-        text_widget.insert(tk.END, "STUDENT RESULTS REPORT\n")
-        text_widget.insert(tk.END, f"Generated: {len(self.students)} students\n")
-        text_widget.insert(tk.END, "=" * 70 + "\n\n")
+        if job is not self.export_job:  # Cancelled
+            return
+        self.export_job = None
+        self.export_frame.grid_remove()
         
-        # Insert each student's detailed results
-        for student_id in sorted(self.students.keys()):
-            student = self.students[student_id]
-            student.calculate_results()  # Ensure calculations are current
-            
-            text_widget.insert(tk.END, f"Student ID: {student_id}\n")
-            text_widget.insert(tk.END, f"Name: {student.name}\n")
-            
-            if student.marks:
-                text_widget.insert(tk.END, "Subject Marks:\n")
-                for subject, mark in student.marks.items():
-                    text_widget.insert(tk.END, f"  • {subject}: {mark}/100\n")
-                text_widget.insert(tk.END, f"Total Marks: {student.total_marks:.1f}/500\n")
-            else:
-                text_widget.insert(tk.END, "No marks recorded.\n")
-            
-            text_widget.insert(tk.END, f"Percentage: {student.percentage:.1f}%\n")
-            text_widget.insert(tk.END, f"Final Grade: {student.grade}\n")
-            text_widget.insert(tk.END, "-" * 50 + "\n\n")
-        
-        # Make text widget read-only
-        text_widget.configure(state='disabled')
-        
-        # Close button
-        close_btn = ttk.Button(
-            results_window, 
-            text="Close Report", 
-            command=results_window.destroy
+        if error is not None:
+            self.status_label.config(text=f"Export failed! Total Students: {len(self.students)}")
+            messagebox.showerror("Export Error", f"Failed to export the report:\n{str(error)}")
+            return
+        
+        self.status_label.config(
+            text=f"Report exported! {job.exported} students, {size / 1024:.0f} KB")
+        messagebox.showinfo(
+            "Export Successful", 
+            f"Report exported successfully!\n"
+            f"File: {job.target_file}\n"
+            f"Students exported: {job.exported}"
+        )
+    
+    def show_statistics(self):
+        """Open the cohort statistics window, or bring it to the front."""
+        
+        if self.load_job is not None:
+            messagebox.showinfo("Loading", "Statistics are available once loading finishes.")
+            return
+        
+        # Results must be current before they are counted
+        self.calculate_students()
+        if self.analytics is None:
+            self.analytics = CohortAnalytics(self.students.store)
+        
+        if self.statistics_window is not None and self.statistics_window.winfo_exists():
+            self.statistics_window.set_analytics(self.analytics)
+            self.statistics_window.lift()
+        else:
+            self.statistics_window = StatisticsWindow(self.root, self.analytics)
+    
+    def show_diagnostics(self):
+        """Open the instrumentation and profiling window, or bring it to the front."""
+        
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.lift()
+        else:
+            self.diagnostics_window = DiagnosticsWindow(self.root)
+    
+    def show_history(self):
+        """Open the term history window, or bring it to the front."""
+        
+        if self.history is None:
+            try:
+                self.history = load_history(history_file(self.data_file))
+            except (OSError, ValueError) as e:
+                messagebox.showerror("History Error", f"Failed to read term history:\n{str(e)}")
+                return
+        
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.lift()
+        else:
+            self.history_window = HistoryWindow(self.root, self.history, self.policy,
+                                                self.record_term)
+    
+    def record_term(self, name):
+        """
+        Record every student's current marks as a term and save the history.
+        
+        Only the marks that changed since the last term are stored. The
+        history file is written on the I/O thread.
+        
+        Args:
+            name (str): Term name; the last term's name records it again
+        
+        Returns:
+            Term: The recorded term, or None if it was not recorded
+        """
+        
+        if self.load_job is not None:
+            messagebox.showinfo("Loading", "Please wait for the load to finish.")
+            return None
+        
+        store = self.students.store
+        records = ((student_id, store.row_marks(row)) for student_id, row in store.rows.items())
+        try:
+            term = self.history.record_term(name, records, store.subjects)
+        except ValueError as e:
+            messagebox.showerror("History Error", str(e))
+            return None
+        
+        self.status_label.config(text=f"Saving term {term.name} "
+                                      f"({term.changed} of {term.students} students changed)...")
+        self.io.submit(
+            write_history, self.history.to_dict(), history_file(self.data_file),
+            on_done=lambda result: self.status_label.config(
+                text=f"Term {term.name} recorded. Total Students: {len(self.students)}"),
+            on_error=lambda error: messagebox.showerror(
+                "Save Error", f"Failed to save term history:\n{str(error)}")
         )
-        close_btn.pack(pady=(0, 10))
+        return term
+    
+    # ============================================
+    # COHORT METHODS
+    # ============================================
+    def window_title(self, data_file):
+        """Return the window title, naming the cohort shown if it is a shard."""
+        
+        title = "EduTech Solutions - Student Result System"
+        if is_shard_file(data_file):
+            title += f" - {cohort_name(data_file)}"
+        return title
+    
+    def find_cohort(self, student_id):
+        """
+        Return the saved cohort of a student from the manifest, None if the
+        student is in no saved cohort (or the manifest cannot be read).
+        """
+        
+        try:
+            return read_manifest(cohort_directory(self.data_file)).find(student_id)
+        except (OSError, ValueError):
+            return None
+    
+    def show_cohorts(self):
+        """Open the cohorts window, or bring it to the front."""
+        
+        if self.cohort_window is not None and self.cohort_window.winfo_exists():
+            self.cohort_window.refresh()
+            self.cohort_window.lift()
+        else:
+            self.cohort_window = CohortWindow(self.root, cohort_directory(self.data_file),
+                                              lambda: self.data_file, self.open_cohort)
+    
+    def open_cohort(self, data_file):
+        """
+        Show another cohort's shard (or data file) in place of the current one.
+        
+        Unsaved changes are saved first. The cohort left is kept in memory
+        (see ShardCache), so switching back to it reads nothing; a cohort
+        that is not cached is loaded from its shard alone.
+        
+        Args:
+            data_file (str): Path of the cohort's shard
+        """
+        
+        if os.path.abspath(data_file) == os.path.abspath(self.data_file):
+            return
+        if self.load_job is not None or self.import_job is not None:
+            messagebox.showinfo("Please Wait",
+                                "Please wait for the load or import to finish first.")
+            return
+        if self.sync_running:  # Switch once the other machines' changes are merged
+            self.root.after(self.load_poll_ms, lambda: self.open_cohort(data_file))
+            return
+        if (self.saves_running or self.save_after_id is not None
+                or self.students.store.has_changes('unsaved')):
+            self.status_label.config(text="Saving before switching cohort...")
+            self.request_save(on_saved=lambda error: error is None
+                              and self.open_cohort(data_file))
+            return
+        
+        # Keep the cohort left (already saved) for a quick switch back
+        size = store_memory(self.students.store) + self.file_sync().memory()
+        self.cohort_cache.put(self.data_file, (self.students, self.index, self.sync, self.edits),
+                              size)
+        
+        self.data_file = data_file
+        self.root.title(self.window_title(data_file))
+        self.analytics = None
+        self.history = None  # Each cohort keeps its own term history
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.destroy()
+        self.history_window = None
+        
+        cached = self.cohort_cache.take(data_file)
+        if cached is not None:
+            self.students, self.index, self.sync, self.edits = cached
+        else:
+            self.students = StudentCollection(self.subjects)
+            self.students.store.track_changes()
+            self.students.store.track_changes('unsaved')
+            self.index = StudentIndex(self.students.store)
+            self.edits = EditLog(self.students.store)
+        
+        # Redraw every row; students graded with another policy are re-graded
+        self.set_table_mode(len(self.students) >= self.virtual_table_threshold)
+        self.students.store.pop_changes()
+        self.students.store.set_policy(self.policy)
+        self.refresh_student_list()
+        self.search_students()
+        
+        if cached is None:
+            self.load_from_file(quiet=True)
+        else:
+            # Changes other machines saved meanwhile are picked up by the watch
+            name = cohort_name(data_file) if is_shard_file(data_file) else data_file
+            self.status_label.config(
+                text=f"Cohort {name} opened. Total Students: {len(self.students)}")
     
     # ============================================
     # FILE HANDLING METHODS
     # ============================================
     def save_to_file(self):
-        """Save all student records to JSON file."""
+        """
+        Save the student records changed since the last save.
+        
+        The storage backend is chosen by the data file's extension. For JSON
+        files, changes are appended to a journal next to the data file and
+        compacted into a new snapshot (written atomically) when it grows
+        large. For SQLite databases, changes are written in one transaction.
+        The write runs on the I/O thread; a message is shown once it is done.
+        """
+        
+        if self.load_job is not None:
+            messagebox.showwarning(
+                "Load In Progress", 
+                "Records are still loading.\nPlease wait for the load to finish before saving."
+            )
+            return
         
         if not self.students:
             messagebox.showwarning("No Data", "No student records to save!")
             return
         
-        try:
-            # Prepare data for JSON serialization
-            data_to_save = {}
-            for student_id, student in self.students.items():
-                data_to_save[student_id] = {
-                    'name': student.name,
-                    'marks': student.marks,
-                    'total_marks': student.total_marks,
-                    'percentage': student.percentage,
-                    'grade': student.grade
-                }
-            
-            # Write to file
-            with open(self.data_file, 'w') as file:
-                json.dump(data_to_save, file, indent=4, sort_keys=True)
-            
+        self.request_save(notify=True)
+    
+    def request_save(self, notify=False, delay_ms=0, on_saved=None):
+        """
+        Save the unsaved changes on the I/O thread.
+        
+        Requests that arrive while a save is waiting or running are merged:
+        at most one more save follows the running one, and it writes every
+        change made in the meantime.
+        
+        Args:
+            notify (bool): Show a message when the save finishes
+            delay_ms (int): Wait this long for more changes before saving
+            on_saved (callable): on_saved(error) runs after the save that
+                includes the current changes, error is None on success
+        """
+        
+        self.save_notify = self.save_notify or notify
+        if on_saved is not None:
+            self.save_callbacks.append(on_saved)
+        
+        if self.saves_running:
+            self.save_pending = True  # Started when the running save finishes
+            return
+        
+        if self.save_after_id is not None:
+            self.root.after_cancel(self.save_after_id)
+        self.save_after_id = self.root.after(delay_ms, self.start_save)
+    
+    def start_save(self):
+        """Hand a copy of the current records to the I/O thread."""
+        
+        self.save_after_id = None
+        notify, self.save_notify = self.save_notify, False
+        callbacks, self.save_callbacks = self.save_callbacks, []
+        
+        # Saved records include results, so make sure they are current
+        self.calculate_students()
+        store = self.students.store
+        changed_ids = store.pop_changes('unsaved')
+        
+        # The I/O thread writes a copy, so editing can go on during the save
+        # and the file gets the records exactly as they were at this moment.
+        # Only the changed students are copied unless the save writes them
+        # all (a journal checkpoint or a shard rewrite).
+        sync = self.file_sync()
+        complete = sync.storage.needs_all_students()
+        snapshot = self.students.copy(None if complete else changed_ids)
+        
+        self.saves_running += 1
+        self.status_label.config(text=f"Saving {len(changed_ids)} changed students...")
+        # Refused (ConflictError) if another machine saved since the file was read
+        self.io.submit(
+            instrumented('save_to_file')(sync.save), snapshot, changed_ids, complete,
+            on_done=lambda saved: self.finish_save(saved, None, notify, callbacks),
+            on_error=lambda error: self.finish_save(
+                0, error, notify, callbacks, store, changed_ids)
+        )
+    
+    def finish_save(self, saved, error, notify, callbacks, store=None, changed_ids=()):
+        """
+        Report the result of a save and start the next one if it was requested.
+        
+        Args:
+            saved (int): Number of changed records written
+            error (Exception): Error that stopped the save, if any
+            notify (bool): Show a message box with the result
+            callbacks (list): on_saved callbacks waiting for this save
+            store (CohortStore): Store the save was taken from
+            changed_ids (set): IDs the failed save should have written
+        """
+        
+        self.saves_running -= 1
+        if isinstance(error, ConflictError) and store is self.students.store:
+            # Someone else saved first: merge their changes, then save again
+            store.add_changes(changed_ids, 'unsaved')
+            self.save_notify = self.save_notify or notify
+            self.save_callbacks[:0] = callbacks
+            self.save_pending = False
+            self.status_label.config(text="The data file was changed on another machine. "
+                                          "Merging the changes before saving...")
+            self.sync_data_file(save_after=True)
+            return
+        if error is not None:
+            # Keep the changes so the next save tries again
+            store.add_changes(changed_ids, 'unsaved')
+            self.status_label.config(text=f"Save failed! Total Students: {len(self.students)}")
+            messagebox.showerror(
+                "Save Error", 
+                f"Failed to save data:\n{str(error)}"
+            )
+        else:
             # Update status
             self.status_label.config(text=f"Data saved! Total Students: {len(self.students)}")
             
-            messagebox.showinfo(
-                "Save Successful", 
-                f"All student records saved successfully!\n"
-                f"File: {self.data_file}\n"
-                f"Students saved: {len(self.students)}"
-            )
+            if notify:
+                messagebox.showinfo(
+                    "Save Successful", 
+                    f"All student records saved successfully!\n"
+                    f"File: {self.data_file}\n"
+                    f"Students saved: {len(self.students)} ({saved} changed)"
+                )
+        
+        for callback in callbacks:
+            callback(error)
+        
+        if self.save_pending and not self.saves_running:
+            self.save_pending = False
+            self.request_save()
+    
+    def flush_saves(self):
+        """Queue a requested save at once, so the next I/O job sees its data."""
+        
+        if self.save_pending or self.save_after_id is not None:
+            if self.save_after_id is not None:
+                self.root.after_cancel(self.save_after_id)
+            self.save_pending = False
+            self.start_save()
+    
+    def autosave(self):
+        """Save unsaved changes in the background, then schedule the next autosave."""
+        
+        if (self.load_job is None and not self.saves_running
+                and self.students.store.has_changes('unsaved')):
+            self.request_save()
+        self.root.after(self.autosave_interval_ms, self.autosave)
+    
+    def file_sync(self):
+        """Return the sync state of the data file (started afresh if the file was switched)."""
+        
+        if self.sync.data_file != self.data_file:
+            self.sync = DataFileSync(self.data_file)
+        return self.sync
+    
+    def watch_data_file(self):
+        """Pick up changes other machines saved to the data file, then check again later."""
+        
+        if (self.watch_var.get() and not self.sync_running and self.load_job is None
+                and self.import_job is None and not self.saves_running
+                and self.save_after_id is None and self.file_sync().changed()):
+            self.sync_data_file()
+        self.root.after(self.watch_interval_ms, self.watch_data_file)
+    
+    def sync_data_file(self, save_after=False):
+        """
+        Read the students other machines changed in the data file.
+        
+        Only the changed students are read when possible (see student_sync)
+        and only their rows are patched, nothing is reloaded.
+        
+        Args:
+            save_after (bool): Save the unsaved changes once the others are merged
+        """
+        
+        self.sync_running = True
+        store = self.students.store
+        self.io.submit(
+            self.file_sync().read_changes,
+            on_done=lambda changes: self.apply_external_changes(changes, store, save_after),
+            on_error=lambda error: self.finish_sync_error(error, save_after)
+        )
+    
+    def apply_external_changes(self, changes, store, save_after=False):
+        """
+        Merge the students changed by other machines into the records shown.
+        
+        A student changed both here (and not saved yet) and elsewhere is a
+        conflict: the user chooses whose changes to keep.
+        
+        Args:
+            changes (ExternalChanges): Changed students, None if there were none
+            store (CohortStore): Store the read was started for
+            save_after (bool): Save the unsaved changes afterwards
+        """
+        
+        self.sync_running = False
+        if store is not self.students.store:  # Replaced by a load meanwhile
+            return
+        
+        if changes:
+            unsaved = store.change_sets.get('unsaved', set())
+            incoming = {}
+            conflicts = {}
+            for student_id, record in changes.records.items():
+                if student_id in unsaved and not same_record(store, student_id, record):
+                    conflicts[student_id] = record
+                else:
+                    incoming[student_id] = record
             
-        except Exception as e:
+            if conflicts:
+                listed = ', '.join(str(student_id) for student_id in sorted(conflicts)[:10])
+                if len(conflicts) > 10:
+                    listed += ", ..."
+                keep_mine = messagebox.askyesno(
+                    "Conflicting Changes", 
+                    f"{len(conflicts)} students you changed were also changed on another "
+                    f"machine:\n{listed}\n\n"
+                    f"Yes: Keep your changes (they replace the others when saved)\n"
+                    f"No: Take the other machine's changes"
+                )
+                if not keep_mine:
+                    incoming.update(conflicts)
+            
+            # Only the changed students are replaced, graded and redrawn
+            apply_records(store, incoming)
+            store.discard_changes(incoming, 'unsaved')  # They are on disk already
+            self.edits.discard(incoming)
+            self.refresh_student_list()
+            self.status_label.config(
+                text=f"{len(incoming)} students updated from the data file. "
+                     f"Total Students: {len(self.students)}")
+        
+        if save_after:
+            self.request_save()
+    
+    def finish_sync_error(self, error, save_after):
+        """Report a failed read of other machines' changes."""
+        
+        self.sync_running = False
+        if save_after:
             messagebox.showerror(
                 "Save Error", 
-                f"Failed to save data:\n{str(e)}"
+                f"The data file was changed on another machine, and reading "
+                f"the changes failed, so nothing was saved:\n{str(error)}"
             )
+            for callback in self.save_callbacks:
+                callback(error)
+            self.save_callbacks = []
+            self.save_notify = False
+        else:
+            # Watching goes on; the next check tries again
+            self.status_label.config(
+                text=f"Could not read changes to the data file: {error}")
     
-    def load_from_file(self):
-        """Load student records from JSON file."""
+    def load_from_file(self, quiet=False):
+        """
+        Start loading student records from the data file.
+        
+        Records are read into a new collection on the I/O thread, so the
+        window stays responsive and the load can be cancelled. The current
+        records stay on screen until the load finishes.
         
+        Args:
+            quiet (bool): Skip the "Load Successful" message (used at startup)
+        """
+        
+        if self.load_job is not None:
+            messagebox.showinfo("Load In Progress", "Student records are already loading.")
+            return
+        if self.import_job is not None:
+            messagebox.showinfo("Import In Progress",
+                                "Please wait for the CSV import to finish before loading.")
+            return
+        
+        storage = open_storage(self.data_file)
         try:
-            if not os.path.exists(self.data_file):
+            if not storage.exists():
+                if quiet:  # First start, nothing saved yet: no need to interrupt
+                    self.status_label.config(text="No saved data yet. Total Students: 0")
+                    return
                 messagebox.showinfo(
                     "No Data File", 
                     f"No saved data found.\nFile '{self.data_file}' doesn't exist.\n"
                     f"Please save some data first."
                 )
                 return
-            
-            # Read from file
-            with open(self.data_file, 'r') as file:
-                loaded_data = json.load(file)
-            
-            # Clear current students
-            self.students.clear()
-            
-            # Recreate Student objects from loaded data
-            for student_id_str, student_data in loaded_data.items():
-                student_id = int(student_id_str)
-                student = Student(student_id, student_data['name'])
-                student.marks = student_data['marks']
-                student.total_marks = student_data['total_marks']
-                student.percentage = student_data['percentage']
-                student.grade = student_data['grade']
-                self.students[student_id] = student
-            
-            # Update display
-            self.refresh_student_list()
-            
-            # Update status
-            self.status_label.config(text=f"Data loaded! Total Students: {len(self.students)}")
-            
+        except Exception as e:
+            messagebox.showerror(
+                "Load Error", 
+                f"Failed to load data:\n{str(e)}"
+            )
+            return
+        
+        # Queued behind any running or requested save, so the load reads the saved data
+        self.flush_saves()
+        job = LoadJob(storage, self.subjects, self.load_chunk_size)
+        self.load_job = job
+        self.io.submit(
+            instrumented('load_from_file')(job),
+            on_done=lambda index: self.finish_load(job, index),
+            on_error=lambda error: self.finish_load(job, None, error)
+        )
+        
+        # Show progress while the I/O thread reads
+        self.load_quiet = quiet
+        self.load_progress['value'] = 0
+        self.load_frame.grid()
+        self.root.after(self.load_poll_ms, self.show_load_progress)
+    
+    def show_load_progress(self):
+        """Update the progress bar while a load is running."""
+        
+        job = self.load_job
+        if job is None:
+            return
+        
+        progress = job.progress
+        self.load_progress['value'] = progress * 100
+        self.status_label.config(
+            text=f"Loading... {len(job.students)} students ({progress:.0%})")
+        self.root.after(self.load_poll_ms, self.show_load_progress)
+    
+    def cancel_load(self):
+        """Stop a running load and keep the current records."""
+        
+        if self.load_job is not None:
+            self.load_job.cancel()
+            self.load_job = None
+            self.load_frame.grid_remove()
+            self.status_label.config(text=f"Load cancelled. Total Students: {len(self.students)}")
+    
+    def finish_load(self, job, index, error=None):
+        """
+        Show the records read by a load, or the error that stopped it.
+        
+        Args:
+            job (LoadJob): The finished load
+            index (StudentIndex): Indexes of the loaded students, None if cancelled
+            error (Exception): Error that stopped the load, if any
+        """
+        
+        if job is not self.load_job:  # Cancelled, the records are not wanted
+            return
+        self.load_job = None
+        self.load_frame.grid_remove()
+        
+        if error is not None:
+            self.record_startup('loaded')
+            messagebox.showerror(
+                "Load Error", 
+                f"Failed to load data:\n{str(error)}"
+            )
+            return
+        
+        # Switch to the loaded records; they are all saved already
+        self.io.submit(self.file_sync().reset, job.digests, job.version)
+        self.students = job.students
+        self.students.store.track_changes()
+        self.students.store.track_changes('unsaved')
+        self.students.store.pop_changes('unsaved')
+        self.index = index
+        self.edits = EditLog(self.students.store)
+        self.analytics = None
+        
+        # Update display (every row is rebuilt, so no row needs patching)
+        self.set_table_mode(len(self.students) >= self.virtual_table_threshold)
+        self.students.store.pop_changes()
+        # Students graded with another policy are re-graded (and saved again)
+        self.students.store.set_policy(self.policy)
+        self.refresh_student_list()
+        
+        # Update status
+        status = f"Data loaded! Total Students: {len(self.students)}"
+        started = self.record_startup('loaded')
+        if started is not None:
+            status += f" (started in {started:.2f} s)"
+        self.status_label.config(text=status)
+        
+        if not self.load_quiet:
             messagebox.showinfo(
                 "Load Successful", 
                 f"Student records loaded successfully!\n"
                 f"File: {self.data_file}\n"
                 f"Students loaded: {len(self.students)}"
             )
-            
-        except Exception as e:
+    
+    def import_csv(self):
+        """
+        Add the students of a CSV file in one batch.
+        
+        The file is read and validated on the I/O thread with the rules of
+        the Add Student form. Invalid rows do not stop the import; they
+        are listed in a report window once the valid students are added.
+        """
+        
+        if self.load_job is not None or self.import_job is not None:
+            messagebox.showinfo(
+                "Busy", 
+                "Please wait for the running load or import to finish."
+            )
+            return
+        
+        source_file = filedialog.askopenfilename(
+            title="Import Students",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not source_file:
+            return
+        
+        job = CsvImportJob(source_file, self.import_batch_size, self.policy)
+        self.import_job = job
+        self.io.submit(
+            instrumented('import_csv')(job),
+            on_done=lambda result: self.finish_import(job, result),
+            on_error=lambda error: self.finish_import(job, None, error)
+        )
+        self.status_label.config(text=f"Importing {source_file}...")
+    
+    def finish_import(self, job, result, error=None):
+        """
+        Add the students validated by an import and report the rejected rows.
+        
+        Args:
+            job (CsvImportJob): The finished import
+            result (CsvImportJob): The job, None if it was cancelled
+            error (Exception): Error that stopped the import, if any
+        """
+        
+        if job is not self.import_job:
+            return
+        self.import_job = None
+        
+        if error is not None:
+            self.status_label.config(text=f"Total Students: {len(self.students)}")
             messagebox.showerror(
-                "Load Error", 
-                f"Failed to load data:\n{str(e)}"
+                "Import Error", 
+                f"Failed to import {job.source_file}:\n{str(error)}"
+            )
+            return
+        if result is None:
+            return
+        
+        # One batch for every valid student: they are graded and drawn in a single refresh
+        added = job.commit(self.students)
+        self.edits.clear()  # Imports cannot be undone, nor edits made before them
+        self.refresh_student_list()
+        self.status_label.config(
+            text=f"Imported {added} students. Total Students: {len(self.students)}")
+        
+        if job.errors.count:
+            ImportReportWindow(self.root, job.source_file, added, job.errors)
+        else:
+            messagebox.showinfo(
+                "Import Successful", 
+                f"Students imported successfully!\n"
+                f"File: {job.source_file}\n"
+                f"Students imported: {added}"
             )
     
+    def choose_policy(self):
+        """Grade every student with a grading policy read from a JSON file."""
+        
+        if self.load_job is not None:
+            messagebox.showinfo("Loading", "Please wait for the load to finish.")
+            return
+        
+        policy_file = filedialog.askopenfilename(
+            title=f"Grading Policy (current: {self.policy.name})",
+            filetypes=[("Grading policy", "*.json"), ("All files", "*.*")]
+        )
+        if not policy_file:
+            return
+        try:
+            policy = load_policy(policy_file)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Policy Error", f"Failed to read grading policy:\n{str(e)}")
+            return
+        
+        self.set_policy(policy)
+        messagebox.showinfo(
+            "Grading Policy", 
+            f"Grading policy '{policy.name}' applied.\n"
+            f"Grades: {', '.join(policy.grades())}\n"
+            f"Students re-graded: {len(self.students)}"
+        )
+    
+    def set_policy(self, policy):
+        """
+        Switch grading policy and re-grade the whole cohort in one batch.
+        
+        Students whose results change are redrawn, re-indexed and saved
+        with the next save, like any other change.
+        """
+        
+        self.policy = policy
+        self.students.store.set_policy(policy)
+        self.refresh_student_list()
+        if self.history_window is not None and self.history_window.winfo_exists():
+            self.history_window.set_policy(policy)
+        self.status_label.config(
+            text=f"Grading policy: {policy.name}. Total Students: {len(self.students)}")
+    
     # ============================================
     # UTILITY METHODS
     # ============================================
+    @instrumented('refresh_student_list')
     def refresh_student_list(self):
-        """Update the treeview with current student data."""
+        """
+        Patch the student table with the students added, changed or removed
+        since the last refresh.
         
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        Only students whose marks changed are recalculated, and only their
+        rows are inserted, updated or deleted.
+        """
         
-        # Insert current students (sorted by ID)
-        for student_id in sorted(self.students.keys()):
-            student = self.students[student_id]
-            
-            # Ensure calculations are current
-            student.calculate_results()
-            
-            # Insert into treeview
-            self.tree.insert('', 'end', values=(
-                student_id,
-                student.name,
-                f"{student.total_marks:.1f}",
-                f"{student.percentage:.1f}%",
-                student.grade
-            ))
+        # Ensure calculations are current for students whose marks changed
+        self.calculate_students()
+        changed_ids = self.students.store.pop_changes()
+        
+        # Large cohorts switch to the virtual table, which renders visible rows only
+        virtual = len(self.students) >= self.virtual_table_threshold
+        if virtual != self.virtual_mode:
+            self.set_table_mode(virtual)
+        # A large batch (e.g. loading a file) is quicker to rebuild than to patch
+        elif len(changed_ids) > max(len(self.tree_ids), 1000):
+            self.rebuild_student_list()
+        else:
+            for student_id in changed_ids:
+                self.patch_student_row(student_id)
+        
+        if self.virtual_mode:
+            self.virtual_table.refresh()
+        
+        # Keep the search indexes current (once a load has finished)
+        if self.load_job is None:
+            self.index.update()
+            self.refresh_statistics()
         
         # Update status label
         self.status_label.config(text=f"Total Students: {len(self.students)}")
     
+    def refresh_statistics(self):
+        """Update the statistics window, if it is open, with the latest changes."""
+        
+        if self.statistics_window is None or not self.statistics_window.winfo_exists():
+            self.statistics_window = None
+            return
+        if self.analytics is None:  # A new file was loaded since the window opened
+            self.analytics = CohortAnalytics(self.students.store)
+        self.statistics_window.set_analytics(self.analytics)
+    
+    def calculate_students(self):
+        """
+        Bring every student's results up to date.
+        
+        NumPy grades a whole cohort faster than rows can be copied to other
+        processes, so worker processes are only used for large batches when
+        grading falls back to pure Python.
+        """
+        
+        store = self.students.store
+        if len(store.dirty_rows) >= self.parallel_threshold and load_numpy() is None:
+            calculate_parallel(store, self.parallel_workers, self.parallel_chunk_size)
+        self.students.calculate_all()
+    
+    def set_table_mode(self, virtual):
+        """
+        Switch between the full treeview and the virtual scrolling table.
+        
+        Args:
+            virtual (bool): True to render only the visible rows
+        """
+        
+        self.virtual_mode = virtual
+        if virtual:
+            # Free the Tk items of the full treeview
+            self.tree.delete(*self.tree.get_children())
+            self.tree.grid_remove()
+            self.tree_scrollbar.grid_remove()
+            self.virtual_table.grid()
+        else:
+            self.virtual_table.clear()
+            self.virtual_table.grid_remove()
+            self.tree.grid()
+            self.tree_scrollbar.grid()
+        self.rebuild_student_list()
+    
+    def rebuild_student_list(self):
+        """
+        Rebuild the sorted ID list and every table row.
+        
+        Rows are inserted a chunk per frame, so the first rows show at
+        once and the window stays responsive while the rest fill in.
+        """
+        
+        self.tree_ids = sorted(self.students.keys())
+        if self.fill_after_id is not None:
+            self.root.after_cancel(self.fill_after_id)
+            self.fill_after_id = None
+        if self.virtual_mode:
+            self.virtual_table.refresh()
+            return
+        
+        self.tree.delete(*self.tree.get_children())
+        self.filled_rows = 0
+        self.fill_student_list()
+    
+    def fill_student_list(self, everything=False):
+        """
+        Insert the next rows of a rebuild and schedule the rest.
+        
+        Args:
+            everything (bool): Insert every remaining row now
+        """
+        
+        self.fill_after_id = None
+        end = len(self.tree_ids)
+        if not everything:
+            end = min(end, self.filled_rows + self.table_fill_chunk)
+        for student_id in self.tree_ids[self.filled_rows:end]:
+            self.tree.insert('', 'end', iid=str(student_id),
+                             values=self.student_row_values(student_id))
+        self.filled_rows = end
+        if end < len(self.tree_ids):
+            self.fill_after_id = self.root.after(1, self.fill_student_list)
+    
+    def patch_student_row(self, student_id):
+        """Insert, update or delete the table row of one student."""
+        
+        # Rows are patched in place, so a rebuild still filling in is finished first
+        if self.fill_after_id is not None:
+            self.root.after_cancel(self.fill_after_id)
+            self.fill_student_list(everything=True)
+        
+        # Keep rows sorted by ID
+        index = bisect.bisect_left(self.tree_ids, student_id)
+        listed = index < len(self.tree_ids) and self.tree_ids[index] == student_id
+        item_id = str(student_id)
+        
+        if student_id in self.students:
+            if not listed:
+                self.tree_ids.insert(index, student_id)
+                if not self.virtual_mode:
+                    self.tree.insert('', index, iid=item_id,
+                                     values=self.student_row_values(student_id))
+            elif not self.virtual_mode:
+                self.tree.item(item_id, values=self.student_row_values(student_id))
+        elif listed:
+            del self.tree_ids[index]
+            if not self.virtual_mode:
+                self.tree.delete(item_id)
+    
+    def student_row_values(self, student_id):
+        """Return the treeview column values for a student."""
+        
+        student = self.students[student_id]
+        return (
+            student_id,
+            student.name,
+            f"{student.total_marks:.1f}",
+            f"{student.percentage:.1f}%",
+            student.grade
+        )
+    
     def on_student_select(self, event):
         """Load selected student's data into the form when clicked in table."""
         
-        selection = self.tree.selection()
-        if selection:
+        if self.virtual_mode:
+            student_id = self.virtual_table.selected_key
+        else:
+            selection = self.tree.selection()
             # Get selected item data
-            item = self.tree.item(selection[0])
-            student_id = int(item['values'][0])
+            student_id = self.tree.item(selection[0])['values'][0] if selection else None
+        
+        if student_id is not None:
+            self.show_student_in_form(int(student_id))
+    
+    def on_search_select(self, event):
+        """Load the search result clicked in the list into the form."""
+        
+        selection = self.search_results.curselection()
+        if selection and selection[0] < len(self.search_ids):
+            self.show_student_in_form(self.search_ids[selection[0]])
+    
+    def show_student_in_form(self, student_id):
+        """Load a student's data into the form."""
+        
+        # Check if student exists in dictionary
+        if student_id in self.students:
+            student = self.students[student_id]
             
-            # Check if student exists in dictionary
-            if student_id in self.students:
-                student = self.students[student_id]
-                
-                # Load data into form
-                self.id_var.set(str(student_id))
-                self.name_var.set(student.name)
-                
-                # Clear all marks first
-                for subject in self.subjects:
-                    self.marks_vars[subject].set('')
-                
-                # Set marks for subjects that have values
-                for subject, mark in student.marks.items():
-                    if subject in self.marks_vars:
-                        self.marks_vars[subject].set(str(mark))
+            # Load data into form
+            self.id_var.set(str(student_id))
+            self.name_var.set(student.name)
+            
+            # Clear all marks first
+            for subject in self.subjects:
+                self.marks_vars[subject].set('')
+            
+            # Set marks for subjects that have values
+            for subject, mark in student.marks.items():
+                if subject in self.marks_vars:
+                    self.marks_vars[subject].set(str(mark))
+    
+    def search_students(self):
+        """Show the students matching the search box as the user types."""
+        
+        self.search_results.delete(0, tk.END)
+        self.search_ids = []
+        if self.load_job is not None:
+            self.search_count_label.config(text="Search is available once loading finishes.")
+            return
+        
+        count, self.search_ids = self.index.search(self.search_var.get(), self.search_limit)
+        for student_id in self.search_ids:
+            student = self.students[student_id]
+            self.search_results.insert(
+                tk.END, f"{student_id:>8}  {student.name[:24]:<24} {student.grade:>3}")
+        
+        if count > len(self.search_ids):
+            self.search_count_label.config(
+                text=f"{count} matches (showing first {len(self.search_ids)})")
+        elif self.search_var.get().strip():
+            query = self.search_var.get().strip()
+            cohort = self.find_cohort(int(query)) if not count and query.isdigit() else None
+            if cohort is not None:
+                self.search_count_label.config(text=f"0 matches (student {query} is in "
+                                                    f"cohort {cohort})")
+            else:
+                self.search_count_label.config(text=f"{count} matches")
+        else:
+            self.search_count_label.config(text="")
     
     def clear_form(self):
         """Clear all input fields in the form."""
@@ -616,9 +1762,29 @@ class ResultManagementSystem:
             if response is None:  # Cancel
                 return
             elif response:  # Yes
-                self.save_to_file()
+                # Exit once the save is on disk (saves run in the background)
+                self.cancel_load()
+                self.status_label.config(text="Saving before exit...")
+                self.request_save(on_saved=self.exit_after_save)
+                return
         
         # Exit program
+        self.quit_program()
+    
+    def exit_after_save(self, error):
+        """Exit after the final save, unless it failed (the error was shown)."""
+        
+        if error is None:
+            self.quit_program()
+    
+    def quit_program(self):
+        """Stop background work and leave the main loop."""
+        
+        self.cancel_load()
+        self.cancel_export()
+        if self.import_job is not None:
+            self.import_job.cancel()
+        self.io.close()  # Wait for a running save to reach the disk
         self.root.quit()
 
 
@@ -631,8 +1797,8 @@ def main():
     # Create main window
     root = tk.Tk()
     
-    # Create application instance
-    app = ResultManagementSystem(root)
+    # Create application instance (optionally for a given data file or cohort shard)
+    app = ResultManagementSystem(root, *sys.argv[1:2])
     
     # Start main event loop
     root.mainloop()
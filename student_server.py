@@ -0,0 +1,617 @@
+"""
+Student Result Management System
+HTTP/JSON API
+EduTech Solutions
+
+Serves the records of a data file to many staff at once, without a
+display (started with "python student_cli.py serve"):
+    
+    GET  /students/{id}                   one student
+    GET  /students?offset=0&limit=100     students in ID order; &grade=A lists one grade
+    GET  /search?q=smi&limit=50           the GUI search syntax (ID, grade:A, 80-90, name)
+    GET  /stats                           number of students and grade counts
+    POST /grade                           grade records without storing them
+    POST /students                        add or update students, saved to the data file
+
+Records have the layout of the data file plus the ID, e.g.
+{"id": 101, "name": "Ann", "marks": {"Mathematics": 90.0}, ...}; POST
+bodies are {"students": [records]} (only id, name and marks are read).
+
+Reads are answered from an immutable snapshot of the cohort (a store
+copy with its own search indexes), so any number of them can run while a
+write is in progress. The snapshot before the current one is kept as a
+spare: no reader can get it any more, so the next write batch patches
+just its changed students and their index entries into it and publishes
+it, instead of copying the whole cohort. Writes queue for a single writer, which applies
+every queued write as one batch on a worker thread, saves the changes
+with the data file's storage backend and then publishes a new snapshot.
+Saves go through DataFileSync: when another program saved to the data
+file since the server last read it, its changes are merged first (the
+server's writes win for students changed on both sides), so a save never
+overwrites them. A batch whose save fails is rolled back and its requests
+answered with an error, so nothing a client was told failed is saved later.
+Every GET response carries the snapshot's ETag; a request whose
+If-None-Match lists it (or is *) gets 304 Not Modified without a body.
+"""
+
+import asyncio
+import bisect
+import json
+import os
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from student_grading import DEFAULT_POLICY
+from student_import import parse_mark, parse_student_id
+from student_edits import EditBatch
+from student_index import StudentIndex
+from student_metrics import instrumented
+from student_sync import ConflictError, DataFileSync, FileLock, apply_records, store_digests
+from student_store import DEFAULT_SUBJECTS, StudentCollection, grade_records
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000            # Students returned by one list or search request
+MAX_BODY_BYTES = 16 * 1024 * 1024  # Largest POST body accepted
+KEEP_ALIVE_SECONDS = 30         # Idle connections are closed after this long
+LOAD_CHUNK_SIZE = 10000         # Records read at a time when the server starts
+SAVE_ATTEMPTS = 3               # Saves tried, merging other programs' changes in between
+COPY_FRACTION = 0.25            # Share of changed students above which a snapshot is copied
+
+STATUS_TEXT = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+               405: 'Method Not Allowed', 413: 'Payload Too Large',
+               500: 'Internal Server Error'}
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status and a JSON {"error": message} body."""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ============================================
+# READ SNAPSHOTS
+# ============================================
+class ResultSnapshot:
+    """
+    Read-only view of the cohort at one version, shared by every reader.
+    
+    A snapshot is only changed (by patch) once no reader can get it.
+    """
+    
+    def __init__(self, store, version, instance):
+        """
+        Args:
+            store (CohortStore): Copy of the store, only changed by patch
+            version (int): Number of writes published before this snapshot
+            instance (str): Identifies the server process in ETags
+        """
+        self.store = store
+        self.instance = instance
+        self.index = StudentIndex(store)
+        self.sorted_ids = array('q', sorted(store.rows))
+        self.code_counts = None  # Counter {grade code: students}, counted on first use
+        self.set_version(version)
+    
+    def set_version(self, version):
+        """Record the number of writes the snapshot includes."""
+        self.version = version
+        self.etag = f'"{self.instance}-{version}"'
+    
+    def patch(self, source, student_ids, version):
+        """
+        Copy some students' current records from the working store (writer thread).
+        
+        Args:
+            source (CohortStore): Working store, with current results
+            student_ids (set): Students changed since the snapshot was current
+            version (int): Number of writes published with the patched snapshot
+        """
+        store = self.store
+        counts = self.code_counts
+        for student_id in student_ids:
+            row = store.rows.get(student_id)
+            if row is not None and counts is not None:
+                counts[store.grade_codes[row]] -= 1
+            source_row = source.rows.get(student_id)
+            if source_row is None:
+                if row is not None:
+                    store.remove_student(student_id)
+                    del self.sorted_ids[bisect.bisect_left(self.sorted_ids, student_id)]
+                continue
+            if row is None:
+                bisect.insort(self.sorted_ids, student_id)
+            row = store.add_student(student_id, source.names[source_row],
+                                    source.row_marks(source_row))
+            store.set_results(row, source.total_marks[source_row], source.percentage[source_row],
+                              source.grade_labels[source.grade_codes[source_row]])
+            store.dirty_rows.discard(row)  # The results were copied with the marks
+            if counts is not None:
+                counts[store.grade_codes[row]] += 1
+        self.index.update()  # Only the changed rows, unless there are many
+        self.set_version(version)
+    
+    def record(self, student_id):
+        """Return a student's record with its ID, or None if there is no such student."""
+        store = self.store
+        row = store.rows.get(student_id)
+        if row is None:
+            return None
+        return {
+            'id': student_id,
+            'name': store.names[row],
+            'marks': store.row_marks(row),
+            'total_marks': store.total_marks[row],
+            'percentage': store.percentage[row],
+            'grade': store.grade_labels[store.grade_codes[row]]
+        }
+    
+    def page(self, offset, limit, grade=None):
+        """Return a page of students in ID order, or of one grade."""
+        if grade is None:
+            total = len(self.sorted_ids)
+            student_ids = self.sorted_ids[offset:offset + limit]
+        else:
+            total, student_ids = self.index.find_by_grade(grade, offset + limit)
+            student_ids = student_ids[offset:]
+        return {'total': total, 'offset': offset, 'limit': limit,
+                'students': [self.record(student_id) for student_id in student_ids]}
+    
+    def search(self, query, limit):
+        """Run a GUI-style search."""
+        total, student_ids = self.index.search(query, limit)
+        return {'total': total, 'students': [self.record(student_id)
+                                             for student_id in student_ids
+                                             if student_id in self.store.rows]}
+    
+    def stats(self):
+        """Return the number of students and the grade counts."""
+        store = self.store
+        if self.code_counts is None:
+            self.code_counts = Counter(store.grade_codes[row] for row in store.rows.values())
+        return {'students': len(store), 'version': self.version,
+                'grades': {store.grade_labels[code]: count
+                           for code, count in sorted(self.code_counts.items()) if count}}
+
+
+# ============================================
+# SERVER
+# ============================================
+class ResultServer:
+    """asyncio HTTP server over one data file."""
+    
+    def __init__(self, data_file, policy=DEFAULT_POLICY, subjects=DEFAULT_SUBJECTS):
+        """
+        Args:
+            data_file (str): Data file to serve and save writes to
+            policy (GradingPolicy): How marks are turned into results
+            subjects (list): Subject columns of the cohort
+        """
+        self.data_file = data_file
+        self.policy = policy
+        self.subjects = list(subjects)
+        self.sync = DataFileSync(data_file)  # Owned by the writer
+        self.storage = self.sync.storage
+        self.students = StudentCollection(self.subjects)  # Owned by the writer
+        self.students.store.track_changes('unsaved')
+        self.instance = f"{os.getpid():x}-{os.urandom(4).hex()}"
+        self.version = 0
+        self.snapshot = None
+        self.spare = None          # Snapshot before the current one, patched for the next
+        self.spare_changes = set()  # Students changed in the current snapshot but not the spare
+        self.writes = None    # asyncio.Queue of (records, future), created by start()
+        self.writer_task = None
+        self.server = None
+        # One thread applies and saves writes; grading requests get their own
+        self.write_executor = ThreadPoolExecutor(max_workers=1)
+        self.grade_executor = ThreadPoolExecutor(max_workers=2)
+    
+    def load(self):
+        """Read the data file and publish the first snapshot."""
+        store = self.students.store
+        store.track_changes('publish')
+        # Under the shared lock the version is that of the records read
+        with FileLock(self.data_file, exclusive=False):
+            version = self.storage.version()
+            if self.storage.exists():
+                stream = self.storage.read()
+                try:
+                    while stream.load_into(store, LOAD_CHUNK_SIZE) == LOAD_CHUNK_SIZE:
+                        pass
+                finally:
+                    stream.close()
+        self.sync.reset(store_digests(store), version)
+        store.pop_changes('unsaved')
+        # Results stored with another policy are re-graded and saved with the next write
+        store.set_policy(self.policy)
+        self.students.calculate_all()
+        store.pop_changes('publish')
+        self.snapshot = ResultSnapshot(store.copy(), self.version, self.instance)
+    
+    def _publish(self):
+        """
+        Return the next snapshot of the working collection (writer thread).
+        
+        Called before the current snapshot is replaced, so the spare cannot
+        be read any more: it is patched with the students changed since it
+        was current. Without a spare, or when much of the cohort changed,
+        the store is copied instead.
+        """
+        store = self.students.store
+        changed = store.pop_changes('publish')
+        spare = self.spare
+        pending = changed | self.spare_changes
+        if spare is None or len(pending) > len(store) * COPY_FRACTION:
+            snapshot = ResultSnapshot(store.copy(), self.version, self.instance)
+        else:
+            try:
+                spare.patch(store, pending, self.version)
+            except BaseException:
+                self.spare = None  # Half patched; the next snapshot is copied
+                raise
+            snapshot = spare
+        self.spare, self.spare_changes = self.snapshot, changed
+        return snapshot
+    
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Load the data file and start accepting connections."""
+        loop = asyncio.get_running_loop()
+        if self.snapshot is None:
+            await loop.run_in_executor(self.write_executor, self.load)
+        self.writes = asyncio.Queue()
+        self.writer_task = asyncio.create_task(self._writer())
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+    
+    async def close(self):
+        """Stop accepting connections and finish the queued writes."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.writer_task is not None:
+            await self.writes.join()
+            self.writer_task.cancel()
+        self.write_executor.shutdown()
+        self.grade_executor.shutdown()
+    
+    @property
+    def port(self):
+        """Port the server listens on (useful when started on port 0)."""
+        return self.server.sockets[0].getsockname()[1]
+    
+    # ============================================
+    # SINGLE WRITER
+    # ============================================
+    async def _writer(self):
+        """Apply queued writes in batches, one batch at a time."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.writes.get()]
+            while not self.writes.empty():
+                batch.append(self.writes.get_nowait())
+            try:
+                results, snapshot = await loop.run_in_executor(
+                    self.write_executor, self._apply_writes, [records for records, _ in batch])
+            except Exception as error:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+            else:
+                self.snapshot = snapshot
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            for _ in batch:
+                self.writes.task_done()
+    
+    @instrumented('server_write')
+    def _apply_writes(self, batch):
+        """
+        Apply a batch of writes, save them and build the next snapshot (writer thread).
+        
+        Args:
+            batch (list): Validated record lists, one per request
+        
+        Returns:
+            tuple: ([{'added', 'updated'} per request], ResultSnapshot)
+        """
+        students = self.students
+        store = students.store
+        pending = store.pop_changes('unsaved')  # Re-graded by a merge, saved with the batch
+        edits = EditBatch(store)
+        results = []
+        for records in batch:
+            added = updated = 0
+            for student_id, name, marks in records:
+                if student_id in store.rows:
+                    edits.update_student(student_id, name, marks)
+                    updated += 1
+                else:
+                    edits.add_student(student_id, name, marks)
+                    added += 1
+            results.append({'added': added, 'updated': updated})
+        
+        students.calculate_all()
+        changed_ids = pending | store.pop_changes('unsaved')
+        try:
+            self._save(changed_ids)
+        except Exception:
+            # The requests get an error, so the batch must not be saved with a later one
+            edited_ids = set(edits.before)
+            edits.rollback()
+            students.calculate_all()
+            store.discard_changes(edited_ids, 'unsaved')
+            store.add_changes(pending, 'unsaved')  # Saved with the next write
+            raise
+        self.version += 1
+        snapshot = self._publish()
+        for result in results:
+            result['version'] = self.version
+        return results, snapshot
+    
+    def _save(self, changed_ids):
+        """
+        Save the changed students, merging other programs' saves first (writer thread).
+        
+        Raises:
+            ConflictError: If other programs kept saving in between every attempt
+        """
+        for _ in range(SAVE_ATTEMPTS - 1):
+            try:
+                return self.sync.save(self.students, changed_ids)
+            except ConflictError:
+                self._merge_external(changed_ids)
+        return self.sync.save(self.students, changed_ids)
+    
+    def _merge_external(self, changed_ids):
+        """
+        Merge the students other programs saved since the last read (writer thread).
+        
+        Args:
+            changed_ids (set): Students about to be saved; their records are kept
+        """
+        changes = self.sync.read_changes()
+        if not changes:
+            return
+        store = self.students.store
+        incoming = {student_id: record for student_id, record in changes.records.items()
+                    if student_id not in changed_ids}
+        apply_records(store, incoming)
+        store.discard_changes(incoming, 'unsaved')  # They are on disk already
+        # Results stored with another policy are re-graded and saved with the next write
+        self.students.calculate_all()
+    
+    # ============================================
+    # HTTP
+    # ============================================
+    async def _handle_connection(self, reader, writer):
+        """Answer requests on one connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "Malformed request line"},
+                                        keep_alive=False)
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1'
+                                                        or connection == 'keep-alive')
+                status, body, etag = await self._dispatch(method, target, headers, reader)
+                await self._respond(writer, status, body, etag, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _dispatch(self, method, target, headers, reader):
+        """
+        Route a request.
+        
+        Returns:
+            tuple: (status, JSON-serializable body or None, ETag or None)
+        """
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+            if length > MAX_BODY_BYTES:
+                raise HTTPError(413, f"Request bodies are limited to {MAX_BODY_BYTES} bytes")
+            body = await reader.readexactly(length) if length else b''
+            
+            url = urlsplit(target)
+            path = unquote(url.path).rstrip('/') or '/'
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            
+            if method == 'GET':
+                # Everything a GET returns is fixed by the snapshot, so its
+                # version is the ETag and a match needs no body at all
+                snapshot = self.snapshot
+                if etag_matches(headers.get('if-none-match'), snapshot.etag):
+                    return 304, None, snapshot.etag
+                return 200, self._get(snapshot, path, query), snapshot.etag
+            if method == 'POST':
+                if path == '/students':
+                    return 200, await self._write(parse_body(body), self.policy), None
+                if path == '/grade':
+                    return 200, await self._grade(parse_body(body)), None
+                raise HTTPError(404, f"No such resource: {path}")
+            raise HTTPError(405, f"Method {method} is not supported")
+        except HTTPError as error:
+            return error.status, {'error': str(error)}, None
+        except Exception as error:
+            return 500, {'error': f"{type(error).__name__}: {error}"}, None
+    
+    def _get(self, snapshot, path, query):
+        """Answer a GET request from a snapshot."""
+        if path.startswith('/students/'):
+            student_id = parse_query_int(path[len('/students/'):], "Student ID")
+            record = snapshot.record(student_id)
+            if record is None:
+                raise HTTPError(404, f"Student ID {student_id} not found")
+            return record
+        if path == '/students':
+            offset = max(0, parse_query_int(query.get('offset', 0), "offset"))
+            return snapshot.page(offset, page_limit(query), query.get('grade'))
+        if path == '/search':
+            return snapshot.search(query.get('q', ''), page_limit(query))
+        if path == '/stats':
+            return snapshot.stats()
+        raise HTTPError(404, f"No such resource: {path}")
+    
+    async def _write(self, records, policy):
+        """Validate records and queue them for the writer; wait until they are saved."""
+        validated = []
+        errors = []
+        for position, record in enumerate(records):
+            try:
+                validated.append(validate_record(record, policy))
+            except (TypeError, ValueError) as error:
+                errors.append({'index': position, 'error': str(error)})
+        if errors:
+            raise HTTPError(400, f"{len(errors)} invalid students, nothing was saved: "
+                                 + "; ".join(f"#{error['index']}: {error['error']}"
+                                             for error in errors[:20]))
+        
+        future = asyncio.get_running_loop().create_future()
+        await self.writes.put((validated, future))
+        return await future
+    
+    async def _grade(self, records):
+        """Grade records with the server's policy without storing them."""
+        validated = []
+        for position, record in enumerate(records):
+            try:
+                validated.append(validate_record(record, self.policy))
+            except (TypeError, ValueError) as error:
+                raise HTTPError(400, f"#{position}: {error}")
+        graded = await asyncio.get_running_loop().run_in_executor(
+            self.grade_executor, grade_records,
+            [(student_id, {'name': name, 'marks': marks}) for student_id, name, marks in validated],
+            self.subjects, self.policy)
+        return {'students': [dict({'id': student_id}, **record) for student_id, record in graded]}
+    
+    async def _respond(self, writer, status, body, etag=None, keep_alive=True):
+        """Write an HTTP response with a JSON body."""
+        payload = b'' if body is None else json.dumps(body).encode('utf-8')
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+                 f"Content-Length: {len(payload)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        if etag is not None:
+            lines.append(f"ETag: {etag}")
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload)
+        await writer.drain()
+
+
+# ============================================
+# REQUEST PARSING
+# ============================================
+def parse_body(body):
+    """Return the student records of a POST body ({"students": [...]} or a list)."""
+    try:
+        data = json.loads(body or b'null')
+    except ValueError as error:
+        raise HTTPError(400, f"Body is not valid JSON: {error}")
+    if isinstance(data, dict):
+        data = data.get('students')
+    if not isinstance(data, list):
+        raise HTTPError(400, 'Body must be {"students": [...]}')
+    return data
+
+
+def etag_matches(header, etag):
+    """
+    Return True if an If-None-Match header lists an ETag.
+    
+    The header is a comma-separated list of ETags, or * for any. ETags
+    are compared weakly, as RFC 9110 asks for If-None-Match: a W/ prefix
+    is ignored.
+    """
+    if not header:
+        return False
+    for tag in header.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def parse_query_int(value, label):
+    """Return an integer from a URL, or raise HTTPError 400."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"{label} must be a number, got {value!r}")
+
+
+def page_limit(query):
+    """Return the limit query parameter, between 1 and MAX_PAGE_SIZE."""
+    limit = parse_query_int(query.get('limit', DEFAULT_PAGE_SIZE), "limit")
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def validate_record(record, policy):
+    """
+    Check a posted student with the rules of the Add Student form.
+    
+    Returns:
+        tuple: (student_id, name, {subject: mark})
+    
+    Raises:
+        ValueError: If the record is invalid
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Each student must be a JSON object")
+    student_id = parse_student_id(str(record.get('id', '')))
+    name = str(record.get('name') or '').strip()
+    if not name:
+        raise ValueError(f"Student {student_id}: name is missing")
+    marks = record.get('marks') or {}
+    if not isinstance(marks, dict):
+        raise ValueError(f"Student {student_id}: marks must be an object")
+    return student_id, name, {subject: parse_mark(subject, mark, policy.maximum(subject))
+                              for subject, mark in marks.items()}
+
+
+def serve(data_file, host=DEFAULT_HOST, port=DEFAULT_PORT, policy=DEFAULT_POLICY):
+    """Run the server until interrupted (Ctrl+C)."""
+    async def run():
+        server = ResultServer(data_file, policy)
+        await server.start(host, port)
+        print(f"Serving {len(server.snapshot.store)} students from {data_file} "
+              f"on http://{host}:{server.port}/")
+        try:
+            await server.server.serve_forever()
+        finally:
+            await server.close()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file
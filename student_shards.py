@@ -0,0 +1,515 @@
+"""
+Student Result Management System
+Cohort Shards
+EduTech Solutions
+
+A deployment with many classes and years keeps each cohort (e.g. a class
+in a term) in its own compressed shard, in one directory with a small
+manifest:
+    
+    student_data.cohorts/
+        manifest.json           cohorts, shard sizes and student ID ranges
+        2026 10A.jsonl.z        one JSON record per line, zlib-compressed
+        2025 10A.jsonl.xz       the same, lzma-compressed (smaller, slower)
+
+A shard is an ordinary data file for open_storage, so the GUI, the
+command-line tool and the server load, save and watch one cohort exactly
+as they do a single data file, and only the cohort being viewed is read.
+The manifest keeps each cohort's student IDs as ranges of consecutive
+IDs, so finding the cohort of a student reads the manifest, never the
+shards, and a student ID can only be in one cohort.
+
+Recently viewed cohorts stay in memory in a ShardCache, which drops the
+least recently used ones beyond a memory budget.
+"""
+
+import bisect
+import json
+import lzma
+import os
+import re
+import tempfile
+import zlib
+from collections import OrderedDict
+
+from student_files import iter_student_records, student_record
+from student_journal import DEFAULT_FILE_MODE, sync_directory
+from student_storage import RecordStream, StorageBackend
+from student_sync import FileLock
+
+COHORTS_SUFFIX = '.cohorts'       # Directory of shards, e.g. student_data.cohorts
+MANIFEST_NAME = 'manifest.json'
+SHARD_SUFFIX = '.jsonl'           # Shard records are JSON lines ...
+COMPRESSIONS = {'zlib': '.z', 'lzma': '.xz'}  # ... compressed, by file extension
+DEFAULT_COMPRESSION = 'zlib'      # Fast to read; lzma is smaller but slower
+COMPRESS_LEVEL = 6                # zlib level (lzma uses its default preset)
+WRITE_CHUNK_SIZE = 1 << 20        # Bytes of records compressed at a time
+READ_CHUNK_SIZE = 256 * 1024      # Compressed bytes read at a time
+STUDENT_MEMORY_BYTES = 300        # Estimated memory per student besides the marks
+COHORT_NAME = re.compile(r'^\w[\w .-]*$')  # No path separators
+
+
+def is_shard_file(data_file):
+    """Return True if a data file is a cohort shard."""
+    return data_file.lower().endswith(tuple(SHARD_SUFFIX + extension
+                                            for extension in COMPRESSIONS.values()))
+
+
+def shard_compression(data_file):
+    """Return the compression of a shard ('zlib' or 'lzma'), from its extension."""
+    for compression, extension in COMPRESSIONS.items():
+        if data_file.lower().endswith(extension):
+            return compression
+    raise ValueError(f"Not a cohort shard: {data_file}")
+
+
+def cohort_name(data_file):
+    """Return the cohort a shard holds, e.g. '2026 10A' for '2026 10A.jsonl.z'."""
+    name = os.path.basename(data_file)
+    return name[:name.lower().rindex(SHARD_SUFFIX)]
+
+
+def cohort_directory(data_file):
+    """
+    Return the shard directory of a data file: the directory of a shard,
+    else the one named after the data file (student_data.cohorts).
+    """
+    if is_shard_file(data_file):
+        return os.path.dirname(os.path.abspath(data_file))
+    return os.path.splitext(data_file)[0] + COHORTS_SUFFIX
+
+
+def shard_path(directory, cohort, compression=DEFAULT_COMPRESSION):
+    """
+    Return the path of a cohort's shard.
+    
+    Raises:
+        ValueError: If the cohort name cannot be a file name or the
+            compression is unknown
+    """
+    cohort = cohort.strip()
+    if not COHORT_NAME.match(cohort):
+        raise ValueError(f"Invalid cohort name {cohort!r}: use letters, digits, "
+                         f"spaces, '.', '-' and '_'")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}: use "
+                         f"{' or '.join(COMPRESSIONS)}")
+    return os.path.join(directory, cohort + SHARD_SUFFIX + COMPRESSIONS[compression])
+
+
+def id_ranges(student_ids):
+    """
+    Return sorted student IDs as [first, last] ranges of consecutive IDs.
+    
+    IDs are usually handed out in blocks, so a cohort needs only a few
+    ranges however many students it has.
+    """
+    ranges = []
+    for student_id in student_ids:
+        if ranges and student_id == ranges[-1][1] + 1:
+            ranges[-1][1] = student_id
+        else:
+            ranges.append([student_id, student_id])
+    return ranges
+
+
+def store_memory(store):
+    """Return an estimate of the bytes a CohortStore takes in memory."""
+    return (len(store.marks) * store.marks.itemsize
+            + len(store.ids) * (2 * store.total_marks.itemsize + STUDENT_MEMORY_BYTES))
+
+
+def temp_file(path):
+    """
+    Create a temporary file next to a file it will atomically replace.
+    
+    mkstemp creates the file private to the user, so it gets the old
+    file's permissions (other machines' users share the cohorts).
+    
+    Returns:
+        tuple: (OS-level handle, path of the temporary file)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = DEFAULT_FILE_MODE
+    os.chmod(temp_path, mode)
+    return handle, temp_path
+
+
+# ============================================
+# MANIFEST
+# ============================================
+class ShardManifest:
+    """Cohorts of a shard directory, with each shard's size and student ID ranges."""
+    
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Shard directory
+        """
+        self.directory = directory
+        self.shards = {}      # Dictionary {cohort: {'file', 'compression', 'students', 'bytes', 'ranges'}}
+        self._lookup = None   # Sorted (first, last, cohort) of every range, built when needed
+    
+    @property
+    def path(self):
+        return os.path.join(self.directory, MANIFEST_NAME)
+    
+    @classmethod
+    def load(cls, directory):
+        """
+        Read the manifest of a shard directory (empty if there is none yet).
+        
+        Raises:
+            ValueError: If the manifest is not valid
+        """
+        manifest = cls(directory)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return manifest
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid cohort manifest {manifest.path}: {e}")
+        try:
+            for cohort, shard in data['shards'].items():
+                shard['ranges'] = [[int(first), int(last)] for first, last in shard['ranges']]
+                manifest.shards[cohort] = shard
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cohort manifest {manifest.path}: {e}")
+        return manifest
+    
+    def cohorts(self):
+        """Return the cohort names, sorted."""
+        return sorted(self.shards)
+    
+    def shard_file(self, cohort):
+        """Return the path of a cohort's shard (a new cohort uses the default compression)."""
+        shard = self.shards.get(cohort)
+        if shard is not None:
+            return os.path.join(self.directory, shard['file'])
+        return shard_path(self.directory, cohort)
+    
+    def find(self, student_id):
+        """
+        Return the cohort a student is in, None if the student is in none.
+        
+        Uses the ID ranges only (binary search), no shard is opened.
+        """
+        if self._lookup is None:
+            self._lookup = sorted((first, last, cohort)
+                                  for cohort, shard in self.shards.items()
+                                  for first, last in shard['ranges'])
+        index = bisect.bisect_right(self._lookup, (student_id, float('inf'))) - 1
+        if index >= 0:
+            first, last, cohort = self._lookup[index]
+            if first <= student_id <= last:
+                return cohort
+        return None
+    
+    def overlap(self, cohort, ranges):
+        """
+        Return (student_id, other cohort) of an ID the ranges share with
+        another cohort, None if they share none.
+        """
+        for first, last in ranges:
+            for other, shard in self.shards.items():
+                if other == cohort:
+                    continue
+                for other_first, other_last in shard['ranges']:
+                    if other_first <= last and first <= other_last:
+                        return max(first, other_first), other
+        return None
+    
+    def set_shard(self, cohort, data_file, students, ranges, size):
+        """Record the size and student IDs of a cohort's shard (None removes it)."""
+        if data_file is None:
+            self.shards.pop(cohort, None)
+        else:
+            self.shards[cohort] = {
+                'file': os.path.basename(data_file),
+                'compression': shard_compression(data_file),
+                'students': students,
+                'bytes': size,
+                'ranges': ranges
+            }
+        self._lookup = None
+    
+    def to_dict(self):
+        """Return the manifest as a JSON-serializable dictionary."""
+        return {'version': 1, 'shards': self.shards}
+    
+    def save(self):
+        """Atomically write the manifest."""
+        handle, temp_path = temp_file(self.path)
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8') as file:
+                json.dump(self.to_dict(), file, indent=1, sort_keys=True)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        sync_directory(self.directory)
+
+
+_manifests = {}  # Dictionary {directory: (manifest file stat, ShardManifest)}
+
+
+def read_manifest(directory):
+    """
+    Return the manifest of a shard directory, re-read only when the file changed.
+    
+    The result is shared and must not be modified; use ShardManifest.load
+    to change a manifest.
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    try:
+        stat = os.stat(path)
+        key = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        key = None
+    cached = _manifests.get(directory)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    manifest = ShardManifest.load(directory)
+    _manifests[directory] = (key, manifest)
+    return manifest
+
+
+# ============================================
+# SHARD STORAGE
+# ============================================
+def _compressor(compression):
+    if compression == 'lzma':
+        return lzma.LZMACompressor()
+    return zlib.compressobj(COMPRESS_LEVEL)
+
+
+def _decompressor(compression):
+    if compression == 'lzma':
+        return lzma.LZMADecompressor()
+    return zlib.decompressobj()
+
+
+class ShardStorage(StorageBackend):
+    """
+    One cohort's compressed shard, a storage backend like any data file.
+    
+    A shard is small (one class or term), so a save rewrites it whole and
+    atomically, then updates the manifest; the manifest lock keeps two
+    programs from recording the same student ID in two cohorts.
+    """
+    
+    def __init__(self, data_file):
+        super().__init__(data_file)
+        self.directory = os.path.dirname(os.path.abspath(data_file))
+        self.cohort = cohort_name(data_file)
+        self.compression = shard_compression(data_file)
+    
+    def exists(self):
+        return os.path.exists(self.data_file)
+    
+    def count(self):
+        shard = read_manifest(self.directory).shards.get(self.cohort)
+        if shard is not None and shard['file'] == os.path.basename(self.data_file):
+            return shard['students']
+        return super().count()
+    
+    def read(self):
+        if not self.exists():
+            return RecordStream([])
+        file = open(self.data_file, 'rb')
+        total = os.path.getsize(self.data_file)
+        
+        def records():
+            decompressor = _decompressor(self.compression)
+            pending = b''
+            try:
+                while True:
+                    chunk = file.read(READ_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    lines = (pending + decompressor.decompress(chunk)).split(b'\n')
+                    pending = lines.pop()  # Incomplete last line
+                    for line in lines:
+                        record = json.loads(line)
+                        yield int(record.pop('id')), record
+                # A shard cut at a line boundary has no partial line, but
+                # its compressed stream has no end marker
+                if pending.strip() or not decompressor.eof:
+                    raise ValueError(f"Truncated cohort shard: {self.data_file}")
+            finally:
+                file.close()
+        
+        return RecordStream(
+            records(),
+            progress=lambda: file.tell() / total if total and not file.closed else 1.0,
+            close=file.close
+        )
+    
+    def save(self, students, changed_ids, complete=True):
+        if not changed_ids:
+            return 0
+        if complete:
+            self.write_records(iter_student_records(students))
+            return len(changed_ids)
+        # Only the changed students were given: merge them with the shard
+        merged = {}
+        stream = self.read()
+        try:
+            merged.update(stream)
+        finally:
+            stream.close()
+        for student_id in changed_ids:
+            if student_id in students:
+                merged[student_id] = student_record(students[student_id])
+            else:
+                merged.pop(student_id, None)
+        self.write_records(sorted(merged.items()))
+        return len(changed_ids)
+    
+    def save_records(self, records):
+        merged = {}
+        stream = self.read()
+        try:
+            merged.update(stream)
+        finally:
+            stream.close()
+        merged.update(records)
+        self.write_records(sorted(merged.items()))
+    
+    def write_records(self, records):
+        """
+        Write the shard and record its students in the manifest.
+        
+        Raises:
+            ValueError: If a student ID is already in another cohort (the
+                shard is then left unchanged)
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with FileLock(os.path.join(self.directory, MANIFEST_NAME)):
+            handle, temp_path = temp_file(self.data_file)
+            claimed = False
+            try:
+                with os.fdopen(handle, 'wb') as file:
+                    student_ids = self._write(file, records)
+                    file.flush()
+                    os.fsync(file.fileno())
+                
+                ranges = id_ranges(sorted(student_ids))
+                manifest = ShardManifest.load(self.directory)
+                shared = manifest.overlap(self.cohort, ranges)
+                if shared is not None:
+                    raise ValueError(f"Student ID {shared[0]} is already in cohort {shared[1]!r}")
+                old_shard = manifest.shards.get(self.cohort)
+                # The manifest claims the new IDs before the shard holds them:
+                # after a crash in between it over-reserves IDs, never misses one
+                manifest.set_shard(self.cohort, self.data_file, len(student_ids), ranges,
+                                   os.path.getsize(temp_path))
+                claimed = True
+                manifest.save()
+                os.replace(temp_path, self.data_file)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                if claimed:
+                    self._restore_manifest(manifest, old_shard)
+                raise
+    
+    def _restore_manifest(self, manifest, old_shard):
+        """Put back the manifest entry of a shard whose replacement failed."""
+        if old_shard is None:
+            manifest.set_shard(self.cohort, None, 0, [], 0)
+        else:
+            manifest.shards[self.cohort] = old_shard
+            manifest._lookup = None
+        try:
+            manifest.save()
+        except OSError:
+            pass  # The entry still covers the new IDs, so no duplicate gets through
+    
+    def _write(self, file, records):
+        """Compress records as JSON lines into a binary file and return their IDs."""
+        compressor = _compressor(self.compression)
+        student_ids = []
+        lines = []
+        size = 0
+        for student_id, record in records:
+            student_ids.append(student_id)
+            line = {'id': student_id}
+            line.update(record)
+            lines.append(json.dumps(line, sort_keys=True, separators=(',', ':')))
+            size += len(lines[-1])
+            if size >= WRITE_CHUNK_SIZE:
+                file.write(compressor.compress(('\n'.join(lines) + '\n').encode('utf-8')))
+                lines = []
+                size = 0
+        if lines:
+            file.write(compressor.compress(('\n'.join(lines) + '\n').encode('utf-8')))
+        file.write(compressor.flush())
+        return student_ids
+
+
+# ============================================
+# RECENTLY VIEWED COHORTS
+# ============================================
+class ShardCache:
+    """
+    Cohorts kept in memory after they were viewed, within a memory budget.
+    
+    Switching back to a cached cohort needs no reading at all. When the
+    cached cohorts take more than the budget, the least recently viewed
+    are dropped (they are saved before they are cached, so nothing is lost).
+    """
+    
+    def __init__(self, budget_bytes):
+        """
+        Args:
+            budget_bytes (int): Most memory the cached cohorts may take (estimated)
+        """
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()  # {key: (value, bytes)}, least recently used first
+        self.total_bytes = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __contains__(self, key):
+        return key in self.entries
+    
+    def put(self, key, value, size):
+        """
+        Cache a value, dropping the least recently used ones beyond the budget.
+        
+        Returns:
+            list: Keys dropped from the cache
+        """
+        self.take(key)
+        self.entries[key] = (value, size)
+        self.total_bytes += size
+        dropped = []
+        while self.total_bytes > self.budget_bytes and self.entries:
+            old_key, (_, old_size) = self.entries.popitem(last=False)
+            self.total_bytes -= old_size
+            dropped.append(old_key)
+        return dropped
+    
+    def take(self, key):
+        """Remove a value from the cache and return it (None if it is not cached)."""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return None
+        self.total_bytes -= entry[1]
+        return entry[0]
+    
+    def clear(self):
+        """Drop every cached value."""
+        self.entries.clear()
+        self.total_bytes = 0
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""
+Student Result Management System
+Binary Snapshot Format
+EduTech Solutions
+
+A memory-mapped alternative to the JSON snapshot, used for data files
+ending in .snap. The file is laid out as:
+    
+    header        magic, version, counts and section offsets
+    record table  one fixed-size record per student, in ascending ID order:
+                  id, name offset, name length, grade code,
+                  total marks, percentage, marks[subjects] (NaN = missing)
+    string heap   UTF-8 names, subject names and grade letters
+    tables        (offset, length) of each subject name and grade letter
+
+All numbers are little-endian. Opening a snapshot only maps the file and
+reads the header, so it takes the same few milliseconds for 100 or
+1,000,000 students; records are decoded when they are read. Convert to
+and from the JSON layout with the storage converter:
+    
+    python student_storage.py student_data.json student_data.snap
+    python student_storage.py student_data.snap student_data.json
+"""
+
+import marshal
+import math
+import mmap
+import struct
+import tempfile
+from array import array
+
+MAGIC = b'SRSNAP\x00\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sIIIIQQQQ')   # See StudentSnapshot.__init__ for the fields
+STRING_REF = struct.Struct('<QI4x')     # Offset into the heap, length in bytes
+RECORD_HEAD = '<qQIB3xdd'               # id, name offset, name length, grade, total, percentage
+WRITE_BUFFER_SIZE = 1 << 20             # Bytes of records written at a time
+
+
+def record_struct(width):
+    """Return the Struct of one record with a number of subject columns."""
+    return struct.Struct(RECORD_HEAD + 'd' * width)
+
+
+# ============================================
+# WRITING
+# ============================================
+def write_snapshot(file, records, subjects=None):
+    """
+    Write records to a binary snapshot.
+    
+    Args:
+        file: Binary file opened for writing, must be seekable
+        records (iterable): (student_id, record) pairs in ascending ID order
+        subjects (list): Every subject the records use, in column order.
+            If not given, the records are spooled to a temporary file
+            first to find the subjects.
+    
+    Returns:
+        int: Number of records written
+    """
+    if subjects is None:
+        return _write_spooled(file, records)
+    
+    subjects = list(subjects)
+    columns = {subject: column for column, subject in enumerate(subjects)}
+    record = record_struct(len(subjects))
+    grade_labels = []
+    grade_codes = {}
+    heap = bytearray()
+    buffer = bytearray()
+    count = 0
+    
+    file.write(bytes(HEADER.size))  # Filled in once the counts are known
+    for student_id, data in records:
+        marks = [math.nan] * len(subjects)
+        for subject, mark in data['marks'].items():
+            if subject not in columns:
+                raise ValueError(f"Subject {subject!r} is not in the snapshot's subjects")
+            marks[columns[subject]] = mark
+        
+        grade = grade_codes.get(data['grade'])
+        if grade is None:
+            grade = grade_codes[data['grade']] = len(grade_labels)
+            grade_labels.append(data['grade'])
+        
+        name = data['name'].encode('utf-8')
+        buffer += record.pack(student_id, len(heap), len(name), grade,
+                              data['total_marks'], data['percentage'], *marks)
+        heap += name
+        count += 1
+        if len(buffer) >= WRITE_BUFFER_SIZE:
+            file.write(buffer)
+            buffer.clear()
+    file.write(buffer)
+    
+    # Subject names and grade letters go in the heap after the names
+    tables = bytearray()
+    for text in subjects + grade_labels:
+        encoded = text.encode('utf-8')
+        tables += STRING_REF.pack(len(heap), len(encoded))
+        heap += encoded
+    
+    heap_offset = HEADER.size + count * record.size
+    file.write(heap)
+    file.write(tables)
+    file.seek(0)
+    file.write(HEADER.pack(MAGIC, VERSION, len(subjects), len(grade_labels), record.size,
+                           count, HEADER.size, heap_offset, heap_offset + len(heap)))
+    file.seek(0, 2)
+    return count
+
+
+def _write_spooled(file, records):
+    """Write records whose subjects are not known up front."""
+    subjects = []
+    seen = set()
+    with tempfile.TemporaryFile() as spool:
+        for student_id, data in records:
+            for subject in data['marks']:
+                if subject not in seen:
+                    seen.add(subject)
+                    subjects.append(subject)
+            marshal.dump((student_id, data['name'], data['marks'], data['total_marks'],
+                          data['percentage'], data['grade']), spool)
+        
+        def spooled():
+            spool.seek(0)
+            while True:
+                try:
+                    student_id, name, marks, total_marks, percentage, grade = marshal.load(spool)
+                except EOFError:
+                    return
+                yield student_id, {'name': name, 'marks': marks, 'total_marks': total_marks,
+                                   'percentage': percentage, 'grade': grade}
+        
+        return write_snapshot(file, spooled(), subjects)
+
+
+# ============================================
+# READING
+# ============================================
+class StudentSnapshot:
+    """Memory-mapped binary snapshot, read one record at a time."""
+    
+    def __init__(self, file_path):
+        """
+        Map a snapshot file.
+        
+        Args:
+            file_path (str): Path of a .snap file
+        
+        Raises:
+            ValueError: If the file is not a snapshot
+        """
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            (magic, version, subject_count, grade_count, record_size, self.count,
+             self.records_offset, self.heap_offset, tables_offset) = HEADER.unpack_from(self._map)
+        except (ValueError, OSError, struct.error):
+            self._file.close()
+            raise ValueError(f"{file_path} is not a student snapshot file")
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{file_path} is not a version {VERSION} student snapshot file")
+        
+        strings = [self._string(*STRING_REF.unpack_from(self._map, tables_offset + index * STRING_REF.size))
+                   for index in range(subject_count + grade_count)]
+        self.subjects = strings[:subject_count]
+        self.grade_labels = strings[subject_count:]
+        self.record = record_struct(subject_count)
+        if self.record.size != record_size:
+            self.close()
+            raise ValueError(f"{file_path} has an unexpected record size")
+        self.position = 0  # Index of the next record read by iteration
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return self._iter_records()
+    
+    @property
+    def progress(self):
+        """Fraction of the records read so far (0.0 - 1.0)."""
+        return self.position / self.count if self.count else 1.0
+    
+    def close(self):
+        """Unmap and close the file."""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+    
+    def _string(self, offset, length):
+        """Decode a string from the heap."""
+        start = self.heap_offset + offset
+        return self._map[start:start + length].decode('utf-8')
+    
+    # ============================================
+    # RANDOM ACCESS
+    # ============================================
+    def read_record(self, index):
+        """
+        Decode the record at an index.
+        
+        Returns:
+            tuple: (student_id, record) as written by student_files.student_record
+        """
+        (student_id, name_offset, name_length, grade, total_marks, percentage,
+         *marks) = self.record.unpack_from(self._map, self.records_offset + index * self.record.size)
+        return student_id, {
+            'name': self._string(name_offset, name_length),
+            'marks': {subject: mark for subject, mark in zip(self.subjects, marks) if mark == mark},
+            'total_marks': total_marks,
+            'percentage': percentage,
+            'grade': self.grade_labels[grade]
+        }
+    
+    # ============================================
+    # SEQUENTIAL READING
+    # ============================================
+    def _iter_records(self):
+        while self.position < self.count:
+            index = self.position
+            self.position += 1
+            yield self.read_record(index)
+        self.close()  # Release the file as soon as it has been read
+    
+    def load_into(self, store, count):
+        """
+        Add the next records to a CohortStore in bulk.
+        
+        The marks and result columns are copied from the mapped record
+        table a block at a time; only the names are decoded one by one.
+        
+        Args:
+            store (CohortStore): Store to fill
+            count (int): Most records to add
+        
+        Returns:
+            int: Number of records added
+        """
+        start = self.position
+        stop = min(self.count, start + count)
+        if start >= stop:
+            return 0
+        width = len(self.subjects)
+        
+        ids = []
+        names = []
+        marks = array('d')
+        total_marks = array('d')
+        percentage = array('d')
+        grade_codes = array('B')
+        heap = self.heap_offset
+        block = self._map[self.records_offset + start * self.record.size:
+                          self.records_offset + stop * self.record.size]
+        for fields in self.record.iter_unpack(block):
+            ids.append(fields[0])
+            names.append(self._map[heap + fields[1]:heap + fields[1] + fields[2]].decode('utf-8'))
+            grade_codes.append(fields[3])
+            total_marks.append(fields[4])
+            percentage.append(fields[5])
+            marks.extend(fields[6:6 + width])
+        
+        store.append_rows(ids, names, self.subjects, marks, total_marks, percentage,
+                          grade_codes, self.grade_labels)
+        self.position = stop
+        if stop == self.count:
+            self.close()
+        return stop - start
\ No newline at end of file
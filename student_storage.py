@@ -0,0 +1,608 @@
+"""
+Student Result Management System
+Storage Backends
+EduTech Solutions
+
+ResultManagementSystem reads and writes student records through a storage
+backend chosen by the data file's extension:
+    
+    student_data.json / .jsonl   JsonStorage      (snapshot + journal)
+    student_data.snap            SnapshotStorage  (binary snapshot + journal)
+    student_data.db / .sqlite    SQLiteStorage    (indexed tables)
+    <cohort>.jsonl.z / .jsonl.xz ShardStorage     (one cohort's compressed shard,
+                                                   see student_shards)
+
+Every backend streams records as (student_id, record) pairs, where a
+record is the dictionary written by student_files.student_record. The
+JSON layout stays available as an import/export path:
+    
+    python student_storage.py student_data.json student_data.db
+    python student_storage.py student_data.db export.json
+    python student_storage.py student_data.json student_data.snap
+"""
+
+import argparse
+import functools
+import itertools
+import os
+import sqlite3
+
+from student_files import StudentFileReader, iter_student_records, student_record
+from student_journal import StudentJournal
+from student_snapshot import StudentSnapshot, write_snapshot
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+SNAPSHOT_EXTENSIONS = ('.snap',)
+WRITE_BATCH_SIZE = 10000  # Rows per executemany call
+
+
+class RecordStream:
+    """Iterator of (student_id, record) pairs that reports load progress."""
+    
+    def __init__(self, records, progress=None, close=None, load_into=None):
+        """
+        Args:
+            records (iterable): (student_id, record) pairs
+            progress (callable): Returns the fraction loaded (0.0 - 1.0)
+            close (callable): Releases the underlying file or connection
+            load_into (callable): Faster load_into(store, count) for the source
+        """
+        self._records = iter(records)
+        self._progress = progress
+        self._close = close
+        self._load_into = load_into
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        return next(self._records)
+    
+    @property
+    def progress(self):
+        """Fraction of the records loaded so far (0.0 - 1.0)."""
+        return self._progress() if self._progress else 1.0
+    
+    def close(self):
+        """Release the underlying file or connection."""
+        if self._close:
+            self._close()
+    
+    def load_into(self, store, count):
+        """
+        Add the next records, with their stored results, to a CohortStore.
+        
+        Args:
+            store (CohortStore): Store to fill
+            count (int): Most records to add
+        
+        Returns:
+            int: Number of records added
+        """
+        if self._load_into:
+            return self._load_into(store, count)
+        
+        loaded = 0
+        for student_id, record in itertools.islice(self._records, count):
+            row = store.add_student(student_id, record['name'], record['marks'])
+            store.set_results(row, record['total_marks'], record['percentage'], record['grade'])
+            loaded += 1
+        return loaded
+
+
+# ============================================
+# STORAGE INTERFACE
+# ============================================
+class StorageBackend:
+    """Interface shared by every storage backend."""
+    
+    def __init__(self, data_file):
+        """
+        Args:
+            data_file (str): Path of the data file or database
+        """
+        self.data_file = data_file
+    
+    def exists(self):
+        """Return True if there is saved data to load."""
+        raise NotImplementedError
+    
+    def files(self):
+        """Return the paths of every file the data is kept in."""
+        return (self.data_file,)
+    
+    def version(self):
+        """
+        Return a cheap fingerprint of the saved data, from file stats only.
+        
+        It changes whenever any program writes the data, so a caller can
+        tell that the file was changed since it was read or saved.
+        
+        Returns:
+            tuple: (inode, size, modification time in ns) of each file,
+                None for a file that does not exist
+        """
+        return tuple(file_stat(path) for path in self.files())
+    
+    def count(self):
+        """Return the number of saved students."""
+        stream = self.read()
+        try:
+            return sum(1 for _ in stream)
+        finally:
+            stream.close()
+    
+    def read(self):
+        """
+        Start reading every saved student.
+        
+        Returns:
+            RecordStream: (student_id, record) pairs, one per student, in
+                ascending ID order
+        """
+        raise NotImplementedError
+    
+    def needs_all_students(self):
+        """
+        Return True if the next save should be given every student.
+        
+        Otherwise a collection of just the changed students will do (see
+        save), which is all a journal append or a database update reads.
+        """
+        return True
+    
+    def save(self, students, changed_ids, complete=True):
+        """
+        Persist the students changed since the last save.
+        
+        Args:
+            students (StudentCollection): Current records
+            changed_ids (set): IDs added, changed or removed since the last save
+            complete (bool): False if students holds only the changed
+                students (an ID missing from it is then a removed student)
+        
+        Returns:
+            int: Number of changed records written
+        """
+        raise NotImplementedError
+    
+    def save_records(self, records):
+        """
+        Add or replace a batch of records without touching the others.
+        
+        Args:
+            records (list): (student_id, record) pairs
+        """
+        raise NotImplementedError
+    
+    def write_records(self, records):
+        """
+        Replace the saved data with a stream of records (used for imports).
+        
+        Args:
+            records (iterable): (student_id, record) pairs in ascending ID order
+        """
+        raise NotImplementedError
+
+
+class JsonStorage(StorageBackend):
+    """JSON snapshot file plus an append-only journal of changes."""
+    
+    def __init__(self, data_file):
+        super().__init__(data_file)
+        self.journal = StudentJournal(data_file)
+    
+    def exists(self):
+        return self.journal.exists()
+    
+    def files(self):
+        return (self.data_file, self.journal.journal_file)
+    
+    def read(self):
+        # Read the last snapshot incrementally, applying the journal on the way
+        if not os.path.exists(self.data_file):
+            return RecordStream(self._apply_journal([]))
+        reader = StudentFileReader(self.data_file)
+        return RecordStream(
+            self._apply_journal(reader),
+            progress=lambda: reader.progress,
+            close=reader.close
+        )
+    
+    def _apply_journal(self, snapshot):
+        """
+        Merge the journal into a snapshot stream.
+        
+        Snapshots are written in ascending ID order, so students added in
+        the journal are slotted in between and the result stays sorted.
+        """
+        changes = dict(self.journal.replay())  # Last entry per ID wins, None = deleted
+        pending = sorted(changes)
+        emitted = set()  # Journal IDs already yielded
+        index = 0
+        
+        for student_id, record in snapshot:
+            # Students only in the journal that come before this one
+            while index < len(pending) and pending[index] < student_id:
+                if changes[pending[index]] is not None:
+                    yield pending[index], changes[pending[index]]
+                    emitted.add(pending[index])
+                index += 1
+            if index < len(pending) and pending[index] == student_id:
+                index += 1
+            if student_id in emitted:  # Only possible if the snapshot is out of order
+                continue
+            if student_id in changes:
+                record = changes[student_id]
+                if record is None:
+                    continue
+            yield student_id, record
+        
+        for student_id in pending[index:]:
+            if changes[student_id] is not None:
+                yield student_id, changes[student_id]
+    
+    def needs_all_students(self):
+        # Only a checkpoint writes every student
+        return self.journal.needs_checkpoint()
+    
+    def save(self, students, changed_ids, complete=True):
+        # Log the changed students, then compact the journal if needed
+        # (left for a later save when only the changed students were given)
+        saved = self.journal.append(students, changed_ids)
+        if complete and self.journal.needs_checkpoint():
+            self.journal.checkpoint(iter_student_records(students))
+        return saved
+    
+    def save_records(self, records):
+        self.journal.append_records(records)
+        if self.journal.needs_checkpoint():
+            self.write_records(self.read())
+    
+    def write_records(self, records):
+        self.journal.checkpoint(records)
+
+
+class SnapshotStorage(JsonStorage):
+    """
+    Memory-mapped binary snapshot (see student_snapshot) plus the journal.
+    
+    Opening the data file only maps it, so loading starts at once however
+    large the cohort is. When the journal is empty the records are copied
+    into the student store a block at a time rather than one by one.
+    """
+    
+    def __init__(self, data_file):
+        super().__init__(data_file)
+        self.journal = StudentJournal(data_file, write_snapshot=write_snapshot)
+    
+    def count(self):
+        if self.journal.journal_size() or not os.path.exists(self.data_file):
+            return super().count()
+        snapshot = StudentSnapshot(self.data_file)
+        try:
+            return len(snapshot)
+        finally:
+            snapshot.close()
+    
+    def read(self):
+        if not os.path.exists(self.data_file):
+            return RecordStream(self._apply_journal([]))
+        snapshot = StudentSnapshot(self.data_file)
+        if self.journal.journal_size():
+            return RecordStream(
+                self._apply_journal(snapshot),
+                progress=lambda: snapshot.progress,
+                close=snapshot.close
+            )
+        return RecordStream(
+            snapshot,
+            progress=lambda: snapshot.progress,
+            close=snapshot.close,
+            load_into=snapshot.load_into
+        )
+    
+    def save(self, students, changed_ids, complete=True):
+        saved = self.journal.append(students, changed_ids)
+        if complete and self.journal.needs_checkpoint():
+            # The store knows its subjects, so the snapshot is written in one pass
+            self.journal.checkpoint(
+                iter_student_records(students),
+                functools.partial(write_snapshot, subjects=students.store.subjects))
+        return saved
+
+
+# ============================================
+# SQLITE BACKEND
+# ============================================
+class SQLiteStorage(StorageBackend):
+    """
+    SQLite database with normalized, indexed students and marks tables.
+    
+    Queries run inside SQLite and stream their results, so they never
+    load the whole cohort into memory.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS students (
+            student_id  INTEGER PRIMARY KEY,
+            name        TEXT NOT NULL,
+            total_marks REAL NOT NULL,
+            percentage  REAL NOT NULL,
+            grade       TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS marks (
+            student_id  INTEGER NOT NULL REFERENCES students(student_id) ON DELETE CASCADE,
+            subject     TEXT NOT NULL,
+            mark        REAL NOT NULL,
+            PRIMARY KEY (student_id, subject)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_students_grade ON students(grade);
+        CREATE INDEX IF NOT EXISTS idx_marks_subject_mark ON marks(subject, mark);
+    """
+    
+    def connect(self):
+        """
+        Open a connection with the schema in place.
+        
+        Each operation opens its own connection, so the storage can be
+        used from any thread.
+        """
+        connection = sqlite3.connect(self.data_file)
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.executescript(self.SCHEMA)
+        return connection
+    
+    def exists(self):
+        return os.path.exists(self.data_file)
+    
+    def files(self):
+        # In WAL mode, commits land in the -wal file until SQLite checkpoints it
+        return (self.data_file, self.data_file + '-wal')
+    
+    def count(self):
+        """Return the number of saved students."""
+        connection = self.connect()
+        try:
+            return connection.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+        finally:
+            connection.close()
+    
+    def read(self):
+        connection = self.connect()
+        total = connection.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+        loaded = [0]
+        
+        def records():
+            # Students and marks are both ordered by ID, so they can be merged in one pass
+            students = connection.execute(
+                "SELECT student_id, name, total_marks, percentage, grade "
+                "FROM students ORDER BY student_id")
+            marks = connection.cursor().execute(
+                "SELECT student_id, subject, mark FROM marks ORDER BY student_id")
+            mark_row = marks.fetchone()
+            for student_id, name, total_marks, percentage, grade in students:
+                student_marks = {}
+                while mark_row is not None and mark_row[0] <= student_id:
+                    if mark_row[0] == student_id:
+                        student_marks[mark_row[1]] = mark_row[2]
+                    mark_row = marks.fetchone()
+                loaded[0] += 1
+                yield student_id, {
+                    'name': name,
+                    'marks': student_marks,
+                    'total_marks': total_marks,
+                    'percentage': percentage,
+                    'grade': grade
+                }
+        
+        return RecordStream(
+            records(),
+            progress=lambda: loaded[0] / total if total else 1.0,
+            close=connection.close
+        )
+    
+    def needs_all_students(self):
+        return False
+    
+    def save(self, students, changed_ids, complete=True):
+        records = []
+        deleted = []
+        for student_id in sorted(changed_ids):
+            if student_id in students:
+                records.append((student_id, student_record(students[student_id])))
+            else:
+                deleted.append(student_id)
+        
+        connection = self.connect()
+        try:
+            with connection:  # One transaction for the whole save
+                self._delete(connection, deleted)
+                self._upsert(connection, records)
+        finally:
+            connection.close()
+        return len(records) + len(deleted)
+    
+    def save_records(self, records):
+        connection = self.connect()
+        try:
+            with connection:
+                self._upsert(connection, records)
+        finally:
+            connection.close()
+    
+    def write_records(self, records):
+        connection = self.connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM marks")
+                connection.execute("DELETE FROM students")
+                records = iter(records)
+                while True:
+                    batch = list(itertools.islice(records, WRITE_BATCH_SIZE))
+                    if not batch:
+                        break
+                    self._upsert(connection, batch)
+        finally:
+            connection.close()
+    
+    def _delete(self, connection, student_ids):
+        connection.executemany(
+            "DELETE FROM students WHERE student_id = ?",
+            [(student_id,) for student_id in student_ids])
+    
+    def _upsert(self, connection, records):
+        """Insert or replace a batch of (student_id, record) pairs."""
+        connection.executemany(
+            "INSERT INTO students (student_id, name, total_marks, percentage, grade) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(student_id) DO UPDATE SET name = excluded.name, "
+            "total_marks = excluded.total_marks, percentage = excluded.percentage, "
+            "grade = excluded.grade",
+            [(student_id, record['name'], record['total_marks'], record['percentage'],
+              record['grade']) for student_id, record in records])
+        connection.executemany(
+            "DELETE FROM marks WHERE student_id = ?",
+            [(student_id,) for student_id, record in records])
+        connection.executemany(
+            "INSERT INTO marks (student_id, subject, mark) VALUES (?, ?, ?)",
+            [(student_id, subject, mark)
+             for student_id, record in records
+             for subject, mark in record['marks'].items()])
+    
+    # ============================================
+    # INDEXED QUERIES
+    # ============================================
+    def find_by_grade(self, grade, subject=None):
+        """
+        Yield students with a final grade, optionally with their mark in a subject.
+        
+        Uses the grade index; the subject mark is looked up by primary key.
+        
+        Yields:
+            tuple: (student_id, name, percentage) or
+                (student_id, name, percentage, subject mark)
+        """
+        connection = self.connect()
+        try:
+            if subject is None:
+                rows = connection.execute(
+                    "SELECT student_id, name, percentage FROM students "
+                    "WHERE grade = ? ORDER BY student_id", (grade,))
+            else:
+                rows = connection.execute(
+                    "SELECT s.student_id, s.name, s.percentage, m.mark "
+                    "FROM students s JOIN marks m ON m.student_id = s.student_id "
+                    "AND m.subject = ? WHERE s.grade = ? ORDER BY s.student_id",
+                    (subject, grade))
+            yield from rows
+        finally:
+            connection.close()
+    
+    def find_by_mark(self, subject, min_mark=0, max_mark=100):
+        """
+        Yield students whose mark in a subject lies in a range.
+        
+        Uses the (subject, mark) index, e.g. find_by_mark('Mathematics',
+        max_mark=59.99) lists everyone failing Mathematics.
+        
+        Args:
+            subject (str): Subject name
+            min_mark (float): Lowest mark included
+            max_mark (float): Highest mark included
+        
+        Yields:
+            tuple: (student_id, name, mark) in ascending mark order
+        """
+        connection = self.connect()
+        try:
+            yield from connection.execute(
+                "SELECT m.student_id, s.name, m.mark "
+                "FROM marks m JOIN students s ON s.student_id = m.student_id "
+                "WHERE m.subject = ? AND m.mark BETWEEN ? AND ? ORDER BY m.mark",
+                (subject, min_mark, max_mark))
+        finally:
+            connection.close()
+    
+    def grade_counts(self):
+        """Return {grade: number of students}, counted from the grade index."""
+        connection = self.connect()
+        try:
+            return dict(connection.execute(
+                "SELECT grade, COUNT(*) FROM students GROUP BY grade"))
+        finally:
+            connection.close()
+
+
+# ============================================
+# BACKEND SELECTION AND CONVERSION
+# ============================================
+def file_stat(path):
+    """Return (inode, size, modification time in ns) of a file, None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def open_storage(data_file):
+    """
+    Return the storage backend for a data file, chosen by its extension.
+    
+    Args:
+        data_file (str): Path of the data file or database
+    
+    Returns:
+        StorageBackend: SQLiteStorage for .db/.sqlite files, SnapshotStorage
+            for .snap files, ShardStorage for cohort shards, else JsonStorage
+    """
+    from student_shards import ShardStorage, is_shard_file  # student_shards imports this module
+    
+    if is_shard_file(data_file):
+        return ShardStorage(data_file)
+    if data_file.lower().endswith(SQLITE_EXTENSIONS):
+        return SQLiteStorage(data_file)
+    if data_file.lower().endswith(SNAPSHOT_EXTENSIONS):
+        return SnapshotStorage(data_file)
+    return JsonStorage(data_file)
+
+
+def convert(source_file, target_file):
+    """
+    Copy every record from one data file to another (e.g. JSON to SQLite).
+    
+    Records are streamed, so the cohort is never held in memory.
+    
+    Returns:
+        int: Number of records copied
+    """
+    stream = open_storage(source_file).read()
+    copied = [0]
+    
+    def records():
+        for student_id, record in stream:
+            copied[0] += 1
+            yield student_id, record
+    
+    try:
+        open_storage(target_file).write_records(records())
+    finally:
+        stream.close()
+    return copied[0]
+
+
+def main():
+    """Convert between the JSON, binary snapshot and SQLite storage formats."""
+    parser = argparse.ArgumentParser(description="Convert student data between storage formats")
+    parser.add_argument('source', help="data file to read (.json, .jsonl, .snap, .db)")
+    parser.add_argument('target', help="data file to write (.json, .jsonl, .snap, .db)")
+    args = parser.parse_args()
+    
+    copied = convert(args.source, args.target)
+    print(f"Copied {copied} students from {args.source} to {args.target}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,930 @@
+"""
+Student Result Management System
+Columnar Student Store
+EduTech Solutions
+
+Marks for the whole cohort are kept in one dense students x subjects matrix
+so that total marks, percentage and grade can be calculated for every
+student in a few array operations. Student objects are thin views onto a
+row of that matrix. How marks become results is set by the store's
+grading policy (see student_grading).
+"""
+
+from array import array
+from bisect import bisect_right
+from collections.abc import MutableMapping
+from enum import IntEnum
+
+from student_grading import (DEFAULT_POLICY, DEFAULT_SUBJECTS, FAIL_GRADE, MAX_SUBJECT_MARK,
+                             NO_MARKS_GRADE, compile_policy)
+from student_metrics import instrumented
+
+np = None             # The numpy module, once load_numpy() has imported it
+_numpy_checked = False
+
+
+def load_numpy():
+    """
+    Import NumPy on first use.
+    
+    NumPy is optional (results fall back to a Python loop) and takes a
+    noticeable part of a second to import, so it is only imported when a
+    batch is first calculated, or ahead of time on a background thread
+    (see the GUI's startup).
+    
+    Returns:
+        module: numpy, or None if it is not installed
+    """
+    global np, _numpy_checked
+    if not _numpy_checked:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+        _numpy_checked = True
+    return np
+
+# ============================================
+# GRADING RULES
+# ============================================
+MISSING = float('nan')   # Stored in the matrix for a subject with no mark
+
+
+class Grade(IntEnum):
+    """Codes of the built-in grades, as stored in CohortStore.grade_codes."""
+    NONE = 0   # Results not calculated yet
+    NA = 1     # No marks recorded
+    F = 2
+    D = 3
+    C = 4
+    B = 5
+    A = 6
+
+
+# Grade letter of each code; grades not listed here get the next free code
+GRADE_LABELS = {Grade.NONE: '', Grade.NA: NO_MARKS_GRADE, Grade.F: FAIL_GRADE,
+                Grade.D: 'D', Grade.C: 'C', Grade.B: 'B', Grade.A: 'A'}
+
+
+def grade_for_percentage(percentage, policy=DEFAULT_POLICY):
+    """
+    Return the grade letter for a percentage.
+    
+    Args:
+        percentage (float): Overall percentage (0-100)
+        policy (GradingPolicy): Grade bands to use
+    
+    Returns:
+        str: Grade letter
+    """
+    return policy.grade(percentage)
+
+
+# ============================================
+# COLUMNAR STORE
+# ============================================
+class CohortStore:
+    """Dense marks matrix and result columns for a cohort of students."""
+    
+    def __init__(self, subjects=(), policy=DEFAULT_POLICY):
+        """
+        Initialize an empty store.
+        
+        Args:
+            subjects (list): Subject names, one matrix column each
+            policy (GradingPolicy): How marks are turned into results
+        """
+        self.subjects = []            # List of subject names (column order)
+        self.subject_index = {}       # Dictionary {subject: column}
+        self.ids = []                 # List: row -> student ID (None if free)
+        self.names = []               # List: row -> student name
+        self.rows = {}                # Dictionary {student_id: row}
+        self.free_rows = []           # Rows released by removed students
+        self.dirty_rows = set()       # Rows whose marks changed since last calculation
+        self.change_sets = {}         # Dictionary {tracker name: set of changed student IDs}
+        
+        # Row-major students x subjects matrix, NaN marks a missing subject
+        self.marks = array('d')
+        
+        # Result columns, one entry per row
+        self.total_marks = array('d')
+        self.percentage = array('d')
+        self.grade_codes = array('B')
+        
+        # Grade letters are stored as small integer codes, the built-in
+        # grades always have the same code (see Grade)
+        self.grade_labels = [GRADE_LABELS[code] for code in Grade]
+        self.grade_lookup = {label: code for code, label in enumerate(self.grade_labels)}
+        
+        self.policy = policy
+        self._apply_policy()
+        for subject in subjects:
+            self.add_subject(subject)
+    
+    def __len__(self):
+        return len(self.rows)
+    
+    def __contains__(self, student_id):
+        return student_id in self.rows
+    
+    def __iter__(self):
+        return iter(self.rows)
+    
+    @property
+    def width(self):
+        """Number of subject columns in the matrix."""
+        return len(self.subjects)
+    
+    def track_changes(self, tracker='display'):
+        """
+        Start recording the IDs of added, changed and removed students.
+        
+        Each tracker (e.g. the table display or the save journal) keeps its
+        own set, so one consumer popping its changes does not hide them
+        from another. A new tracker starts with every current student.
+        
+        Args:
+            tracker (str): Name of the change set
+        """
+        if tracker not in self.change_sets:
+            self.change_sets[tracker] = set(self.rows)
+    
+    def pop_changes(self, tracker='display'):
+        """Return the set of changed student IDs for a tracker and start a new one."""
+        changed = self.change_sets.get(tracker, set())
+        if tracker in self.change_sets:
+            self.change_sets[tracker] = set()
+        return changed
+    
+    def has_changes(self, tracker='display'):
+        """Return True if a tracker has recorded changes since it was last popped."""
+        return bool(self.change_sets.get(tracker))
+    
+    def add_changes(self, student_ids, tracker='display'):
+        """Put student IDs back into a tracker's change set (e.g. after a failed save)."""
+        if tracker in self.change_sets:
+            self.change_sets[tracker].update(student_ids)
+    
+    def discard_changes(self, student_ids, tracker='display'):
+        """Take student IDs out of a tracker's change set (e.g. changes read from disk)."""
+        if tracker in self.change_sets:
+            self.change_sets[tracker].difference_update(student_ids)
+    
+    def mark_changed(self, row):
+        """Record that the data of a row changed."""
+        student_id = self.ids[row]
+        if student_id is None:  # Free row
+            return
+        for changed in self.change_sets.values():
+            changed.add(student_id)
+    
+    def grade_code(self, grade):
+        """Return the integer code for a grade letter, adding it if new."""
+        code = self.grade_lookup.get(grade)
+        if code is None:
+            code = len(self.grade_labels)
+            self.grade_labels.append(grade)
+            self.grade_lookup[grade] = code
+        return code
+    
+    # ============================================
+    # GRADING POLICY
+    # ============================================
+    def set_policy(self, policy):
+        """
+        Grade with another policy.
+        
+        Every student is marked for recalculation, so the next calculate()
+        re-grades the whole cohort in one batch; students whose results
+        change are reported to the change trackers as usual.
+        
+        Args:
+            policy (GradingPolicy): The new policy
+        """
+        if policy == self.policy:
+            return
+        self.policy = policy
+        self._apply_policy()
+        self.dirty_rows.update(row for row, student_id in enumerate(self.ids)
+                               if student_id is not None)
+    
+    def _apply_policy(self):
+        """Compile the policy for the current subjects and give its grades codes."""
+        self.compiled_policy = compile_policy(self.policy, tuple(self.subjects))
+        # Grade band table: ladder_codes[i] is the grade below ladder_bounds[i]
+        self.ladder_bounds = list(self.policy.bounds)
+        self.ladder_codes = [self.grade_code(grade) for grade in self.policy.ladder]
+    
+    # ============================================
+    # ROW MANAGEMENT
+    # ============================================
+    def add_subject(self, subject):
+        """
+        Add a subject column, widening every existing row.
+        
+        Returns:
+            int: Column index of the subject
+        """
+        if subject in self.subject_index:
+            return self.subject_index[subject]
+        
+        old_width = self.width
+        column = old_width
+        self.subjects.append(subject)
+        self.subject_index[subject] = column
+        self._apply_policy()
+        
+        # Rebuild the matrix with one extra missing mark per row
+        if self.ids:
+            widened = array('d')
+            for row in range(len(self.ids)):
+                start = row * old_width
+                widened.extend(self.marks[start:start + old_width])
+                widened.append(MISSING)
+            self.marks = widened
+        return column
+    
+    def add_student(self, student_id, name, marks=None):
+        """
+        Add a student row, or reset the row of an existing student.
+        
+        Args:
+            student_id (int): Unique student identifier
+            name (str): Student's full name
+            marks (dict): Optional {subject: mark} dictionary
+        
+        Returns:
+            int: Row index of the student
+        """
+        row = self.rows.get(student_id)
+        if row is None:
+            if self.free_rows:
+                row = self.free_rows.pop()
+                self.ids[row] = student_id
+                self.names[row] = name
+            else:
+                row = len(self.ids)
+                self.ids.append(student_id)
+                self.names.append(name)
+                self.marks.extend([MISSING] * self.width)
+                self.total_marks.append(0.0)
+                self.percentage.append(0.0)
+                self.grade_codes.append(0)
+            self.rows[student_id] = row
+        else:
+            self.names[row] = name
+        self.mark_changed(row)
+        
+        self.clear_marks(row)
+        self.set_results(row, 0.0, 0.0, '')
+        if marks:
+            for subject, mark in marks.items():
+                self.set_mark(row, subject, mark)
+        return row
+    
+    def append_rows(self, ids, names, subjects, marks, total_marks, percentage,
+                    grade_codes, grade_labels):
+        """
+        Add a block of new students from columns (e.g. a binary snapshot).
+        
+        Args:
+            ids (list): Student IDs
+            names (list): Student names
+            subjects (list): Subject of each column of marks
+            marks (array): Row-major marks, len(subjects) per student, NaN = missing
+            total_marks (array): Total marks per student
+            percentage (array): Percentage per student
+            grade_codes (array): Grade codes, indexes into grade_labels
+            grade_labels (list): Grade letters of the codes
+        
+        Returns:
+            int: Number of students added
+        """
+        if any(student_id in self.rows for student_id in ids):
+            # Replacing existing students needs the row-by-row path
+            source_width = len(subjects)
+            for index, student_id in enumerate(ids):
+                row_marks = {subject: mark for subject, mark
+                             in zip(subjects, marks[index * source_width:(index + 1) * source_width])
+                             if mark == mark}
+                row = self.add_student(student_id, names[index], row_marks)
+                self.set_results(row, total_marks[index], percentage[index],
+                                 grade_labels[grade_codes[index]])
+            return len(ids)
+        
+        columns = [self.add_subject(subject) for subject in subjects]
+        start = len(self.ids)
+        count = len(ids)
+        self.ids.extend(ids)
+        self.names.extend(names)
+        self.rows.update(zip(ids, range(start, start + count)))
+        
+        if columns == list(range(self.width)):
+            self.marks.extend(marks)  # Same column layout, one block copy
+        else:
+            block = array('d', [MISSING]) * (count * self.width)
+            source_width = len(subjects)
+            for index in range(count):
+                for source, column in enumerate(columns):
+                    block[index * self.width + column] = marks[index * source_width + source]
+            self.marks.extend(block)
+        
+        self.total_marks.extend(total_marks)
+        self.percentage.extend(percentage)
+        translate = [self.grade_code(label) for label in grade_labels]
+        if translate == list(range(len(translate))):
+            self.grade_codes.extend(grade_codes)
+        else:
+            self.grade_codes.extend(translate[code] for code in grade_codes)
+        
+        self.dirty_rows.update(range(start, start + count))
+        for changed in self.change_sets.values():
+            changed.update(ids)
+        return count
+    
+    def remove_student(self, student_id):
+        """Remove a student and release their row for reuse."""
+        row = self.rows.pop(student_id)
+        self.mark_changed(row)
+        self.ids[row] = None
+        self.names[row] = ''
+        self.clear_marks(row)
+        self.set_results(row, 0.0, 0.0, '')
+        self.dirty_rows.discard(row)
+        self.free_rows.append(row)
+    
+    def clear(self):
+        """Remove every student, keeping the subject columns."""
+        for changed in self.change_sets.values():
+            changed.update(self.rows)
+        self.ids = []
+        self.names = []
+        self.rows = {}
+        self.free_rows = []
+        self.dirty_rows = set()
+        self.marks = array('d')
+        self.total_marks = array('d')
+        self.percentage = array('d')
+        self.grade_codes = array('B')
+    
+    def copy(self, student_ids=None):
+        """
+        Return an independent copy of the students, marks and results.
+        
+        Change tracking is not copied. The copy is cheap (whole-array
+        copies, no per-student work), so it can be taken on the UI thread
+        and handed to a background thread.
+        
+        Args:
+            student_ids (iterable): Copy only these students (those that are
+                in the store) into a compact store, e.g. the ones a save writes
+        """
+        store = CohortStore(policy=self.policy)
+        store.subjects = list(self.subjects)
+        store.subject_index = dict(self.subject_index)
+        store.compiled_policy = self.compiled_policy
+        store.grade_labels = list(self.grade_labels)
+        store.grade_lookup = dict(self.grade_lookup)
+        store.ladder_codes = list(self.ladder_codes)
+        if student_ids is not None:
+            student_ids = [student_id for student_id in student_ids if student_id in self.rows]
+            store.ids = student_ids
+            store.rows = {student_id: row for row, student_id in enumerate(student_ids)}
+            (store.names, store.marks, store.total_marks,
+             store.percentage, _) = self.copy_rows(student_ids)
+            store.grade_codes = array('B', (self.grade_codes[self.rows[student_id]]
+                                            for student_id in student_ids))
+            store.dirty_rows = {store.rows[student_id] for student_id in student_ids
+                                if self.rows[student_id] in self.dirty_rows}
+            return store
+        store.ids = list(self.ids)
+        store.names = list(self.names)
+        store.rows = dict(self.rows)
+        store.free_rows = list(self.free_rows)
+        store.dirty_rows = set(self.dirty_rows)
+        store.marks = array('d', self.marks)
+        store.total_marks = array('d', self.total_marks)
+        store.percentage = array('d', self.percentage)
+        store.grade_codes = array('B', self.grade_codes)
+        return store
+    
+    # ============================================
+    # MARK ACCESS
+    # ============================================
+    def get_mark(self, row, subject):
+        """Return the mark for a subject, or None if it is missing."""
+        column = self.subject_index.get(subject)
+        if column is None:
+            return None
+        mark = self.marks[row * self.width + column]
+        return None if mark != mark else mark  # NaN never equals itself
+    
+    def set_mark(self, row, subject, mark):
+        """Set the mark for a subject, adding the subject column if new."""
+        column = self.add_subject(subject)
+        self.marks[row * self.width + column] = mark
+        self.dirty_rows.add(row)
+        self.mark_changed(row)
+    
+    def delete_mark(self, row, subject):
+        """Mark a subject as missing for a row."""
+        column = self.subject_index.get(subject)
+        if column is not None:
+            self.marks[row * self.width + column] = MISSING
+            self.dirty_rows.add(row)
+            self.mark_changed(row)
+    
+    def clear_marks(self, row):
+        """Mark every subject as missing for a row."""
+        start = row * self.width
+        for column in range(self.width):
+            self.marks[start + column] = MISSING
+        self.dirty_rows.add(row)
+        self.mark_changed(row)
+    
+    def row_marks(self, row):
+        """Return a {subject: mark} dictionary of the marks recorded for a row."""
+        start = row * self.width
+        marks = {}
+        for column, subject in enumerate(self.subjects):
+            mark = self.marks[start + column]
+            if mark == mark:
+                marks[subject] = mark
+        return marks
+    
+    def set_results(self, row, total_marks, percentage, grade):
+        """Store already calculated results for a row."""
+        grade_code = self.grade_code(grade)
+        if (self.total_marks[row] != total_marks or self.percentage[row] != percentage
+                or self.grade_codes[row] != grade_code):
+            self.total_marks[row] = total_marks
+            self.percentage[row] = percentage
+            self.grade_codes[row] = grade_code
+            self.mark_changed(row)
+    
+    # ============================================
+    # RESULT CALCULATION
+    # ============================================
+    def calculate_row(self, row):
+        """Calculate total marks, percentage and grade for a single row."""
+        self.dirty_rows.discard(row)
+        start = row * self.width
+        # Results are memoized per policy, subject layout and marks
+        self.set_results(row, *self.compiled_policy.results(self.marks[start:start + self.width]))
+    
+    @instrumented('calculate_batch')
+    def calculate(self, rows=None):
+        """
+        Calculate results for a batch of rows.
+        
+        Args:
+            rows (list): Rows to calculate. Defaults to the rows whose
+                marks changed since they were last calculated.
+        """
+        if rows is None:
+            rows = self.dirty_rows
+            self.dirty_rows = set()
+        else:
+            self.dirty_rows.difference_update(rows)
+        if not rows:
+            return
+        
+        if load_numpy() is None or not self.width:
+            changed_rows = self._calculate_python(rows)
+        else:
+            changed_rows = self._calculate_numpy(rows)
+        self._report_changes(changed_rows)
+    
+    def _report_changes(self, changed_rows):
+        """Add the students of rows whose results changed to every change set."""
+        # Only rows whose results actually changed are reported
+        for changed in self.change_sets.values():
+            changed.update(self.ids[row] for row in changed_rows if self.ids[row] is not None)
+    
+    def calculate_all(self):
+        """Calculate results for every row in the store."""
+        self.calculate(range(len(self.ids)))
+    
+    def apply_results(self, start, total_marks, percentage, grade_codes, grade_labels):
+        """
+        Store results calculated elsewhere (e.g. by a worker process).
+        
+        Args:
+            start (int): First row of the block
+            total_marks (array): Total marks, one per row of the block
+            percentage (array): Percentages, one per row of the block
+            grade_codes (array): Grade codes, indexes into grade_labels
+            grade_labels (list): Grade letters of the store that calculated
+                the codes
+        
+        Returns:
+            list: Rows whose results changed
+        """
+        count = len(total_marks)
+        translate = [self.grade_code(label) for label in grade_labels]
+        
+        if load_numpy() is not None:
+            block = slice(start, start + count)
+            codes = np.asarray(translate, dtype=np.uint8)[np.frombuffer(grade_codes, dtype=np.uint8)]
+            totals = np.frombuffer(total_marks, dtype=np.float64)
+            percentages = np.frombuffer(percentage, dtype=np.float64)
+            
+            total_column = np.frombuffer(self.total_marks, dtype=np.float64)
+            percentage_column = np.frombuffer(self.percentage, dtype=np.float64)
+            grade_column = np.frombuffer(self.grade_codes, dtype=np.uint8)
+            changed = ((total_column[block] != totals)
+                       | (percentage_column[block] != percentages)
+                       | (grade_column[block] != codes))
+            
+            total_column[block] = totals
+            percentage_column[block] = percentages
+            grade_column[block] = codes
+            changed_rows = (np.flatnonzero(changed) + start).tolist()
+        else:
+            changed_rows = []
+            for offset in range(count):
+                row = start + offset
+                code = translate[grade_codes[offset]]
+                if (self.total_marks[row] != total_marks[offset]
+                        or self.percentage[row] != percentage[offset]
+                        or self.grade_codes[row] != code):
+                    self.total_marks[row] = total_marks[offset]
+                    self.percentage[row] = percentage[offset]
+                    self.grade_codes[row] = code
+                    changed_rows.append(row)
+        
+        self.dirty_rows.difference_update(range(start, start + count))
+        self._report_changes(changed_rows)
+        return changed_rows
+    
+    def copy_rows(self, student_ids):
+        """
+        Return a compact, picklable copy of some students' rows.
+        
+        Args:
+            student_ids (list): Students to copy, in the order wanted
+        
+        Returns:
+            tuple: (names, marks, total_marks, percentage, grades) where
+                marks is a row-major array with one row per student
+        """
+        width = self.width
+        names = []
+        marks = array('d')
+        total_marks = array('d')
+        percentage = array('d')
+        grades = []
+        for student_id in student_ids:
+            row = self.rows[student_id]
+            names.append(self.names[row])
+            marks.extend(self.marks[row * width:(row + 1) * width])
+            total_marks.append(self.total_marks[row])
+            percentage.append(self.percentage[row])
+            grades.append(self.grade_labels[self.grade_codes[row]])
+        return names, marks, total_marks, percentage, grades
+    
+    def _calculate_numpy(self, rows):
+        """
+        Calculate a batch of rows with NumPy array operations.
+        
+        Returns:
+            list: Rows whose results changed
+        """
+        count = len(self.ids)
+        if len(rows) == count:
+            selected = np.arange(count)
+        else:
+            selected = np.fromiter(rows, dtype=np.intp, count=len(rows))
+        
+        # Zero-copy NumPy views over the stored columns
+        matrix = np.frombuffer(self.marks, dtype=np.float64).reshape(count, self.width)[selected]
+        present = ~np.isnan(matrix)
+        marked_subjects = present.sum(axis=1)
+        totals = np.where(present, matrix, 0.0).sum(axis=1)
+        
+        compiled = self.compiled_policy
+        if compiled.uniform:
+            # Each subject out of 100, equally weighted
+            weighted = totals
+            max_possible_marks = marked_subjects * MAX_SUBJECT_MARK
+        else:
+            weighted = np.where(present, matrix * np.asarray(compiled.factors), 0.0).sum(axis=1)
+            max_possible_marks = (present * np.asarray(compiled.weights)).sum(axis=1) \
+                * MAX_SUBJECT_MARK
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percentages = np.where(
+                marked_subjects > 0, (weighted / max_possible_marks) * 100, 0.0)
+        
+        ladder = np.asarray(self.ladder_codes, dtype=np.uint8)
+        codes = ladder[np.searchsorted(self.ladder_bounds, percentages, side='right')]
+        codes[marked_subjects == 0] = self.grade_lookup[NO_MARKS_GRADE]
+        
+        total_column = np.frombuffer(self.total_marks, dtype=np.float64)
+        percentage_column = np.frombuffer(self.percentage, dtype=np.float64)
+        grade_column = np.frombuffer(self.grade_codes, dtype=np.uint8)
+        changed = ((total_column[selected] != totals)
+                   | (percentage_column[selected] != percentages)
+                   | (grade_column[selected] != codes))
+        
+        total_column[selected] = totals
+        percentage_column[selected] = percentages
+        grade_column[selected] = codes
+        return selected[changed].tolist()
+    
+    def _calculate_python(self, rows):
+        """
+        Calculate a batch of rows without NumPy.
+        
+        Returns:
+            list: Rows whose results changed
+        """
+        width = self.width
+        marks = self.marks
+        compiled = self.compiled_policy
+        no_marks_code = self.grade_lookup[NO_MARKS_GRADE]
+        bounds = self.ladder_bounds
+        codes = self.ladder_codes
+        changed_rows = []
+        
+        for row in rows:
+            start = row * width
+            if compiled.uniform:
+                # Plain mean, inlined: this is the hot loop without NumPy
+                row_marks = [mark for mark in marks[start:start + width] if mark == mark]
+                if not row_marks:
+                    total_marks, percentage, code = 0.0, 0.0, no_marks_code
+                else:
+                    total_marks = sum(row_marks)
+                    percentage = (total_marks / (len(row_marks) * MAX_SUBJECT_MARK)) * 100
+                    code = codes[bisect_right(bounds, percentage)]
+            else:
+                total_marks, percentage, grade = compiled.calculate(marks[start:start + width])
+                code = no_marks_code if grade == NO_MARKS_GRADE else \
+                    codes[bisect_right(bounds, percentage)]
+            
+            if (self.total_marks[row] != total_marks or self.percentage[row] != percentage
+                    or self.grade_codes[row] != code):
+                self.total_marks[row] = total_marks
+                self.percentage[row] = percentage
+                self.grade_codes[row] = code
+                changed_rows.append(row)
+        return changed_rows
+
+
+# ============================================
+# STUDENT VIEWS
+# ============================================
+class MarksView(MutableMapping):
+    """Dictionary-style {subject: mark} view onto one row of the store."""
+    
+    __slots__ = ('_store', '_row')
+    
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+    
+    def __getitem__(self, subject):
+        mark = self._store.get_mark(self._row, subject)
+        if mark is None:
+            raise KeyError(subject)
+        return mark
+    
+    def __setitem__(self, subject, mark):
+        self._store.set_mark(self._row, subject, mark)
+    
+    def __delitem__(self, subject):
+        if self._store.get_mark(self._row, subject) is None:
+            raise KeyError(subject)
+        self._store.delete_mark(self._row, subject)
+    
+    def __iter__(self):
+        return iter(self._store.row_marks(self._row))
+    
+    def __len__(self):
+        return len(self._store.row_marks(self._row))
+    
+    def __repr__(self):
+        return repr(self._store.row_marks(self._row))
+
+
+class Student:
+    """
+    A student record, backed by a row of a CohortStore.
+    
+    The object itself only holds the store and row (no per-instance
+    dictionary); marks live in the store's matrix and the grade is a
+    one-byte code.
+    """
+    
+    __slots__ = ('_store', '_row')
+    
+    def __init__(self, student_id, name):
+        """
+        Initialize a student object.
+        
+        The student gets a private single-row store until it is added to
+        a StudentCollection, which then takes over the row.
+        
+        Args:
+            student_id (int): Unique student identifier
+            name (str): Student's full name
+        """
+        store = CohortStore()
+        self._bind(store, store.add_student(student_id, name))
+    
+    @classmethod
+    def from_row(cls, store, row):
+        """Return a view of an existing row without copying any data."""
+        student = cls.__new__(cls)
+        student._bind(store, row)
+        return student
+    
+    def _bind(self, store, row):
+        self._store = store
+        self._row = row
+    
+    @property
+    def student_id(self):
+        return self._store.ids[self._row]
+    
+    @property
+    def name(self):
+        return self._store.names[self._row]
+    
+    @name.setter
+    def name(self, value):
+        self._store.names[self._row] = value
+        self._store.mark_changed(self._row)
+    
+    @property
+    def marks(self):
+        """Dictionary-style view of the student's marks {subject: mark}."""
+        return MarksView(self._store, self._row)
+    
+    @marks.setter
+    def marks(self, value):
+        value = dict(value)
+        self._store.clear_marks(self._row)
+        for subject, mark in value.items():
+            self._store.set_mark(self._row, subject, mark)
+    
+    @property
+    def total_marks(self):
+        return self._store.total_marks[self._row]
+    
+    @total_marks.setter
+    def total_marks(self, value):
+        self._store.total_marks[self._row] = value
+    
+    @property
+    def percentage(self):
+        return self._store.percentage[self._row]
+    
+    @percentage.setter
+    def percentage(self, value):
+        self._store.percentage[self._row] = value
+    
+    @property
+    def grade(self):
+        return self._store.grade_labels[self._store.grade_codes[self._row]]
+    
+    @grade.setter
+    def grade(self, value):
+        self._store.grade_codes[self._row] = self._store.grade_code(value)
+    
+    @property
+    def grade_code(self):
+        """Stored grade code, a Grade member for the built-in grades."""
+        code = self._store.grade_codes[self._row]
+        return Grade(code) if code < len(Grade) else code
+    
+    @instrumented('calculate_results')
+    def calculate_results(self):
+        """
+        Calculate total marks, percentage, and assign final grade.
+        
+        Results are cached in the store and only recalculated when the
+        student's marks changed since the last calculation.
+        """
+        if self._row in self._store.dirty_rows:
+            self._store.calculate_row(self._row)
+
+
+class StudentCollection(MutableMapping):
+    """Dictionary {student_id: Student} whose students all share one store."""
+    
+    def __init__(self, subjects=()):
+        """
+        Initialize an empty collection.
+        
+        Args:
+            subjects (list): Subject names used as the store's columns
+        """
+        self.store = CohortStore(subjects)
+    
+    def __getitem__(self, student_id):
+        row = self.store.rows[student_id]
+        return Student.from_row(self.store, row)
+    
+    def __setitem__(self, student_id, student):
+        if student._store is self.store and self.store.rows.get(student_id) == student._row:
+            return
+        
+        # Copy the student into the shared store and re-point the object at it
+        row = self.store.add_student(student_id, student.name, student.marks)
+        self.store.set_results(row, student.total_marks, student.percentage, student.grade)
+        student._bind(self.store, row)
+    
+    def __delitem__(self, student_id):
+        self.store.remove_student(student_id)
+    
+    def __contains__(self, student_id):
+        return student_id in self.store.rows
+    
+    def __iter__(self):
+        return iter(self.store.rows)
+    
+    def __len__(self):
+        return len(self.store.rows)
+    
+    def add(self, student_id, name, marks=None):
+        """
+        Add a student directly to the store.
+        
+        Returns:
+            Student: View of the new student's row
+        """
+        return Student.from_row(self.store, self.store.add_student(student_id, name, marks))
+    
+    def clear(self):
+        """Remove every student."""
+        self.store.clear()
+    
+    def copy(self, student_ids=None):
+        """Return an independent collection with a copy of the store (see CohortStore.copy)."""
+        students = StudentCollection()
+        students.store = self.store.copy(student_ids)
+        return students
+    
+    def calculate_all(self):
+        """Bring every student's results up to date in one batch."""
+        self.store.calculate()
+
+
+def calculate_block(subjects, marks, policy=DEFAULT_POLICY):
+    """
+    Calculate results for a block of rows copied out of a marks matrix.
+    
+    Runs in worker processes (see student_parallel), so it only takes and
+    returns picklable arrays.
+    
+    Args:
+        subjects (list): Subject names, one column each
+        marks (array): Row-major block of the matrix
+        policy (GradingPolicy): Grading policy of the store
+    
+    Returns:
+        tuple: (total_marks, percentage, grade_codes, grade_labels)
+    """
+    store = CohortStore(subjects, policy)
+    count = len(marks) // store.width
+    store.ids = [None] * count
+    store.names = [''] * count
+    store.marks = marks
+    store.total_marks = array('d', [0.0]) * count
+    store.percentage = array('d', [0.0]) * count
+    store.grade_codes = array('B', [0]) * count
+    store.calculate_all()
+    return store.total_marks, store.percentage, store.grade_codes, store.grade_labels
+
+
+def grade_records(records, subjects=DEFAULT_SUBJECTS, policy=DEFAULT_POLICY):
+    """
+    Calculate results for a batch of records with the batch engine.
+    
+    Used by the headless tools, which work on (student_id, record) pairs
+    instead of a loaded StudentCollection.
+    
+    Args:
+        records (iterable): (student_id, record) pairs; only 'name' and
+            'marks' are read
+        subjects (list): Subject columns to start the store with
+        policy (GradingPolicy): How marks are turned into results
+    
+    Returns:
+        list: (student_id, record) pairs with total_marks, percentage and
+            grade filled in. A repeated ID keeps its last record.
+    """
+    store = CohortStore(subjects, policy)
+    for student_id, record in records:
+        store.add_student(student_id, record['name'], record['marks'])
+    store.calculate_all()
+    
+    return [(student_id, {
+        'name': store.names[row],
+        'marks': store.row_marks(row),
+        'total_marks': store.total_marks[row],
+        'percentage': store.percentage[row],
+        'grade': store.grade_labels[store.grade_codes[row]]
+    }) for row, student_id in enumerate(store.ids)]
\ No newline at end of file
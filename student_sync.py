@@ -0,0 +1,439 @@
+"""
+Student Result Management System
+Shared Data File Sync
+EduTech Solutions
+
+Several machines may share one data file. This module keeps a program's
+records in step with it:
+
+- Watching: DataFileSync.changed() compares the stats (inode, size and
+  modification time) of the data files with those of the last read or
+  save. It costs a few stat calls, so the GUI polls it every few seconds;
+  polling works the same on every platform and on network drives, where
+  change notifications are unreliable.
+- Incremental reload: read_changes() returns only the students that
+  differ from what was last read. When another program only appended to
+  the journal, just the new journal lines are read; otherwise the data
+  file is read once and compared with a digest of each last-read record
+  (a hash of its name and marks, far smaller than a copy of the cohort).
+- Optimistic concurrency: save() refuses to write (ConflictError) when the
+  data file changed since it was last read, so the caller merges the
+  other changes first instead of overwriting them. Bulk writers that do
+  not keep the records in memory (imports, re-grading) use
+  merge_records() and rewrite() instead, which read what they merge with
+  under the same lock as the write.
+- Advisory locking: writers hold an exclusive FileLock on a lock file
+  next to the data file and readers a shared one, so a save is never
+  read half-written or interleaved with another program's save.
+"""
+
+import itertools
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from student_storage import JsonStorage, open_storage
+
+LOCK_SUFFIX = '.lock'   # Lock file kept next to the data file
+LOCK_TIMEOUT = 10.0     # Seconds to wait for another program's lock
+LOCK_RETRY = 0.05       # Seconds between attempts to take a lock
+DIGEST_MEMORY_BYTES = 100  # Estimated memory per student digest
+
+
+class ConflictError(Exception):
+    """The data file was changed by another program since it was last read."""
+
+
+# ============================================
+# ADVISORY LOCKING
+# ============================================
+class FileLock:
+    """
+    Advisory lock on a data file, shared by every program that uses it.
+    
+    Other programs are only kept out if they take the lock too (the GUI,
+    the command-line tool and the server all do). Windows has no shared
+    locks, so there readers lock exclusively as well.
+    """
+    
+    def __init__(self, data_file, exclusive=True, timeout=LOCK_TIMEOUT):
+        """
+        Args:
+            data_file (str): Path of the data file to lock
+            exclusive (bool): True to write, False to read
+            timeout (float): Seconds to wait for the lock
+        """
+        self.lock_file = data_file + LOCK_SUFFIX
+        self.exclusive = exclusive
+        self.timeout = timeout
+        self.file = None
+    
+    def acquire(self):
+        """
+        Take the lock, waiting while another program holds it.
+        
+        Raises:
+            TimeoutError: If the lock was not free within the timeout
+        """
+        self.file = open(self.lock_file, 'a+b')
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._try_lock()
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    self.file.close()
+                    self.file = None
+                    raise TimeoutError(
+                        f"The data file is locked by another program: {self.lock_file}")
+                time.sleep(LOCK_RETRY)
+    
+    def _try_lock(self):
+        """Take the lock without waiting (raises OSError if it is held)."""
+        if fcntl is not None:
+            mode = fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH
+            fcntl.flock(self.file.fileno(), mode | fcntl.LOCK_NB)
+        else:
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_NBLCK, 1)
+    
+    def release(self):
+        """Release the lock."""
+        if self.file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.file.close()
+            self.file = None
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+
+
+# ============================================
+# CHANGES MADE BY OTHER PROGRAMS
+# ============================================
+class ExternalChanges:
+    """Students changed in the data file by another program."""
+    
+    __slots__ = ('records', 'incremental')
+    
+    def __init__(self, records, incremental):
+        """
+        Args:
+            records (dict): {student_id: record}, a record of None for a
+                student deleted from the file
+            incremental (bool): True if only the journal's new lines were read
+        """
+        self.records = records
+        self.incremental = incremental
+    
+    def __len__(self):
+        return len(self.records)
+
+
+def same_record(store, student_id, record):
+    """Return True if a store holds a student with the name and marks of a record."""
+    row = store.rows.get(student_id)
+    if row is None:
+        return record is None
+    if record is None or store.names[row] != record['name']:
+        return False
+    return store.row_marks(row) == {subject: float(mark)
+                                    for subject, mark in record['marks'].items()}
+
+
+def record_digest(record):
+    """
+    Return a digest of a record's name and marks.
+    
+    Digests are Python hashes: they only compare records within one run
+    of the program and are never saved.
+    
+    Args:
+        record (dict): Record read from the data file, None for a deleted student
+    
+    Returns:
+        int: The digest, None for a deleted student
+    """
+    if record is None:
+        return None
+    return hash((record['name'], tuple(sorted((subject, float(mark))
+                                              for subject, mark in record['marks'].items()))))
+
+
+def row_digest(store, student_id):
+    """Return the record_digest of a student in a store, None if it has no such student."""
+    row = store.rows.get(student_id)
+    if row is None:
+        return None
+    return hash((store.names[row], tuple(sorted(store.row_marks(row).items()))))
+
+
+def store_digests(store):
+    """Return {student_id: digest} of every student in a store."""
+    return {student_id: row_digest(store, student_id) for student_id in store.rows}
+
+
+def apply_records(store, records):
+    """
+    Put records read from the data file into a store.
+    
+    Stored results are kept (as when loading), so students whose results
+    the store's policy grades the same are not reported as changed again.
+    
+    Args:
+        store (CohortStore): Store to change
+        records (dict): {student_id: record or None (deleted)}
+    """
+    for student_id, record in records.items():
+        if record is None:
+            if student_id in store:
+                store.remove_student(student_id)
+        else:
+            row = store.add_student(student_id, record['name'], record['marks'])
+            store.set_results(row, record['total_marks'], record['percentage'], record['grade'])
+
+
+# ============================================
+# DATA FILE SYNC
+# ============================================
+class DataFileSync:
+    """
+    Version and contents of a data file as this program last read or saved it.
+    
+    read_changes() and save() touch the disk and are meant for the I/O
+    thread; changed() only compares file stats and can be polled from the
+    main loop.
+    """
+    
+    def __init__(self, data_file):
+        """
+        Args:
+            data_file (str): Path of the shared data file
+        """
+        self.data_file = data_file
+        self.storage = open_storage(data_file)
+        # {student_id: digest} of the students as they are in the file
+        self.digests = {}
+        self.journal_offset = 0  # Journal bytes already read (JSON and snapshot files)
+        # A missing file is known to be empty; an existing one has to be read first
+        self.version = None if self.storage.exists() else self.storage.version()
+    
+    def reset(self, digests, version):
+        """
+        Record that the whole file was just read.
+        
+        Args:
+            digests (dict): {student_id: digest} of the records read (see
+                store_digests), kept for comparisons
+            version (tuple): storage.version() taken before the records were read
+        """
+        self.digests = digests
+        self.version = version
+        self.journal_offset = self._journal_size(version)
+    
+    def memory(self):
+        """Return an estimate of the bytes the digests take in memory."""
+        return len(self.digests) * DIGEST_MEMORY_BYTES
+    
+    def _update_digests(self, digests):
+        """Record new digests, {student_id: digest or None (deleted)}."""
+        for student_id, digest in digests.items():
+            if digest is None:
+                self.digests.pop(student_id, None)
+            else:
+                self.digests[student_id] = digest
+    
+    def changed(self):
+        """Return True if another program changed the file since it was last read."""
+        return self.version is not None and self.storage.version() != self.version
+    
+    def _journal_size(self, version):
+        """Return the journal size recorded in a version (0 without a journal)."""
+        if isinstance(self.storage, JsonStorage) and version and version[1] is not None:
+            return version[1][1]
+        return 0
+    
+    def read_changes(self):
+        """
+        Read the students another program changed since the last read or save.
+        
+        Returns:
+            ExternalChanges: The changed students, None if the file is unchanged
+        """
+        with FileLock(self.data_file, exclusive=False):
+            version = self.storage.version()
+            if version == self.version:
+                return None
+            
+            incremental = self._appended_only(version)
+            if incremental:
+                records = self._read_journal()
+            else:
+                records = self._read_differences()
+            
+            digests = {student_id: record_digest(record)
+                       for student_id, record in records.items()}
+            records = {student_id: record for student_id, record in records.items()
+                       if self.digests.get(student_id) != digests[student_id]}
+            self._update_digests(digests)
+            # Taken after reading: closing a database can touch its files
+            # (e.g. an SQLite WAL checkpoint), and no writer can run meanwhile
+            self.version = self.storage.version()
+            if not incremental:
+                self.journal_offset = self._journal_size(self.version)
+        return ExternalChanges(records, incremental)
+    
+    def _appended_only(self, version):
+        """Return True if the file only changed by new journal lines since the last read."""
+        if not isinstance(self.storage, JsonStorage) or self.version is None:
+            return False
+        old_snapshot, old_journal = self.version
+        snapshot, journal = version
+        if snapshot != old_snapshot or journal is None:
+            return False
+        # A checkpoint replaces the snapshot, so the same snapshot means the journal only grew
+        return old_journal is None or (journal[0] == old_journal[0]
+                                       and journal[1] >= self.journal_offset)
+    
+    def _read_journal(self):
+        """Return {student_id: record} of the journal lines added since the last read."""
+        entries, self.journal_offset = self.storage.journal.read_since(self.journal_offset)
+        return dict(entries)  # The last entry per student wins
+    
+    def _read_differences(self):
+        """Read the whole file and return the students whose digests differ."""
+        records = {}
+        seen = set()
+        stream = self.storage.read()
+        try:
+            for student_id, record in stream:
+                seen.add(student_id)
+                if self.digests.get(student_id) != record_digest(record):
+                    records[student_id] = record
+        finally:
+            stream.close()
+        for student_id in self.digests:
+            if student_id not in seen:
+                records[student_id] = None
+        return records
+    
+    def save(self, students, changed_ids, complete=True):
+        """
+        Save changed students unless another program changed the file first.
+        
+        Args:
+            students (StudentCollection): Copy of the current records, or
+                only of the changed ones (see StorageBackend.needs_all_students)
+            changed_ids (set): IDs added, changed or removed since the last save
+            complete (bool): False if students holds only the changed students
+        
+        Returns:
+            int: Number of changed records written
+        
+        Raises:
+            ConflictError: If the file changed since it was last read; read
+                and merge the changes, then save again
+        """
+        with FileLock(self.data_file):
+            if self.storage.version() != self.version:
+                raise ConflictError(
+                    f"{self.data_file} was changed by another program since it was read")
+            saved = self.storage.save(students, changed_ids, complete)
+            # The file held the digested records, so only the changed ones are new
+            self._update_digests({student_id: row_digest(students.store, student_id)
+                                  for student_id in changed_ids})
+            self.version = self.storage.version()
+            self.journal_offset = self._journal_size(self.version)
+        return saved
+    
+    def _forget(self):
+        """Record that the file has to be read again before the next save."""
+        self.digests = {}
+        self.version = None if self.storage.exists() else self.storage.version()
+        self.journal_offset = 0
+    
+    def merge_records(self, batches, replace=False):
+        """
+        Add or replace batches of records, keeping every other student in the file.
+        
+        The file stays locked until the last batch is written, so other
+        programs see the records all at once. Each batch is merged with the
+        file as it is on disk (a JSON checkpoint reads the file again first),
+        so no other program's save is lost.
+        
+        A new file (or one replaced) is written in one pass while the IDs
+        ascend, as storage.write_records needs; from the first record out of
+        order (or repeated) on, the batches are merged like those added to
+        an existing file, so the file still ends up in ID order with one
+        record per student.
+        
+        Args:
+            batches (iterable): Lists of (student_id, record) pairs, in any order
+            replace (bool): Replace the whole file with the records instead
+        
+        Returns:
+            int: Number of records written
+        """
+        batches = iter(batches)
+        rest = []  # Remainder of the batch where the IDs stopped ascending
+        written = 0
+        
+        def ascending():
+            nonlocal written
+            last_id = None
+            for batch in batches:
+                for position, (student_id, record) in enumerate(batch):
+                    if last_id is not None and student_id <= last_id:
+                        rest.append(batch[position:])
+                        return
+                    last_id = student_id
+                    written += 1
+                    yield student_id, record
+        
+        with FileLock(self.data_file):
+            try:
+                if replace or not self.storage.exists():
+                    self.storage.write_records(ascending())
+                for batch in itertools.chain(rest, batches):
+                    self.storage.save_records(batch)
+                    written += len(batch)
+            finally:
+                self._forget()
+        return written
+    
+    def rewrite(self, transform):
+        """
+        Replace every record with a transformed copy (e.g. re-graded).
+        
+        The records are read under the same exclusive lock as the rewrite,
+        so no save made by another program in between is lost.
+        
+        Args:
+            transform (callable): transform(records) takes the file's
+                (student_id, record) pairs and yields the new ones, in
+                ascending ID order
+        """
+        with FileLock(self.data_file):
+            stream = self.storage.read()
+            try:
+                self.storage.write_records(transform(stream))
+            finally:
+                stream.close()
+                self._forget()
\ No newline at end of file
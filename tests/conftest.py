@@ -0,0 +1,30 @@
+"""
+Shared fixtures for the test suite.
+
+The modules live at the top of the repository, so it is put on the path.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from student_store import StudentCollection  # noqa: E402
+
+
+def make_students(count=20, subjects=('Mathematics', 'Science', 'English')):
+    """Return a calculated collection of students 1..count with varied marks."""
+    students = StudentCollection(list(subjects))
+    for student_id in range(1, count + 1):
+        students.add(student_id, f"Student {student_id}",
+                     {subject: float((student_id * 7 + column * 13) % 101)
+                      for column, subject in enumerate(subjects)})
+    students.calculate_all()
+    return students
+
+
+@pytest.fixture
+def students():
+    return make_students()
\ No newline at end of file
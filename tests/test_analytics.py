@@ -0,0 +1,104 @@
+"""Cohort statistics kept up to date in place against a fresh rebuild."""
+
+import random
+import statistics
+
+import pytest
+
+from student_analytics import CohortAnalytics, RunningStats
+
+from conftest import make_students
+
+
+def answers(analytics):
+    """Return every statistic of a store, means and deviations rounded."""
+    results = {'grades': analytics.grade_distribution(),
+               'ranks': {student_id: analytics.rank(student_id)
+                         for student_id in analytics.store.rows}}
+    for label, summary in analytics.summary():
+        results[label] = {key: value if value is None else pytest.approx(value)
+                          for key, value in summary.items()}
+    for percent in (0, 10, 50, 90, 100):
+        results[percent] = analytics.percentile(percent)
+        for subject in analytics.store.subjects:
+            results[subject, percent] = analytics.percentile(percent, subject)
+    return results
+
+
+def check_against_rebuild(store, analytics):
+    assert answers(analytics) == answers(CohortAnalytics(store.copy()))
+
+
+def test_running_stats_match_statistics():
+    rng = random.Random(0)
+    values = [rng.uniform(0, 100) for _ in range(500)]
+    stats = RunningStats(values[:100])
+    for value in values[100:]:
+        stats.add(value)
+    for value in values[:250]:
+        stats.remove(value)
+    assert stats.count == 250
+    assert stats.mean == pytest.approx(statistics.fmean(values[250:]))
+    assert stats.std == pytest.approx(statistics.pstdev(values[250:]))
+
+
+def test_single_edits_are_applied_in_place(students):
+    store = students.store
+    analytics = CohortAnalytics(store)
+    subject_marks = analytics.subject_marks
+    
+    store.set_mark(store.rows[3], 'Mathematics', 100)
+    store.delete_mark(store.rows[4], 'Science')
+    store.remove_student(5)
+    students.add(500, "New", {'English': 10})
+    students.add(501, "No Marks")
+    students.calculate_all()
+    
+    check_against_rebuild(store, analytics)
+    assert analytics.subject_marks is subject_marks  # Updated, not rebuilt
+    assert analytics.rank(5) is None and analytics.rank(501) is None
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_edits_match_a_rebuild(seed):
+    rng = random.Random(seed)
+    students = make_students(200)
+    store = students.store
+    analytics = CohortAnalytics(store)
+    next_id = 1000
+    
+    for _ in range(30):
+        for _ in range(rng.randint(1, 15)):
+            action = rng.random()
+            student_id = rng.choice(list(store.rows))
+            if action < 0.5:
+                store.set_mark(store.rows[student_id], rng.choice(store.subjects),
+                               float(rng.randint(0, 100)))
+            elif action < 0.6:
+                store.delete_mark(store.rows[student_id], rng.choice(store.subjects))
+            elif action < 0.8:
+                store.remove_student(student_id)
+            else:
+                students.add(next_id, f"Student {next_id}",
+                             {'Mathematics': rng.randint(0, 100)} if action < 0.95 else {})
+                next_id += 1
+        students.calculate_all()
+        check_against_rebuild(store, analytics)
+
+
+def test_new_subject_and_large_batch_rebuild(students, monkeypatch):
+    monkeypatch.setattr('student_analytics.REBUILD_THRESHOLD', 5)
+    store = students.store
+    analytics = CohortAnalytics(store)
+    subject_marks = analytics.subject_marks
+    
+    for student_id in range(1, 11):
+        store.set_mark(store.rows[student_id], 'Science', 0)
+    students.calculate_all()
+    check_against_rebuild(store, analytics)
+    assert analytics.subject_marks is not subject_marks
+    
+    store.set_mark(store.rows[1], 'Art', 88)
+    students.calculate_all()
+    check_against_rebuild(store, analytics)
+    assert analytics.subject_summary('Art')['count'] == 1
\ No newline at end of file
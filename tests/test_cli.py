@@ -0,0 +1,41 @@
+"""Command-line tool: report order and errors reported without a traceback."""
+
+import json
+
+from student_cli import main
+from student_files import student_record
+
+from conftest import make_students
+
+
+def test_report_is_in_student_id_order(tmp_path, capsys):
+    students = make_students(100)
+    data_file = str(tmp_path / 'student_data.json')
+    data = {str(student_id): student_record(student) for student_id, student in students.items()
+            if student_id in (2, 9, 10, 100)}
+    with open(data_file, 'w') as file:
+        json.dump(data, file, indent=4, sort_keys=True)  # Keys in text order: 10, 100, 2, 9
+    
+    assert main(['--data-file', data_file, '--workers', '1', 'report']) == 0
+    report = capsys.readouterr().out
+    assert "Generated: 4 students" in report
+    assert [line for line in report.splitlines() if line.startswith("Student ID")] == [
+        "Student ID: 2", "Student ID: 9", "Student ID: 10", "Student ID: 100"]
+
+
+def test_import_of_a_report_csv_is_refused(tmp_path, capsys):
+    source = tmp_path / 'results.csv'
+    source.write_text("Student ID,Name,Mathematics\n1,Ann,90\n", encoding='utf-8')
+    data_file = str(tmp_path / 'student_data.json')
+    
+    assert main(['--data-file', data_file, '--workers', '1', 'import', str(source)]) == 1
+    error = capsys.readouterr().err
+    assert "student_id" in error
+    assert "Traceback" not in error
+
+
+def test_missing_source_is_reported(tmp_path, capsys):
+    data_file = str(tmp_path / 'student_data.json')
+    missing = str(tmp_path / 'missing.csv')
+    assert main(['--data-file', data_file, 'import', missing]) == 1
+    assert "missing.csv" in capsys.readouterr().err
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""Edit batches: rollback on failure, undo and redo."""
+
+import pytest
+
+from student_edits import EditLog
+
+
+def state(store):
+    """Return {student_id: (name, marks)} of every student in a store."""
+    return {student_id: (store.names[row], store.row_marks(row))
+            for student_id, row in store.rows.items()}
+
+
+def test_failed_batch_rolls_back_every_edit(students):
+    store = students.store
+    log = EditLog(store)
+    before = state(store)
+    
+    with pytest.raises(ValueError):
+        with log.batch("Broken") as batch:
+            batch.set_mark(1, 'Mathematics', 55)
+            batch.update_student(2, name="Renamed", marks={'Science': 40})
+            batch.remove_student(3)
+            batch.add_student(100, "New", {'English': 70})
+            batch.set_mark(4, 'Mathematics', 500)  # Above the maximum
+    
+    assert state(store) == before
+    assert not log.can_undo()
+
+
+def test_invalid_edit_changes_nothing(students):
+    store = students.store
+    log = EditLog(store)
+    before = state(store)
+    
+    with pytest.raises(KeyError):
+        with log.batch() as batch:
+            batch.set_mark(999, 'Mathematics', 50)
+    with pytest.raises(ValueError):
+        with log.batch() as batch:
+            batch.add_student(1, "Taken")
+    
+    assert state(store) == before
+
+
+def test_undo_and_redo_round_trip(students):
+    store = students.store
+    log = EditLog(store)
+    original = state(store)
+    
+    with log.batch("Mathematics +5") as batch:
+        batch.adjust_subject('Mathematics', 5)
+    with log.batch("Edits") as batch:
+        batch.update_student(2, name="Renamed", marks={'Science': 40})
+        batch.set_mark(5, 'English', None)
+        batch.remove_student(3)
+        batch.add_student(100, "New", {'English': 70})
+    edited = state(store)
+    assert edited != original
+    
+    assert log.undo().changed_ids == {2, 3, 5, 100}
+    log.undo()
+    assert state(store) == original
+    assert not log.can_undo() and log.can_redo()
+    
+    log.redo()
+    log.redo()
+    assert state(store) == edited
+    assert log.can_undo() and not log.can_redo()
+
+
+def test_new_batch_clears_redo(students):
+    log = EditLog(students.store)
+    with log.batch() as batch:
+        batch.set_mark(1, 'Mathematics', 10)
+    log.undo()
+    with log.batch() as batch:
+        batch.set_mark(2, 'Mathematics', 20)
+    assert not log.can_redo()
+
+
+def test_edit_back_to_old_state_is_not_recorded(students):
+    store = students.store
+    log = EditLog(store)
+    old_mark = store.get_mark(store.rows[1], 'Mathematics')
+    with log.batch() as batch:
+        batch.set_mark(1, 'Mathematics', 0)
+        batch.set_mark(1, 'Mathematics', old_mark)
+    assert batch.changed_ids == set()
+    assert not log.can_undo()
+
+
+def test_commit_reports_changes_with_unchanged_results(students):
+    store = students.store
+    store.track_changes('unsaved')
+    store.pop_changes('unsaved')
+    log = EditLog(store)
+    
+    with log.batch() as batch:
+        batch.update_student(1, name="Same Marks")
+    students.calculate_all()
+    
+    assert store.pop_changes('unsaved') == {1}
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""Report export: student order, the header and the three formats."""
+
+import csv
+import json
+import os
+
+import pytest
+
+from student_export import ExportJob, export_data_file, scan_storage
+from student_files import iter_student_records, student_record
+from student_storage import open_storage
+from student_store import DEFAULT_SUBJECTS
+
+from conftest import make_students
+
+
+def legacy_file(tmp_path, students):
+    """Write students as the original save_to_file did: keys sorted as text."""
+    data_file = str(tmp_path / 'student_data.json')
+    data = {str(student_id): student_record(student) for student_id, student in students.items()}
+    with open(data_file, 'w') as file:
+        json.dump(data, file, indent=4, sort_keys=True)
+    return open_storage(data_file)
+
+
+def csv_rows(target_file):
+    with open(target_file, newline='', encoding='utf-8') as file:
+        return list(csv.reader(file))
+
+
+def cohort(student_ids):
+    students = make_students(max(student_ids))
+    for student_id in list(students.store.rows):
+        if student_id not in student_ids:
+            students.store.remove_student(student_id)
+    return students
+
+
+def test_file_out_of_id_order_is_exported_sorted(tmp_path):
+    storage = legacy_file(tmp_path, cohort([2, 10, 100, 9]))
+    assert scan_storage(storage)[::2] == (4, False)
+    
+    target = str(tmp_path / 'results.csv')
+    assert export_data_file(storage, target)[0] == 4
+    assert [row[0] for row in csv_rows(target)[1:]] == ['2', '9', '10', '100']
+    
+    target = str(tmp_path / 'results.txt')
+    export_data_file(storage, target)
+    with open(target, encoding='utf-8') as file:
+        text = file.read()
+    assert "Generated: 4 students" in text
+    assert [line for line in text.splitlines() if line.startswith("Student ID")] == [
+        "Student ID: 2", "Student ID: 9", "Student ID: 10", "Student ID: 100"]
+
+
+def test_csv_export_matches_the_gui_export(tmp_path):
+    students = make_students(50, DEFAULT_SUBJECTS)
+    students.add(51, "Extra", {'Art': 75})
+    students.calculate_all()
+    storage = open_storage(str(tmp_path / 'students.jsonl'))
+    storage.write_records(iter_student_records(students))
+    assert scan_storage(storage) == (51, list(DEFAULT_SUBJECTS) + ['Art'], True)
+    
+    from_file = str(tmp_path / 'from_file.csv')
+    from_store = str(tmp_path / 'from_store.csv')
+    assert export_data_file(storage, from_file, chunk_size=7)[0] == 51
+    ExportJob(from_store, students.store.copy(), chunk_size=7)()
+    
+    rows = csv_rows(from_file)
+    assert rows == csv_rows(from_store)
+    assert rows[0] == (['student_id', 'name'] + list(DEFAULT_SUBJECTS)
+                       + ['Art', 'total_marks', 'percentage', 'grade'])
+    assert [int(row[0]) for row in rows[1:]] == list(range(1, 52))
+    assert rows[-1][2:-3] == [''] * len(DEFAULT_SUBJECTS) + ['75.0']
+
+
+def test_html_export_has_a_row_per_student(tmp_path):
+    storage = legacy_file(tmp_path, make_students(12))
+    target = str(tmp_path / 'results.html')
+    export_data_file(storage, target, chunk_size=5)
+    with open(target, encoding='utf-8') as file:
+        page = file.read()
+    
+    assert "<th>Mathematics (/100)</th>" in page
+    assert "<p>Generated: 12 students</p>" in page
+    assert page.count("<tr><td") == 12
+    assert page.endswith("</table>\n</body>\n</html>\n")
+
+
+def test_unknown_format_writes_nothing(tmp_path):
+    storage = legacy_file(tmp_path, make_students(3))
+    with pytest.raises(ValueError, match="Cannot export"):
+        export_data_file(storage, str(tmp_path / 'results.pdf'))
+    assert sorted(os.listdir(tmp_path)) == ['student_data.json']
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""Grading policies: grade bands, subject weights and maximums, policy files."""
+
+import json
+
+import pytest
+
+from student_grading import DEFAULT_POLICY, GradingPolicy, load_policy, save_policy
+from student_store import CohortStore
+
+PHYSICS = GradingPolicy(
+    "Physics 2026",
+    bands=[(80, 'B-'), (93, 'A'), (90, 'A-'), (83, 'B'), (87, 'B+'), (60, 'C')],
+    fail_grade='E',
+    subjects={'Mathematics': {'weight': 2, 'maximum': 50}, 'Practical': {'maximum': 40}})
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def engine(request, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr('student_store.load_numpy', lambda: None)
+    else:
+        pytest.importorskip('numpy')
+    return request.param
+
+
+def graded(policy, *rows):
+    """Return (total, percentage, grade) of each row of marks, graded in one batch."""
+    store = CohortStore(['Mathematics', 'Science', 'Practical'], policy)
+    for student_id, marks in enumerate(rows, 1):
+        store.add_student(student_id, "Student", marks)
+    store.calculate_all()
+    return [(store.total_marks[row], store.percentage[row],
+             store.grade_labels[store.grade_codes[row]]) for row in range(len(rows))]
+
+
+@pytest.mark.parametrize('percentage, grade', [
+    (100, 'A'), (93, 'A'), (92.99, 'A-'), (90, 'A-'), (87, 'B+'), (86.5, 'B'),
+    (80, 'B-'), (79.99, 'C'), (60, 'C'), (59.99, 'E'), (0, 'E'),
+])
+def test_bands_in_any_order(percentage, grade):
+    assert PHYSICS.grade(percentage) == grade
+
+
+def test_grades_are_listed_best_first():
+    assert PHYSICS.grades() == ['A', 'A-', 'B+', 'B', 'B-', 'C', 'E']
+    assert PHYSICS.rank('A') > PHYSICS.rank('B+') > PHYSICS.rank('E') > PHYSICS.rank('N/A')
+
+
+@pytest.mark.parametrize('bands, fail_grade, subjects', [
+    ([(90, 'A'), (80, 'A')], 'F', None),
+    ([(90, 'A'), (90, 'B')], 'F', None),
+    ([(90, 'A')], 'A', None),
+    ([(90, 'N/A')], 'F', None),
+    ([(90, 'A')], 'F', {'Mathematics': {'weight': 0}}),
+    ([(90, 'A')], 'F', {'Mathematics': {'maximum': -10}}),
+])
+def test_invalid_policies_are_refused(bands, fail_grade, subjects):
+    with pytest.raises(ValueError):
+        GradingPolicy("Bad", bands, fail_grade, subjects)
+
+
+def test_weights_and_maximums(engine):
+    # Mathematics 25/50 counts twice (50%), Science 80/100 once: (2 * 50 + 80) / 3
+    (total, percentage, grade), = graded(PHYSICS, {'Mathematics': 25, 'Science': 80})
+    assert total == 105
+    assert percentage == pytest.approx(60.0)
+    assert grade == 'C'
+    assert PHYSICS.max_total(['Mathematics', 'Science']) == 150
+
+
+def test_batch_matches_single_rows(engine):
+    rows = [{}, {'Practical': 40}, {'Mathematics': 50, 'Practical': 36},
+            {'Science': 59.5}, {'Mathematics': 46.5, 'Science': 93, 'Practical': 37.2}]
+    store = CohortStore(['Mathematics', 'Science', 'Practical'], PHYSICS)
+    expected = []
+    for row, marks in enumerate(rows):
+        store.add_student(row, "Student", marks)
+        expected.append(store.compiled_policy.calculate(store.marks[row * 3:row * 3 + 3]))
+    assert graded(PHYSICS, *rows) == [pytest.approx(results) for results in expected]
+    assert [results[2] for results in expected] == ['N/A', 'A', 'A', 'E', 'A']
+
+
+def test_changing_policy_regrades_the_cohort(engine):
+    store = CohortStore(['Mathematics', 'Science'])
+    store.add_student(1, "Ann", {'Mathematics': 41, 'Science': 95})
+    store.add_student(2, "Bob", {'Science': 85})
+    store.calculate_all()
+    assert store.grade_labels[store.grade_codes[0]] == 'D'
+    store.track_changes('display')
+    store.pop_changes('display')
+    
+    store.set_policy(PHYSICS)
+    store.calculate()
+    assert store.percentage[0] == pytest.approx((2 * 82 + 95) / 3)
+    assert [store.grade_labels[code] for code in store.grade_codes] == ['B', 'B']
+    assert store.pop_changes('display') == {1}  # Bob's results are the same
+
+
+def test_policy_file_round_trip(tmp_path):
+    policy_file = str(tmp_path / 'physics.json')
+    save_policy(PHYSICS, policy_file)
+    loaded = load_policy(policy_file)
+    assert loaded == PHYSICS
+    assert hash(loaded) == hash(PHYSICS)
+    assert loaded.maximum('Practical') == 40
+    assert loaded.weight('Practical') == 1
+    assert loaded != DEFAULT_POLICY
+
+
+def test_hand_written_policy_file(tmp_path):
+    policy_file = tmp_path / 'pass.json'
+    policy_file.write_text(json.dumps({'bands': [[50, 'P']]}), encoding='utf-8')
+    policy = load_policy(str(policy_file))
+    assert (policy.name, policy.grade(50), policy.grade(49.9)) == ("Custom", 'P', 'F')
+    
+    policy_file.write_text(json.dumps({'bands': 5}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_policy(str(policy_file))
\ No newline at end of file
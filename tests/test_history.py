@@ -0,0 +1,122 @@
+"""Term history: terms stored as deltas rebuild to the marks recorded."""
+
+import random
+
+import pytest
+
+from student_history import TermHistory, load_history, write_history
+
+
+def random_terms(seed, count=6, students=80):
+    """Return (name, subjects, {student_id: marks}) of terms with random changes."""
+    rng = random.Random(seed)
+    subjects = ['Mathematics', 'Science', 'English']
+    marks = {student_id: {subject: float(rng.randint(0, 100)) for subject in subjects}
+             for student_id in range(1, students + 1)}
+    terms = []
+    for position in range(count):
+        if position == 2:
+            subjects = ['Mathematics', 'Science', 'Art']  # English dropped, Art added
+        term = {}
+        for student_id, student_marks in marks.items():
+            if rng.random() < 0.05:
+                continue  # Not in this term (left, or away for a term)
+            student_marks = {subject: mark for subject, mark in student_marks.items()
+                             if subject in subjects}
+            for subject in subjects:
+                action = rng.random()
+                if action < 0.05:
+                    student_marks[subject] = float(rng.randint(0, 100))
+                elif action < 0.07:
+                    student_marks.pop(subject, None)
+            term[student_id] = student_marks
+        marks.update(term)
+        terms.append((f"2026 T{position + 1}", list(subjects), term))
+    return terms
+
+
+def recorded(terms):
+    history = TermHistory()
+    for name, subjects, term in terms:
+        history.record_term(name, term.items(), subjects)
+    return history
+
+
+def check(history, terms):
+    for position, (name, subjects, term) in enumerate(terms):
+        assert history.term_marks(name) == term
+        for student_id in term:
+            assert history.history(student_id)[position] == term[student_id]
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_terms_rebuild_to_the_recorded_marks(seed, tmp_path):
+    terms = random_terms(seed)
+    history = recorded(terms)
+    check(history, terms)
+    # Most students keep their marks from term to term: far fewer deltas than full copies
+    assert history.delta_count() < sum(len(term) for _, _, term in terms) / 2
+    
+    history_file = str(tmp_path / 'students.history.json')
+    write_history(history.to_dict(), history_file)
+    loaded = load_history(history_file)
+    assert loaded.term_names() == history.term_names()
+    check(loaded, terms)
+
+
+def test_unchanged_students_store_no_delta():
+    history = TermHistory()
+    history.record_term("T1", [(1, {'Mathematics': 50}), (2, {'Mathematics': 60})])
+    term = history.record_term("T2", [(1, {'Mathematics': 50}), (2, {'Mathematics': 65})])
+    assert (term.students, term.changed) == (2, 1)
+    assert history.changes[1] == [(0, {'Mathematics': 50.0})]
+    assert history.changes[2][-1] == (1, {'Mathematics': 65.0})
+
+
+def test_dropped_subject_is_not_carried_over():
+    history = TermHistory()
+    history.record_term("T1", [(1, {'Mathematics': 50, 'Art': 70})])
+    history.record_term("T2", [(1, {'Mathematics': 50})], ['Mathematics'])
+    history.record_term("T3", [(1, {'Mathematics': 55})], ['Mathematics', 'Art'])
+    assert history.history(1) == [{'Mathematics': 50.0, 'Art': 70.0}, {'Mathematics': 50.0},
+                                  {'Mathematics': 55.0}]
+    # Dropping Art with its subject costs no delta in T2
+    assert [position for position, _ in history.changes[1]] == [0, 2]
+
+
+def test_student_who_left_and_returned():
+    history = TermHistory()
+    history.record_term("T1", [(1, {'Mathematics': 50}), (2, {'Science': 80})])
+    history.record_term("T2", [(1, {'Mathematics': 50})])
+    history.record_term("T3", [(1, {'Mathematics': 50}), (2, {'Science': 90})])
+    assert history.history(2) == [{'Science': 80.0}, None, {'Science': 90.0}]
+    assert [name for name, *_ in history.progress(2)] == ["T1", "T3"]
+    assert history.progress(2)[-1][1:] == (90.0, 90.0, 'A')
+
+
+def test_last_term_can_be_recorded_again():
+    history = TermHistory()
+    history.record_term("T1", [(1, {'Mathematics': 50})])
+    history.record_term("T2", [(1, {'Mathematics': 40})])
+    assert history.progress(1)[-1][3] == 'F'
+    
+    history.record_term("T2", [(1, {'Mathematics': 75})])  # After a re-sit
+    assert history.term_names() == ["T1", "T2"]
+    assert history.history(1) == [{'Mathematics': 50.0}, {'Mathematics': 75.0}]
+    assert history.progress(1)[-1][3] == 'C'
+    
+    with pytest.raises(ValueError):
+        history.record_term("T1", [(1, {'Mathematics': 90})])
+    with pytest.raises(ValueError):
+        history.record_term("  ", [])
+
+
+def test_invalid_history_file(tmp_path):
+    history_file = tmp_path / 'students.history.json'
+    assert len(load_history(str(history_file))) == 0
+    history_file.write_text('{"terms": [{"subjects": []}]}', encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_history(str(history_file))
+    history_file.write_text('{"terms": [', encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_history(str(history_file))
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""Bulk CSV import: validation of rows and the error report."""
+
+import io
+
+import pytest
+
+from student_grading import GradingPolicy
+from student_import import CsvImportJob, ImportErrors, iter_csv_records, parse_mark
+from student_store import StudentCollection
+
+
+def read_csv(text, policy=None):
+    """Return (records, errors, rows read) of a CSV text."""
+    errors = ImportErrors()
+    counter = [0]
+    kwargs = {} if policy is None else {'policy': policy}
+    records = [(line_number, student_id, record) for line_number, student_id, record
+               in iter_csv_records(io.StringIO(text), errors, counter, **kwargs)]
+    return records, errors, counter[0]
+
+
+@pytest.mark.parametrize('value', ['nan', 'NaN', 'inf', '-inf', 'Infinity', float('nan')])
+def test_non_finite_marks_are_rejected(value):
+    with pytest.raises(ValueError, match="must be a number"):
+        parse_mark('Mathematics', value)
+
+
+@pytest.mark.parametrize('value, expected', [('0', 0.0), (' 99.5 ', 99.5), (100, 100.0)])
+def test_marks_in_range_are_accepted(value, expected):
+    assert parse_mark('Mathematics', value) == expected
+
+
+@pytest.mark.parametrize('value', ['-1', '100.5', 'abc', '', None])
+def test_invalid_marks_are_rejected(value):
+    with pytest.raises(ValueError):
+        parse_mark('Mathematics', value)
+
+
+def test_wide_csv_rows_are_validated():
+    records, errors, rows = read_csv(
+        "student_id,name,Mathematics,Science\n"
+        "1,Ann,90,80\n"
+        "2,Bob,nan,70\n"
+        "x,Cy,50,50\n"
+        "4,,50,50\n"
+        "5,Dee,,101\n"
+        "6,Eve,,\n"
+        "\n")
+    assert [(student_id, record) for _, student_id, record in records] == [
+        (1, {'name': 'Ann', 'marks': {'Mathematics': 90.0, 'Science': 80.0}}),
+        (6, {'name': 'Eve', 'marks': {}})]
+    assert [line for line, _ in errors.sorted()] == [3, 4, 5, 6]
+    assert rows == 7
+
+
+def test_long_csv_groups_rows_by_student():
+    records, errors, _ = read_csv(
+        "student_id,name,subject,mark\n"
+        "1,Ann,Mathematics,90\n"
+        "1,,Science,NaN\n"
+        "1,,English,70\n"
+        "2,Bob,Mathematics,40\n")
+    assert [(line, student_id, record['marks']) for line, student_id, record in records] == [
+        (2, 1, {'Mathematics': 90.0, 'English': 70.0}),
+        (5, 2, {'Mathematics': 40.0})]
+    assert [line for line, _ in errors.sorted()] == [3]
+
+
+def test_policy_maximum_is_used():
+    policy = GradingPolicy('Physics', [(50, 'P')], 'F', subjects={'Practical': {'maximum': 40}})
+    records, errors, _ = read_csv("id,name,Practical\n1,Ann,40\n2,Bob,41\n", policy)
+    assert [student_id for _, student_id, _ in records] == [1]
+    assert errors.count == 1
+
+
+def test_header_without_id_or_name_is_refused():
+    with pytest.raises(ValueError, match="student_id"):
+        read_csv("Student ID,Name,Mathematics\n1,Ann,90\n")
+
+
+def test_gui_job_commits_only_valid_students(tmp_path):
+    source = tmp_path / 'marks.csv'
+    source.write_text("student_id,name,Mathematics\n1,Ann,90\n2,Bob,inf\n3,Cy,60\n",
+                      encoding='utf-8')
+    job = CsvImportJob(str(source), batch_size=1)
+    assert job() is job
+    students = StudentCollection(['Mathematics'])
+    students.add(3, "Existing")
+    
+    assert job.commit(students) == 1
+    assert sorted(students) == [1, 3]
+    assert students[3].name == "Existing"
+    assert [line for line, _ in job.errors.sorted()] == [3, 4]
+
+
+def test_repeated_id_in_wide_csv_is_reported():
+    records, errors, _ = read_csv(
+        "student_id,name,Mathematics\n30,A,10\n5,B,20\n30,C,30\n")
+    assert [(student_id, record['name']) for _, student_id, record in records] == [
+        (30, 'A'), (5, 'B')]
+    assert errors.sorted() == [(4, "Student ID 30 appears more than once in the file")]
+
+
+def test_repeated_student_in_long_csv_is_reported():
+    records, errors, _ = read_csv(
+        "student_id,name,subject,mark\n"
+        "1,Ann,Mathematics,90\n"
+        "2,Bob,Mathematics,40\n"
+        "1,Ann,Science,70\n"
+        "1,Ann,English,60\n"
+        "3,Cy,Science,50\n")
+    assert [(student_id, record['marks']) for _, student_id, record in records] == [
+        (1, {'Mathematics': 90.0}), (2, {'Mathematics': 40.0}), (3, {'Science': 50.0})]
+    assert [line for line, _ in errors.sorted()] == [4, 5]
+
+
+def test_gui_job_reports_repeats_across_batches(tmp_path):
+    source = tmp_path / 'marks.csv'
+    source.write_text("student_id,name,Mathematics\n30,A,10\n5,B,20\n30,C,30\n",
+                      encoding='utf-8')
+    job = CsvImportJob(str(source), batch_size=1)
+    job()
+    assert job.valid_count == 2
+    assert job.errors.sorted() == [(4, "Student ID 30 appears more than once in the file")]
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""Search indexes kept up to date in place against a fresh rebuild."""
+
+import random
+
+import pytest
+
+from student_index import StudentIndex
+
+from conftest import make_students
+
+QUERIES = ['student 1', 'student', 'renamed', 'grade:A', 'grade:F', 'grade:B',
+           '0-40', '40-60', '60-100', '12', '999']
+
+
+def answers(index):
+    """Return every query's answer, the IDs sorted (ties may come in any order)."""
+    results = {}
+    for query in QUERIES:
+        total, student_ids = index.search(query, limit=10000)
+        results[query] = (total, sorted(student_ids))
+    return results
+
+
+def check_against_rebuild(store, index):
+    index.update()
+    assert answers(index) == answers(StudentIndex(store.copy()))
+
+
+def test_single_edits_are_applied_in_place(students):
+    store = students.store
+    index = StudentIndex(store)
+    name_order = index.name_order
+    
+    store.set_mark(store.rows[3], 'Mathematics', 100)
+    store.names[store.rows[4]] = "Renamed"
+    store.mark_changed(store.rows[4])
+    store.remove_student(5)
+    students.add(500, "Renamed Too", {'English': 10})
+    students.calculate_all()
+    
+    check_against_rebuild(store, index)
+    assert index.name_order is name_order  # Patched, not rebuilt
+
+
+def test_removed_row_reused_by_a_new_student(students):
+    store = students.store
+    index = StudentIndex(store)
+    store.remove_student(2)
+    students.add(200, "Student Reused", {'Science': 90})
+    students.calculate_all()
+    assert store.rows[200] == 1  # The row of student 2
+    
+    check_against_rebuild(store, index)
+    assert index.search('2', 10) == (0, [])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_random_edits_match_a_rebuild(seed):
+    rng = random.Random(seed)
+    students = make_students(200)
+    store = students.store
+    index = StudentIndex(store)
+    next_id = 1000
+    
+    for _ in range(30):
+        for _ in range(rng.randint(1, 15)):
+            action = rng.random()
+            student_id = rng.choice(list(store.rows))
+            if action < 0.5:
+                store.set_mark(store.rows[student_id], rng.choice(store.subjects),
+                               float(rng.randint(0, 100)))
+            elif action < 0.7:
+                store.remove_student(student_id)
+            elif action < 0.85:
+                students.add(next_id, f"Student {next_id}", {'Mathematics': rng.randint(0, 100)})
+                next_id += 1
+            else:
+                store.names[store.rows[student_id]] = rng.choice(["Renamed", "student x", "Zed"])
+                store.mark_changed(store.rows[student_id])
+        students.calculate_all()
+        check_against_rebuild(store, index)
+
+
+def test_large_batch_rebuilds(students, monkeypatch):
+    monkeypatch.setattr('student_index.REBUILD_THRESHOLD', 5)
+    store = students.store
+    index = StudentIndex(store)
+    name_order = index.name_order
+    for student_id in range(1, 11):
+        store.set_mark(store.rows[student_id], 'Science', 0)
+    students.calculate_all()
+    
+    check_against_rebuild(store, index)
+    assert index.name_order is not name_order
\ No newline at end of file
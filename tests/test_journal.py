@@ -0,0 +1,112 @@
+"""Write-ahead journal: appends, replay on load and checkpoints."""
+
+import json
+
+import pytest
+
+from student_files import iter_student_records
+from student_journal import StudentJournal
+from student_storage import JsonStorage, open_storage
+
+from conftest import make_students
+
+
+def read_all(storage):
+    stream = storage.read()
+    try:
+        return dict(stream)
+    finally:
+        stream.close()
+
+
+@pytest.fixture(params=['students.json', 'students.jsonl', 'students.snap'])
+def data_file(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+def test_save_appends_only_the_changed_students(tmp_path):
+    data_file = str(tmp_path / 'students.json')
+    students = make_students()
+    storage = JsonStorage(data_file)
+    storage.journal.checkpoint(iter_student_records(students))
+    
+    students.store.set_mark(students.store.rows[4], 'Science', 99)
+    students.store.remove_student(5)
+    students.calculate_all()
+    assert storage.save(students, {4, 5}) == 2
+    
+    with open(storage.journal.journal_file) as file:
+        entries = [json.loads(line) for line in file]
+    assert [(entry['op'], entry['id']) for entry in entries] == [('put', 4), ('delete', 5)]
+    assert entries[0]['marks']['Science'] == 99
+
+
+def test_load_replays_the_journal(data_file):
+    storage = open_storage(data_file)
+    students = make_students()
+    storage.save(students, set(students.store.rows))
+    
+    store = students.store
+    store.set_mark(store.rows[2], 'English', 1)
+    store.remove_student(3)
+    students.add(50, "Late Joiner", {'Mathematics': 80})
+    students.calculate_all()
+    storage.save(students, {2, 3, 50}, complete=False)
+    
+    records = read_all(open_storage(data_file))
+    assert sorted(records) == sorted(store.rows)
+    assert records[2]['marks']['English'] == 1
+    assert 3 not in records
+    assert records[50]['name'] == "Late Joiner"
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    journal = StudentJournal(str(tmp_path / 'students.json'))
+    journal.append_records([(1, {'name': "A", 'marks': {}})])
+    with open(journal.journal_file, 'a') as file:
+        file.write('{"op": "put", "id": 2, "na')
+    
+    assert [student_id for student_id, _ in journal.replay()] == [1]
+    entries, offset = journal.read_since(0)
+    assert [student_id for student_id, _ in entries] == [1]
+    assert offset < journal.journal_size()
+
+
+def test_read_since_returns_only_new_entries(tmp_path):
+    journal = StudentJournal(str(tmp_path / 'students.json'))
+    journal.append_records([(1, {'name': "A", 'marks': {}})])
+    _, offset = journal.read_since(0)
+    journal.append_records([(2, {'name': "B", 'marks': {}}), (1, None)])
+    
+    entries, end = journal.read_since(offset)
+    assert entries == [(2, {'name': "B", 'marks': {}}), (1, None)]
+    assert end == journal.journal_size()
+
+
+def test_checkpoint_empties_the_journal(data_file, monkeypatch):
+    monkeypatch.setattr('student_journal.MIN_CHECKPOINT_BYTES', 0)
+    storage = open_storage(data_file)
+    students = make_students(200)
+    storage.save(students, set(students.store.rows))
+    assert storage.journal.journal_size() == 0  # A new file is checkpointed at once
+    
+    store = students.store
+    assert storage.needs_all_students() is False
+    for mark in (41, 40, 42):
+        for student_id in range(1, 151):
+            store.set_mark(store.rows[student_id], 'Mathematics', mark)
+        students.calculate_all()
+        storage.save(students.copy(range(1, 151)), set(range(1, 151)), complete=False)
+    assert storage.journal.journal_size() > 0  # Not compacted with only the changed students
+    
+    # The journal now outweighs half the snapshot: the next full save compacts it
+    assert storage.needs_all_students()
+    store.set_mark(store.rows[151], 'Mathematics', 43)
+    students.calculate_all()
+    storage.save(students, {151})
+    assert storage.journal.journal_size() == 0
+    
+    records = read_all(open_storage(data_file))
+    assert len(records) == 200
+    assert records[1]['marks']['Mathematics'] == 42
+    assert records[151]['marks']['Mathematics'] == 43
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""HTTP/JSON API: ETags, validation of posted students and failed saves."""
+
+import asyncio
+import functools
+import http.client
+import json
+
+import pytest
+
+from student_server import ResultServer, etag_matches
+from student_storage import open_storage
+
+
+def request(port, method, path, body=None, headers=None):
+    """Make one request; return (status, ETag, decoded body)."""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        connection.request(method, path, None if body is None else json.dumps(body),
+                           headers or {})
+        response = connection.getresponse()
+        data = response.read()
+        return response.status, response.getheader('ETag'), json.loads(data) if data else None
+    finally:
+        connection.close()
+
+
+def with_server(data_file, client):
+    """Serve a data file and run client(call, server) on another thread."""
+    async def run():
+        server = ResultServer(data_file)
+        await server.start('127.0.0.1', 0)
+        try:
+            call = functools.partial(request, server.port)
+            return await asyncio.get_running_loop().run_in_executor(None, client, call, server)
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+
+def student(student_id, name, **marks):
+    return {'id': student_id, 'name': name, 'marks': marks}
+
+
+@pytest.mark.parametrize('header, expected', [
+    (None, False),
+    ('', False),
+    ('"v1"', True),
+    ('"v0", "v1"', True),
+    ('W/"v1"', True),
+    ('*', True),
+    ('"v2"', False),
+    ('v1', False),
+])
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"v1"') is expected
+
+
+def test_unchanged_snapshot_is_not_modified(tmp_path):
+    def client(call, server):
+        status = call('POST', '/students', {'students': [student(1, "Ann", Mathematics=90)]})[0]
+        assert status == 200
+        status, etag, record = call('GET', '/students/1')
+        assert status == 200 and record['grade'] == 'A'
+        
+        for header in (etag, 'W/' + etag, '"old", ' + etag, '*'):
+            assert call('GET', '/students/1', headers={'If-None-Match': header}) == (
+                304, etag, None)
+        assert call('GET', '/stats', headers={'If-None-Match': etag})[0] == 304
+        
+        # A write publishes a new snapshot, with a new ETag
+        call('POST', '/students', {'students': [student(2, "Bob")]})
+        status, new_etag, _ = call('GET', '/students/1', headers={'If-None-Match': etag})
+        assert status == 200 and new_etag != etag
+    
+    with_server(str(tmp_path / 'students.json'), client)
+
+
+@pytest.mark.parametrize('record', [
+    student(1, "Ann", Mathematics=float('nan')),
+    student(1, "Ann", Mathematics=101),
+    student(1, "Ann", Mathematics="ninety"),
+    student(1, "  "),
+    student('x', "Ann"),
+    student(-1, "Ann"),
+    student(1.5, "Ann"),
+    {'id': 1, 'name': "Ann", 'marks': [90]},
+    "Ann",
+])
+def test_invalid_students_are_refused(tmp_path, record):
+    data_file = str(tmp_path / 'students.json')
+    
+    def client(call, server):
+        status, _, body = call('POST', '/students',
+                               {'students': [student(2, "Bob", Science=50), record]})
+        assert status == 400
+        assert body['error'].startswith("1 invalid students, nothing was saved: #1:")
+        assert call('GET', '/students/2')[0] == 404
+    
+    with_server(data_file, client)
+    assert not open_storage(data_file).exists()
+
+
+def test_failed_save_is_rolled_back(tmp_path):
+    data_file = str(tmp_path / 'students.json')
+    
+    def client(call, server):
+        call('POST', '/students', {'students': [student(1, "Ann", Mathematics=90)]})
+        
+        def fail(changed_ids):
+            raise OSError("Disk full")
+        server._save = fail
+        status, _, body = call('POST', '/students', {'students': [
+            student(1, "Ann B", Mathematics=10), student(2, "Bob", Science=50)]})
+        assert status == 500 and "Disk full" in body['error']
+        del server._save
+        
+        assert call('GET', '/students/2')[0] == 404
+        store = server.students.store
+        assert 2 not in store
+        assert store.names[store.rows[1]] == "Ann"
+        assert not store.has_changes('unsaved')
+        
+        assert call('POST', '/students', {'students': [student(3, "Cy")]})[0] == 200
+        status, _, record = call('GET', '/students/1')
+        assert (record['name'], record['marks'], record['grade']) == (
+            "Ann", {'Mathematics': 90.0}, 'A')
+    
+    with_server(data_file, client)
+    stream = open_storage(data_file).read()
+    try:
+        records = dict(stream)
+    finally:
+        stream.close()
+    assert sorted(records) == [1, 3]
+    assert records[1]['marks'] == {'Mathematics': 90.0}
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""Cohort shards: the manifest keeps every student ID in one cohort."""
+
+import os
+
+import pytest
+
+from student_files import iter_student_records
+from student_shards import MANIFEST_NAME, ShardManifest, shard_path
+from student_storage import open_storage
+
+from conftest import make_students
+
+
+def write_cohort(directory, cohort, student_ids, compression='zlib'):
+    """Write a shard holding some students and return its storage."""
+    students = make_students(max(student_ids))
+    for student_id in list(students.store.rows):
+        if student_id not in student_ids:
+            students.store.remove_student(student_id)
+    storage = open_storage(shard_path(str(directory), cohort, compression))
+    storage.write_records(iter_student_records(students))
+    return storage
+
+
+def read_ids(storage):
+    stream = storage.read()
+    try:
+        return [student_id for student_id, _ in stream]
+    finally:
+        stream.close()
+
+
+@pytest.mark.parametrize('compression', ['zlib', 'lzma'])
+def test_shards_are_recorded_in_the_manifest(tmp_path, compression):
+    storage = write_cohort(tmp_path, '2026 10A', range(1, 11), compression)
+    write_cohort(tmp_path, '2026 10B', range(11, 21), compression)
+    
+    manifest = ShardManifest.load(str(tmp_path))
+    assert manifest.cohorts() == ['2026 10A', '2026 10B']
+    assert manifest.shards['2026 10A']['students'] == 10
+    assert manifest.find(5) == '2026 10A'
+    assert manifest.find(15) == '2026 10B'
+    assert manifest.find(25) is None
+    assert read_ids(storage) == list(range(1, 11))
+
+
+def test_overlapping_ids_are_refused(tmp_path):
+    write_cohort(tmp_path, '2026 10A', range(1, 11))
+    storage_b = write_cohort(tmp_path, '2026 10B', range(11, 21))
+    shard_b = ShardManifest.load(str(tmp_path)).shards['2026 10B']
+    with open(storage_b.data_file, 'rb') as file:
+        contents = file.read()
+    
+    with pytest.raises(ValueError, match="already in cohort '2026 10A'"):
+        write_cohort(tmp_path, '2026 10B', [10, 11, 12])
+    
+    # Neither the shard nor its manifest entry changed, and no temporary file is left
+    assert ShardManifest.load(str(tmp_path)).shards['2026 10B'] == shard_b
+    with open(storage_b.data_file, 'rb') as file:
+        assert file.read() == contents
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        ['2026 10A.jsonl.z', '2026 10B.jsonl.z', MANIFEST_NAME, MANIFEST_NAME + '.lock'])
+
+
+def test_new_cohort_overlapping_is_not_recorded(tmp_path):
+    write_cohort(tmp_path, '2026 10A', range(1, 11))
+    with pytest.raises(ValueError):
+        write_cohort(tmp_path, '2026 10C', [5])
+    assert ShardManifest.load(str(tmp_path)).cohorts() == ['2026 10A']
+
+
+def test_save_of_changed_students_merges_with_the_shard(tmp_path):
+    storage = write_cohort(tmp_path, '2026 10A', range(1, 11))
+    students = make_students(10)
+    store = students.store
+    store.set_mark(store.rows[3], 'English', 5)
+    store.remove_student(4)
+    students.add(11, "New", {'Science': 50})
+    students.calculate_all()
+    
+    storage.save(students.copy({3, 4, 11}), {3, 4, 11}, complete=False)
+    assert read_ids(storage) == [1, 2, 3, 5, 6, 7, 8, 9, 10, 11]
+    assert ShardManifest.load(str(tmp_path)).find(11) == '2026 10A'
+
+
+def test_truncated_shard_is_an_error(tmp_path):
+    storage = write_cohort(tmp_path, '2026 10A', range(1, 200))
+    size = os.path.getsize(storage.data_file)
+    with open(storage.data_file, 'r+b') as file:
+        file.truncate(size - 4)
+    
+    with pytest.raises(ValueError, match="Truncated"):
+        read_ids(storage)
\ No newline at end of file
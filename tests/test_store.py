@@ -0,0 +1,124 @@
+"""Columnar grading against the original per-student calculate_results."""
+
+import random
+
+import pytest
+
+from student_grading import DEFAULT_SUBJECTS
+from student_store import CohortStore, Student, StudentCollection, calculate_block
+
+
+def legacy_results(marks):
+    """Student.calculate_results as first written: (total, percentage, grade)."""
+    if not marks:
+        return 0.0, 0.0, 'N/A'
+    total_marks = sum(marks.values())
+    percentage = (total_marks / (len(marks) * 100)) * 100
+    for bound, grade in ((90, 'A'), (80, 'B'), (70, 'C'), (60, 'D')):
+        if percentage >= bound:
+            return total_marks, percentage, grade
+    return total_marks, percentage, 'F'
+
+
+def random_marks(rng):
+    """Marks of a random subset of the subjects, whole or with decimals."""
+    marks = {}
+    for subject in DEFAULT_SUBJECTS:
+        if rng.random() < 0.8:
+            marks[subject] = float(rng.randint(0, 100)) if rng.random() < 0.7 \
+                else round(rng.uniform(0, 100), 2)
+    return marks
+
+
+def check(students, expected):
+    for student_id, marks in expected.items():
+        student = students[student_id]
+        total_marks, percentage, grade = legacy_results(marks)
+        assert student.total_marks == pytest.approx(total_marks)
+        assert student.percentage == pytest.approx(percentage)
+        assert student.grade == grade, (student_id, marks)
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def engine(request, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr('student_store.load_numpy', lambda: None)
+    else:
+        pytest.importorskip('numpy')
+    return request.param
+
+
+def test_batch_matches_legacy_results(engine):
+    rng = random.Random(1)
+    students = StudentCollection(DEFAULT_SUBJECTS)
+    expected = {}
+    for student_id in range(1, 2001):
+        expected[student_id] = random_marks(rng)
+        students.add(student_id, f"Student {student_id}", expected[student_id])
+    students.calculate_all()
+    check(students, expected)
+
+
+@pytest.mark.parametrize('marks', [
+    {},
+    {'Mathematics': 90},
+    {'Mathematics': 89.99},
+    {'Mathematics': 89.5, 'Science': 90.5},
+    {'Mathematics': 60, 'Science': 60, 'English': 60},
+    {'Mathematics': 59.99},
+    {'Mathematics': 0},
+    {'Mathematics': 100, 'Science': 100, 'English': 100, 'History': 100,
+     'Computer Science': 100},
+])
+def test_grade_boundaries_match_legacy_results(engine, marks):
+    students = StudentCollection(DEFAULT_SUBJECTS)
+    students.add(1, "Ann", marks)
+    students.calculate_all()
+    check(students, {1: marks})
+
+
+def test_edits_recalculate_only_changed_students(engine):
+    rng = random.Random(2)
+    students = StudentCollection(DEFAULT_SUBJECTS)
+    expected = {student_id: random_marks(rng) for student_id in range(1, 101)}
+    for student_id, marks in expected.items():
+        students.add(student_id, "Student", marks)
+    students.calculate_all()
+    store = students.store
+    store.track_changes('display')
+    store.pop_changes('display')  # A new tracker starts with every student
+    
+    expected[5] = {'English': 95.0}
+    students[5].marks = expected[5]
+    store.set_mark(store.rows[6], 'Mathematics', 100.0)
+    expected[6]['Mathematics'] = 100.0
+    students.calculate_all()
+    check(students, expected)
+    assert store.pop_changes('display') == {5, 6}
+
+
+def test_single_student_matches_legacy_results():
+    student = Student(7, "Ann")
+    student.marks = {'Mathematics': 72, 'Science': 91}
+    student.calculate_results()
+    assert (student.total_marks, student.percentage, student.grade) == pytest.approx(
+        legacy_results({'Mathematics': 72, 'Science': 91}))
+    
+    # Added to a collection, the student keeps its results
+    students = StudentCollection(DEFAULT_SUBJECTS)
+    students[7] = student
+    assert students[7].grade == 'B'
+
+
+def test_worker_block_matches_the_store():
+    rng = random.Random(3)
+    store = CohortStore(DEFAULT_SUBJECTS)
+    for student_id in range(1, 301):
+        store.add_student(student_id, "Student", random_marks(rng))
+    store.calculate_all()
+    
+    total_marks, percentage, codes, labels = calculate_block(list(store.subjects), store.marks)
+    assert list(total_marks) == list(store.total_marks)
+    assert list(percentage) == list(store.percentage)
+    assert [labels[code] for code in codes] == [store.grade_labels[code]
+                                                for code in store.grade_codes]
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""Shared data files: change detection, conflicts and incremental reloads."""
+
+import pytest
+
+from student_files import student_record
+from student_sync import ConflictError, DataFileSync, store_digests
+
+from conftest import make_students
+
+
+@pytest.fixture(params=['students.json', 'students.snap', 'students.db'])
+def data_file(request, tmp_path):
+    return str(tmp_path / request.param)
+
+
+def saved_sync(data_file, students):
+    """Save every student to a new data file and return the saver's sync."""
+    sync = DataFileSync(data_file)
+    sync.save(students.copy(), set(students.store.rows))
+    return sync
+
+
+def loaded_sync(data_file):
+    """Return a sync that has read the whole file, as after a load."""
+    sync = DataFileSync(data_file)
+    version = sync.storage.version()
+    students = make_students(0)
+    stream = sync.storage.read()
+    try:
+        stream.load_into(students.store, 1000000)
+    finally:
+        stream.close()
+    sync.reset(store_digests(students.store), version)
+    return sync
+
+
+def test_unread_file_cannot_be_saved(data_file):
+    students = make_students()
+    saved_sync(data_file, students)
+    with pytest.raises(ConflictError):
+        DataFileSync(data_file).save(students.copy(), {1})
+
+
+def test_save_after_another_program_saved_conflicts(data_file):
+    students = make_students()
+    mine = saved_sync(data_file, students)
+    other = loaded_sync(data_file)
+    assert not mine.changed()
+    
+    students.store.set_mark(students.store.rows[1], 'Mathematics', 12)
+    students.calculate_all()
+    other.save(students.copy(), {1})
+    assert mine.changed()
+    assert not other.changed()
+    
+    with pytest.raises(ConflictError):
+        mine.save(students.copy(), {2})
+
+
+def test_read_changes_returns_only_changed_students(data_file):
+    students = make_students()
+    mine = saved_sync(data_file, students)
+    other = loaded_sync(data_file)
+    
+    store = students.store
+    store.set_mark(store.rows[4], 'English', 3)
+    store.remove_student(5)
+    students.add(99, "New", {'Science': 60})
+    students.calculate_all()
+    other.save(students.copy({4, 5, 99}), {4, 5, 99}, complete=False)
+    
+    changes = mine.read_changes()
+    assert sorted(changes.records) == [4, 5, 99]
+    assert changes.records[4] == student_record(students[4])
+    assert changes.records[5] is None
+    assert not mine.changed()
+    assert mine.read_changes() is None
+    
+    # Merged, the next save goes through
+    store.set_mark(store.rows[6], 'English', 4)
+    students.calculate_all()
+    mine.save(students.copy(), {6})
+
+
+def test_journal_appends_are_read_incrementally(tmp_path):
+    data_file = str(tmp_path / 'students.json')
+    students = make_students()
+    mine = saved_sync(data_file, students)
+    other = loaded_sync(data_file)
+    
+    students.store.set_mark(students.store.rows[7], 'Science', 1)
+    students.calculate_all()
+    other.save(students.copy({7}), {7}, complete=False)
+    
+    changes = mine.read_changes()
+    assert changes.incremental
+    assert list(changes.records) == [7]
+
+
+def test_rewritten_file_is_compared_by_digest(tmp_path):
+    data_file = str(tmp_path / 'students.json')
+    students = make_students()
+    mine = saved_sync(data_file, students)
+    
+    # Another program rewrites the file with a single change
+    students.store.set_mark(students.store.rows[8], 'Science', 2)
+    students.calculate_all()
+    other = loaded_sync(data_file)
+    other.rewrite(lambda records: ((student_id, student_record(students[student_id]))
+                                   for student_id, _ in records))
+    
+    changes = mine.read_changes()
+    assert not changes.incremental
+    assert list(changes.records) == [8]
+
+
+def test_merge_records_keeps_other_students(data_file):
+    students = make_students()
+    saved_sync(data_file, students)
+    
+    sync = DataFileSync(data_file)
+    written = sync.merge_records([[(100, {'name': "Imported", 'marks': {'Mathematics': 50.0},
+                                          'total_marks': 50.0, 'percentage': 50.0,
+                                          'grade': 'D'})]])
+    assert written == 1
+    
+    stream = sync.storage.read()
+    try:
+        records = dict(stream)
+    finally:
+        stream.close()
+    assert sorted(records) == sorted(students.store.rows) + [100]
+
+
+def imported(student_id, name):
+    return student_id, {'name': name, 'marks': {'Mathematics': 50.0},
+                        'total_marks': 50.0, 'percentage': 50.0, 'grade': 'D'}
+
+
+@pytest.mark.parametrize('replace', [False, True])
+def test_new_file_is_written_in_id_order(data_file, replace):
+    sync = DataFileSync(data_file)
+    written = sync.merge_records([[imported(30, "A"), imported(5, "B")],
+                                  [imported(30, "C"), imported(7, "D")]], replace=replace)
+    assert written == 4
+    
+    stream = sync.storage.read()
+    try:
+        records = list(stream)
+    finally:
+        stream.close()
+    assert [(student_id, record['name']) for student_id, record in records] == [
+        (5, "B"), (7, "D"), (30, "C")]
+
+
+def test_replace_drops_the_old_students(data_file):
+    saved_sync(data_file, make_students())
+    sync = DataFileSync(data_file)
+    sync.merge_records([[imported(3, "A"), imported(1, "B")]], replace=True)
+    
+    stream = sync.storage.read()
+    try:
+        assert [student_id for student_id, _ in stream] == [1, 3]
+    finally:
+        stream.close()
\ No newline at end of file
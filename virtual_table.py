@@ -0,0 +1,196 @@
+"""
+Student Result Management System
+Virtual Scrolling Table
+EduTech Solutions
+
+A table that only creates Tk rows for the records currently visible. The
+rows are refilled from the in-memory store as the user scrolls, so memory
+use and scroll latency stay the same for 100 or 1,000,000 students.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+
+class VirtualTable(ttk.Frame):
+    """Treeview-style table that renders only its visible rows."""
+    
+    def __init__(self, master, columns, column_widths, row_count, row_values,
+                 command=None, height=20):
+        """
+        Initialize the table.
+        
+        Args:
+            master: Parent widget
+            columns (tuple): Column names
+            column_widths (dict): {column: width in pixels}
+            row_count (callable): Returns the total number of rows
+            row_values (callable): Returns the column values for a row index
+            command (callable): Called with the Tk event when the user
+                selects a row
+            height (int): Number of rows shown before the first resize
+        """
+        super().__init__(master)
+        self.row_count = row_count
+        self.row_values = row_values
+        self.command = command
+        self.first_row = 0          # Index of the row shown at the top
+        self.visible_rows = height  # Number of rows that fit in the widget
+        self.selected_key = None    # First column value of the selected row
+        self.items = []             # Treeview items currently in use
+        self.row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        
+        self.tree = ttk.Treeview(
+            self,
+            columns=columns,
+            show='headings',
+            height=height,
+            selectmode='browse'
+        )
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=column_widths[col], anchor='center')
+        
+        # The scrollbar moves through the whole data set, not the Treeview
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        
+        self.tree.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.E, tk.W))
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        
+        # Scrolling and selection events
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.tree.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.tree.bind('<Button-5>', lambda event: self.scroll(3))
+        self.tree.bind('<Up>', lambda event: self.move_selection(-1))
+        self.tree.bind('<Down>', lambda event: self.move_selection(1))
+        self.tree.bind('<Prior>', lambda event: self.scroll(-self.visible_rows))
+        self.tree.bind('<Next>', lambda event: self.scroll(self.visible_rows))
+        self.tree.bind('<Home>', lambda event: self.scroll_to(0))
+        self.tree.bind('<End>', lambda event: self.scroll_to(self.row_count()))
+    
+    # ============================================
+    # RENDERING
+    # ============================================
+    def refresh(self):
+        """Refill the visible rows from the data source."""
+        
+        count = self.row_count()
+        self.first_row = max(0, min(self.first_row, count - self.visible_rows))
+        shown = min(self.visible_rows, count - self.first_row)
+        
+        # Create or delete Treeview items so exactly the visible rows exist
+        while len(self.items) < shown:
+            self.items.append(self.tree.insert('', 'end', values=()))
+        while len(self.items) > shown:
+            self.tree.delete(self.items.pop())
+        
+        selected_item = None
+        for offset, item in enumerate(self.items):
+            values = self.row_values(self.first_row + offset)
+            self.tree.item(item, values=values)
+            if values[0] == self.selected_key:
+                selected_item = item
+        
+        # Keep the selection on the same record while it is visible
+        if selected_item is not None:
+            self.tree.selection_set(selected_item)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+        
+        if count:
+            self.scrollbar.set(self.first_row / count, (self.first_row + shown) / count)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def clear(self):
+        """Delete every Treeview item and go back to the top."""
+        
+        self.tree.delete(*self.items)
+        self.items = []
+        self.first_row = 0
+        self.selected_key = None
+    
+    # ============================================
+    # SCROLLING
+    # ============================================
+    def yview(self, *args):
+        """Scrollbar command: handles 'moveto' and 'scroll' requests."""
+        
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * self.row_count()))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.visible_rows
+            self.scroll(amount)
+    
+    def scroll(self, amount):
+        """Scroll by a number of rows (negative scrolls up)."""
+        
+        self.scroll_to(self.first_row + amount)
+        return 'break'
+    
+    def scroll_to(self, first_row):
+        """Show the rows starting at first_row."""
+        
+        first_row = max(0, min(first_row, self.row_count() - self.visible_rows))
+        if first_row != self.first_row or not self.items:
+            self.first_row = first_row
+            self.refresh()
+        return 'break'
+    
+    def on_mouse_wheel(self, event):
+        """Scroll three rows per wheel notch."""
+        
+        return self.scroll(-3 if event.delta > 0 else 3)
+    
+    def on_resize(self, event):
+        """Render as many rows as fit in the new height."""
+        
+        # One row's worth of height is taken by the column headings
+        visible_rows = max(1, event.height // self.row_height - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.refresh()
+    
+    # ============================================
+    # SELECTION
+    # ============================================
+    def on_select(self, event):
+        """Remember the selected record and notify the command callback."""
+        
+        selection = self.tree.selection()
+        if not selection:
+            return
+        
+        key = self.tree.item(selection[0])['values'][0]
+        # Re-selecting the same record after a scroll is not a user action
+        if key != self.selected_key:
+            self.selected_key = key
+            if self.command:
+                self.command(event)
+    
+    def move_selection(self, step):
+        """Move the selection up or down one row, scrolling at the edges."""
+        
+        selection = self.tree.selection()
+        if selection and selection[0] in self.items:
+            position = self.items.index(selection[0]) + step
+        else:
+            position = 0 if step > 0 else len(self.items) - 1
+        
+        if position < 0:
+            self.scroll(-1)
+            position = 0
+        elif position >= len(self.items):
+            self.scroll(1)
+            position = len(self.items) - 1
+        
+        if self.items:
+            self.tree.selection_set(self.items[position])
+        return 'break'
\ No newline at end of file